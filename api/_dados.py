@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Dados estáticos das funções serverless (Vercel) em api/
+
+Este arquivo é a fonte; as funções servem os bytes já codificados de
+api/_payloads.py, gerado a partir daqui. Depois de editar os dados, rode:
+
+    python api/_dados.py
+
+Arquivos com _ no início não viram funções na Vercel.
+"""
+
+import json
+import os
+
+# Dados estáticos para produção
+FUNCIONARIOS = [
+    {"id": "guido", "nome": "Guido", "horarioInicio": "09:00", "horarioFim": "17:30", "cor": "#2563eb"},
+    {"id": "pedro", "nome": "Pedro", "horarioInicio": "09:00", "horarioFim": "17:30", "cor": "#10b981"},
+    {"id": "michelle", "nome": "Michelle", "horarioInicio": "13:00", "horarioFim": "17:30", "cor": "#f59e0b"},
+    {"id": "dayana", "nome": "Dayana", "horarioInicio": "09:00", "horarioFim": "17:30", "cor": "#ef4444"},
+    {"id": "jean", "nome": "Jean", "horarioInicio": "08:00", "horarioFim": "17:30", "cor": "#8b5cf6"},
+    {"id": "andreia", "nome": "Andreia", "horarioInicio": "14:00", "horarioFim": "17:30", "cor": "#06b6d4"},
+    {"id": "thais", "nome": "Thais", "horarioInicio": "flexible", "horarioFim": "flexible", "cor": "#ec4899"},
+    {"id": "teste_funcionario", "nome": "Funcionário de Teste", "horarioInicio": "", "horarioFim": "16:00", "cor": "#2563eb"}
+]
+
+TAREFAS = [
+    {"id": "checkins", "nome": "Check-ins", "categoria": "gestao", "tempoEstimado": 30, "descricao": "Acompanhamento individual dos alunos", "prioridade": "alta"},
+    {"id": "reuniao_diaria", "nome": "Reunião diária", "categoria": "gestao", "tempoEstimado": 30, "descricao": "Alinhamento da equipe e planejamento do dia", "prioridade": "alta"},
+    {"id": "suporte", "nome": "Suporte", "categoria": "atendimento", "tempoEstimado": 60, "descricao": "Atendimento aos clientes e resolução de dúvidas", "prioridade": "alta"},
+    {"id": "social_selling", "nome": "Social Selling Insta", "categoria": "marketing", "tempoEstimado": 45, "descricao": "Atividades de marketing no Instagram", "prioridade": "media"},
+    {"id": "engajamento_grupo", "nome": "Enviar mensagens de engajamento no grupo", "categoria": "engajamento", "tempoEstimado": 30, "descricao": "Comunicação ativa com grupos de alunos", "prioridade": "alta"},
+    {"id": "separar_alunos", "nome": "Separar alunos para engajamento", "categoria": "engajamento", "tempoEstimado": 45, "descricao": "Segmentação de alunos para ações específicas", "prioridade": "media"},
+    {"id": "material_renovacao", "nome": "Elaborar material para alunos de renovação", "categoria": "conteudo", "tempoEstimado": 90, "descricao": "Criação de conteúdo para retenção de clientes", "prioridade": "alta"},
+    {"id": "montar_planos", "nome": "Montar planos novos", "categoria": "produto", "tempoEstimado": 60, "descricao": "Desenvolvimento de novos produtos e serviços", "prioridade": "media"},
+    {"id": "engajamento_alunos", "nome": "Engajamento dos alunos", "categoria": "engajamento", "tempoEstimado": 45, "descricao": "Ativação e motivação dos alunos", "prioridade": "alta"},
+    {"id": "conteudo_desengajados", "nome": "Produção de conteúdo para alunos desengajados", "categoria": "conteudo", "tempoEstimado": 60, "descricao": "Material específico para reativação de alunos", "prioridade": "media"},
+    {"id": "engajamento_time", "nome": "Engajamento no grupo do Time", "categoria": "interno", "tempoEstimado": 15, "descricao": "Comunicação e motivação da equipe interna", "prioridade": "baixa"}
+]
+
+AGENDA = [
+    {"horario": "08:00", "funcionario": "jean", "tarefa": "suporte"},
+    {"horario": "09:00", "funcionario": "guido", "tarefa": "checkins"},
+    {"horario": "09:00", "funcionario": "pedro", "tarefa": "checkins"},
+    {"horario": "09:00", "funcionario": "dayana", "tarefa": "social_selling"},
+    {"horario": "09:00", "funcionario": "jean", "tarefa": "suporte"},
+    {"horario": "09:30", "funcionario": "guido", "tarefa": "reuniao_diaria"},
+    {"horario": "09:30", "funcionario": "pedro", "tarefa": "reuniao_diaria"},
+    {"horario": "09:30", "funcionario": "dayana", "tarefa": "reuniao_diaria"},
+    {"horario": "09:30", "funcionario": "jean", "tarefa": "suporte"},
+    {"horario": "10:00", "funcionario": "guido", "tarefa": "reuniao_diaria"},
+    {"horario": "10:00", "funcionario": "pedro", "tarefa": "reuniao_diaria"},
+    {"horario": "10:00", "funcionario": "dayana", "tarefa": "reuniao_diaria"},
+    {"horario": "10:00", "funcionario": "jean", "tarefa": "suporte"},
+    {"horario": "10:30", "funcionario": "guido", "tarefa": "checkins"},
+    {"horario": "10:30", "funcionario": "pedro", "tarefa": "checkins"},
+    {"horario": "10:30", "funcionario": "dayana", "tarefa": "engajamento_grupo"},
+    {"horario": "10:30", "funcionario": "jean", "tarefa": "suporte"},
+    {"horario": "11:00", "funcionario": "guido", "tarefa": "checkins"},
+    {"horario": "11:00", "funcionario": "pedro", "tarefa": "checkins"},
+    {"horario": "11:00", "funcionario": "jean", "tarefa": "suporte"},
+    {"horario": "11:00", "funcionario": "thais", "tarefa": "checkins"},
+    {"horario": "11:30", "funcionario": "guido", "tarefa": "montar_planos"},
+    {"horario": "11:30", "funcionario": "pedro", "tarefa": "checkins"},
+    {"horario": "11:30", "funcionario": "thais", "tarefa": "montar_planos"},
+    {"horario": "13:00", "funcionario": "guido", "tarefa": "suporte"},
+    {"horario": "13:00", "funcionario": "michelle", "tarefa": "checkins"},
+    {"horario": "13:00", "funcionario": "dayana", "tarefa": "social_selling"},
+    {"horario": "13:30", "funcionario": "guido", "tarefa": "separar_alunos"},
+    {"horario": "13:30", "funcionario": "michelle", "tarefa": "checkins"},
+    {"horario": "13:30", "funcionario": "dayana", "tarefa": "social_selling"},
+    {"horario": "14:00", "funcionario": "guido", "tarefa": "separar_alunos"},
+    {"horario": "14:00", "funcionario": "michelle", "tarefa": "engajamento_grupo"},
+    {"horario": "14:00", "funcionario": "andreia", "tarefa": "suporte"},
+    {"horario": "14:30", "funcionario": "guido", "tarefa": "separar_alunos"},
+    {"horario": "14:30", "funcionario": "michelle", "tarefa": "engajamento_grupo"},
+    {"horario": "14:30", "funcionario": "andreia", "tarefa": "suporte"},
+    {"horario": "15:00", "funcionario": "pedro", "tarefa": "material_renovacao"},
+    {"horario": "15:00", "funcionario": "michelle", "tarefa": "engajamento_grupo"},
+    {"horario": "15:00", "funcionario": "andreia", "tarefa": "suporte"},
+    {"horario": "15:30", "funcionario": "pedro", "tarefa": "material_renovacao"},
+    {"horario": "15:30", "funcionario": "michelle", "tarefa": "material_renovacao"},
+    {"horario": "15:30", "funcionario": "andreia", "tarefa": "suporte"},
+    {"horario": "16:00", "funcionario": "pedro", "tarefa": "material_renovacao"},
+    {"horario": "16:00", "funcionario": "michelle", "tarefa": "material_renovacao"},
+    {"horario": "16:00", "funcionario": "dayana", "tarefa": "engajamento_alunos"},
+    {"horario": "16:00", "funcionario": "andreia", "tarefa": "suporte"},
+    {"horario": "16:30", "funcionario": "pedro", "tarefa": "checkins"},
+    {"horario": "16:30", "funcionario": "michelle", "tarefa": "material_renovacao"},
+    {"horario": "16:30", "funcionario": "dayana", "tarefa": "checkins"},
+    {"horario": "16:30", "funcionario": "andreia", "tarefa": "suporte"},
+    {"horario": "17:00", "funcionario": "pedro", "tarefa": "checkins"},
+    {"horario": "17:00", "funcionario": "michelle", "tarefa": "suporte"},
+    {"horario": "17:00", "funcionario": "dayana", "tarefa": "social_selling"},
+    {"horario": "17:00", "funcionario": "andreia", "tarefa": "suporte"},
+    {"horario": "17:00", "funcionario": "thais", "tarefa": "checkins"},
+    {"horario": "17:30", "funcionario": "pedro", "tarefa": "checkins"},
+    {"horario": "17:30", "funcionario": "michelle", "tarefa": "suporte"},
+    {"horario": "17:30", "funcionario": "dayana", "tarefa": "social_selling"},
+    {"horario": "17:30", "funcionario": "andreia", "tarefa": "suporte"},
+    {"horario": "17:30", "funcionario": "thais", "tarefa": "montar_planos"}
+]
+
+
+def _json(dados) -> bytes:
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def payloads() -> dict:
+    """Nome da constante em _payloads.py -> bytes (ou dicionário de bytes)"""
+    agenda_por_funcionario = {}
+    for item in AGENDA:
+        agenda_por_funcionario.setdefault(item['funcionario'], []).append(item)
+    return {
+        'SAUDE': _json({"status": "ok", "message": "API funcionando na Vercel"}),
+        'FUNCIONARIOS': _json(FUNCIONARIOS),
+        'TAREFAS': _json(TAREFAS),
+        'AGENDA': _json(AGENDA),
+        'FUNCIONARIO': {f['id']: _json(f) for f in FUNCIONARIOS},
+        'AGENDA_POR_FUNCIONARIO': {f['id']: _json(agenda_por_funcionario.get(f['id'], [])) for f in FUNCIONARIOS},
+    }
+
+
+def gerar_modulo() -> str:
+    """Código-fonte de _payloads.py (bytes literais: carregados do .pyc, sem codificar nada no cold start)"""
+    linhas = ['# Gerado por api/_dados.py (python api/_dados.py); não edite à mão', '']
+    for nome, valor in payloads().items():
+        if isinstance(valor, dict):
+            linhas.append(f'{nome} = {{')
+            linhas += [f'    {chave!r}: {corpo!r},' for chave, corpo in valor.items()]
+            linhas.append('}')
+        else:
+            linhas.append(f'{nome} = {valor!r}')
+    return '\n'.join(linhas) + '\n'
+
+
+CAMINHO_PAYLOADS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_payloads.py')
+
+
+if __name__ == '__main__':
+    with open(CAMINHO_PAYLOADS, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(gerar_modulo())
+    print(f'✅ {CAMINHO_PAYLOADS} atualizado')
@@ -0,0 +1,26 @@
+# Gerado por api/_dados.py (python api/_dados.py); não edite à mão
+
+SAUDE = b'{"status":"ok","message":"API funcionando na Vercel"}'
+FUNCIONARIOS = b'[{"id":"guido","nome":"Guido","horarioInicio":"09:00","horarioFim":"17:30","cor":"#2563eb"},{"id":"pedro","nome":"Pedro","horarioInicio":"09:00","horarioFim":"17:30","cor":"#10b981"},{"id":"michelle","nome":"Michelle","horarioInicio":"13:00","horarioFim":"17:30","cor":"#f59e0b"},{"id":"dayana","nome":"Dayana","horarioInicio":"09:00","horarioFim":"17:30","cor":"#ef4444"},{"id":"jean","nome":"Jean","horarioInicio":"08:00","horarioFim":"17:30","cor":"#8b5cf6"},{"id":"andreia","nome":"Andreia","horarioInicio":"14:00","horarioFim":"17:30","cor":"#06b6d4"},{"id":"thais","nome":"Thais","horarioInicio":"flexible","horarioFim":"flexible","cor":"#ec4899"},{"id":"teste_funcionario","nome":"Funcion\xc3\xa1rio de Teste","horarioInicio":"","horarioFim":"16:00","cor":"#2563eb"}]'
+TAREFAS = b'[{"id":"checkins","nome":"Check-ins","categoria":"gestao","tempoEstimado":30,"descricao":"Acompanhamento individual dos alunos","prioridade":"alta"},{"id":"reuniao_diaria","nome":"Reuni\xc3\xa3o di\xc3\xa1ria","categoria":"gestao","tempoEstimado":30,"descricao":"Alinhamento da equipe e planejamento do dia","prioridade":"alta"},{"id":"suporte","nome":"Suporte","categoria":"atendimento","tempoEstimado":60,"descricao":"Atendimento aos clientes e resolu\xc3\xa7\xc3\xa3o de d\xc3\xbavidas","prioridade":"alta"},{"id":"social_selling","nome":"Social Selling Insta","categoria":"marketing","tempoEstimado":45,"descricao":"Atividades de marketing no Instagram","prioridade":"media"},{"id":"engajamento_grupo","nome":"Enviar mensagens de engajamento no grupo","categoria":"engajamento","tempoEstimado":30,"descricao":"Comunica\xc3\xa7\xc3\xa3o ativa com grupos de alunos","prioridade":"alta"},{"id":"separar_alunos","nome":"Separar alunos para engajamento","categoria":"engajamento","tempoEstimado":45,"descricao":"Segmenta\xc3\xa7\xc3\xa3o de alunos para a\xc3\xa7\xc3\xb5es espec\xc3\xadficas","prioridade":"media"},{"id":"material_renovacao","nome":"Elaborar material para alunos de renova\xc3\xa7\xc3\xa3o","categoria":"conteudo","tempoEstimado":90,"descricao":"Cria\xc3\xa7\xc3\xa3o de conte\xc3\xbado para reten\xc3\xa7\xc3\xa3o de clientes","prioridade":"alta"},{"id":"montar_planos","nome":"Montar planos novos","categoria":"produto","tempoEstimado":60,"descricao":"Desenvolvimento de novos produtos e servi\xc3\xa7os","prioridade":"media"},{"id":"engajamento_alunos","nome":"Engajamento dos alunos","categoria":"engajamento","tempoEstimado":45,"descricao":"Ativa\xc3\xa7\xc3\xa3o e motiva\xc3\xa7\xc3\xa3o dos alunos","prioridade":"alta"},{"id":"conteudo_desengajados","nome":"Produ\xc3\xa7\xc3\xa3o de conte\xc3\xbado para alunos desengajados","categoria":"conteudo","tempoEstimado":60,"descricao":"Material espec\xc3\xadfico para reativa\xc3\xa7\xc3\xa3o de alunos","prioridade":"media"},{"id":"engajamento_time","nome":"Engajamento no grupo do Time","categoria":"interno","tempoEstimado":15,"descricao":"Comunica\xc3\xa7\xc3\xa3o e motiva\xc3\xa7\xc3\xa3o da equipe interna","prioridade":"baixa"}]'
+AGENDA = b'[{"horario":"08:00","funcionario":"jean","tarefa":"suporte"},{"horario":"09:00","funcionario":"guido","tarefa":"checkins"},{"horario":"09:00","funcionario":"pedro","tarefa":"checkins"},{"horario":"09:00","funcionario":"dayana","tarefa":"social_selling"},{"horario":"09:00","funcionario":"jean","tarefa":"suporte"},{"horario":"09:30","funcionario":"guido","tarefa":"reuniao_diaria"},{"horario":"09:30","funcionario":"pedro","tarefa":"reuniao_diaria"},{"horario":"09:30","funcionario":"dayana","tarefa":"reuniao_diaria"},{"horario":"09:30","funcionario":"jean","tarefa":"suporte"},{"horario":"10:00","funcionario":"guido","tarefa":"reuniao_diaria"},{"horario":"10:00","funcionario":"pedro","tarefa":"reuniao_diaria"},{"horario":"10:00","funcionario":"dayana","tarefa":"reuniao_diaria"},{"horario":"10:00","funcionario":"jean","tarefa":"suporte"},{"horario":"10:30","funcionario":"guido","tarefa":"checkins"},{"horario":"10:30","funcionario":"pedro","tarefa":"checkins"},{"horario":"10:30","funcionario":"dayana","tarefa":"engajamento_grupo"},{"horario":"10:30","funcionario":"jean","tarefa":"suporte"},{"horario":"11:00","funcionario":"guido","tarefa":"checkins"},{"horario":"11:00","funcionario":"pedro","tarefa":"checkins"},{"horario":"11:00","funcionario":"jean","tarefa":"suporte"},{"horario":"11:00","funcionario":"thais","tarefa":"checkins"},{"horario":"11:30","funcionario":"guido","tarefa":"montar_planos"},{"horario":"11:30","funcionario":"pedro","tarefa":"checkins"},{"horario":"11:30","funcionario":"thais","tarefa":"montar_planos"},{"horario":"13:00","funcionario":"guido","tarefa":"suporte"},{"horario":"13:00","funcionario":"michelle","tarefa":"checkins"},{"horario":"13:00","funcionario":"dayana","tarefa":"social_selling"},{"horario":"13:30","funcionario":"guido","tarefa":"separar_alunos"},{"horario":"13:30","funcionario":"michelle","tarefa":"checkins"},{"horario":"13:30","funcionario":"dayana","tarefa":"social_selling"},{"horario":"14:00","funcionario":"guido","tarefa":"separar_alunos"},{"horario":"14:00","funcionario":"michelle","tarefa":"engajamento_grupo"},{"horario":"14:00","funcionario":"andreia","tarefa":"suporte"},{"horario":"14:30","funcionario":"guido","tarefa":"separar_alunos"},{"horario":"14:30","funcionario":"michelle","tarefa":"engajamento_grupo"},{"horario":"14:30","funcionario":"andreia","tarefa":"suporte"},{"horario":"15:00","funcionario":"pedro","tarefa":"material_renovacao"},{"horario":"15:00","funcionario":"michelle","tarefa":"engajamento_grupo"},{"horario":"15:00","funcionario":"andreia","tarefa":"suporte"},{"horario":"15:30","funcionario":"pedro","tarefa":"material_renovacao"},{"horario":"15:30","funcionario":"michelle","tarefa":"material_renovacao"},{"horario":"15:30","funcionario":"andreia","tarefa":"suporte"},{"horario":"16:00","funcionario":"pedro","tarefa":"material_renovacao"},{"horario":"16:00","funcionario":"michelle","tarefa":"material_renovacao"},{"horario":"16:00","funcionario":"dayana","tarefa":"engajamento_alunos"},{"horario":"16:00","funcionario":"andreia","tarefa":"suporte"},{"horario":"16:30","funcionario":"pedro","tarefa":"checkins"},{"horario":"16:30","funcionario":"michelle","tarefa":"material_renovacao"},{"horario":"16:30","funcionario":"dayana","tarefa":"checkins"},{"horario":"16:30","funcionario":"andreia","tarefa":"suporte"},{"horario":"17:00","funcionario":"pedro","tarefa":"checkins"},{"horario":"17:00","funcionario":"michelle","tarefa":"suporte"},{"horario":"17:00","funcionario":"dayana","tarefa":"social_selling"},{"horario":"17:00","funcionario":"andreia","tarefa":"suporte"},{"horario":"17:00","funcionario":"thais","tarefa":"checkins"},{"horario":"17:30","funcionario":"pedro","tarefa":"checkins"},{"horario":"17:30","funcionario":"michelle","tarefa":"suporte"},{"horario":"17:30","funcionario":"dayana","tarefa":"social_selling"},{"horario":"17:30","funcionario":"andreia","tarefa":"suporte"},{"horario":"17:30","funcionario":"thais","tarefa":"montar_planos"}]'
+FUNCIONARIO = {
+    'guido': b'{"id":"guido","nome":"Guido","horarioInicio":"09:00","horarioFim":"17:30","cor":"#2563eb"}',
+    'pedro': b'{"id":"pedro","nome":"Pedro","horarioInicio":"09:00","horarioFim":"17:30","cor":"#10b981"}',
+    'michelle': b'{"id":"michelle","nome":"Michelle","horarioInicio":"13:00","horarioFim":"17:30","cor":"#f59e0b"}',
+    'dayana': b'{"id":"dayana","nome":"Dayana","horarioInicio":"09:00","horarioFim":"17:30","cor":"#ef4444"}',
+    'jean': b'{"id":"jean","nome":"Jean","horarioInicio":"08:00","horarioFim":"17:30","cor":"#8b5cf6"}',
+    'andreia': b'{"id":"andreia","nome":"Andreia","horarioInicio":"14:00","horarioFim":"17:30","cor":"#06b6d4"}',
+    'thais': b'{"id":"thais","nome":"Thais","horarioInicio":"flexible","horarioFim":"flexible","cor":"#ec4899"}',
+    'teste_funcionario': b'{"id":"teste_funcionario","nome":"Funcion\xc3\xa1rio de Teste","horarioInicio":"","horarioFim":"16:00","cor":"#2563eb"}',
+}
+AGENDA_POR_FUNCIONARIO = {
+    'guido': b'[{"horario":"09:00","funcionario":"guido","tarefa":"checkins"},{"horario":"09:30","funcionario":"guido","tarefa":"reuniao_diaria"},{"horario":"10:00","funcionario":"guido","tarefa":"reuniao_diaria"},{"horario":"10:30","funcionario":"guido","tarefa":"checkins"},{"horario":"11:00","funcionario":"guido","tarefa":"checkins"},{"horario":"11:30","funcionario":"guido","tarefa":"montar_planos"},{"horario":"13:00","funcionario":"guido","tarefa":"suporte"},{"horario":"13:30","funcionario":"guido","tarefa":"separar_alunos"},{"horario":"14:00","funcionario":"guido","tarefa":"separar_alunos"},{"horario":"14:30","funcionario":"guido","tarefa":"separar_alunos"}]',
+    'pedro': b'[{"horario":"09:00","funcionario":"pedro","tarefa":"checkins"},{"horario":"09:30","funcionario":"pedro","tarefa":"reuniao_diaria"},{"horario":"10:00","funcionario":"pedro","tarefa":"reuniao_diaria"},{"horario":"10:30","funcionario":"pedro","tarefa":"checkins"},{"horario":"11:00","funcionario":"pedro","tarefa":"checkins"},{"horario":"11:30","funcionario":"pedro","tarefa":"checkins"},{"horario":"15:00","funcionario":"pedro","tarefa":"material_renovacao"},{"horario":"15:30","funcionario":"pedro","tarefa":"material_renovacao"},{"horario":"16:00","funcionario":"pedro","tarefa":"material_renovacao"},{"horario":"16:30","funcionario":"pedro","tarefa":"checkins"},{"horario":"17:00","funcionario":"pedro","tarefa":"checkins"},{"horario":"17:30","funcionario":"pedro","tarefa":"checkins"}]',
+    'michelle': b'[{"horario":"13:00","funcionario":"michelle","tarefa":"checkins"},{"horario":"13:30","funcionario":"michelle","tarefa":"checkins"},{"horario":"14:00","funcionario":"michelle","tarefa":"engajamento_grupo"},{"horario":"14:30","funcionario":"michelle","tarefa":"engajamento_grupo"},{"horario":"15:00","funcionario":"michelle","tarefa":"engajamento_grupo"},{"horario":"15:30","funcionario":"michelle","tarefa":"material_renovacao"},{"horario":"16:00","funcionario":"michelle","tarefa":"material_renovacao"},{"horario":"16:30","funcionario":"michelle","tarefa":"material_renovacao"},{"horario":"17:00","funcionario":"michelle","tarefa":"suporte"},{"horario":"17:30","funcionario":"michelle","tarefa":"suporte"}]',
+    'dayana': b'[{"horario":"09:00","funcionario":"dayana","tarefa":"social_selling"},{"horario":"09:30","funcionario":"dayana","tarefa":"reuniao_diaria"},{"horario":"10:00","funcionario":"dayana","tarefa":"reuniao_diaria"},{"horario":"10:30","funcionario":"dayana","tarefa":"engajamento_grupo"},{"horario":"13:00","funcionario":"dayana","tarefa":"social_selling"},{"horario":"13:30","funcionario":"dayana","tarefa":"social_selling"},{"horario":"16:00","funcionario":"dayana","tarefa":"engajamento_alunos"},{"horario":"16:30","funcionario":"dayana","tarefa":"checkins"},{"horario":"17:00","funcionario":"dayana","tarefa":"social_selling"},{"horario":"17:30","funcionario":"dayana","tarefa":"social_selling"}]',
+    'jean': b'[{"horario":"08:00","funcionario":"jean","tarefa":"suporte"},{"horario":"09:00","funcionario":"jean","tarefa":"suporte"},{"horario":"09:30","funcionario":"jean","tarefa":"suporte"},{"horario":"10:00","funcionario":"jean","tarefa":"suporte"},{"horario":"10:30","funcionario":"jean","tarefa":"suporte"},{"horario":"11:00","funcionario":"jean","tarefa":"suporte"}]',
+    'andreia': b'[{"horario":"14:00","funcionario":"andreia","tarefa":"suporte"},{"horario":"14:30","funcionario":"andreia","tarefa":"suporte"},{"horario":"15:00","funcionario":"andreia","tarefa":"suporte"},{"horario":"15:30","funcionario":"andreia","tarefa":"suporte"},{"horario":"16:00","funcionario":"andreia","tarefa":"suporte"},{"horario":"16:30","funcionario":"andreia","tarefa":"suporte"},{"horario":"17:00","funcionario":"andreia","tarefa":"suporte"},{"horario":"17:30","funcionario":"andreia","tarefa":"suporte"}]',
+    'thais': b'[{"horario":"11:00","funcionario":"thais","tarefa":"checkins"},{"horario":"11:30","funcionario":"thais","tarefa":"montar_planos"},{"horario":"17:00","funcionario":"thais","tarefa":"checkins"},{"horario":"17:30","funcionario":"thais","tarefa":"montar_planos"}]',
+    'teste_funcionario': b'[]',
+}
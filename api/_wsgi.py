@@ -0,0 +1,88 @@
+"""
+WSGI mínimo das funções serverless (Vercel)
+Respostas JSON já codificadas e CORS aberto, sem Flask: importar uma função
+custa poucos milissegundos no cold start
+"""
+
+from typing import Dict, Optional, Tuple
+
+CABECALHOS = [('Content-Type', 'application/json'), ('Access-Control-Allow-Origin', '*')]
+CABECALHOS_PREFLIGHT = [
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, HEAD, POST, OPTIONS'),
+    ('Access-Control-Allow-Headers', '*'),
+    ('Access-Control-Max-Age', '86400'),
+]
+
+NAO_ENCONTRADO = b'{"error":"Rota n\xc3\xa3o encontrada"}'
+
+# Mesmo formato de POST /api/batch do backend (backend/src/services/lote.py); os dados não mudam
+ROTA_LOTE = '/api/batch'
+MAX_ITENS_LOTE = 32
+
+
+def app_json(rotas: Dict[str, bytes], colecoes: Optional[Dict[str, Tuple[Dict[str, bytes], str, bytes]]] = None,
+             padrao: Optional[bytes] = None, lote: bool = False):
+    """
+    Monta o app WSGI
+
+    Args:
+        rotas: caminho exato -> corpo
+        colecoes: prefixo (ex.: '/api/funcionarios/') -> (id -> corpo, status e corpo quando o id não existe)
+        padrao: corpo para qualquer outro caminho (função de um recurso só); sem ele, 404
+        lote: atende POST /api/batch com as rotas acima (só faz sentido sem `padrao`)
+    """
+    colecoes = colecoes or {}
+
+    def resolver(caminho: str) -> Tuple[str, bytes]:
+        caminho = caminho.rstrip('/') or '/'
+        corpo = rotas.get(caminho)
+        if corpo is not None:
+            return '200 OK', corpo
+        for prefixo, (itens, status_ausente, ausente) in colecoes.items():
+            if caminho.startswith(prefixo):
+                corpo = itens.get(caminho[len(prefixo):])
+                return ('200 OK', corpo) if corpo is not None else (status_ausente, ausente)
+        return ('200 OK', padrao) if padrao is not None else ('404 Not Found', NAO_ENCONTRADO)
+
+    def executar_lote(environ) -> Tuple[str, bytes]:
+        # Só aqui: json e urllib custam milissegundos no cold start das outras rotas
+        import json
+        from urllib.parse import urlsplit
+
+        try:
+            tamanho = int(environ.get('CONTENT_LENGTH') or 0)
+            dados = json.loads(environ['wsgi.input'].read(tamanho) or b'null')
+        except (ValueError, KeyError):
+            dados = None
+        pedidos = dados.get('requisicoes') if isinstance(dados, dict) else dados
+        if not isinstance(pedidos, list) or not pedidos or len(pedidos) > MAX_ITENS_LOTE:
+            erro = f'Envie {{"requisicoes": [...]}} com 1 a {MAX_ITENS_LOTE} itens'
+            return '400 Bad Request', json.dumps({'error': erro}, ensure_ascii=False).encode('utf-8')
+        respostas = []
+        for pedido in pedidos:
+            caminho = pedido.get('caminho') if isinstance(pedido, dict) else pedido
+            caminho = urlsplit(caminho).path if isinstance(caminho, str) else ''
+            status, corpo = resolver(caminho) if caminho != ROTA_LOTE else ('404 Not Found', NAO_ENCONTRADO)
+            cabeca = json.dumps({'caminho': caminho, 'status': int(status.split(' ', 1)[0])}, ensure_ascii=False)
+            respostas.append(cabeca[:-1].encode('utf-8') + b',"corpo":' + corpo + b'}')
+        return '200 OK', b'{"versao":"0","consistente":true,"respostas":[' + b','.join(respostas) + b']}'
+
+    def app(environ, start_response):
+        metodo = environ.get('REQUEST_METHOD', 'GET')
+        caminho = environ.get('PATH_INFO', '/')
+        if metodo == 'OPTIONS':
+            start_response('204 No Content', CABECALHOS_PREFLIGHT)
+            return [b'']
+        if lote and metodo == 'POST' and caminho.rstrip('/') == ROTA_LOTE:
+            status, corpo = executar_lote(environ)
+        elif metodo not in ('GET', 'HEAD'):
+            start_response('405 Method Not Allowed', CABECALHOS + [('Allow', 'GET, HEAD, OPTIONS')])
+            return [b'']
+        else:
+            status, corpo = resolver(caminho)
+
+        start_response(status, CABECALHOS + [('Content-Length', str(len(corpo)))])
+        return [b'' if metodo == 'HEAD' else corpo]
+
+    return app
@@ -0,0 +1,10 @@
+"""
+POST /api/batch: as rotas de api/index.py num lote só (carga inicial do painel
+numa função e num cold start)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from index import app
@@ -1,132 +1,28 @@
 #!/usr/bin/env python3
 """
 API para Vercel - Serverless Functions
+Dados estáticos (fonte em api/_dados.py), servidos já codificados
 """
-from flask import Flask, jsonify
-from flask_cors import CORS
-import json
 import os
-
-app = Flask(__name__)
-CORS(app, origins="*")
-
-# Dados estáticos para produção
-FUNCIONARIOS = [
-    {"id": "guido", "nome": "Guido", "horarioInicio": "09:00", "horarioFim": "17:30", "cor": "#2563eb"},
-    {"id": "pedro", "nome": "Pedro", "horarioInicio": "09:00", "horarioFim": "17:30", "cor": "#10b981"},
-    {"id": "michelle", "nome": "Michelle", "horarioInicio": "13:00", "horarioFim": "17:30", "cor": "#f59e0b"},
-    {"id": "dayana", "nome": "Dayana", "horarioInicio": "09:00", "horarioFim": "17:30", "cor": "#ef4444"},
-    {"id": "jean", "nome": "Jean", "horarioInicio": "08:00", "horarioFim": "17:30", "cor": "#8b5cf6"},
-    {"id": "andreia", "nome": "Andreia", "horarioInicio": "14:00", "horarioFim": "17:30", "cor": "#06b6d4"},
-    {"id": "thais", "nome": "Thais", "horarioInicio": "flexible", "horarioFim": "flexible", "cor": "#ec4899"},
-    {"id": "teste_funcionario", "nome": "Funcionário de Teste", "horarioInicio": "", "horarioFim": "16:00", "cor": "#2563eb"}
-]
-
-TAREFAS = [
-    {"id": "checkins", "nome": "Check-ins", "categoria": "gestao", "tempoEstimado": 30, "descricao": "Acompanhamento individual dos alunos", "prioridade": "alta"},
-    {"id": "reuniao_diaria", "nome": "Reunião diária", "categoria": "gestao", "tempoEstimado": 30, "descricao": "Alinhamento da equipe e planejamento do dia", "prioridade": "alta"},
-    {"id": "suporte", "nome": "Suporte", "categoria": "atendimento", "tempoEstimado": 60, "descricao": "Atendimento aos clientes e resolução de dúvidas", "prioridade": "alta"},
-    {"id": "social_selling", "nome": "Social Selling Insta", "categoria": "marketing", "tempoEstimado": 45, "descricao": "Atividades de marketing no Instagram", "prioridade": "media"},
-    {"id": "engajamento_grupo", "nome": "Enviar mensagens de engajamento no grupo", "categoria": "engajamento", "tempoEstimado": 30, "descricao": "Comunicação ativa com grupos de alunos", "prioridade": "alta"},
-    {"id": "separar_alunos", "nome": "Separar alunos para engajamento", "categoria": "engajamento", "tempoEstimado": 45, "descricao": "Segmentação de alunos para ações específicas", "prioridade": "media"},
-    {"id": "material_renovacao", "nome": "Elaborar material para alunos de renovação", "categoria": "conteudo", "tempoEstimado": 90, "descricao": "Criação de conteúdo para retenção de clientes", "prioridade": "alta"},
-    {"id": "montar_planos", "nome": "Montar planos novos", "categoria": "produto", "tempoEstimado": 60, "descricao": "Desenvolvimento de novos produtos e serviços", "prioridade": "media"},
-    {"id": "engajamento_alunos", "nome": "Engajamento dos alunos", "categoria": "engajamento", "tempoEstimado": 45, "descricao": "Ativação e motivação dos alunos", "prioridade": "alta"},
-    {"id": "conteudo_desengajados", "nome": "Produção de conteúdo para alunos desengajados", "categoria": "conteudo", "tempoEstimado": 60, "descricao": "Material específico para reativação de alunos", "prioridade": "media"},
-    {"id": "engajamento_time", "nome": "Engajamento no grupo do Time", "categoria": "interno", "tempoEstimado": 15, "descricao": "Comunicação e motivação da equipe interna", "prioridade": "baixa"}
-]
-
-AGENDA = [
-    {"horario": "08:00", "funcionario": "jean", "tarefa": "suporte"},
-    {"horario": "09:00", "funcionario": "guido", "tarefa": "checkins"},
-    {"horario": "09:00", "funcionario": "pedro", "tarefa": "checkins"},
-    {"horario": "09:00", "funcionario": "dayana", "tarefa": "social_selling"},
-    {"horario": "09:00", "funcionario": "jean", "tarefa": "suporte"},
-    {"horario": "09:30", "funcionario": "guido", "tarefa": "reuniao_diaria"},
-    {"horario": "09:30", "funcionario": "pedro", "tarefa": "reuniao_diaria"},
-    {"horario": "09:30", "funcionario": "dayana", "tarefa": "reuniao_diaria"},
-    {"horario": "09:30", "funcionario": "jean", "tarefa": "suporte"},
-    {"horario": "10:00", "funcionario": "guido", "tarefa": "reuniao_diaria"},
-    {"horario": "10:00", "funcionario": "pedro", "tarefa": "reuniao_diaria"},
-    {"horario": "10:00", "funcionario": "dayana", "tarefa": "reuniao_diaria"},
-    {"horario": "10:00", "funcionario": "jean", "tarefa": "suporte"},
-    {"horario": "10:30", "funcionario": "guido", "tarefa": "checkins"},
-    {"horario": "10:30", "funcionario": "pedro", "tarefa": "checkins"},
-    {"horario": "10:30", "funcionario": "dayana", "tarefa": "engajamento_grupo"},
-    {"horario": "10:30", "funcionario": "jean", "tarefa": "suporte"},
-    {"horario": "11:00", "funcionario": "guido", "tarefa": "checkins"},
-    {"horario": "11:00", "funcionario": "pedro", "tarefa": "checkins"},
-    {"horario": "11:00", "funcionario": "jean", "tarefa": "suporte"},
-    {"horario": "11:00", "funcionario": "thais", "tarefa": "checkins"},
-    {"horario": "11:30", "funcionario": "guido", "tarefa": "montar_planos"},
-    {"horario": "11:30", "funcionario": "pedro", "tarefa": "checkins"},
-    {"horario": "11:30", "funcionario": "thais", "tarefa": "montar_planos"},
-    {"horario": "13:00", "funcionario": "guido", "tarefa": "suporte"},
-    {"horario": "13:00", "funcionario": "michelle", "tarefa": "checkins"},
-    {"horario": "13:00", "funcionario": "dayana", "tarefa": "social_selling"},
-    {"horario": "13:30", "funcionario": "guido", "tarefa": "separar_alunos"},
-    {"horario": "13:30", "funcionario": "michelle", "tarefa": "checkins"},
-    {"horario": "13:30", "funcionario": "dayana", "tarefa": "social_selling"},
-    {"horario": "14:00", "funcionario": "guido", "tarefa": "separar_alunos"},
-    {"horario": "14:00", "funcionario": "michelle", "tarefa": "engajamento_grupo"},
-    {"horario": "14:00", "funcionario": "andreia", "tarefa": "suporte"},
-    {"horario": "14:30", "funcionario": "guido", "tarefa": "separar_alunos"},
-    {"horario": "14:30", "funcionario": "michelle", "tarefa": "engajamento_grupo"},
-    {"horario": "14:30", "funcionario": "andreia", "tarefa": "suporte"},
-    {"horario": "15:00", "funcionario": "pedro", "tarefa": "material_renovacao"},
-    {"horario": "15:00", "funcionario": "michelle", "tarefa": "engajamento_grupo"},
-    {"horario": "15:00", "funcionario": "andreia", "tarefa": "suporte"},
-    {"horario": "15:30", "funcionario": "pedro", "tarefa": "material_renovacao"},
-    {"horario": "15:30", "funcionario": "michelle", "tarefa": "material_renovacao"},
-    {"horario": "15:30", "funcionario": "andreia", "tarefa": "suporte"},
-    {"horario": "16:00", "funcionario": "pedro", "tarefa": "material_renovacao"},
-    {"horario": "16:00", "funcionario": "michelle", "tarefa": "material_renovacao"},
-    {"horario": "16:00", "funcionario": "dayana", "tarefa": "engajamento_alunos"},
-    {"horario": "16:00", "funcionario": "andreia", "tarefa": "suporte"},
-    {"horario": "16:30", "funcionario": "pedro", "tarefa": "checkins"},
-    {"horario": "16:30", "funcionario": "michelle", "tarefa": "material_renovacao"},
-    {"horario": "16:30", "funcionario": "dayana", "tarefa": "checkins"},
-    {"horario": "16:30", "funcionario": "andreia", "tarefa": "suporte"},
-    {"horario": "17:00", "funcionario": "pedro", "tarefa": "checkins"},
-    {"horario": "17:00", "funcionario": "michelle", "tarefa": "suporte"},
-    {"horario": "17:00", "funcionario": "dayana", "tarefa": "social_selling"},
-    {"horario": "17:00", "funcionario": "andreia", "tarefa": "suporte"},
-    {"horario": "17:00", "funcionario": "thais", "tarefa": "checkins"},
-    {"horario": "17:30", "funcionario": "pedro", "tarefa": "checkins"},
-    {"horario": "17:30", "funcionario": "michelle", "tarefa": "suporte"},
-    {"horario": "17:30", "funcionario": "dayana", "tarefa": "social_selling"},
-    {"horario": "17:30", "funcionario": "andreia", "tarefa": "suporte"},
-    {"horario": "17:30", "funcionario": "thais", "tarefa": "montar_planos"}
-]
-
-@app.route('/api/health')
-def health():
-    return jsonify({"status": "ok", "message": "API funcionando na Vercel"})
-
-@app.route('/api/funcionarios')
-def funcionarios():
-    return jsonify(FUNCIONARIOS)
-
-@app.route('/api/tarefas')
-def tarefas():
-    return jsonify(TAREFAS)
-
-@app.route('/api/agenda')
-def agenda():
-    return jsonify(AGENDA)
-
-@app.route('/api/funcionarios/<funcionario_id>')
-def funcionario_by_id(funcionario_id):
-    func = next((f for f in FUNCIONARIOS if f['id'] == funcionario_id), None)
-    if func:
-        return jsonify(func)
-    return jsonify({"error": "Funcionário não encontrado"}), 404
-
-@app.route('/api/agenda/funcionario/<funcionario_id>')
-def agenda_funcionario(funcionario_id):
-    agenda_items = [item for item in AGENDA if item['funcionario'] == funcionario_id]
-    return jsonify(agenda_items)
-
-# Para Vercel Serverless Functions
-def handler(request):
-    return app(request.environ, lambda status, headers: None)
\ No newline at end of file
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import _payloads
+from _wsgi import app_json
+
+app = app_json(
+    {
+        '/api/health': _payloads.SAUDE,
+        '/api/funcionarios': _payloads.FUNCIONARIOS,
+        '/api/tarefas': _payloads.TAREFAS,
+        '/api/agenda': _payloads.AGENDA,
+    },
+    colecoes={
+        '/api/funcionarios/': (_payloads.FUNCIONARIO, '404 Not Found',
+                               b'{"error":"Funcion\xc3\xa1rio n\xc3\xa3o encontrado"}'),
+        # Funcionário sem agendamentos (ou desconhecido) recebe lista vazia
+        '/api/agenda/funcionario/': (_payloads.AGENDA_POR_FUNCIONARIO, '200 OK', b'[]'),
+    },
+    lote=True
+)
@@ -1,11 +1,36 @@
+"""
+Ponto de entrada serverless (Vercel) do backend completo
+
+Importar este arquivo não carrega o Flask nem toca no banco: /api/health
+responde na hora, o app (src/main.py, com SQLAlchemy) só é importado na
+primeira requisição que precisa dele e o schema só é conferido nessa
+primeira requisição. Google e NumPy ficam para quando as rotas deles forem usadas.
+"""
+
 import os
 import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+SAUDE = b'{"status":"healthy","message":"API funcionando"}'
+
+_app = None
+_trava = threading.Lock()
+
 
-# Adiciona o diretório src ao path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+def _carregar():
+    global _app
+    with _trava:
+        if _app is None:
+            from src.main import app as principal
+            _app = principal
+    return _app
 
-from main import app
 
-# Vercel precisa de uma função handler
-def handler(request):
-    return app(request.environ, lambda status, headers: None)
\ No newline at end of file
+def app(environ, start_response):
+    if environ.get('REQUEST_METHOD') == 'GET' and environ.get('PATH_INFO') in ('/api/health', '/health'):
+        start_response('200 OK', [('Content-Type', 'application/json'), ('Content-Length', str(len(SAUDE))),
+                                  ('Access-Control-Allow-Origin', '*')])
+        return [SAUDE]
+    return (_app or _carregar())(environ, start_response)
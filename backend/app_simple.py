@@ -4,9 +4,15 @@ Backend minimalista que funciona garantidamente
 """
 import json
 import os
-from datetime import datetime
-from flask import Flask, jsonify
+from datetime import date, datetime
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
+from src.asgi import AppLeitura, FonteEstatica
+from src.services.admissao import controlar_app
+from src.services.agenda_compacta import AgendaCompacta
+from src.services.lote import registrar_lote
+from src.services.metricas import instrumentar_app, medir_arquivo_json
+from src.servidor import executar, prontidao, registrar_prontidao
 
 # Cria app Flask simples - só API
 app = Flask(__name__)
@@ -16,12 +22,12 @@ print("🚀 Iniciando API backend...")
 print("📡 CORS habilitado para todos os domínios")
 print("🔗 Endpoints disponíveis: /api/funcionarios, /api/tarefas, /api/agenda")
 
-# Carrega dados do JSON uma vez
-DATA_PATH = os.path.join(os.path.dirname(__file__), 'src', 'data', 'agenda.json')
+# Carrega dados do JSON uma vez (AGENDA_JSON aponta para outro arquivo, ex.: dados sintéticos)
+DATA_PATH = os.getenv('AGENDA_JSON', os.path.join(os.path.dirname(__file__), 'src', 'data', 'agenda.json'))
 
 def load_data():
     try:
-        with open(DATA_PATH, 'r', encoding='utf-8') as f:
+        with medir_arquivo_json(DATA_PATH, 'carregar'), open(DATA_PATH, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception as e:
         print(f"Erro ao carregar dados: {e}")
@@ -30,6 +36,18 @@ def load_data():
 # Carrega dados na inicialização
 data = load_data()
 
+# Agenda em colunas, com as respostas já codificadas (src/services/agenda_compacta.py);
+# a lista de dicionários sai da memória
+agenda = AgendaCompacta(data.pop('agenda', []), data.get('funcionarios', []), data.get('tarefas', []))
+funcionarios_por_id = {f['id']: f for f in data.get('funcionarios', [])}
+tarefas_por_id = {t['id']: t for t in data.get('tarefas', [])}
+
+prontidao.registrar('dados', lambda: bool(data.get('funcionarios')))
+registrar_prontidao(app)
+instrumentar_app(app)
+admissao = controlar_app(app)
+registrar_lote(app)
+
 # Rotas simples
 @app.route('/')
 def home():
@@ -38,7 +56,7 @@ def home():
         "status": "ok",
         "funcionarios": len(data.get('funcionarios', [])),
         "tarefas": len(data.get('tarefas', [])),
-        "agenda": len(data.get('agenda', []))
+        "agenda": len(agenda)
     })
 
 @app.route('/api/funcionarios')
@@ -51,29 +69,31 @@ def get_tarefas():
 
 @app.route('/api/agenda')
 def get_agenda():
-    return jsonify(data.get('agenda', []))
+    dia = request.args.get('data')
+    if dia:
+        try:
+            return jsonify(agenda.do_dia(date.fromisoformat(dia)))
+        except ValueError:
+            return jsonify({"error": "Data inválida (use AAAA-MM-DD)"}), 400
+    return Response(agenda.json_agenda, mimetype='application/json')
 
 @app.route('/api/funcionarios/<funcionario_id>')
 def get_funcionario(funcionario_id):
-    funcionarios = data.get('funcionarios', [])
-    funcionario = next((f for f in funcionarios if f['id'] == funcionario_id), None)
+    funcionario = funcionarios_por_id.get(funcionario_id)
     if funcionario:
         return jsonify(funcionario)
     return jsonify({"error": "Funcionário não encontrado"}), 404
 
 @app.route('/api/tarefas/<tarefa_id>')
 def get_tarefa(tarefa_id):
-    tarefas = data.get('tarefas', [])
-    tarefa = next((t for t in tarefas if t['id'] == tarefa_id), None)
+    tarefa = tarefas_por_id.get(tarefa_id)
     if tarefa:
         return jsonify(tarefa)
     return jsonify({"error": "Tarefa não encontrada"}), 404
 
 @app.route('/api/agenda/funcionario/<funcionario_id>')
 def get_agenda_funcionario(funcionario_id):
-    agenda = data.get('agenda', [])
-    agenda_funcionario = [item for item in agenda if item['funcionario'] == funcionario_id]
-    return jsonify(agenda_funcionario)
+    return Response(agenda.json_do_funcionario(funcionario_id), mimetype='application/json')
 
 @app.route('/api/health')
 def health():
@@ -103,6 +123,9 @@ def api_info():
         "status": "online"
     })
 
+# Rotas de leitura num event loop, com o resto do app atrás (uvicorn app_simple:asgi)
+asgi = AppLeitura(FonteEstatica(data, agenda), wsgi=app, admissao=admissao)
+
 if __name__ == '__main__':
     # Pega a porta do ambiente (Render, Heroku, etc.) ou usa 5000 como padrão
     port = int(os.environ.get('PORT', 5000))
@@ -111,8 +134,8 @@ if __name__ == '__main__':
     print("📊 Dados carregados:")
     print(f"   - {len(data.get('funcionarios', []))} funcionários")
     print(f"   - {len(data.get('tarefas', []))} tarefas")
-    print(f"   - {len(data.get('agenda', []))} agendamentos")
+    print(f"   - {len(agenda)} agendamentos")
     print(f"\n🌐 Servidor rodando na porta: {port}")
     print(f"🔗 Teste: http://localhost:{port}/api/funcionarios")
     
-    app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
\ No newline at end of file
+    executar(app, 5000)
\ No newline at end of file
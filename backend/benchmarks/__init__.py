@@ -0,0 +1,6 @@
+"""
+Ferramentas de benchmark do backend
+
+Tudo aqui roda offline: as integrações externas (Google Calendar) são
+substituídas por servidores locais que imitam a API real.
+"""
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Controle de admissão sob abuso (src/services/admissao.py)
+
+Sobe o src/main.py no gunicorn com um workspace sintético e mede a latência
+de clientes bem-comportados (--bons clientes, cada um com --taxa leituras
+por segundo em /api/funcionarios) em três fases:
+- sem abuso
+- com --abusivos clientes (abas de --usuarios-abusivos usuários) em loop
+  apertado em /api/admin/dados-completos, com o controle de admissão
+  desligado (ADMISSAO=0)
+- o mesmo abuso com o controle ligado
+
+Cada cliente se identifica pelo cabeçalho X-Cliente
+(ADMISSAO_CABECALHO_CLIENTE), já que todos saem do mesmo IP.
+
+Falha (código 1) se, com o controle ligado, o p95 dos clientes bons passar
+de --fator vezes o p95 sem abuso (mais --piso-ms), se algum cliente bom
+for recusado ou se os abusivos não receberem 429 com Retry-After. Os
+clientes rodam na mesma máquina e os abusivos ignoram o Retry-After, então
+parte da piora é CPU gasta pelo próprio gerador de carga; com poucas CPUs,
+prefira comparar com a fase de controle desligado.
+
+Uso:
+    python benchmarks/bench_admissao.py
+    python benchmarks/bench_admissao.py --abusivos 16 --duracao 10
+"""
+
+import argparse
+import http.client
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_api import ALVOS, parar_servidor, percentil, subir_servidor
+from benchmarks.dados_sinteticos import gerar_workspace, popular_banco
+
+
+def cliente_bom(porta: int, nome: str, taxa: float, ate: float, latencias: List[float], status: Counter):
+    conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=60)
+    intervalo = 1 / taxa
+    proxima = time.perf_counter()
+    while proxima < ate:
+        espera = proxima - time.perf_counter()
+        if espera > 0:
+            time.sleep(espera)
+        inicio = time.perf_counter()
+        conexao.request('GET', '/api/funcionarios', headers={'X-Cliente': nome})
+        resposta = conexao.getresponse()
+        resposta.read()
+        latencias.append(time.perf_counter() - inicio)
+        status[resposta.status] += 1
+        proxima += intervalo
+    conexao.close()
+
+
+def cliente_abusivo(porta: int, nome: str, ate: float, status: Counter, retry_after: Counter):
+    conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=60)
+    while time.perf_counter() < ate:
+        conexao.request('GET', '/api/admin/dados-completos', headers={'X-Cliente': nome})
+        resposta = conexao.getresponse()
+        resposta.read()
+        status[resposta.status] += 1
+        if resposta.getheader('Retry-After'):
+            retry_after[resposta.status] += 1
+    conexao.close()
+
+
+def fase(porta: int, args, abuso: bool) -> Dict:
+    ate = time.perf_counter() + args.duracao
+    latencias: List[float] = []
+    status_bons: Counter = Counter()
+    status_abusivos: Counter = Counter()
+    retry_after: Counter = Counter()
+    threads = [threading.Thread(target=cliente_bom, args=(porta, f'bom-{n}', args.taxa, ate, latencias, status_bons))
+               for n in range(args.bons)]
+    if abuso:
+        # Os abusivos se dividem entre --usuarios-abusivos identidades, como abas do mesmo usuário
+        threads += [threading.Thread(target=cliente_abusivo,
+                                     args=(porta, f'abusivo-{n % args.usuarios_abusivos}', ate,
+                                           status_abusivos, retry_after))
+                    for n in range(args.abusivos)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencias.sort()
+    return {
+        'p50_ms': round(statistics.median(latencias) * 1000, 2),
+        'p95_ms': round(percentil(latencias, 0.95) * 1000, 2),
+        'p99_ms': round(percentil(latencias, 0.99) * 1000, 2),
+        'bons': dict(status_bons),
+        'abusivos': dict(status_abusivos),
+        'abusivos_com_retry_after': dict(retry_after),
+    }
+
+
+def rodar(args, ambiente: Dict[str, str], admissao: bool, fases) -> List[Dict]:
+    ambiente = dict(ambiente, ADMISSAO='1' if admissao else '0')
+    servidor = subir_servidor(ALVOS['main'], args.porta, args, ambiente)
+    try:
+        # Aquecimento (caches e conexões do banco)
+        conexao = http.client.HTTPConnection('127.0.0.1', args.porta, timeout=60)
+        for caminho in ('/api/funcionarios', '/api/admin/dados-completos'):
+            conexao.request('GET', caminho, headers={'X-Cliente': 'aquecimento'})
+            conexao.getresponse().read()
+        conexao.close()
+        return [fase(args.porta, args, abuso) for abuso in fases]
+    finally:
+        parar_servidor(servidor)
+
+
+def imprimir(titulo: str, resultado: Dict):
+    abusivos = f"; abusivos {resultado['abusivos']}" if resultado['abusivos'] else ''
+    print(f"{titulo:<32} p50 {resultado['p50_ms']:7.2f}  p95 {resultado['p95_ms']:7.2f}  "
+          f"p99 {resultado['p99_ms']:7.2f} ms; bons {resultado['bons']}{abusivos}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bons', type=int, default=4, help='clientes bem-comportados')
+    parser.add_argument('--taxa', type=float, default=10, help='leituras por segundo de cada cliente bom')
+    parser.add_argument('--abusivos', type=int, default=8, help='clientes em loop apertado')
+    parser.add_argument('--usuarios-abusivos', type=int, default=1, help='identidades dos clientes abusivos')
+    parser.add_argument('--duracao', type=float, default=8, help='segundos por fase')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--funcionarios', type=int, default=20)
+    parser.add_argument('--tarefas', type=int, default=50)
+    parser.add_argument('--dias', type=int, default=20)
+    parser.add_argument('--fator', type=float, default=3.0, help='piora tolerada do p95 dos clientes bons')
+    parser.add_argument('--piso-ms', type=float, default=5.0)
+    parser.add_argument('--porta', type=int, default=5198)
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix='bench-admissao-')
+    try:
+        banco = f"sqlite:///{os.path.join(pasta, 'app.db')}"
+        popular_banco(gerar_workspace(args.funcionarios, args.tarefas, args.dias), banco)
+        ambiente = dict(os.environ, DATABASE_URL=banco, ADMISSAO_CABECALHO_CLIENTE='X-Cliente',
+                        PROFILE_CAPTURES_DIR=os.path.join(pasta, 'capturas'))
+        print(f'{args.bons} clientes bons a {args.taxa:g} req/s; {args.abusivos} abusivos; '
+              f'gunicorn {args.workers}x{args.threads}; {args.duracao:g}s por fase')
+
+        [sem_controle] = rodar(args, ambiente, False, [True])
+        imprimir('abuso, controle desligado:', sem_controle)
+        sem_abuso, com_controle = rodar(args, ambiente, True, [False, True])
+        imprimir('sem abuso:', sem_abuso)
+        imprimir('abuso, controle ligado:', com_controle)
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    falhas = []
+    teto = sem_abuso['p95_ms'] * args.fator + args.piso_ms
+    if com_controle['p95_ms'] > teto:
+        falhas.append(f"p95 dos clientes bons sob abuso {com_controle['p95_ms']} ms > {teto:.2f} ms")
+    recusados = sum(n for status, n in com_controle['bons'].items() if status != 200)
+    if recusados:
+        falhas.append(f'{recusados} requisições de clientes bons recusadas')
+    if not com_controle['abusivos_com_retry_after'].get(429):
+        falhas.append('os clientes abusivos não receberam 429 com Retry-After')
+    if falhas:
+        print('\n'.join(['', *falhas]))
+        sys.exit(1)
+    print('✅ latência dos clientes bons estável sob abuso')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Agenda compacta (src/services/agenda_compacta.py) contra a lista de dicionários
+
+Para cada tamanho em --linhas, gera a agenda de um workspace sintético
+(--funcionarios funcionários, com tantos dias quantos forem precisos), codifica
+em JSON e mede:
+- memória retida (tracemalloc) pela lista de dicionários que o json.load
+  devolve, como o app_simple guardava, e pela AgendaCompacta montada a partir
+  dela, já sem a lista
+- tempo de carga (json.loads) e de montagem das colunas e respostas
+- tempo de uma resposta de /api/agenda/funcionario/<id>: filtrar a lista e
+  codificar (o jeito antigo) contra consultar os bytes já codificados
+
+Falha (código 1) se, no maior tamanho, a agenda compacta não ocupar pelo
+menos --reducao vezes menos memória que a lista, se a resposta por
+funcionário passar de --limite-us ou se as respostas não baterem com as da
+lista. As colunas são a menor parte da agenda compacta: o grosso são as
+respostas já codificadas (a agenda inteira e a de cada funcionário, cada
+agendamento duas vezes), que a tabela mostra à parte.
+
+Uso:
+    python benchmarks/bench_agenda_compacta.py
+    python benchmarks/bench_agenda_compacta.py --linhas 10000 100000 1000000 --funcionarios 500
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.dados_sinteticos import gerar_workspace
+from src.services.agenda_compacta import AgendaCompacta
+
+# Agendamentos por funcionário por dia útil nos workspaces sintéticos (medido)
+POR_FUNCIONARIO_DIA = 6
+
+
+def _json(dados) -> bytes:
+    # Como o jsonify do Flask: chaves ordenadas, sem espaços
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def _mb(valor: float) -> float:
+    return round(valor / 1024 / 1024, 1)
+
+
+def gerar(linhas: int, funcionarios: int) -> Dict:
+    dias = max(linhas // (funcionarios * POR_FUNCIONARIO_DIA) + 1, 1)
+    workspace = gerar_workspace(funcionarios, 200, dias, demandas=0, tarefas_a_fazer=0)
+    while len(workspace['agenda']) < linhas:
+        dias *= 2
+        workspace = gerar_workspace(funcionarios, 200, dias, demandas=0, tarefas_a_fazer=0)
+    del workspace['agenda'][linhas:]
+    return workspace
+
+
+def medir_resposta(funcao, ids: List[str], repeticoes: int) -> float:
+    """Mediana, em µs, de uma resposta por funcionário"""
+    tempos = []
+    for _ in range(repeticoes):
+        for id_ in ids:
+            inicio = time.perf_counter()
+            funcao(id_)
+            tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1e6
+
+
+def medir(linhas: int, args) -> Dict:
+    workspace = gerar(linhas, args.funcionarios)
+    texto = json.dumps(workspace['agenda'], ensure_ascii=False).encode('utf-8')
+    funcionarios, tarefas = workspace['funcionarios'], workspace['tarefas']
+    del workspace
+    gc.collect()
+
+    # Memória: a lista do json.loads, depois a agenda compacta montada dela, sem a lista
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    lista = json.loads(texto)
+    memoria_lista = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.reset_peak()
+    compacta = AgendaCompacta(lista, funcionarios, tarefas)
+    pico_montagem = tracemalloc.get_traced_memory()[1] - base
+    del lista
+    gc.collect()
+    memoria_compacta = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    colunas = sum(coluna.buffer_info()[1] * coluna.itemsize for coluna in (
+        compacta.inicio, compacta.funcionario, compacta.tarefa, compacta.duracao, compacta.data,
+        compacta.ordem_funcionario, compacta.ordem_data))
+    codificadas = len(compacta.json_agenda) + sum(map(len, compacta.json_por_funcionario.values()))
+    del compacta
+    gc.collect()
+
+    # Tempo, sem tracemalloc
+    inicio = time.perf_counter()
+    lista = json.loads(texto)
+    carga = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    compacta = AgendaCompacta(lista, funcionarios, tarefas)
+    montagem = time.perf_counter() - inicio
+
+    ids = random.Random(42).sample([f['id'] for f in funcionarios], min(args.amostra, len(funcionarios)))
+    divergentes = [id_ for id_ in ids
+                   if json.loads(compacta.json_do_funcionario(id_)) != [i for i in lista if i['funcionario'] == id_]]
+    if json.loads(compacta.json_agenda) != lista:
+        divergentes.append('/api/agenda')
+    antigo = medir_resposta(lambda id_: _json([i for i in lista if i['funcionario'] == id_]), ids, 1)
+    novo = medir_resposta(compacta.json_do_funcionario, ids, args.repeticoes)
+
+    return {
+        'linhas': linhas,
+        'memoria_lista_mb': _mb(memoria_lista),
+        'memoria_compacta_mb': _mb(memoria_compacta),
+        'colunas_mb': _mb(colunas),
+        'respostas_codificadas_mb': _mb(codificadas),
+        'pico_montagem_mb': _mb(pico_montagem),
+        'reducao': round(memoria_lista / max(memoria_compacta, 1), 2),
+        'carga_s': round(carga, 2),
+        'montagem_s': round(montagem, 2),
+        'por_funcionario_lista_us': round(antigo, 1),
+        'por_funcionario_compacta_us': round(novo, 2),
+        'divergentes': divergentes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--funcionarios', type=int, default=200)
+    parser.add_argument('--amostra', type=int, default=20, help='funcionários consultados')
+    parser.add_argument('--repeticoes', type=int, default=50, help='repetições da consulta compacta')
+    parser.add_argument('--reducao', type=float, default=1.5, help='redução mínima de memória')
+    parser.add_argument('--limite-us', type=float, default=50.0, help='teto da resposta por funcionário')
+    args = parser.parse_args()
+
+    print(f"{'linhas':>9}  {'lista':>8}  {'compacta':>8}  {'(colunas':>9}  {'respostas)':>10}  {'redução':>7}  "
+          f"{'montagem':>8}  {'func. lista':>11}  {'func. compacta':>14}")
+    resultados = []
+    for linhas in sorted(args.linhas):
+        r = medir(linhas, args)
+        resultados.append(r)
+        print(f"{r['linhas']:>9}  {r['memoria_lista_mb']:>6} MB  {r['memoria_compacta_mb']:>6} MB  "
+              f"{r['colunas_mb']:>6} MB  {r['respostas_codificadas_mb']:>7} MB  {r['reducao']:>6}x  "
+              f"{r['montagem_s']:>7}s  {r['por_funcionario_lista_us']:>8} µs  "
+              f"{r['por_funcionario_compacta_us']:>11} µs")
+
+    maior = resultados[-1]
+    falhas = []
+    if maior['reducao'] < args.reducao:
+        falhas.append(f"redução de memória {maior['reducao']}x < {args.reducao}x")
+    if maior['por_funcionario_compacta_us'] > args.limite_us:
+        falhas.append(f"resposta por funcionário {maior['por_funcionario_compacta_us']} µs > {args.limite_us} µs")
+    for r in resultados:
+        if r['divergentes']:
+            falhas.append(f"{r['linhas']} linhas: respostas diferentes da lista em {r['divergentes'][:5]}")
+    if falhas:
+        print('\n'.join(['', *falhas]))
+        sys.exit(1)
+    print('✅ agenda compacta menor e com resposta por funcionário em tempo constante')
+
+
+if __name__ == '__main__':
+    main()
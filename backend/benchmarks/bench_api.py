@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Benchmark de ponta a ponta das APIs
+
+Gera um workspace sintético (benchmarks/dados_sinteticos.py), sobe cada alvo
+no gunicorn (gthread, como em produção) e percorre todos os endpoints com N
+clientes simultâneos, medindo por endpoint a latência (p50/p95/p99), a vazão
+e os erros, e a memória (RSS somado de mestre e processos) do servidor.
+
+Alvos:
+- simple: app_simple.py, lendo o agenda.json sintético (AGENDA_JSON)
+- api:    api/index.py da raiz (funções da Vercel; dados estáticos próprios)
+- main:   src/main.py, num banco SQLite sintético (DATABASE_URL)
+
+Para os alvos em Flask, rotas novas que não estejam na lista de endpoints
+nem em ROTAS_FORA fazem o benchmark falhar, para nenhuma ficar sem medição.
+
+Linhas de base: com --gravar-baseline, o resultado vai para
+benchmarks/baselines/<alvo>.json. Nas execuções seguintes com a mesma
+configuração, o benchmark falha (código 1) se o p95 de um endpoint subir ou a
+vazão cair mais que --limite (25% por padrão), ou se o RSS crescer mais que
+isso. Grave as linhas de base na mesma máquina em que vai comparar.
+
+Uso:
+    python benchmarks/bench_api.py
+    python benchmarks/bench_api.py --alvos main --concorrencia 16 --requisicoes 500 --escritas
+    python benchmarks/bench_api.py --gravar-baseline
+"""
+
+import argparse
+import datetime
+import http.client
+import itertools
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAIZ = os.path.dirname(BACKEND)
+PASTA_BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+sys.path.insert(0, BACKEND)
+
+from benchmarks.dados_sinteticos import gerar_workspace, gravar_json, popular_banco
+
+
+class Endpoint(NamedTuple):
+    metodo: str
+    regra: str            # regra da rota no Flask (para a checagem de cobertura)
+    caminho: str          # com {marcadores} preenchidos a partir do workspace
+    corpo: Optional[Dict] = None
+    escrita: bool = False
+
+
+ENDPOINTS_SIMPLE = [
+    Endpoint('GET', '/', '/'),
+    Endpoint('GET', '/api/health', '/api/health'),
+    Endpoint('GET', '/health', '/health'),
+    Endpoint('GET', '/test', '/test'),
+    Endpoint('GET', '/api/ready', '/api/ready'),
+    Endpoint('GET', '/metrics', '/metrics'),
+    Endpoint('GET', '/api/funcionarios', '/api/funcionarios'),
+    Endpoint('GET', '/api/tarefas', '/api/tarefas'),
+    Endpoint('GET', '/api/agenda', '/api/agenda'),
+    Endpoint('GET', '/api/funcionarios/<funcionario_id>', '/api/funcionarios/{funcionario}'),
+    Endpoint('GET', '/api/tarefas/<tarefa_id>', '/api/tarefas/{tarefa}'),
+    Endpoint('GET', '/api/agenda/funcionario/<funcionario_id>', '/api/agenda/funcionario/{funcionario}'),
+    Endpoint('POST', '/api/batch', '/api/batch',
+             {'requisicoes': ['/api/funcionarios', '/api/tarefas', '/api/agenda/funcionario/{funcionario}']}),
+]
+
+ENDPOINTS_API = [
+    Endpoint('GET', '/api/health', '/api/health'),
+    Endpoint('GET', '/api/funcionarios', '/api/funcionarios'),
+    Endpoint('GET', '/api/tarefas', '/api/tarefas'),
+    Endpoint('GET', '/api/agenda', '/api/agenda'),
+    Endpoint('GET', '/api/funcionarios/<funcionario_id>', '/api/funcionarios/guido'),
+    Endpoint('GET', '/api/agenda/funcionario/<funcionario_id>', '/api/agenda/funcionario/guido'),
+    Endpoint('POST', '/api/batch', '/api/batch',
+             {'requisicoes': ['/api/funcionarios', '/api/tarefas', '/api/agenda/funcionario/guido']}),
+]
+
+ENDPOINTS_MAIN = [
+    Endpoint('GET', '/api/ready', '/api/ready'),
+    Endpoint('GET', '/metrics', '/metrics'),
+    Endpoint('GET', '/api/funcionarios', '/api/funcionarios'),
+    Endpoint('GET', '/api/funcionarios/<funcionario_id>', '/api/funcionarios/{funcionario}'),
+    Endpoint('GET', '/api/tarefas', '/api/tarefas'),
+    Endpoint('GET', '/api/tarefas/<tarefa_id>', '/api/tarefas/{tarefa}'),
+    Endpoint('GET', '/api/agenda', '/api/agenda'),
+    Endpoint('GET', '/api/agenda.ics', '/api/agenda.ics'),
+    Endpoint('GET', '/api/agenda/funcionario/<funcionario_id>', '/api/agenda/funcionario/{funcionario}'),
+    Endpoint('GET', '/api/agenda/funcionario/<funcionario_id>.ics', '/api/agenda/funcionario/{funcionario}.ics'),
+    Endpoint('GET', '/api/agenda/ocorrencias', '/api/agenda/ocorrencias?inicio={semana}&fim={semana_fim}'),
+    Endpoint('POST', '/api/agenda/gerar', '/api/agenda/gerar', {'dias': 5, 'melhorar': False}),
+    Endpoint('GET', '/api/disponibilidade', '/api/disponibilidade?inicio={semana}&duracao=60'),
+    Endpoint('GET', '/api/search', '/api/search?q=revisar%20relatorio'),
+    Endpoint('GET', '/api/processos', '/api/processos'),
+    Endpoint('GET', '/api/processos/<tarefa_id>', '/api/processos/{tarefa}'),
+    Endpoint('GET', '/api/demandas', '/api/demandas?status=pendente&limite=50'),
+    Endpoint('GET', '/api/demandas/<int:demanda_id>', '/api/demandas/1'),
+    Endpoint('GET', '/api/demandas/contagens', '/api/demandas/contagens?agrupar=status,funcionario'),
+    Endpoint('GET', '/api/tarefas-a-fazer', '/api/tarefas-a-fazer?limite=50'),
+    Endpoint('GET', '/api/tarefas-a-fazer/<int:tarefa_id>', '/api/tarefas-a-fazer/1'),
+    Endpoint('GET', '/api/tarefas-a-fazer/contagens', '/api/tarefas-a-fazer/contagens'),
+    Endpoint('GET', '/api/kpis', '/api/kpis?inicio={mes}&fim={hoje}'),
+    Endpoint('GET', '/api/previsao', '/api/previsao'),
+    Endpoint('GET', '/api/export', '/api/export?formato=csv&inicio={semana}&fim={semana_fim}'),
+    Endpoint('GET', '/api/users', '/api/users'),
+    Endpoint('GET', '/api/admin/dados-completos', '/api/admin/dados-completos'),
+    Endpoint('GET', '/api/admin/funcionarios', '/api/admin/funcionarios'),
+    Endpoint('GET', '/api/admin/funcionarios/<funcionario_id>', '/api/admin/funcionarios/{funcionario}'),
+    Endpoint('GET', '/api/admin/tarefas', '/api/admin/tarefas'),
+    Endpoint('GET', '/api/admin/tarefas/<tarefa_id>', '/api/admin/tarefas/{tarefa}'),
+    Endpoint('GET', '/api/admin/agenda', '/api/admin/agenda'),
+    Endpoint('GET', '/api/admin/processos', '/api/admin/processos'),
+    Endpoint('GET', '/api/admin/capturas', '/api/admin/capturas'),
+    # Carga inicial do painel num lote só
+    Endpoint('POST', '/api/batch', '/api/batch',
+             {'requisicoes': ['/api/funcionarios', '/api/tarefas', '/api/processos', '/api/demandas?limite=50',
+                              '/api/tarefas-a-fazer?limite=50', '/api/demandas/contagens']}),
+    # Escritas (com --escritas): reaplicam o mesmo valor, mas mudam a versão dos dados como numa edição real
+    Endpoint('PUT', '/api/demandas/<int:demanda_id>', '/api/demandas/1', {'observacoes': 'bench'}, True),
+    Endpoint('PATCH', '/api/tarefas-a-fazer/<int:tarefa_id>', '/api/tarefas-a-fazer/1', {'observacoes': 'bench'},
+             True),
+    Endpoint('PUT', '/api/admin/funcionarios/<funcionario_id>', '/api/admin/funcionarios/{funcionario}',
+             {'nome': 'Bench'}, True),
+]
+
+# Rotas que o benchmark não percorre, e por quê
+ROTAS_FORA = {
+    '/': 'arquivos do frontend',
+    '/<path:path>': 'arquivos do frontend',
+    '/static/<path:filename>': 'arquivos do frontend',
+    '/api/admin/capturas/<captura_id>': 'depende de uma captura existente',
+    '/api/export/tarefas': 'exportação em segundo plano (medida por GET /api/export)',
+    '/api/export/tarefas/<tarefa_id>': 'depende de uma exportação em andamento',
+    '/api/export/tarefas/<tarefa_id>/arquivo': 'depende de uma exportação concluída',
+    '/api/calendar/canais': 'Google Calendar (veja bench_calendar_push.py)',
+    '/api/calendar/canais/<channel_id>': 'Google Calendar (veja bench_calendar_push.py)',
+    '/api/calendar/eventos/<calendar_id>': 'Google Calendar (veja bench_calendar_push.py)',
+    '/api/calendar/notificacoes': 'Google Calendar (veja bench_calendar_push.py)',
+    '/api/calendar/contas/<usuario>': 'conta do Google de um usuário (OAuth)',
+    '/api/calendar/contas/<usuario>/calendarios': 'conta do Google de um usuário (OAuth)',
+    '/api/calendar/contas/<usuario>/token': 'conta do Google de um usuário (OAuth)',
+    '/api/calendar/oauth/callback': 'redirecionamento do OAuth do Google',
+    '/api/users/<int:user_id>': 'sem usuários no workspace sintético',
+}
+
+
+class Alvo(NamedTuple):
+    nome: str
+    aplicacao: str        # módulo:objeto para o gunicorn
+    pasta: str
+    saude: str
+    endpoints: List[Endpoint]
+    modulo_flask: Optional[str]   # para a checagem de cobertura
+
+
+ALVOS = {
+    'simple': Alvo('simple', 'app_simple:app', BACKEND, '/api/health', ENDPOINTS_SIMPLE, 'app_simple'),
+    'api': Alvo('api', 'index:app', os.path.join(RAIZ, 'api'), '/api/health', ENDPOINTS_API, None),
+    'main': Alvo('main', 'src.main:app', BACKEND, '/api/ready', ENDPOINTS_MAIN, 'src.main'),
+}
+
+
+def rotas_sem_cobertura(alvo: Alvo) -> List[str]:
+    """Rotas do app Flask que não estão nos endpoints nem em ROTAS_FORA"""
+    if alvo.modulo_flask is None:
+        return []
+    import importlib
+    app = importlib.import_module(alvo.modulo_flask).app
+    cobertas = {(e.metodo, e.regra) for e in alvo.endpoints}
+    faltando = []
+    for regra in app.url_map.iter_rules():
+        if regra.rule in ROTAS_FORA:
+            continue
+        # Escritas só entram quando há cenário idempotente para elas; leituras, sempre
+        if 'GET' in regra.methods and ('GET', regra.rule) not in cobertas:
+            faltando.append(f'GET {regra.rule}')
+    return faltando
+
+
+def rss_arvore(pid: int) -> Optional[int]:
+    """RSS (KiB) do processo e de todos os descendentes (só Linux)"""
+    total = 0
+    pendentes = [pid]
+    while pendentes:
+        atual = pendentes.pop()
+        try:
+            with open(f'/proc/{atual}/status') as arquivo:
+                for linha in arquivo:
+                    if linha.startswith('VmRSS:'):
+                        total += int(linha.split()[1])
+            with open(f'/proc/{atual}/task/{atual}/children') as arquivo:
+                pendentes += [int(filho) for filho in arquivo.read().split()]
+        except OSError:
+            if atual == pid:
+                return None
+    return total
+
+
+def subir_servidor(alvo: Alvo, porta: int, args, ambiente: Dict[str, str]) -> subprocess.Popen:
+    servidor = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', alvo.aplicacao, '--chdir', alvo.pasta,
+         '--bind', f'127.0.0.1:{porta}', '--worker-class', 'gthread', '--workers', str(args.workers),
+         '--threads', str(args.threads), '--preload', '--timeout', '120', '--keep-alive', '30',
+         '--log-level', 'warning'],
+        cwd=alvo.pasta, env=ambiente, stdout=subprocess.DEVNULL
+    )
+    limite = time.monotonic() + 60
+    while time.monotonic() < limite:
+        if servidor.poll() is not None:
+            raise RuntimeError(f'{alvo.nome}: o servidor saiu com código {servidor.returncode}')
+        try:
+            conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=5)
+            conexao.request('GET', alvo.saude)
+            if conexao.getresponse().status == 200:
+                conexao.close()
+                return servidor
+        except OSError:
+            pass
+        time.sleep(0.2)
+    servidor.kill()
+    raise RuntimeError(f'{alvo.nome}: o servidor não respondeu a tempo')
+
+
+def parar_servidor(servidor: subprocess.Popen):
+    servidor.terminate()
+    try:
+        servidor.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        servidor.kill()
+
+
+def percentil(ordenados: List[float], p: float) -> float:
+    return ordenados[min(int(len(ordenados) * p), len(ordenados) - 1)]
+
+
+def preencher(modelo, valores: Dict[str, str]):
+    """Preenche os {marcadores} de um caminho ou de um corpo JSON"""
+    if isinstance(modelo, str):
+        return modelo.format(**valores)
+    if isinstance(modelo, list):
+        return [preencher(item, valores) for item in modelo]
+    if isinstance(modelo, dict):
+        return {chave: preencher(valor, valores) for chave, valor in modelo.items()}
+    return modelo
+
+
+def carregar(porta: int, endpoint: Endpoint, caminho: str, corpo: Optional[Dict], requisicoes: int,
+             concorrencia: int, aquecimento: int) -> Dict:
+    """Dispara `requisicoes` requisições com `concorrencia` clientes (conexões keep-alive)"""
+    corpo = json.dumps(corpo).encode() if corpo is not None else None
+    cabecalhos = {'Content-Type': 'application/json'} if corpo is not None else {}
+
+    def requisitar(conexao) -> Tuple[object, http.client.HTTPConnection]:
+        try:
+            conexao.request(endpoint.metodo, caminho, corpo, cabecalhos)
+            resposta = conexao.getresponse()
+            resposta.read()
+            return resposta.status, conexao
+        except (OSError, http.client.HTTPException):
+            conexao.close()
+            return 'conexao', http.client.HTTPConnection('127.0.0.1', porta, timeout=120)
+
+    conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=120)
+    for _ in range(aquecimento):
+        _, conexao = requisitar(conexao)
+    conexao.close()
+
+    contador = itertools.count()
+    latencias: List[float] = []
+    erros: Counter = Counter()
+    trava = threading.Lock()
+
+    def cliente():
+        conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=120)
+        minhas, meus_erros = [], Counter()
+        while next(contador) < requisicoes:
+            inicio = time.perf_counter()
+            status, conexao = requisitar(conexao)
+            minhas.append(time.perf_counter() - inicio)
+            if status == 'conexao' or status >= 400:
+                meus_erros[str(status)] += 1
+        conexao.close()
+        with trava:
+            latencias.extend(minhas)
+            erros.update(meus_erros)
+
+    clientes = [threading.Thread(target=cliente) for _ in range(concorrencia)]
+    inicio = time.perf_counter()
+    for thread in clientes:
+        thread.start()
+    for thread in clientes:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        'requisicoes': len(latencias),
+        'erros': dict(erros),
+        'rps': round(len(latencias) / duracao, 1),
+        'p50_ms': round(statistics.median(latencias) * 1000, 2),
+        'p95_ms': round(percentil(latencias, 0.95) * 1000, 2),
+        'p99_ms': round(percentil(latencias, 0.99) * 1000, 2),
+    }
+
+
+def comparar(resultado: Dict, baseline: Dict, limite: float, piso_ms: float) -> List[str]:
+    """Regressões em relação à linha de base (mesma configuração)"""
+    regressoes = []
+    for nome, atual in resultado['endpoints'].items():
+        base = baseline['endpoints'].get(nome)
+        if base is None:
+            continue
+        if atual['p95_ms'] > base['p95_ms'] * (1 + limite) and atual['p95_ms'] - base['p95_ms'] > piso_ms:
+            regressoes.append(f"{nome}: p95 {base['p95_ms']} -> {atual['p95_ms']} ms")
+        if atual['rps'] < base['rps'] * (1 - limite):
+            regressoes.append(f"{nome}: vazão {base['rps']} -> {atual['rps']} req/s")
+    if resultado['rss_kib'] and baseline.get('rss_kib') and resultado['rss_kib'] > baseline['rss_kib'] * (1 + limite):
+        regressoes.append(f"RSS {baseline['rss_kib']} -> {resultado['rss_kib']} KiB")
+    return regressoes
+
+
+def executar_alvo(alvo: Alvo, args, valores: Dict[str, str], ambiente: Dict[str, str]) -> Dict:
+    servidor = subir_servidor(alvo, args.porta, args, ambiente)
+    try:
+        rss_inicial = rss_arvore(servidor.pid)
+        resultados = {}
+        rss_pico = rss_inicial or 0
+        for endpoint in alvo.endpoints:
+            if endpoint.escrita and not args.escritas:
+                continue
+            nome = f'{endpoint.metodo} {endpoint.regra}'
+            if args.endpoints and not any(filtro in nome for filtro in args.endpoints):
+                continue
+            resultados[nome] = carregar(args.porta, endpoint, preencher(endpoint.caminho, valores),
+                                        preencher(endpoint.corpo, valores), args.requisicoes, args.concorrencia,
+                                        args.aquecimento)
+            rss_pico = max(rss_pico, rss_arvore(servidor.pid) or 0)
+            r = resultados[nome]
+            erros = f"  erros {r['erros']}" if r['erros'] else ''
+            print(f"  {nome:<58} p50 {r['p50_ms']:8.2f}  p95 {r['p95_ms']:8.2f}  p99 {r['p99_ms']:8.2f} ms "
+                  f"{r['rps']:8.1f} req/s{erros}")
+        return {'endpoints': resultados, 'rss_inicial_kib': rss_inicial, 'rss_kib': rss_pico or None}
+    finally:
+        parar_servidor(servidor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--alvos', nargs='+', choices=sorted(ALVOS), default=['simple', 'api', 'main'])
+    parser.add_argument('--concorrencia', type=int, default=8, help='clientes simultâneos')
+    parser.add_argument('--requisicoes', type=int, default=200, help='requisições medidas por endpoint')
+    parser.add_argument('--aquecimento', type=int, default=10, help='requisições descartadas por endpoint')
+    parser.add_argument('--workers', type=int, default=1, help='processos do gunicorn')
+    parser.add_argument('--threads', type=int, default=8, help='threads por processo do gunicorn')
+    parser.add_argument('--funcionarios', type=int, default=50)
+    parser.add_argument('--tarefas', type=int, default=200)
+    parser.add_argument('--dias', type=int, default=60, help='dias úteis de agenda datada')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--escritas', action='store_true', help='inclui os endpoints de escrita')
+    parser.add_argument('--endpoints', nargs='*', help='só endpoints que contenham um destes trechos')
+    parser.add_argument('--porta', type=int, default=5199)
+    parser.add_argument('--baselines', default=PASTA_BASELINES, help='pasta das linhas de base')
+    parser.add_argument('--gravar-baseline', action='store_true', help='grava o resultado como linha de base')
+    parser.add_argument('--limite', type=float, default=0.25, help='piora tolerada (fração)')
+    parser.add_argument('--piso-ms', type=float, default=2.0, help='diferença mínima de p95 para contar como piora')
+    parser.add_argument('--json', help='grava o resultado neste arquivo')
+    args = parser.parse_args()
+
+    falhas = []
+    for nome in args.alvos:
+        faltando = rotas_sem_cobertura(ALVOS[nome])
+        if faltando:
+            falhas.append(f"{nome}: rotas sem medição (adicione aos endpoints ou a ROTAS_FORA): {', '.join(faltando)}")
+
+    pasta = tempfile.mkdtemp(prefix='bench-api-')
+    workspace = gerar_workspace(args.funcionarios, args.tarefas, args.dias, seed=args.seed)
+    caminhos = gravar_json(workspace, pasta)
+    banco = f"sqlite:///{os.path.join(pasta, 'app.db')}"
+    popular_banco(workspace, banco)
+    print(f"Workspace: {len(workspace['funcionarios'])} funcionários, {len(workspace['tarefas'])} tarefas, "
+          f"{len(workspace['agenda'])} agendamentos; {args.concorrencia} clientes, {args.requisicoes} requisições "
+          f"por endpoint, gunicorn {args.workers}x{args.threads}")
+
+    hoje = datetime.date.today()
+    semana = hoje - datetime.timedelta(days=hoje.weekday() + 7)
+    valores = {
+        'funcionario': workspace['funcionarios'][0]['id'],
+        'tarefa': workspace['tarefas'][2]['id'],
+        'hoje': hoje.isoformat(),
+        'mes': (hoje - datetime.timedelta(days=27)).isoformat(),
+        'semana': semana.isoformat(),
+        'semana_fim': (semana + datetime.timedelta(days=6)).isoformat(),
+    }
+    # Sem controle de admissão: todos os clientes saem do mesmo IP (veja bench_admissao.py)
+    ambiente = dict(os.environ, DATABASE_URL=banco, AGENDA_JSON=caminhos['agenda'],
+                    PROFILE_CAPTURES_DIR=os.path.join(pasta, 'capturas'), ADMISSAO='0')
+    configuracao = {chave: getattr(args, chave) for chave in
+                    ('concorrencia', 'requisicoes', 'workers', 'threads', 'funcionarios', 'tarefas', 'dias', 'seed',
+                     'escritas')}
+
+    resultados = {}
+    try:
+        for nome in args.alvos:
+            print(f'\n{nome}:')
+            resultado = executar_alvo(ALVOS[nome], args, valores, ambiente)
+            resultado['configuracao'] = configuracao
+            resultados[nome] = resultado
+            print(f"  RSS do servidor: {resultado['rss_inicial_kib']} -> {resultado['rss_kib']} KiB")
+
+            erros = {n: r['erros'] for n, r in resultado['endpoints'].items() if r['erros']}
+            if erros:
+                falhas.append(f'{nome}: respostas com erro {erros}')
+
+            caminho_baseline = os.path.join(args.baselines, f'{nome}.json')
+            if args.gravar_baseline:
+                os.makedirs(args.baselines, exist_ok=True)
+                with open(caminho_baseline, 'w') as arquivo:
+                    json.dump(resultado, arquivo, indent=2, sort_keys=True)
+                print(f'  linha de base gravada em {caminho_baseline}')
+            elif os.path.exists(caminho_baseline):
+                with open(caminho_baseline) as arquivo:
+                    baseline = json.load(arquivo)
+                if baseline.get('configuracao') != configuracao:
+                    print('  ⚠️  linha de base com outra configuração; comparação ignorada')
+                else:
+                    regressoes = comparar(resultado, baseline, args.limite, args.piso_ms)
+                    falhas += [f'{nome}: {regressao}' for regressao in regressoes]
+                    print(f"  {'❌' if regressoes else '✅'} comparado com a linha de base ({len(regressoes)} pioras)")
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w') as arquivo:
+            json.dump({'resultados': resultados, 'falhas': falhas}, arquivo, indent=2)
+
+    if falhas:
+        print('\n'.join(['', *falhas]))
+        sys.exit(1)
+    print('\n✅ benchmark sem regressões')
+
+
+if __name__ == '__main__':
+    main()
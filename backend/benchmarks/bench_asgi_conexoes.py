@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Benchmark de conexões paradas na superfície ASGI (src/asgi.py)
+
+Sobe um único processo do uvicorn com o app escolhido, abre milhares de
+conexões de long-poll (ou SSE) que ficam esperando mudança e, com todas
+abertas, mede:
+- quantas o servidor informa em espera (`conexoes_em_espera`)
+- memória (RSS) e threads do processo do servidor antes e depois
+- latência de leituras normais (GET /api/funcionarios) enquanto as conexões estão abertas
+- se alguma conexão foi respondida antes da hora
+
+Falha (código 1) se o servidor não segurar todas as conexões.
+
+Uso:
+    python benchmarks/bench_asgi_conexoes.py
+    python benchmarks/bench_asgi_conexoes.py --conexoes 10000 --modo sse --json resultado.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def aumentar_limite_arquivos(necessario: int) -> int:
+    """Sobe o limite de descritores abertos até o máximo permitido (herdado pelo servidor)"""
+    if resource is None:
+        return necessario
+    atual, maximo = resource.getrlimit(resource.RLIMIT_NOFILE)
+    alvo = maximo if maximo != resource.RLIM_INFINITY else max(atual, necessario)
+    if atual < alvo:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (alvo, maximo))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def estado_processo(pid: int) -> Dict[str, Optional[int]]:
+    """RSS (KiB) e threads do processo, lidos de /proc (só Linux)"""
+    estado = {'rss_kib': None, 'threads': None}
+    try:
+        with open(f'/proc/{pid}/status') as arquivo:
+            for linha in arquivo:
+                if linha.startswith('VmRSS:'):
+                    estado['rss_kib'] = int(linha.split()[1])
+                elif linha.startswith('Threads:'):
+                    estado['threads'] = int(linha.split()[1])
+    except OSError:
+        pass
+    return estado
+
+
+async def requisitar(porta: int, caminho: str) -> Tuple[int, bytes]:
+    """GET simples numa conexão nova; devolve (status, corpo)"""
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    escritor.write(f'GET {caminho} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode())
+    await escritor.drain()
+    resposta = await leitor.read()
+    escritor.close()
+    cabecalho, _, corpo = resposta.partition(b'\r\n\r\n')
+    return int(cabecalho.split(b' ', 2)[1]), corpo
+
+
+async def esperar_servidor(porta: int, limite: float = 30):
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        try:
+            status, _ = await requisitar(porta, '/api/health')
+            if status == 200:
+                return
+        except OSError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError('servidor não respondeu a tempo')
+
+
+async def abrir_conexao(porta: int, caminho: str, modo: str):
+    """Abre a conexão parada; devolve (escritor, tarefa que termina se ela for respondida ou fechada)"""
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    escritor.write(f'GET {caminho} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+    await escritor.drain()
+    if modo == 'sse':
+        # Cabeçalhos e o evento inicial com a versão atual; depois disso só
+        # chegam comentários de keep-alive, e a tarefa termina se o servidor fechar
+        await leitor.readuntil(b'\r\n\r\n')
+        await leitor.readuntil(b'\n\n')
+        return escritor, asyncio.ensure_future(leitor.read())
+    return escritor, asyncio.ensure_future(leitor.read(1))
+
+
+async def executar(args) -> Dict:
+    limite = aumentar_limite_arquivos(args.conexoes * 2 + 100)
+    if limite < args.conexoes + 100:
+        print(f'⚠️  Limite de arquivos abertos ({limite}) menor que o necessário; reduza --conexoes')
+
+    servidor = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', args.app, '--port', str(args.porta), '--backlog', '8192',
+         '--log-level', 'warning', '--timeout-keep-alive', '120'],
+        # Sem controle de admissão: as leituras em sequência de um cliente só passariam do limite
+        cwd=BACKEND, env=dict(os.environ, ADMISSAO='0'), stdout=subprocess.DEVNULL
+    )
+    try:
+        await esperar_servidor(args.porta)
+        _, corpo = await requisitar(args.porta, '/api/mudancas?timeout=0')
+        versao = json.loads(corpo)['versao']
+        antes = estado_processo(servidor.pid)
+
+        if args.modo == 'sse':
+            caminho = '/api/mudancas/stream'
+        else:
+            caminho = f'/api/mudancas?desde={versao}&timeout=60'
+
+        comeco = time.perf_counter()
+        conexoes = []
+        for i in range(0, args.conexoes, args.lote):
+            lote = min(args.lote, args.conexoes - i)
+            conexoes += await asyncio.gather(*(abrir_conexao(args.porta, caminho, args.modo) for _ in range(lote)))
+        tempo_abertura = time.perf_counter() - comeco
+
+        await asyncio.sleep(0.5)
+        _, corpo = await requisitar(args.porta, '/api/mudancas?timeout=0')
+        em_espera = json.loads(corpo)['conexoes_em_espera']
+        durante = estado_processo(servidor.pid)
+
+        latencias: List[float] = []
+        for _ in range(args.leituras):
+            inicio = time.perf_counter()
+            status, _ = await requisitar(args.porta, '/api/funcionarios')
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            assert status == 200
+        await asyncio.sleep(args.segurar)
+
+        respondidas = sum(1 for _, tarefa in conexoes if tarefa.done())
+        for escritor, tarefa in conexoes:
+            tarefa.cancel()
+            escritor.close()
+
+        latencias.sort()
+        rss_por_conexao = None
+        if antes['rss_kib'] is not None and durante['rss_kib'] is not None:
+            rss_por_conexao = round((durante['rss_kib'] - antes['rss_kib']) / args.conexoes, 2)
+        return {
+            'app': args.app,
+            'modo': args.modo,
+            'conexoes': args.conexoes,
+            'em_espera_no_servidor': em_espera,
+            'respondidas_antes_da_hora': respondidas,
+            'tempo_abertura_s': round(tempo_abertura, 2),
+            'servidor_antes': antes,
+            'servidor_com_conexoes': durante,
+            'rss_por_conexao_kib': rss_por_conexao,
+            'leitura_ms': {
+                'p50': round(statistics.median(latencias), 2),
+                'p99': round(latencias[int(len(latencias) * 0.99) - 1], 2),
+                'max': round(latencias[-1], 2)
+            }
+        }
+    finally:
+        servidor.terminate()
+        try:
+            servidor.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            servidor.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--conexoes', type=int, default=5000)
+    parser.add_argument('--modo', choices=('longpoll', 'sse'), default='longpoll')
+    parser.add_argument('--app', default='app_simple:asgi', help='app ASGI para o uvicorn (padrão app_simple:asgi)')
+    parser.add_argument('--porta', type=int, default=5099)
+    parser.add_argument('--lote', type=int, default=500, help='conexões abertas ao mesmo tempo')
+    parser.add_argument('--leituras', type=int, default=200, help='leituras medidas com as conexões abertas')
+    parser.add_argument('--segurar', type=float, default=2, help='segundos extras com as conexões abertas')
+    parser.add_argument('--json', help='grava o resultado neste arquivo')
+    args = parser.parse_args()
+
+    resultado = asyncio.run(executar(args))
+
+    print(f"{resultado['conexoes']} conexões ({resultado['modo']}) em {resultado['app']}, 1 processo")
+    print(f"  abertas em {resultado['tempo_abertura_s']}s; em espera no servidor: {resultado['em_espera_no_servidor']}; "
+          f"respondidas antes da hora: {resultado['respondidas_antes_da_hora']}")
+    print(f"  servidor: RSS {resultado['servidor_antes']['rss_kib']} -> {resultado['servidor_com_conexoes']['rss_kib']} KiB "
+          f"({resultado['rss_por_conexao_kib']} KiB/conexão), threads {resultado['servidor_antes']['threads']} -> "
+          f"{resultado['servidor_com_conexoes']['threads']}")
+    leitura = resultado['leitura_ms']
+    print(f"  GET /api/funcionarios com as conexões abertas: p50 {leitura['p50']} ms, p99 {leitura['p99']} ms, "
+          f"máx {leitura['max']} ms")
+
+    if args.json:
+        with open(args.json, 'w') as arquivo:
+            json.dump(resultado, arquivo, indent=2)
+
+    if resultado['em_espera_no_servidor'] < resultado['conexoes'] or resultado['respondidas_antes_da_hora']:
+        print('❌ o servidor não segurou todas as conexões')
+        sys.exit(1)
+    print('✅ todas as conexões ficaram abertas')
+
+
+if __name__ == '__main__':
+    main()
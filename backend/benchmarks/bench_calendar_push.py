@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark das notificações push do Google Calendar (offline)
+
+Sobe o FakeCalendarServer e um app Flask local com o calendar_bp, abre um
+canal de watch e simula edições externas em rajadas. Para cada rajada mede:
+- o tempo entre a última edição e a mudança aparecer no Workspace
+- quantas listagens (events.list) foram feitas para absorver a rajada
+
+Uso:
+    python benchmarks/bench_calendar_push.py --bursts 5 --burst-size 20 --debounce 0.5
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from werkzeug.serving import make_server
+
+from benchmarks.fake_google_calendar import FakeCalendarServer
+from src.services.calendar_push import CalendarPushSync, ChannelRegistry
+from src.services.google_calendar import GoogleCalendarService
+
+
+def start_receiver(push_sync: CalendarPushSync):
+    """Sobe um app Flask com o blueprint de calendário usando push_sync"""
+    import src.routes.calendar as calendar_routes
+
+    calendar_routes.calendar_push_sync = push_sync
+    app = Flask(__name__)
+    app.register_blueprint(calendar_routes.calendar_bp, url_prefix='/api/calendar')
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}/api/calendar/notificacoes'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bursts', type=int, default=5)
+    parser.add_argument('--burst-size', type=int, default=20, help='Edições externas por rajada')
+    parser.add_argument('--debounce', type=float, default=0.5, help='Janela do debouncer (s)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Latência artificial da API (s)')
+    args = parser.parse_args(argv)
+
+    logging.getLogger('src.services.calendar_push').setLevel(logging.WARNING)
+    logging.getLogger('googleapiclient.discovery_cache').setLevel(logging.WARNING)
+
+    with FakeCalendarServer(latency=args.latency) as google, tempfile.TemporaryDirectory() as workdir:
+        service = GoogleCalendarService()
+        service.service = google.build_service()
+        registry = ChannelRegistry(service, channels_file=os.path.join(workdir, 'watch_channels.json'))
+        push_sync = CalendarPushSync(service, registry, debounce_seconds=args.debounce)
+
+        receiver, address = start_receiver(push_sync)
+        push_sync.subscribe('externo', address)
+
+        inicio = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+        print(f"{'rajada':>6} {'edições':>8} {'listagens':>10} {'latência (s)':>13} {'eventos':>8}")
+
+        for burst in range(args.bursts):
+            expected = (burst + 1) * args.burst_size
+            google.reset_stats()
+            for i in range(args.burst_size):
+                start = inicio + datetime.timedelta(minutes=30 * (burst * args.burst_size + i))
+                google.store.insert('externo', {
+                    'summary': f'Reunião externa {burst}-{i}',
+                    'start': {'dateTime': start.isoformat()},
+                    'end': {'dateTime': (start + datetime.timedelta(minutes=30)).isoformat()}
+                })
+            last_edit = time.perf_counter()
+
+            while len(push_sync.get_events('externo')) < expected:
+                if time.perf_counter() - last_edit > 30:
+                    raise RuntimeError('Mudanças não chegaram em 30s')
+                time.sleep(0.01)
+            latency = time.perf_counter() - last_edit
+
+            # Espera notificações atrasadas da rajada antes de contar as listagens
+            while push_sync.debouncer.pending():
+                time.sleep(0.01)
+
+            print(f"{burst + 1:>6} {args.burst_size:>8} {google.stats().get('events.list', 0):>10} "
+                  f"{latency:>13.3f} {len(push_sync.get_events('externo')):>8}")
+
+        registry.shutdown()
+        receiver.shutdown()
+
+
+if __name__ == '__main__':
+    main()
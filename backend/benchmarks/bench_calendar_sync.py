@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark da sincronização com o Google Calendar (offline)
+
+Roda o GoogleCalendarService contra o FakeCalendarServer local e mede, para
+cada tamanho de agenda:
+- sync_workspace_to_google na primeira execução (criação de todos os eventos)
+- sync_workspace_to_google novamente sem mudanças (estado estável)
+- sync_google_to_workspace com a mesma quantidade de eventos externos
+
+Para cada cenário são reportados chamadas à API, tempo total e pico de memória
+(RSS do processo; com --tracemalloc, o pico alocado pelo próprio cenário, ao
+custo de deixar a execução bem mais lenta).
+
+Uso:
+    python benchmarks/bench_calendar_sync.py
+    python benchmarks/bench_calendar_sync.py --sizes 100 1000 --latency 0.002 --json resultado.json
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_google_calendar import FakeCalendarServer
+from src.services.google_calendar import GoogleCalendarService
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+
+def generate_workspace_events(count: int, start: datetime.datetime) -> List[Dict[str, Any]]:
+    """Gera agendamentos do Workspace em slots de 30 minutos a partir de start"""
+    funcionarios = ['guido', 'pedro', 'michelle', 'dayana', 'jean', 'andreia', 'thais']
+    tarefas = ['checkins', 'suporte', 'social_selling', 'material_renovacao', 'montar_planos']
+    events = []
+    for i in range(count):
+        inicio = start + datetime.timedelta(minutes=30 * (i // len(funcionarios)))
+        events.append({
+            'workspace_id': f'bench-{i}',
+            'title': f'Agendamento {i}',
+            'funcionario': funcionarios[i % len(funcionarios)],
+            'tarefa': tarefas[i % len(tarefas)],
+            'categoria': 'benchmark',
+            'tempo_estimado': 30,
+            'start': inicio.isoformat(),
+            'end': (inicio + datetime.timedelta(minutes=30)).isoformat()
+        })
+    return events
+
+
+def seed_external_events(server: FakeCalendarServer, count: int, start: datetime.datetime):
+    """Cria eventos "de fora" diretamente no armazenamento do servidor falso"""
+    for i in range(count):
+        inicio = start + datetime.timedelta(minutes=15 * i)
+        server.store.insert('externo', {
+            'summary': f'Reunião externa {i}',
+            'start': {'dateTime': inicio.isoformat()},
+            'end': {'dateTime': (inicio + datetime.timedelta(minutes=15)).isoformat()}
+        })
+
+
+def peak_rss_kb() -> float:
+    """Pico de memória residente do processo em KB (None se indisponível)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reporta em bytes, Linux em KB
+    return round(peak / 1024 if sys.platform == 'darwin' else peak, 1)
+
+
+def measure(server: FakeCalendarServer, func: Callable[[], Any], trace: bool = False) -> Dict[str, Any]:
+    """Executa func medindo chamadas à API, tempo e pico de memória"""
+    server.reset_stats()
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_kb = round(peak / 1024, 1)
+    else:
+        peak_kb = peak_rss_kb()
+    return {
+        'api_calls': server.stats(),
+        'wall_time_s': round(elapsed, 3),
+        'peak_memory_kb': peak_kb,
+        'result': result
+    }
+
+
+def run_size(size: int, latency: float, rate_limit: float, error_rate: float,
+             trace: bool = False) -> Dict[str, Any]:
+    now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+
+    with FakeCalendarServer(latency=latency, rate_limit=rate_limit, error_rate=error_rate) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        calendar = GoogleCalendarService()
+        calendar.mapping_file = os.path.join(workdir, 'event_mappings.json')
+        calendar.service = server.build_service()
+
+        workspace_events = generate_workspace_events(size, now + datetime.timedelta(hours=1))
+        seed_external_events(server, size, now + datetime.timedelta(hours=1))
+
+        def summary(report):
+            return {key: report.get(key) for key in ('created', 'updated', 'skipped', 'errors')}
+
+        first = measure(server, lambda: summary(calendar.sync_workspace_to_google(workspace_events, 'primary')),
+                        trace)
+        steady = measure(server, lambda: summary(calendar.sync_workspace_to_google(workspace_events, 'primary')),
+                         trace)
+        pull = measure(server, lambda: {'events': len(calendar.sync_google_to_workspace('externo'))}, trace)
+
+    return {
+        'size': size,
+        'workspace_to_google_initial': first,
+        'workspace_to_google_steady': steady,
+        'google_to_workspace': pull
+    }
+
+
+def print_table(results: List[Dict[str, Any]]):
+    header = f"{'eventos':>8}  {'cenário':<28} {'chamadas':>9} {'tempo (s)':>10} {'pico (KB)':>10}  resultado"
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        for scenario in ('workspace_to_google_initial', 'workspace_to_google_steady', 'google_to_workspace'):
+            data = result[scenario]
+            print(f"{result['size']:>8}  {scenario:<28} {data['api_calls']['total']:>9} "
+                  f"{data['wall_time_s']:>10} {data['peak_memory_kb']:>10}  {data['result']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--latency', type=float, default=0.0, help='Latência artificial por chamada (s)')
+    parser.add_argument('--rate-limit', type=float, default=None, help='Máximo de chamadas por segundo')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probabilidade de erro 503 (0-1)')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='Mede o pico alocado por cenário com tracemalloc (mais lento)')
+    parser.add_argument('--json', help='Salva os resultados neste arquivo')
+    args = parser.parse_args(argv)
+
+    # Os logs por evento distorcem o tempo medido
+    logging.getLogger('src.services.google_calendar').setLevel(logging.WARNING)
+    logging.getLogger('googleapiclient.discovery_cache').setLevel(logging.WARNING)
+
+    results = [run_size(size, args.latency, args.rate_limit, args.error_rate, args.tracemalloc)
+               for size in args.sizes]
+    print_table(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
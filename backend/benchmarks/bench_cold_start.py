@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Orçamento de cold start dos pontos de entrada
+
+Importa cada ponto de entrada num processo novo com `python -X importtime` e
+falha (código 1) se:
+- o tempo de import passar do orçamento (o menor de --repeticoes execuções,
+  com os .pyc já gerados, como numa implantação)
+- o import carregar um módulo proibido (ex.: SQLAlchemy numa função estática,
+  bibliotecas do Google ou NumPy no app completo)
+- importar o app completo criar o banco (o schema não pode estar no caminho do import)
+- api/_payloads.py estiver desatualizado em relação a api/_dados.py
+
+Uso:
+    python benchmarks/bench_cold_start.py
+    python benchmarks/bench_cold_start.py --escala 2 --json resultado.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAIZ = os.path.dirname(BACKEND)
+
+# (nome, diretório no sys.path, módulo, orçamento em ms, prefixos de módulos proibidos)
+PONTOS_DE_ENTRADA: List[Tuple[str, str, str, float, Tuple[str, ...]]] = [
+    ('api/index.py', os.path.join(RAIZ, 'api'), 'index', 25, ('flask', 'sqlalchemy', 'google', 'numpy')),
+    ('api/funcionarios.py', os.path.join(RAIZ, 'api'), 'funcionarios', 25, ('flask', 'sqlalchemy')),
+    ('api/tarefas.py', os.path.join(RAIZ, 'api'), 'tarefas', 25, ('flask', 'sqlalchemy')),
+    ('api/agenda.py', os.path.join(RAIZ, 'api'), 'agenda', 25, ('flask', 'sqlalchemy')),
+    ('api/batch.py', os.path.join(RAIZ, 'api'), 'batch', 25, ('flask', 'sqlalchemy')),
+    ('backend/api/index.py', os.path.join(BACKEND, 'api'), 'index', 25, ('flask', 'sqlalchemy', 'google', 'numpy')),
+    ('backend/src/main.py', BACKEND, 'src.main', 600,
+     ('numpy', 'google.oauth2.credentials', 'google_auth_oauthlib', 'googleapiclient.discovery', 'xlsxwriter',
+      'pstats')),
+]
+
+
+def medir(diretorio: str, modulo: str, ambiente: Dict[str, str]) -> Tuple[Optional[float], List[str], str]:
+    """(tempo acumulado do import em ms, módulos importados, stderr em caso de erro)"""
+    codigo = f'import sys; sys.path.insert(0, {diretorio!r}); import {modulo}'
+    processo = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo], cwd=diretorio,
+                              env=ambiente, capture_output=True, text=True)
+    tempo = None
+    modulos = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith('import time:') or '|' not in linha:
+            continue
+        partes = linha.split('|')
+        nome = partes[2].strip()
+        modulos.append(nome)
+        # O módulo pedido é o de nível zero (sem recuo) com esse nome
+        if partes[2].rstrip() == f' {modulo}':
+            tempo = int(partes[1]) / 1000
+    return tempo, modulos, processo.stderr if processo.returncode else ''
+
+
+def payloads_atualizados() -> bool:
+    sys.path.insert(0, os.path.join(RAIZ, 'api'))
+    try:
+        import _dados
+        with open(_dados.CAMINHO_PAYLOADS, encoding='utf-8') as arquivo:
+            return arquivo.read() == _dados.gerar_modulo()
+    finally:
+        sys.path.pop(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--escala', type=float, default=1.0, help='multiplica os orçamentos (máquinas lentas)')
+    parser.add_argument('--json', help='grava o resultado neste arquivo')
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix='cold-start-')
+    banco = os.path.join(pasta, 'app.db')
+    ambiente = dict(os.environ, DATABASE_URL=f'sqlite:///{banco}')
+    # .pyc gravados na primeira execução, como depois de uma implantação
+    ambiente.pop('PYTHONDONTWRITEBYTECODE', None)
+
+    falhas = []
+    resultados = []
+    for nome, diretorio, modulo, orcamento, proibidos in PONTOS_DE_ENTRADA:
+        orcamento *= args.escala
+        tempos = []
+        modulos: List[str] = []
+        for _ in range(args.repeticoes + 1):
+            tempo, modulos, erro = medir(diretorio, modulo, ambiente)
+            if erro:
+                falhas.append(f'{nome}: import falhou\n{erro[-2000:]}')
+                break
+            tempos.append(tempo)
+        if not tempos:
+            continue
+        melhor = min(tempos[1:] or tempos)
+        carregados = sorted({m for m in modulos if any(m == p or m.startswith(p + '.') for p in proibidos)})
+        resultados.append({'ponto': nome, 'ms': round(melhor, 1), 'orcamento_ms': orcamento,
+                           'modulos': len(modulos), 'proibidos': carregados})
+        situacao = '✅' if melhor <= orcamento and not carregados else '❌'
+        print(f'{situacao} {nome:<24} {melhor:8.1f} ms (orçamento {orcamento:.0f} ms, {len(modulos)} módulos)')
+        if melhor > orcamento:
+            falhas.append(f'{nome}: {melhor:.1f} ms > {orcamento:.0f} ms')
+        if carregados:
+            falhas.append(f"{nome}: importou {', '.join(carregados[:5])}")
+
+    if os.path.exists(banco):
+        falhas.append('importar src.main criou o banco (schema no caminho do import)')
+    shutil.rmtree(pasta, ignore_errors=True)
+    if not payloads_atualizados():
+        falhas.append('api/_payloads.py desatualizado: rode python api/_dados.py')
+
+    if args.json:
+        with open(args.json, 'w') as arquivo:
+            json.dump({'resultados': resultados, 'falhas': falhas}, arquivo, indent=2)
+
+    if falhas:
+        print('\n'.join(['', *falhas]))
+        sys.exit(1)
+    print('✅ cold start dentro do orçamento')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark do gerador automático de cronograma
+
+Monta um problema sintético (por padrão 50 funcionários x 40 tarefas x 5 dias),
+com reunião diária fixa, almoço e algumas ausências, e mede o tempo da
+heurística gulosa e da busca local. Falha se o tempo total passar do limite.
+
+Uso:
+    python benchmarks/bench_gerador_agenda.py --funcionarios 50 --tarefas 40 --dias 5
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.gerador_agenda import Atribuicao, GeradorAgenda, dias_uteis
+
+PRIORIDADES = ['alta', 'media', 'baixa']
+FREQUENCIAS = ['diária', 'diária', 'contínua', 'semanal', 'quinzenal', 'mensal']
+
+
+def gerar_problema(n_funcionarios: int, n_tarefas: int, n_dias: int, seed: int):
+    rng = random.Random(seed)
+    funcionarios = [
+        {'id': f'func{i}', 'nome': f'Funcionário {i}', 'horarioInicio': '09:00', 'horarioFim': '17:30'}
+        for i in range(n_funcionarios)
+    ]
+    tarefas = [
+        {'id': f'tarefa{i}', 'nome': f'Tarefa {i}', 'prioridade': rng.choice(PRIORIDADES)}
+        for i in range(n_tarefas)
+    ]
+    frequencias = {t['id']: rng.choice(FREQUENCIAS) for t in tarefas}
+
+    atribuicoes = []
+    for func in funcionarios:
+        for tarefa in rng.sample(tarefas, 6):
+            minutos = rng.choice([30, 30, 60]) if frequencias[tarefa['id']] in ('diária', 'contínua') \
+                else rng.choice([60, 90, 120])
+            atribuicoes.append(Atribuicao(func['id'], tarefa['id'], minutos))
+
+    dias = dias_uteis(datetime.date(2025, 1, 6), n_dias)
+    fixos = []
+    for func in funcionarios:
+        fixos.append({'funcionario': func['id'], 'tarefa': 'reuniao_diaria', 'horario': '09:00', 'duracao': 30})
+        fixos.append({'funcionario': func['id'], 'tarefa': 'almoco', 'horario': '12:00', 'duracao': 60})
+    ausencias = [
+        {'funcionario': func['id'], 'tipo': 'folga', 'status': 'aprovado',
+         'dataInicio': rng.choice(dias).isoformat(), 'dataFim': None}
+        for func in rng.sample(funcionarios, max(1, n_funcionarios // 10))
+    ]
+    for ausencia in ausencias:
+        ausencia['dataFim'] = ausencia['dataInicio']
+
+    return funcionarios, tarefas, frequencias, atribuicoes, dias, ausencias, fixos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--funcionarios', type=int, default=50)
+    parser.add_argument('--tarefas', type=int, default=40)
+    parser.add_argument('--dias', type=int, default=5)
+    parser.add_argument('--tempo-limite', type=float, default=1.0, help='Orçamento da busca local (s)')
+    parser.add_argument('--limite', type=float, default=2.0, help='Tempo total máximo aceito (s)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    problema = gerar_problema(args.funcionarios, args.tarefas, args.dias, args.seed)
+    funcionarios, tarefas, frequencias, atribuicoes, dias, ausencias, fixos = problema
+
+    inicio = time.perf_counter()
+    gerador = GeradorAgenda(funcionarios, tarefas, frequencias, atribuicoes, dias,
+                            ausencias=ausencias, fixos=fixos)
+    montagem = time.perf_counter() - inicio
+    proposta = gerador.gerar(tempo_limite=args.tempo_limite)
+    total = time.perf_counter() - inicio
+
+    stats = proposta.estatisticas
+    print(f"problema: {args.funcionarios} funcionários x {args.tarefas} tarefas x {args.dias} dias, "
+          f"{stats['blocos']} blocos")
+    print(f"montagem:        {montagem * 1000:8.1f} ms")
+    print(f"gulosa:          {stats['tempo_guloso_ms']:8.1f} ms  (penalidade {stats['penalidade_gulosa']})")
+    print(f"total:           {total * 1000:8.1f} ms  (penalidade {stats['penalidade_final']})")
+    print(f"alocados:        {stats['alocados']}/{stats['blocos']}  "
+          f"desalojamentos={stats['desalojamentos']} realinhamentos={stats['realinhamentos']}")
+
+    if total > args.limite:
+        print(f"FALHOU: {total:.2f}s > {args.limite:.2f}s")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Custo das métricas (src/services/metricas.py)
+
+Mede:
+- o custo por requisição da instrumentação: o mesmo app Flask mínimo com e
+  sem instrumentar_app, atendendo --requisicoes requisições pelo test client
+- contagem concorrente: --threads threads incrementando ao mesmo tempo; o
+  total juntado no scrape tem que bater exatamente (nenhum incremento perdido)
+- o tempo de um scrape de /metrics com os fragmentos de todas essas threads
+
+Falha (código 1) se o custo por requisição passar de --limite-us ou se a
+contagem concorrente não bater.
+
+Uso:
+    python benchmarks/bench_metricas.py
+    python benchmarks/bench_metricas.py --requisicoes 50000 --threads 32
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+
+from src.services.metricas import Metricas, instrumentar_app, metricas
+
+
+def criar_app(instrumentado: bool) -> Flask:
+    app = Flask(__name__)
+
+    @app.route('/api/item/<int:item_id>')
+    def item(item_id):
+        return jsonify({'id': item_id})
+
+    if instrumentado:
+        instrumentar_app(app)
+    return app
+
+
+def tempo_por_requisicao(apps: List[Flask], requisicoes: int, rodadas: int = 5) -> List[float]:
+    """Melhor rodada de cada app, em microssegundos por requisição (rodadas alternadas entre os apps)"""
+    clientes = [app.test_client() for app in apps]
+    melhores = [float('inf')] * len(apps)
+    for _ in range(rodadas):
+        for n, cliente in enumerate(clientes):
+            inicio = time.perf_counter()
+            for i in range(requisicoes):
+                cliente.get(f'/api/item/{i % 100}')
+            melhores[n] = min(melhores[n], (time.perf_counter() - inicio) / requisicoes * 1e6)
+    return melhores
+
+
+def contagem_concorrente(threads: int, incrementos: int) -> float:
+    """Incrementa em paralelo e confere o total; devolve o tempo de um scrape em ms"""
+    registro = Metricas()
+    largada = threading.Barrier(threads)
+
+    def trabalhar(n):
+        largada.wait()
+        for i in range(incrementos):
+            registro.contar('workspace_http_requisicoes_total', (f'/rota/{i % 10}', 'GET', '200'))
+            registro.observar('workspace_http_duracao_segundos', (f'/rota/{i % 10}', 'GET'), 0.001 * (n + 1))
+
+    trabalhadores = [threading.Thread(target=trabalhar, args=(n,)) for n in range(threads)]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+
+    inicio = time.perf_counter()
+    registro.texto()
+    scrape_ms = (time.perf_counter() - inicio) * 1000
+
+    total = registro.coletar()
+    contados = sum(v for (nome, _), v in total.items() if nome == 'workspace_http_requisicoes_total')
+    # Histogramas: contagens dos buckets (o último item é a soma)
+    observados = sum(sum(v[:-1]) for (nome, _), v in total.items() if nome == 'workspace_http_duracao_segundos')
+    esperado = threads * incrementos
+    if contados != esperado or observados != esperado:
+        raise AssertionError(f'contagem concorrente: {contados}/{observados} de {esperado}')
+    return scrape_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requisicoes', type=int, default=10000, help='requisições por rodada')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--incrementos', type=int, default=50000, help='incrementos por thread')
+    parser.add_argument('--limite-us', type=float, default=80, help='custo máximo por requisição (µs)')
+    args = parser.parse_args()
+
+    sem, com = tempo_por_requisicao([criar_app(False), criar_app(True)], args.requisicoes)
+    custo = com - sem
+    print(f'Requisição sem métricas: {sem:.1f} µs; com métricas: {com:.1f} µs; custo {custo:.1f} µs')
+
+    inicio = time.perf_counter()
+    metricas.texto()
+    print(f'Scrape de /metrics depois de {5 * args.requisicoes} requisições: '
+          f'{(time.perf_counter() - inicio) * 1000:.2f} ms')
+
+    falhas = []
+    try:
+        scrape_ms = contagem_concorrente(args.threads, args.incrementos)
+        print(f'{args.threads} threads x {args.incrementos} incrementos: total confere; '
+              f'scrape com {args.threads} fragmentos em {scrape_ms:.2f} ms')
+    except AssertionError as erro:
+        falhas.append(str(erro))
+
+    if custo > args.limite_us:
+        falhas.append(f'custo por requisição {custo:.1f} µs > {args.limite_us:.0f} µs')
+    if falhas:
+        print('\n'.join(['', *falhas]))
+        sys.exit(1)
+    print('✅ métricas dentro do orçamento')
+
+
+if __name__ == '__main__':
+    main()
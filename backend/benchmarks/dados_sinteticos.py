@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Gerador de workspaces sintéticos
+
+Monta um workspace realista de qualquer tamanho: N funcionários com
+expedientes variados, M tarefas com categorias e prioridades, o cronograma
+recorrente (agendamentos sem data) e D dias úteis de agenda datada com
+`duracao`, processos com passos, demandas e tarefas a fazer. Os mesmos dados
+saem em dois formatos:
+
+- arquivos JSON no formato de src/data (agenda.json e processos.json), que o
+  app_simple lê com AGENDA_JSON=<pasta>/agenda.json
+- um banco pelo SQLAlchemy, com o schema e as versões de migração gravados
+  (o app completo sobe direto nele com DATABASE_URL)
+
+A mesma semente gera sempre o mesmo workspace.
+
+Uso:
+    python benchmarks/dados_sinteticos.py --funcionarios 50 --tarefas 200 --dias 60 \\
+        --json /tmp/ws --banco sqlite:////tmp/ws/app.db
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+from typing import Dict, List, Optional
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NOMES = ['Ana', 'Bruno', 'Carla', 'Diego', 'Elisa', 'Fábio', 'Gabriela', 'Heitor', 'Isabela', 'João',
+         'Larissa', 'Marcos', 'Natália', 'Otávio', 'Paula', 'Rafael', 'Sabrina', 'Tiago', 'Vanessa', 'Yuri']
+SOBRENOMES = ['Silva', 'Souza', 'Oliveira', 'Santos', 'Lima', 'Costa', 'Pereira', 'Almeida', 'Ribeiro', 'Gomes']
+
+# (início, fim) dos expedientes, com peso; 'flexible' existe nos dados reais
+EXPEDIENTES = [(('09:00', '17:30'), 6), (('08:00', '17:30'), 2), (('13:00', '17:30'), 1),
+               (('14:00', '17:30'), 1), (('flexible', 'flexible'), 1)]
+
+CATEGORIAS = ['gestao', 'atendimento', 'marketing', 'engajamento', 'conteudo', 'produto', 'interno']
+VERBOS = ['Revisar', 'Preparar', 'Enviar', 'Acompanhar', 'Organizar', 'Atualizar', 'Produzir', 'Analisar',
+          'Planejar', 'Responder']
+OBJETOS = ['check-ins dos alunos', 'material de renovação', 'campanha no Instagram', 'relatório semanal',
+           'mensagens de engajamento', 'planos novos', 'suporte no WhatsApp', 'conteúdo para desengajados',
+           'métricas do funil', 'agenda da equipe', 'fila de atendimento', 'feedback dos clientes']
+RECURSOS = ['CRM', 'WhatsApp', 'Planilha', 'Canva', 'Instagram', 'Notion', 'Google Drive', 'Discord', 'E-mail']
+PRIORIDADES = [('alta', 3), ('media', 4), ('baixa', 2)]
+FREQUENCIAS = ['Diária', 'Diária', 'Semanal', 'Quinzenal', 'Mensal', 'Contínua']
+DURACOES = [15, 30, 30, 45, 60, 60, 90]
+STATUS_DEMANDA = [('pendente', 5), ('em_andamento', 3), ('concluida', 4)]
+REGRAS = [None, None, None, 'FREQ=WEEKLY;BYDAY=MO,WE,FR', 'FREQ=WEEKLY;BYDAY=TU,TH', 'FREQ=DAILY']
+
+
+def _escolher(rng: random.Random, opcoes):
+    """Escolha ponderada em [(valor, peso)]"""
+    valores, pesos = zip(*opcoes)
+    return rng.choices(valores, weights=pesos)[0]
+
+
+def _minutos(horario: str) -> int:
+    horas, minutos = horario.split(':')
+    return int(horas) * 60 + int(minutos)
+
+
+def _horario(minutos: int) -> str:
+    return f'{minutos // 60:02d}:{minutos % 60:02d}'
+
+
+def _dias_uteis_ate(fim: datetime.date, quantidade: int) -> List[datetime.date]:
+    dias = []
+    dia = fim
+    while len(dias) < quantidade:
+        if dia.weekday() < 5:
+            dias.append(dia)
+        dia -= datetime.timedelta(days=1)
+    return dias[::-1]
+
+
+def gerar_workspace(funcionarios: int = 50, tarefas: int = 200, dias: int = 60, demandas: int = 500,
+                    tarefas_a_fazer: int = 500, seed: int = 42, fim: Optional[datetime.date] = None) -> Dict:
+    """
+    Workspace sintético
+
+    Args:
+        dias: dias úteis de agenda datada, terminando em `fim` (padrão: hoje)
+
+    Returns:
+        {'funcionarios', 'tarefas', 'agenda', 'processos', 'demandas', 'tarefas_a_fazer'} nos
+        formatos de src/data (agenda com o campo extra `data` nos agendamentos datados)
+    """
+    rng = random.Random(seed)
+    fim = fim or datetime.date.today()
+
+    lista_funcionarios = []
+    for i in range(funcionarios):
+        inicio, termino = _escolher(rng, EXPEDIENTES)
+        lista_funcionarios.append({
+            'id': f'func_{i:04d}',
+            'nome': f'{rng.choice(NOMES)} {rng.choice(SOBRENOMES)}',
+            'horarioInicio': inicio,
+            'horarioFim': termino,
+            'cor': f'#{rng.randrange(0x1000000):06x}'
+        })
+
+    lista_tarefas = [
+        {'id': 'almoco', 'nome': 'Almoço', 'categoria': 'interno', 'tempoEstimado': 60,
+         'descricao': 'Pausa para almoço', 'prioridade': 'baixa', 'computar_horas': False},
+        {'id': 'reuniao_diaria', 'nome': 'Reunião diária', 'categoria': 'gestao', 'tempoEstimado': 30,
+         'descricao': 'Alinhamento da equipe e planejamento do dia', 'prioridade': 'alta'},
+    ]
+    for i in range(len(lista_tarefas), tarefas):
+        verbo, objeto = rng.choice(VERBOS), rng.choice(OBJETOS)
+        lista_tarefas.append({
+            'id': f'tarefa_{i:04d}',
+            'nome': f'{verbo} {objeto}',
+            'categoria': rng.choice(CATEGORIAS),
+            'tempoEstimado': rng.choice(DURACOES),
+            'descricao': f'{verbo} {objeto} ({rng.choice(RECURSOS)})',
+            'prioridade': _escolher(rng, PRIORIDADES)
+        })
+    trabalho = lista_tarefas[2:] or lista_tarefas
+    por_id = {tarefa['id']: tarefa for tarefa in lista_tarefas}
+
+    agenda = []
+    # Cronograma recorrente: reunião, almoço e algumas tarefas fixas de cada funcionário
+    for funcionario in lista_funcionarios:
+        expediente = funcionario['horarioInicio']
+        inicio = _minutos(expediente) if expediente != 'flexible' else 9 * 60
+        agenda.append({'horario': _horario(max(inicio, 9 * 60)), 'funcionario': funcionario['id'],
+                       'tarefa': 'reuniao_diaria', 'duracao': 30})
+        if inicio < 12 * 60:
+            agenda.append({'horario': '12:00', 'funcionario': funcionario['id'], 'tarefa': 'almoco', 'duracao': 60})
+        for _ in range(rng.randint(2, 5)):
+            tarefa = rng.choice(trabalho)
+            minuto = rng.randrange(max(inicio, 13 * 60), 17 * 60, 30)
+            item = {'horario': _horario(minuto), 'funcionario': funcionario['id'], 'tarefa': tarefa['id'],
+                    'duracao': tarefa['tempoEstimado']}
+            regra = rng.choice(REGRAS)
+            if regra:
+                item['recorrencia'] = regra
+            agenda.append(item)
+
+    # Agenda datada: cada dia útil preenchido do início ao fim do expediente, com folgas
+    for dia in _dias_uteis_ate(fim, dias):
+        for funcionario in lista_funcionarios:
+            if rng.random() < 0.05:  # ausente no dia
+                continue
+            expediente = funcionario['horarioInicio']
+            minuto = _minutos(expediente) if expediente != 'flexible' else rng.choice([8, 9, 10]) * 60
+            termino = _minutos(funcionario['horarioFim']) if funcionario['horarioFim'] != 'flexible' else 17 * 60
+            while minuto < termino:
+                tarefa = rng.choice(trabalho)
+                duracao = min(tarefa['tempoEstimado'], termino - minuto)
+                if rng.random() < 0.8:
+                    agenda.append({'horario': _horario(minuto), 'funcionario': funcionario['id'],
+                                   'tarefa': tarefa['id'], 'duracao': duracao, 'data': dia.isoformat()})
+                minuto += duracao + rng.choice([0, 0, 15, 30])
+
+    processos = {}
+    for tarefa in trabalho:
+        passos = [
+            {'numero': n + 1, 'titulo': f'{rng.choice(VERBOS)} etapa {n + 1}',
+             'descricao': f'{rng.choice(VERBOS)} {rng.choice(OBJETOS)}', 'tempo': f'{rng.choice([5, 10, 15])} min',
+             'recursos': rng.sample(RECURSOS, rng.randint(1, 3))}
+            for n in range(rng.randint(3, 7))
+        ]
+        processos[tarefa['id']] = {
+            'titulo': tarefa['nome'],
+            'descricao': tarefa['descricao'],
+            'tempoEstimado': f"{por_id[tarefa['id']]['tempoEstimado']} minutos",
+            'frequencia': rng.choice(FREQUENCIAS),
+            'passos': passos,
+            'observacoes': [f'Usar {rng.choice(RECURSOS)} quando possível']
+        }
+
+    def prazo():
+        return (fim + datetime.timedelta(days=rng.randint(-30, 60))).isoformat()
+
+    lista_demandas = []
+    for i in range(demandas):
+        tarefa = rng.choice(trabalho)
+        lista_demandas.append({
+            'titulo': f'Demanda {i + 1}: {tarefa["nome"]}',
+            'descricao': f'{rng.choice(VERBOS)} {rng.choice(OBJETOS)} para {rng.choice(NOMES)}',
+            'funcionario_id': rng.choice(lista_funcionarios)['id'],
+            'tarefa_id': tarefa['id'] if rng.random() < 0.7 else None,
+            'importancia': _escolher(rng, PRIORIDADES),
+            'status': _escolher(rng, STATUS_DEMANDA),
+            'prazo': prazo(),
+            'observacoes': None
+        })
+
+    lista_tarefas_a_fazer = []
+    for i in range(tarefas_a_fazer):
+        concluida = rng.random() < 0.4
+        lista_tarefas_a_fazer.append({
+            'titulo': f'{rng.choice(VERBOS)} {rng.choice(OBJETOS)}',
+            'descricao': f'Pedido {i + 1} de {rng.choice(NOMES)}',
+            'funcionario_responsavel_id': rng.choice(lista_funcionarios)['id'],
+            'importancia': _escolher(rng, PRIORIDADES),
+            'concluida': concluida,
+            'prazo': prazo(),
+            'telefone_whatsapp': f'+55119{rng.randrange(10 ** 8):08d}' if rng.random() < 0.3 else None,
+            'mensagem_whatsapp': None,
+            'observacoes': None
+        })
+
+    return {
+        'funcionarios': lista_funcionarios,
+        'tarefas': lista_tarefas,
+        'agenda': agenda,
+        'processos': processos,
+        'demandas': lista_demandas,
+        'tarefas_a_fazer': lista_tarefas_a_fazer
+    }
+
+
+def gravar_json(workspace: Dict, pasta: str) -> Dict[str, str]:
+    """Grava agenda.json e processos.json (formato de src/data); devolve os caminhos"""
+    os.makedirs(pasta, exist_ok=True)
+    caminhos = {'agenda': os.path.join(pasta, 'agenda.json'), 'processos': os.path.join(pasta, 'processos.json')}
+    with open(caminhos['agenda'], 'w', encoding='utf-8') as arquivo:
+        json.dump({chave: workspace[chave] for chave in ('funcionarios', 'tarefas', 'agenda')}, arquivo,
+                  ensure_ascii=False)
+    with open(caminhos['processos'], 'w', encoding='utf-8') as arquivo:
+        json.dump(workspace['processos'], arquivo, ensure_ascii=False)
+    return caminhos
+
+
+def popular_banco(workspace: Dict, database_url: str) -> Dict[str, int]:
+    """
+    Cria o schema em `database_url` e insere o workspace; devolve as contagens por tabela
+
+    O banco precisa estar vazio. As versões de migração são gravadas no fim,
+    então o app completo não tenta popular com os dados iniciais.
+    """
+    if BACKEND not in sys.path:
+        sys.path.insert(0, BACKEND)
+    from flask import Flask
+    from src.database import db
+    from src.database.migracoes import _importar_modelos, migrar
+    from src.models.agenda import Agenda
+    from src.models.demanda import Demanda
+    from src.models.funcionario import Funcionario
+    from src.models.processo import Processo
+    from src.models.tarefa import Tarefa
+    from src.models.tarefa_a_fazer import TarefaAFazer
+
+    app = Flask('dados_sinteticos')
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    db.init_app(app)
+
+    def data(valor):
+        return datetime.date.fromisoformat(valor) if valor else None
+
+    linhas = {
+        Funcionario: [
+            {'id': f['id'], 'nome': f['nome'], 'horario_inicio': f['horarioInicio'], 'horario_fim': f['horarioFim'],
+             'cor': f['cor']}
+            for f in workspace['funcionarios']
+        ],
+        Tarefa: [
+            {'id': t['id'], 'nome': t['nome'], 'categoria': t['categoria'], 'tempo_estimado': t['tempoEstimado'],
+             'descricao': t['descricao'], 'prioridade': t['prioridade'],
+             'computar_horas': t.get('computar_horas', True)}
+            for t in workspace['tarefas']
+        ],
+        Agenda: [
+            {'horario': a['horario'], 'funcionario_id': a['funcionario'], 'tarefa_id': a['tarefa'],
+             'duracao': a['duracao'], 'data': data(a.get('data')), 'recorrencia': a.get('recorrencia')}
+            for a in workspace['agenda']
+        ],
+        Processo: [
+            {'tarefa_id': tarefa_id, 'titulo': p['titulo'], 'descricao': p['descricao'],
+             'tempo_estimado': p['tempoEstimado'], 'frequencia': p['frequencia'], 'passos': p['passos'],
+             'observacoes': p['observacoes']}
+            for tarefa_id, p in workspace['processos'].items()
+        ],
+        Demanda: [{**d, 'prazo': data(d['prazo'])} for d in workspace['demandas']],
+        TarefaAFazer: [{**t, 'prazo': data(t['prazo'])} for t in workspace['tarefas_a_fazer']],
+    }
+
+    with app.app_context():
+        _importar_modelos()
+        db.create_all()
+        if Funcionario.query.count():
+            raise RuntimeError(f'{database_url} já tem dados; use um banco vazio')
+        for modelo, registros in linhas.items():
+            if registros:
+                db.session.execute(db.insert(modelo), registros)
+        db.session.commit()
+        migrar()
+        contagens = {modelo.__tablename__: modelo.query.count() for modelo in linhas}
+        db.session.remove()
+        db.engine.dispose()
+    return contagens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--funcionarios', type=int, default=50)
+    parser.add_argument('--tarefas', type=int, default=200)
+    parser.add_argument('--dias', type=int, default=60, help='dias úteis de agenda datada (terminando hoje)')
+    parser.add_argument('--demandas', type=int, default=500)
+    parser.add_argument('--tarefas-a-fazer', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='pasta onde gravar agenda.json e processos.json')
+    parser.add_argument('--banco', help='URL do banco a criar e popular (ex.: sqlite:////tmp/ws/app.db)')
+    args = parser.parse_args()
+    if not args.json and not args.banco:
+        parser.error('informe --json e/ou --banco')
+
+    workspace = gerar_workspace(args.funcionarios, args.tarefas, args.dias, args.demandas, args.tarefas_a_fazer,
+                                args.seed)
+    print(f"{len(workspace['funcionarios'])} funcionários, {len(workspace['tarefas'])} tarefas, "
+          f"{len(workspace['agenda'])} agendamentos, {len(workspace['processos'])} processos, "
+          f"{len(workspace['demandas'])} demandas, {len(workspace['tarefas_a_fazer'])} tarefas a fazer")
+    if args.json:
+        for caminho in gravar_json(workspace, args.json).values():
+            print(f'  {caminho}')
+    if args.banco:
+        print(f'  {args.banco}: {popular_banco(workspace, args.banco)}')
+
+
+if __name__ == '__main__':
+    main()
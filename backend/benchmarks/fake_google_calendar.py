@@ -0,0 +1,506 @@
+"""
+Servidor HTTP local que imita a Google Calendar API v3
+
+Implementa o subconjunto usado pelo GoogleCalendarService:
+- calendarList.list
+- events.list (timeMin/timeMax, orderBy, paginação por pageToken e syncToken)
+- events.get / insert / update / patch / delete
+- requisições em lote (multipart/mixed em /batch/calendar/v3)
+- events.watch / channels.stop, enviando notificações push (cabeçalhos
+  X-Goog-*) para o endereço do canal sempre que um evento muda
+
+Também permite injetar latência, limite de requisições por segundo e erros
+aleatórios, e conta as chamadas recebidas por método.
+
+Uso:
+    with FakeCalendarServer(latency=0.005) as server:
+        service = server.build_service()
+        calendar = GoogleCalendarService()
+        calendar.service = service
+        ...
+        print(server.stats())
+"""
+
+import datetime
+import email.parser
+import email.policy
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import urllib.request
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+SERVICE_PREFIX = '/calendar/v3/'
+BATCH_PATH = '/batch/calendar/v3'
+DEFAULT_PAGE_SIZE = 250
+MAX_PAGE_SIZE = 2500
+
+_EVENT_PATH = re.compile(r'^calendars/(?P<calendar>[^/]+)/events(?:/(?P<event>[^/]+))?$')
+
+
+class FakeCalendarError(Exception):
+    """Erro no formato retornado pela API do Google"""
+
+    def __init__(self, status: int, reason: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+        self.message = message
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'error': {
+                'code': self.status,
+                'message': self.message,
+                'errors': [{'domain': 'global', 'reason': self.reason, 'message': self.message}]
+            }
+        }
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Converte dateTime/date ISO em datetime com fuso (sem fuso = UTC)"""
+    if not value:
+        return None
+    parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def _event_start(event: Dict[str, Any]) -> Optional[datetime.datetime]:
+    start = event.get('start') or {}
+    return _parse_time(start.get('dateTime') or start.get('date'))
+
+
+class FakeCalendarStore:
+    """Armazenamento em memória dos calendários e eventos"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calendars: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._sequence = itertools.count(1)
+        self.last_sequence = 0
+        self.listeners = []
+
+    def _calendar(self, calendar_id: str) -> Dict[str, Dict[str, Any]]:
+        return self._calendars.setdefault(calendar_id, {})
+
+    def _touch(self, event: Dict[str, Any]):
+        self.last_sequence = next(self._sequence)
+        event['_seq'] = self.last_sequence
+        event['updated'] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        event['etag'] = f'"{self.last_sequence}"'
+
+    def _changed(self, calendar_id: str):
+        for listener in self.listeners:
+            listener(calendar_id)
+
+    @staticmethod
+    def _public(event: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in event.items() if not key.startswith('_')}
+
+    def calendar_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._calendars) or ['primary']
+
+    def insert(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            event = dict(body)
+            event['id'] = body.get('id') or uuid.uuid4().hex
+            event['status'] = 'confirmed'
+            event['created'] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            self._touch(event)
+            self._calendar(calendar_id)[event['id']] = event
+            result = self._public(event)
+        self._changed(calendar_id)
+        return result
+
+    def get(self, calendar_id: str, event_id: str) -> Dict[str, Any]:
+        with self._lock:
+            event = self._calendar(calendar_id).get(event_id)
+            if not event or event['status'] == 'cancelled':
+                raise FakeCalendarError(404, 'notFound', 'Not Found')
+            return self._public(event)
+
+    def update(self, calendar_id: str, event_id: str, body: Dict[str, Any],
+               partial: bool) -> Dict[str, Any]:
+        with self._lock:
+            event = self._calendar(calendar_id).get(event_id)
+            if not event or event['status'] == 'cancelled':
+                raise FakeCalendarError(404, 'notFound', 'Not Found')
+            if not partial:
+                preserved = {key: event[key] for key in ('id', 'created', 'status', '_seq')}
+                event.clear()
+                event.update(preserved)
+            event.update({key: value for key, value in body.items() if key not in ('id', 'etag')})
+            self._touch(event)
+            result = self._public(event)
+        self._changed(calendar_id)
+        return result
+
+    def delete(self, calendar_id: str, event_id: str):
+        with self._lock:
+            event = self._calendar(calendar_id).get(event_id)
+            if not event or event['status'] == 'cancelled':
+                raise FakeCalendarError(410, 'deleted', 'Resource has been deleted')
+            # Como na API real, o evento vira "cancelled" e aparece em listagens incrementais
+            event['status'] = 'cancelled'
+            self._touch(event)
+        self._changed(calendar_id)
+
+    def list(self, calendar_id: str, params: Dict[str, str]) -> Dict[str, Any]:
+        page_size = min(int(params.get('maxResults', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        offset = int(params.get('pageToken') or 0)
+
+        with self._lock:
+            events = list(self._calendar(calendar_id).values())
+            sync_token = params.get('syncToken')
+
+            if sync_token:
+                try:
+                    since = int(sync_token)
+                except ValueError:
+                    raise FakeCalendarError(410, 'fullSyncRequired', 'Sync token is no longer valid')
+                selected = sorted((e for e in events if e['_seq'] > since), key=lambda e: e['_seq'])
+            else:
+                show_deleted = params.get('showDeleted') == 'true'
+                time_min = _parse_time(params.get('timeMin'))
+                time_max = _parse_time(params.get('timeMax'))
+                selected = []
+                for event in events:
+                    if event['status'] == 'cancelled' and not show_deleted:
+                        continue
+                    start = _event_start(event)
+                    if time_min and start and start < time_min:
+                        continue
+                    if time_max and start and start >= time_max:
+                        continue
+                    selected.append(event)
+                if params.get('orderBy') == 'startTime':
+                    selected.sort(key=lambda e: _event_start(e) or datetime.datetime.min.replace(
+                        tzinfo=datetime.timezone.utc))
+                else:
+                    selected.sort(key=lambda e: e['_seq'])
+
+            page = selected[offset:offset + page_size]
+            result = {
+                'kind': 'calendar#events',
+                'summary': calendar_id,
+                'items': [self._public(event) for event in page]
+            }
+            if offset + page_size < len(selected):
+                result['nextPageToken'] = str(offset + page_size)
+            else:
+                result['nextSyncToken'] = str(self.last_sequence)
+            return result
+
+
+class FakeCalendarServer:
+    """
+    Servidor HTTP em thread própria que responde como a Calendar API v3
+
+    Args:
+        latency: Atraso artificial (segundos) aplicado a cada requisição
+        rate_limit: Máximo de requisições por segundo (None = sem limite);
+            acima disso responde 403 rateLimitExceeded, como a API real
+        error_rate: Probabilidade (0-1) de responder 503 backendError
+        seed: Semente do gerador usado na injeção de erros
+    """
+
+    def __init__(self, latency: float = 0.0, rate_limit: Optional[float] = None,
+                 error_rate: float = 0.0, seed: int = 0, host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.store = FakeCalendarStore()
+        self._random = random.Random(seed)
+        self._counter_lock = threading.Lock()
+        self._calls: Counter = Counter()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._channels: Dict[str, Dict[str, Any]] = {}
+        self._message_numbers = itertools.count(1)
+        self.store.listeners.append(self.notify)
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    # Ciclo de vida
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def api_endpoint(self) -> str:
+        return self.base_url + SERVICE_PREFIX
+
+    @property
+    def batch_uri(self) -> str:
+        return self.base_url + BATCH_PATH
+
+    def start(self) -> 'FakeCalendarServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'FakeCalendarServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def build_service(self):
+        """Cria um cliente googleapiclient apontando para este servidor (sem OAuth)"""
+        import httplib2
+        from googleapiclient.discovery import build
+
+        return build('calendar', 'v3', http=httplib2.Http(), static_discovery=True,
+                     client_options={'api_endpoint': self.api_endpoint})
+
+    def new_batch_request(self, callback=None):
+        """Cria um BatchHttpRequest que envia o lote para este servidor"""
+        from googleapiclient.http import BatchHttpRequest
+
+        return BatchHttpRequest(callback=callback, batch_uri=self.batch_uri)
+
+    # Estatísticas
+
+    def stats(self) -> Dict[str, int]:
+        """Contagem de chamadas recebidas por método (e total)"""
+        with self._counter_lock:
+            stats = dict(self._calls)
+        stats['total'] = sum(count for name, count in stats.items() if name not in ('batch', 'notifications'))
+        return stats
+
+    def reset_stats(self):
+        with self._counter_lock:
+            self._calls.clear()
+
+    def _count(self, method: str):
+        with self._counter_lock:
+            self._calls[method] += 1
+
+    # Notificações push
+
+    def channels(self) -> List[Dict[str, Any]]:
+        """Canais de watch ativos"""
+        with self._counter_lock:
+            return [dict(channel) for channel in self._channels.values()]
+
+    def _watch(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        ttl = int((body.get('params') or {}).get('ttl') or 604800)
+        channel = {
+            'kind': 'api#channel',
+            'id': body['id'],
+            'resourceId': uuid.uuid4().hex,
+            'resourceUri': f'{self.api_endpoint}calendars/{calendar_id}/events',
+            'token': body.get('token'),
+            'address': body['address'],
+            'expiration': str(int((time.time() + ttl) * 1000)),
+            '_calendar': calendar_id
+        }
+        with self._counter_lock:
+            self._channels[channel['id']] = channel
+        self._post_notification(channel, 'sync')
+        return {key: value for key, value in channel.items() if not key.startswith('_')}
+
+    def _stop_channel(self, body: Dict[str, Any]):
+        with self._counter_lock:
+            channel = self._channels.get(body.get('id'))
+            if not channel or channel['resourceId'] != body.get('resourceId'):
+                raise FakeCalendarError(404, 'notFound', 'Channel not found')
+            del self._channels[body['id']]
+
+    def notify(self, calendar_id: str, state: str = 'exists'):
+        """Envia uma notificação a todos os canais do calendário (como o Google faz)"""
+        for channel in self.channels():
+            if channel['_calendar'] == calendar_id:
+                self._post_notification(channel, state)
+
+    def _post_notification(self, channel: Dict[str, Any], state: str):
+        headers = {
+            'X-Goog-Channel-ID': channel['id'],
+            'X-Goog-Channel-Expiration': channel['expiration'],
+            'X-Goog-Message-Number': str(next(self._message_numbers)),
+            'X-Goog-Resource-ID': channel['resourceId'],
+            'X-Goog-Resource-State': state,
+            'X-Goog-Resource-URI': channel['resourceUri']
+        }
+        if channel.get('token'):
+            headers['X-Goog-Channel-Token'] = channel['token']
+
+        def send():
+            request = urllib.request.Request(channel['address'], data=b'', headers=headers, method='POST')
+            try:
+                urllib.request.urlopen(request, timeout=5).close()
+            except Exception:
+                # O Google também ignora falhas de entrega (sem novas tentativas)
+                pass
+
+        self._count('notifications')
+        threading.Thread(target=send, daemon=True).start()
+
+    # Injeção de falhas
+
+    def _check_faults(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._counter_lock:
+            if self.rate_limit:
+                now = time.monotonic()
+                if now - self._window_start >= 1.0:
+                    self._window_start = now
+                    self._window_count = 0
+                self._window_count += 1
+                if self._window_count > self.rate_limit:
+                    raise FakeCalendarError(403, 'rateLimitExceeded', 'Rate Limit Exceeded')
+            failed = self.error_rate and self._random.random() < self.error_rate
+
+        if failed:
+            raise FakeCalendarError(503, 'backendError', 'Backend Error')
+
+    # Roteamento
+
+    def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Executa uma chamada da API e retorna (status, corpo JSON)"""
+        parts = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        path = parts.path
+        payload = json.loads(body) if body else {}
+
+        try:
+            if not path.startswith(SERVICE_PREFIX):
+                raise FakeCalendarError(404, 'notFound', f'Unknown path {path}')
+            path = path[len(SERVICE_PREFIX):]
+
+            if path == 'users/me/calendarList' and method == 'GET':
+                self._count('calendarList.list')
+                self._check_faults()
+                items = [{'id': calendar_id, 'summary': calendar_id, 'primary': calendar_id == 'primary',
+                          'accessRole': 'owner'} for calendar_id in self.store.calendar_ids()]
+                return 200, {'kind': 'calendar#calendarList', 'items': items}
+
+            if path == 'channels/stop' and method == 'POST':
+                self._count('channels.stop')
+                self._check_faults()
+                self._stop_channel(payload)
+                return 204, None
+
+            match = _EVENT_PATH.match(path)
+            if not match:
+                raise FakeCalendarError(404, 'notFound', f'Unknown path {path}')
+
+            calendar_id = unquote(match.group('calendar'))
+            event_id = match.group('event') and unquote(match.group('event'))
+
+            if event_id is None and method == 'GET':
+                self._count('events.list')
+                self._check_faults()
+                return 200, self.store.list(calendar_id, params)
+            if event_id is None and method == 'POST':
+                self._count('events.insert')
+                self._check_faults()
+                return 200, self.store.insert(calendar_id, payload)
+            if event_id == 'watch' and method == 'POST':
+                self._count('events.watch')
+                self._check_faults()
+                return 200, self._watch(calendar_id, payload)
+            if event_id and method == 'GET':
+                self._count('events.get')
+                self._check_faults()
+                return 200, self.store.get(calendar_id, event_id)
+            if event_id and method in ('PUT', 'PATCH'):
+                self._count('events.update' if method == 'PUT' else 'events.patch')
+                self._check_faults()
+                return 200, self.store.update(calendar_id, event_id, payload, partial=method == 'PATCH')
+            if event_id and method == 'DELETE':
+                self._count('events.delete')
+                self._check_faults()
+                self.store.delete(calendar_id, event_id)
+                return 204, None
+
+            raise FakeCalendarError(405, 'methodNotAllowed', f'{method} not allowed')
+
+        except FakeCalendarError as e:
+            return e.status, e.to_dict()
+
+    def dispatch_batch(self, content_type: str, body: bytes) -> Tuple[str, bytes]:
+        """Processa um lote multipart/mixed e retorna (content-type, corpo)"""
+        self._count('batch')
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + body
+        )
+
+        boundary = uuid.uuid4().hex
+        chunks = []
+        for part in message.iter_parts():
+            request_line, _, rest = part.get_payload(decode=True).partition(b'\n')
+            inner_method, inner_target, _ = request_line.decode('utf-8').strip().split(' ', 2)
+            _, _, inner_body = rest.replace(b'\r\n', b'\n').partition(b'\n\n')
+
+            status, result = self.dispatch(inner_method, inner_target, inner_body.strip())
+            response_body = json.dumps(result) if result is not None else ''
+            content_id = (part.get('Content-ID') or '').strip('<>')
+            chunks.append(
+                f'--{boundary}\r\n'
+                f'Content-Type: application/http\r\n'
+                f'Content-ID: <response-{content_id}>\r\n\r\n'
+                f'HTTP/1.1 {status} OK\r\n'
+                f'Content-Type: application/json; charset=UTF-8\r\n'
+                f'Content-Length: {len(response_body.encode("utf-8"))}\r\n\r\n'
+                f'{response_body}\r\n'
+            )
+        chunks.append(f'--{boundary}--\r\n')
+        return f'multipart/mixed; boundary={boundary}', ''.join(chunks).encode('utf-8')
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _read_body(self) -> bytes:
+                length = int(self.headers.get('Content-Length') or 0)
+                return self.rfile.read(length) if length else b''
+
+            def _send(self, status: int, content_type: str, body: bytes):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _handle(self):
+                body = self._read_body()
+                if urlsplit(self.path).path == BATCH_PATH:
+                    content_type, response = server.dispatch_batch(self.headers.get('Content-Type', ''), body)
+                    self._send(200, content_type, response)
+                    return
+
+                status, result = server.dispatch(self.command, self.path, body)
+                response = json.dumps(result).encode('utf-8') if result is not None else b''
+                self._send(status, 'application/json; charset=UTF-8', response)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+        return Handler
@@ -0,0 +1,79 @@
+"""
+Configuração dos testes (python -m pytest, em backend/)
+
+O app é importado uma vez por sessão, com banco, canais, contas do Google e
+capturas numa pasta temporária: os testes não tocam em src/database/app.db.
+O controle de admissão fica desligado (o cliente de teste não fecha as
+respostas, e as vagas não seriam devolvidas).
+"""
+
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+PASTA_TESTES = tempfile.mkdtemp(prefix='workspace-testes-')
+
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(PASTA_TESTES, 'app.db')}")
+os.environ.setdefault('GOOGLE_CALENDAR_CHANNELS_FILE', os.path.join(PASTA_TESTES, 'watch_channels.json'))
+os.environ.setdefault('GOOGLE_CALENDAR_ACCOUNTS_DIR', os.path.join(PASTA_TESTES, 'calendar_accounts'))
+os.environ.setdefault('PROFILE_CAPTURES_DIR', os.path.join(PASTA_TESTES, 'profile_captures'))
+os.environ['ADMISSAO'] = '0'
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def app():
+    from src.main import app, garantir_banco
+    garantir_banco()
+    return app
+
+
+@pytest.fixture
+def cliente(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def novo_id():
+    """IDs únicos na sessão (o banco é o mesmo para todos os testes)"""
+    return lambda prefixo: f'{prefixo}-{uuid.uuid4().hex[:10]}'
+
+
+@pytest.fixture
+def funcionario(cliente, novo_id):
+    """Funcionário novo, criado pela rota de admin; retorna o id"""
+    funcionario_id = novo_id('func')
+    resposta = cliente.post('/api/admin/funcionarios', json={
+        'id': funcionario_id, 'nome': f'Funcionário {funcionario_id}',
+        'horarioInicio': '08:00', 'horarioFim': '17:00', 'cor': '#123456'
+    })
+    assert resposta.status_code == 201
+    return funcionario_id
+
+
+@pytest.fixture
+def tarefa(cliente, novo_id):
+    """Tarefa nova, criada pela rota de admin; retorna o id"""
+    tarefa_id = novo_id('tarefa')
+    resposta = cliente.post('/api/admin/tarefas', json={
+        'id': tarefa_id, 'nome': f'Tarefa {tarefa_id}', 'categoria': 'teste',
+        'tempoEstimado': 30, 'descricao': 'Criada pelos testes', 'prioridade': 'media'
+    })
+    assert resposta.status_code == 201
+    return tarefa_id
+
+
+@pytest.fixture
+def agendamento(cliente, funcionario, tarefa):
+    """Cria agendamentos do funcionário e da tarefa dos fixtures; retorna o id"""
+    def criar(**campos):
+        resposta = cliente.post('/api/admin/agenda', json={
+            'horario': '09:00', 'funcionario': funcionario, 'tarefa': tarefa, **campos
+        })
+        assert resposta.status_code == 201, resposta.get_json()
+        return resposta.get_json()['id']
+    return criar
@@ -2,10 +2,11 @@
 """
 API minimalista sem Flask complexo
 """
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify
 from flask_cors import CORS
 import json
 import os
+from src.services.agenda_compacta import AgendaCompacta
 
 app = Flask(__name__)
 CORS(app, origins="*")
@@ -27,6 +28,9 @@ AGENDA = [
     {"horario": "10:00", "funcionario": "pedro", "tarefa": "suporte"}
 ]
 
+# Agenda em colunas, com as respostas já codificadas
+AGENDA_COMPACTA = AgendaCompacta(AGENDA, FUNCIONARIOS, TAREFAS)
+
 @app.route('/')
 def home():
     return jsonify({
@@ -53,7 +57,11 @@ def tarefas():
 
 @app.route('/api/agenda')
 def agenda():
-    return jsonify(AGENDA)
+    return Response(AGENDA_COMPACTA.json_agenda, mimetype='application/json')
+
+@app.route('/api/agenda/funcionario/<funcionario_id>')
+def agenda_funcionario(funcionario_id):
+    return Response(AGENDA_COMPACTA.json_do_funcionario(funcionario_id), mimetype='application/json')
 
 @app.route('/api/funcionarios/<funcionario_id>')
 def funcionario_by_id(funcionario_id):
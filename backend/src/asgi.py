@@ -0,0 +1,463 @@
+"""
+Superfície ASGI de leitura
+As rotas de leitura mais usadas (funcionários, tarefas, agenda, agenda por
+funcionário, saúde e prontidão) e as de acompanhamento de mudanças
+(long-poll e SSE) rodam num event loop: uma conexão parada esperando
+mudança custa uma corrotina, não uma thread. Todo o resto cai no app WSGI
+(Flask), montado atrás pelo a2wsgi, então um único servidor atende as duas
+superfícies.
+
+As respostas têm o mesmo conteúdo das rotas do Flask, codificadas uma vez por
+versão dos dados e servidas da memória; leituras do banco rodam numa thread
+separada para não travar o loop.
+
+Uso (a partir de backend/):
+    uvicorn src.main:asgi --port 5000      # banco (SQLAlchemy)
+    uvicorn app_simple:asgi --port 5000    # dados estáticos de agenda.json
+
+A versão dos dados é por processo (veja src/services/versoes.py): rode esta
+superfície num processo só (é para isso que ela existe) ou com sessões
+fixas no balanceador; escritas feitas por outro processo só aparecem aqui
+no próximo commit deste processo.
+"""
+
+import abc
+import asyncio
+import json
+import os
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from src.servidor import prontidao
+from src.services.admissao import classificar, resposta_recusada
+from src.services.versoes import versoes_dados
+
+# Espera de um long-poll, em segundos (padrão e máximo)
+TIMEOUT_PADRAO = 25
+TIMEOUT_MAXIMO = 60
+
+# Intervalo entre comentários de keep-alive no SSE (segundos)
+INTERVALO_PING = 15
+
+_SAUDE = json.dumps({'status': 'healthy', 'message': 'API funcionando'}).encode()
+
+
+def _json(dados) -> bytes:
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+
+class FonteLeitura(abc.ABC):
+    """
+    Dados servidos pela superfície de leitura
+
+    `funcionarios`, `tarefas`, `agenda` e `prontidao` podem bloquear (rodam
+    fora do event loop); `versao` é chamada no loop e precisa ser imediata.
+    Mudanças nas `tabelas` acordam quem está esperando em /api/mudancas.
+    """
+
+    tabelas: Tuple[str, ...] = ()
+
+    def versao(self) -> Hashable:
+        return 0
+
+    @abc.abstractmethod
+    def funcionarios(self) -> List[Dict]:
+        ...
+
+    @abc.abstractmethod
+    def tarefas(self) -> List[Dict]:
+        ...
+
+    @abc.abstractmethod
+    def agenda(self) -> List[Dict]:
+        ...
+
+    def agenda_json(self) -> Tuple[bytes, Dict[str, bytes]]:
+        """Agenda codificada: (agenda inteira, {funcionário: agenda dele})"""
+        itens = self.agenda()
+        por_funcionario = defaultdict(list)
+        for item in itens:
+            por_funcionario[item.get('funcionario')].append(item)
+        return _json(itens), {funcionario: _json(lista) for funcionario, lista in por_funcionario.items()}
+
+    def prontidao(self) -> Dict:
+        return prontidao.estado()
+
+
+class FonteBanco(FonteLeitura):
+    """Lê pelos modelos do SQLAlchemy, no contexto do app Flask"""
+
+    tabelas = ('funcionarios', 'tarefas', 'agenda')
+
+    def __init__(self, app, preparar: Optional[Callable[[], None]] = None):
+        self.app = app
+        # Chamado antes de cada leitura (ex.: garantir que o banco foi inicializado)
+        self.preparar = preparar
+
+    def versao(self) -> Hashable:
+        return versoes_dados.versao(*self.tabelas)
+
+    def _listar(self, modelo) -> List[Dict]:
+        from src.database import db
+
+        if self.preparar:
+            self.preparar()
+        with self.app.app_context():
+            try:
+                return [item.to_dict() for item in modelo.query.all()]
+            finally:
+                db.session.remove()
+
+    def funcionarios(self):
+        from src.models.funcionario import Funcionario
+        return self._listar(Funcionario)
+
+    def tarefas(self):
+        from src.models.tarefa import Tarefa
+        return self._listar(Tarefa)
+
+    def agenda(self):
+        from src.models.agenda import Agenda
+        return self._listar(Agenda)
+
+
+class FonteEstatica(FonteLeitura):
+    """
+    Dados carregados uma vez (dicionário com funcionarios, tarefas e agenda)
+
+    Com `agenda` (src/services/agenda_compacta.AgendaCompacta), a agenda vem
+    dela, já codificada, e não de dados['agenda'].
+    """
+
+    def __init__(self, dados: Dict, agenda=None):
+        self.dados = dados
+        self.compacta = agenda
+
+    def funcionarios(self):
+        return self.dados.get('funcionarios', [])
+
+    def tarefas(self):
+        return self.dados.get('tarefas', [])
+
+    def agenda(self):
+        if self.compacta is not None:
+            return list(self.compacta)
+        return self.dados.get('agenda', [])
+
+    def agenda_json(self):
+        if self.compacta is not None:
+            return self.compacta.json_agenda, self.compacta.json_por_funcionario
+        return super().agenda_json()
+
+
+async def _aguardar_desconexao(receive):
+    while True:
+        mensagem = await receive()
+        if mensagem['type'] == 'http.disconnect':
+            return
+
+
+class AppLeitura:
+    """
+    App ASGI com as rotas de leitura; as demais vão para o app WSGI `wsgi`
+
+    Rotas:
+        GET /api/funcionarios, /api/tarefas, /api/agenda
+        GET /api/agenda/funcionario/<id>
+        GET /api/health, /health, /api/ready
+        GET /api/mudancas?desde=&timeout=   long-poll: responde quando a versão
+                                            muda ou o tempo acaba
+        GET /api/mudancas/stream            SSE: um evento `versao` a cada mudança
+
+    As listagens levam `ETag` com a versão e respondem 304 a `If-None-Match`;
+    com query string, vão para o app WSGI, que aplica os filtros.
+
+    Com `admissao` (veja src/services/admissao.py), as leituras daqui gastam
+    fichas dos mesmos baldes do app WSGI; como saem da memória sem ocupar
+    thread, não contam no limite de requisições simultâneas.
+    """
+
+    def __init__(self, fonte: FonteLeitura, wsgi=None, threads_wsgi: int = 10, admissao=None):
+        self.fonte = fonte
+        self.wsgi = wsgi
+        self.admissao = admissao
+        self.threads_wsgi = threads_wsgi
+        self.em_espera = 0
+        self._wsgi_asgi = None
+        self._cache: Dict[str, Tuple[Hashable, object]] = {}
+        self._travas: Dict[str, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._mudanca: Optional[asyncio.Event] = None
+        # Muda a cada início do processo, para um ETag antigo nunca casar com dados recarregados
+        self._boot = os.urandom(4).hex()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        self._iniciar()
+        if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD'):
+            rota = self._rota(scope['path'], scope.get('query_string', b''))
+            if rota:
+                handler, argumentos = rota
+                if self.admissao is not None and await self._limitado(scope, send):
+                    return
+                await handler(scope, receive, send, *argumentos)
+                return
+        await self._encaminhar(scope, receive, send)
+
+    # Ciclo de vida
+
+    async def _lifespan(self, receive, send):
+        while True:
+            mensagem = await receive()
+            if mensagem['type'] == 'lifespan.startup':
+                self._iniciar()
+                await send({'type': 'lifespan.startup.complete'})
+            elif mensagem['type'] == 'lifespan.shutdown':
+                versoes_dados.parar_de_ouvir(self._ouvinte)
+                self._loop = None
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _iniciar(self):
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._mudanca = asyncio.Event()
+        if self.fonte.tabelas:
+            versoes_dados.ouvir(self._ouvinte)
+
+    def _ouvinte(self, tabelas):
+        # Roda na thread que fez o commit; só agenda o aviso no loop
+        loop = self._loop
+        if loop is None or not set(tabelas) & set(self.fonte.tabelas):
+            return
+        try:
+            loop.call_soon_threadsafe(self._notificar)
+        except RuntimeError:
+            pass  # loop já encerrado
+
+    def _notificar(self):
+        evento, self._mudanca = self._mudanca, asyncio.Event()
+        evento.set()
+
+    def _token(self) -> str:
+        versao = self.fonte.versao()
+        partes = versao if isinstance(versao, tuple) else (versao,)
+        return '-'.join([self._boot, *map(str, partes)])
+
+    # Roteamento
+
+    def _rota(self, caminho: str, query: bytes = b''):
+        # Listagens com query string (filtros como /api/agenda?data=) ficam com o app WSGI
+        listagens = {
+            '/api/funcionarios': self._funcionarios,
+            '/api/tarefas': self._tarefas,
+            '/api/agenda': self._agenda,
+        }
+        if caminho in listagens:
+            return None if query else (listagens[caminho], ())
+        fixas = {
+            '/api/health': self._saude,
+            '/health': self._saude,
+            '/api/ready': self._pronto,
+            '/api/mudancas': self._long_poll,
+            '/api/mudancas/stream': self._stream,
+        }
+        if caminho in fixas:
+            return fixas[caminho], ()
+        prefixo = '/api/agenda/funcionario/'
+        if caminho.startswith(prefixo):
+            funcionario = caminho[len(prefixo):]
+            # O feed .ics continua no Flask
+            if funcionario and '/' not in funcionario and not funcionario.endswith('.ics') and not query:
+                return self._agenda_funcionario, (funcionario,)
+        return None
+
+    async def _encaminhar(self, scope, receive, send):
+        if scope['type'] == 'websocket':
+            await send({'type': 'websocket.close'})
+            return
+        if self.wsgi is None:
+            await self._responder(scope, send, 404, _json({'error': 'Rota não encontrada'}))
+            return
+        if self._wsgi_asgi is None:
+            from a2wsgi import WSGIMiddleware
+            self._wsgi_asgi = WSGIMiddleware(self.wsgi, workers=self.threads_wsgi)
+        await self._wsgi_asgi(scope, receive, send)
+
+    async def _limitado(self, scope, send) -> bool:
+        """Responde 429 se o cliente estourou o balde da classe da rota"""
+        classe = classificar(scope['method'], scope['path'])
+        if classe is None:
+            return False
+        cabecalhos = {nome.decode('latin-1'): valor.decode('latin-1') for nome, valor in scope['headers']}
+        cliente = self.admissao.cliente((scope.get('client') or (None,))[0],
+                                        lambda nome: cabecalhos.get(nome.lower()))
+        espera = self.admissao.limitar(classe, cliente)
+        if espera is None:
+            return False
+        _, recusa, corpo = resposta_recusada(429, espera)
+        await self._responder(scope, send, 429, corpo, [(b'retry-after', dict(recusa)['Retry-After'].encode())])
+        return True
+
+    # Respostas
+
+    async def _responder(self, scope, send, status: int, corpo: bytes = b'',
+                         cabecalhos: Optional[List[Tuple[bytes, bytes]]] = None):
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(corpo)).encode()),
+                (b'access-control-allow-origin', b'*'),
+                *(cabecalhos or [])
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else corpo})
+
+    async def _responder_versionado(self, scope, send, corpo: bytes, token: str):
+        etag = f'W/"{token}"'.encode()
+        for nome, valor in scope['headers']:
+            if nome == b'if-none-match' and etag in [v.strip() for v in valor.split(b',')]:
+                await self._responder(scope, send, 304, cabecalhos=[(b'etag', etag)])
+                return
+        await self._responder(scope, send, 200, corpo, [(b'etag', etag), (b'cache-control', b'no-cache')])
+
+    async def _recurso(self, nome: str, montar):
+        """Valor em cache para a versão atual; monta numa thread (uma vez por versão) se preciso"""
+        versao = self.fonte.versao()
+        em_cache = self._cache.get(nome)
+        if em_cache and em_cache[0] == versao:
+            return em_cache[1]
+        async with self._travas.setdefault(nome, asyncio.Lock()):
+            em_cache = self._cache.get(nome)
+            if em_cache and em_cache[0] == versao:
+                return em_cache[1]
+            # Se houver commit durante a leitura, o valor fica com a versão
+            # anterior e é refeito na próxima requisição
+            valor = await asyncio.to_thread(montar)
+            self._cache[nome] = (versao, valor)
+            return valor
+
+    async def _funcionarios(self, scope, receive, send):
+        token = self._token()
+        corpo = await self._recurso('funcionarios', lambda: _json(self.fonte.funcionarios()))
+        await self._responder_versionado(scope, send, corpo, token)
+
+    async def _tarefas(self, scope, receive, send):
+        token = self._token()
+        corpo = await self._recurso('tarefas', lambda: _json(self.fonte.tarefas()))
+        await self._responder_versionado(scope, send, corpo, token)
+
+    async def _agenda(self, scope, receive, send):
+        token = self._token()
+        corpo, _ = await self._recurso('agenda', self.fonte.agenda_json)
+        await self._responder_versionado(scope, send, corpo, token)
+
+    async def _agenda_funcionario(self, scope, receive, send, funcionario):
+        token = self._token()
+        _, por_funcionario = await self._recurso('agenda', self.fonte.agenda_json)
+        await self._responder_versionado(scope, send, por_funcionario.get(funcionario, b'[]'), token)
+
+    async def _saude(self, scope, receive, send):
+        await self._responder(scope, send, 200, _SAUDE)
+
+    async def _pronto(self, scope, receive, send):
+        estado = await asyncio.to_thread(self.fonte.prontidao)
+        await self._responder(scope, send, 200 if estado['status'] == 'ready' else 503, _json(estado))
+
+    # Acompanhamento de mudanças
+
+    async def _long_poll(self, scope, receive, send):
+        parametros = parse_qs(scope['query_string'].decode('latin-1'))
+        desde = parametros.get('desde', [None])[0]
+        try:
+            timeout = float(parametros.get('timeout', [TIMEOUT_PADRAO])[0])
+        except ValueError:
+            timeout = -1
+        if not 0 <= timeout <= TIMEOUT_MAXIMO:
+            await self._responder(scope, send, 400,
+                                  _json({'error': f'timeout deve estar entre 0 e {TIMEOUT_MAXIMO} segundos'}))
+            return
+
+        mudou = await self._esperar(desde, timeout, receive)
+        if mudou is None:
+            return  # cliente desconectou
+        await self._responder(scope, send, 200, _json({
+            'versao': self._token(), 'mudou': mudou, 'conexoes_em_espera': self.em_espera
+        }),
+                              [(b'cache-control', b'no-store')])
+
+    async def _esperar(self, desde: Optional[str], timeout: float, receive) -> Optional[bool]:
+        """True se a versão é outra, False se o tempo acabou, None se o cliente desconectou"""
+        if desde != self._token():
+            return True
+        loop = asyncio.get_running_loop()
+        limite = loop.time() + timeout
+        desconexao = asyncio.ensure_future(_aguardar_desconexao(receive))
+        self.em_espera += 1
+        try:
+            while True:
+                evento = self._mudanca
+                if desde != self._token():
+                    return True
+                restante = limite - loop.time()
+                if restante <= 0:
+                    return False
+                espera = asyncio.ensure_future(evento.wait())
+                prontos, _ = await asyncio.wait((espera, desconexao), timeout=restante,
+                                                return_when=asyncio.FIRST_COMPLETED)
+                espera.cancel()
+                if desconexao in prontos:
+                    return None
+        finally:
+            desconexao.cancel()
+            self.em_espera -= 1
+
+    async def _stream(self, scope, receive, send):
+        ultimo = None
+        for nome, valor in scope['headers']:
+            if nome == b'last-event-id':
+                ultimo = valor.decode('latin-1')
+
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-store'),
+                (b'x-accel-buffering', b'no'),
+                (b'access-control-allow-origin', b'*'),
+            ]
+        })
+        if scope['method'] == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        desconexao = asyncio.ensure_future(_aguardar_desconexao(receive))
+        self.em_espera += 1
+        try:
+            while True:
+                evento = self._mudanca
+                token = self._token()
+                if token != ultimo:
+                    mensagem = f"id: {token}\nevent: versao\ndata: {json.dumps({'versao': token})}\n\n"
+                    await send({'type': 'http.response.body', 'body': mensagem.encode(), 'more_body': True})
+                    ultimo = token
+                espera = asyncio.ensure_future(evento.wait())
+                prontos, _ = await asyncio.wait((espera, desconexao), timeout=INTERVALO_PING,
+                                                return_when=asyncio.FIRST_COMPLETED)
+                espera.cancel()
+                if desconexao in prontos:
+                    return
+                if not prontos:
+                    await send({'type': 'http.response.body', 'body': b': ping\n\n', 'more_body': True})
+        except OSError:
+            return  # conexão caiu no meio do envio
+        finally:
+            desconexao.cancel()
+            self.em_espera -= 1
@@ -1,4 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
 
+from src.services.metricas import ouvir_consultas
+from src.services.versoes import ouvir_commits
+
 # Instância única do SQLAlchemy
-db = SQLAlchemy()
\ No newline at end of file
+db = SQLAlchemy()
+
+# Versões por tabela e contagem de consultas valem para toda sessão do ORM
+ouvir_commits()
+ouvir_consultas()
@@ -0,0 +1,299 @@
+"""
+Migrações do banco
+Na inicialização, uma única consulta compara as versões gravadas em
+`versao_banco` com as esperadas pelo código: a impressão do schema (tabelas,
+colunas e índices dos modelos, mais as colunas adicionadas depois) e a
+versão dos dados iniciais. Se estiver tudo em dia, nenhum DDL roda.
+
+Quando algo mudou, só um processo migra: os outros esperam numa trava
+(arquivo ao lado do banco no SQLite, advisory lock no Postgres) e, ao
+conseguirem a trava, releem as versões e encontram o banco já migrado.
+
+Linha de comando (a partir de backend/):
+    flask --app src.main banco status
+    flask --app src.main banco migrar [--forcar]
+"""
+
+import contextlib
+import functools
+import hashlib
+import importlib
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import exc, inspect, text
+
+from src.database import db
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Todos os modelos entram na impressão do schema
+MODELOS = (
+    'user', 'funcionario', 'tarefa', 'agenda', 'agenda_excecao', 'demanda', 'tarefa_a_fazer',
+    'processo', 'versao_banco',
+)
+
+# Colunas que chegaram depois de as tabelas existirem em produção: (tabela, coluna, definição)
+COLUNAS_ADICIONADAS = [
+    ('agenda', 'duracao', 'INTEGER DEFAULT 30'),
+    ('agenda', 'recorrencia', 'VARCHAR(100)'),
+    ('tarefas', 'computar_horas', 'BOOLEAN NOT NULL DEFAULT TRUE'),
+    ('funcionarios', 'versao', 'INTEGER NOT NULL DEFAULT 1'),
+    ('tarefas', 'versao', 'INTEGER NOT NULL DEFAULT 1'),
+    ('agenda', 'versao', 'INTEGER NOT NULL DEFAULT 1'),
+    ('processos', 'versao', 'INTEGER NOT NULL DEFAULT 1'),
+]
+
+# Índices de tabelas que já existiam em produção (create_all não cria índices em
+# tabelas existentes): (nome, tabela, colunas)
+INDICES_ADICIONADOS = [
+    ('ix_demandas_funcionario_id', 'demandas', 'funcionario_id'),
+    ('ix_demandas_importancia', 'demandas', 'importancia'),
+    ('ix_demandas_status', 'demandas', 'status'),
+    ('ix_demandas_prazo', 'demandas', 'prazo'),
+    ('idx_demandas_funcionario_status_prazo', 'demandas', 'funcionario_id, status, prazo, id'),
+    ('idx_demandas_importancia_prazo', 'demandas', 'importancia, prazo, id'),
+    ('ix_tarefas_a_fazer_funcionario_responsavel_id', 'tarefas_a_fazer', 'funcionario_responsavel_id'),
+    ('ix_tarefas_a_fazer_importancia', 'tarefas_a_fazer', 'importancia'),
+    ('ix_tarefas_a_fazer_concluida', 'tarefas_a_fazer', 'concluida'),
+    ('ix_tarefas_a_fazer_prazo', 'tarefas_a_fazer', 'prazo'),
+    ('idx_tarefas_responsavel_concluida_prazo', 'tarefas_a_fazer', 'funcionario_responsavel_id, concluida, prazo, id'),
+    ('idx_tarefas_concluida_prazo', 'tarefas_a_fazer', 'concluida, prazo, id'),
+]
+
+# Suba quando os dados iniciais mudarem (só tabelas vazias são populadas)
+VERSAO_DADOS_INICIAIS = '1'
+
+# Chave do advisory lock no Postgres (qualquer bigint fixo, igual em todos os processos)
+CHAVE_TRAVA_POSTGRES = 7245117001
+
+_trava_local = threading.Lock()
+
+
+class BancoDesatualizado(RuntimeError):
+    """O banco precisa de migração e a migração automática está desligada"""
+
+
+def _importar_modelos():
+    for nome in MODELOS:
+        importlib.import_module(f'src.models.{nome}')
+
+
+@functools.lru_cache(maxsize=None)
+def impressao_schema() -> str:
+    """Hash das tabelas, colunas e índices dos modelos e das colunas adicionadas"""
+    _importar_modelos()
+    partes = []
+    for tabela in sorted(db.metadata.sorted_tables, key=lambda t: t.name):
+        partes.append(f'T {tabela.name}')
+        for coluna in tabela.columns:
+            partes.append(f'C {coluna.name} {coluna.type!r} {coluna.nullable} {coluna.primary_key}')
+        for indice in sorted(tabela.indexes, key=lambda i: i.name or ''):
+            partes.append(f"I {indice.name} {indice.unique} {','.join(c.name for c in indice.columns)}")
+    partes += [f'A {tabela}.{coluna} {definicao}' for tabela, coluna, definicao in COLUNAS_ADICIONADAS]
+    partes += [f'X {nome} {tabela}({colunas})' for nome, tabela, colunas in INDICES_ADICIONADOS]
+    return hashlib.sha256('\n'.join(partes).encode()).hexdigest()[:16]
+
+
+def versoes_esperadas() -> Dict[str, str]:
+    return {'schema': impressao_schema(), 'dados_iniciais': VERSAO_DADOS_INICIAIS}
+
+
+def versoes_aplicadas() -> Optional[Dict[str, str]]:
+    """Versões gravadas no banco (uma consulta); None se a tabela ainda não existe"""
+    try:
+        with db.engine.connect() as conn:
+            return dict(conn.execute(text('SELECT chave, valor FROM versao_banco')).all())
+    except (exc.OperationalError, exc.ProgrammingError):
+        return None
+
+
+def pendencias(aplicadas: Optional[Dict[str, str]]) -> List[str]:
+    aplicadas = aplicadas or {}
+    return [chave for chave, valor in versoes_esperadas().items() if aplicadas.get(chave) != valor]
+
+
+@contextlib.contextmanager
+def _trava_arquivo(caminho: str):
+    with open(caminho, 'a+b') as arquivo:
+        if fcntl:
+            fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    arquivo.seek(0)
+                    msvcrt.locking(arquivo.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
+            else:
+                arquivo.seek(0)
+                msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def trava_migracao(engine):
+    """Garante um único processo migrando por vez (e uma thread por processo)"""
+    with _trava_local:
+        if engine.dialect.name == 'postgresql':
+            with engine.connect() as conn:
+                conn.execute(text('SELECT pg_advisory_lock(:chave)'), {'chave': CHAVE_TRAVA_POSTGRES})
+                try:
+                    yield
+                finally:
+                    conn.execute(text('SELECT pg_advisory_unlock(:chave)'), {'chave': CHAVE_TRAVA_POSTGRES})
+                    conn.commit()
+        elif engine.dialect.name == 'sqlite' and engine.url.database not in (None, '', ':memory:'):
+            with _trava_arquivo(f'{engine.url.database}.migracao.lock'):
+                yield
+        else:
+            # Banco em memória (um processo só) ou outro banco sem trava conhecida
+            yield
+
+
+def _adicionar_colunas() -> List[str]:
+    inspetor = inspect(db.engine)
+    colunas = {}
+    adicionadas = []
+    with db.engine.begin() as conn:
+        for tabela, coluna, definicao in COLUNAS_ADICIONADAS:
+            if tabela not in colunas:
+                colunas[tabela] = {c['name'] for c in inspetor.get_columns(tabela)}
+            if coluna not in colunas[tabela]:
+                conn.execute(text(f'ALTER TABLE {tabela} ADD COLUMN {coluna} {definicao}'))
+                colunas[tabela].add(coluna)
+                adicionadas.append(f'{tabela}.{coluna}')
+    return adicionadas
+
+
+def _criar_indices() -> List[str]:
+    inspetor = inspect(db.engine)
+    existentes = {}
+    criados = []
+    with db.engine.begin() as conn:
+        for nome, tabela, colunas in INDICES_ADICIONADOS:
+            if tabela not in existentes:
+                existentes[tabela] = {i['name'] for i in inspetor.get_indexes(tabela)}
+            if nome not in existentes[tabela]:
+                conn.execute(text(f'CREATE INDEX IF NOT EXISTS {nome} ON {tabela} ({colunas})'))
+                criados.append(nome)
+    return criados
+
+
+def _popular() -> List[str]:
+    from src.models.funcionario import Funcionario
+    from src.models.processo import Processo
+
+    populadas = []
+    # Popula apenas tabelas vazias
+    if Funcionario.query.count() == 0:
+        from src.seed_data import seed_database
+        seed_database()
+        populadas.append('funcionarios, tarefas e agenda')
+    # Processos saíram de processos.json para uma tabela (um registro por tarefa)
+    if Processo.query.count() == 0:
+        from src.seed_data import seed_processos
+        seed_processos()
+        populadas.append('processos')
+    return populadas
+
+
+def _gravar_versao(chave: str, valor: str):
+    from src.models.versao_banco import VersaoBanco
+
+    registro = db.session.get(VersaoBanco, chave)
+    if registro is None:
+        db.session.add(VersaoBanco(chave=chave, valor=valor))
+    else:
+        registro.valor = valor
+    db.session.commit()
+
+
+def migrar(forcar: bool = False) -> Dict:
+    """
+    Aplica o que estiver pendente (no contexto do app), com a trava de migração
+
+    Args:
+        forcar: roda create_all, as colunas adicionadas e a população mesmo com as versões em dia
+    """
+    with trava_migracao(db.engine):
+        # Relido com a trava: outro processo pode ter acabado de migrar
+        pendentes = ['schema', 'dados_iniciais'] if forcar else pendencias(versoes_aplicadas())
+        esperadas = versoes_esperadas()
+        resumo = {'pendentes': pendentes, 'colunas_adicionadas': [], 'indices_criados': [], 'populadas': [],
+                  'versoes': esperadas}
+        if 'schema' in pendentes:
+            db.create_all()
+            resumo['colunas_adicionadas'] = _adicionar_colunas()
+            resumo['indices_criados'] = _criar_indices()
+            _gravar_versao('schema', esperadas['schema'])
+        if 'dados_iniciais' in pendentes:
+            resumo['populadas'] = _popular()
+            _gravar_versao('dados_iniciais', esperadas['dados_iniciais'])
+        if pendentes:
+            logger.info('Banco migrado: %s', resumo)
+        return resumo
+
+
+def preparar_banco(migrar_se_preciso: bool = True) -> Dict:
+    """
+    Checagem de inicialização (no contexto do app): uma consulta quando o banco está em dia
+
+    Raises:
+        BancoDesatualizado: há migração pendente e migrar_se_preciso é False
+    """
+    pendentes = pendencias(versoes_aplicadas())
+    if not pendentes:
+        return {'pendentes': []}
+    if not migrar_se_preciso:
+        raise BancoDesatualizado(
+            f"Banco desatualizado ({', '.join(pendentes)}): rode `flask --app src.main banco migrar`"
+        )
+    return migrar()
+
+
+def registrar_comandos(app):
+    """Adiciona `flask banco status` e `flask banco migrar` ao app"""
+    grupo = AppGroup('banco', help='Migrações e dados iniciais do banco')
+
+    @grupo.command('status')
+    def status():
+        """Mostra as versões gravadas e o que está pendente"""
+        aplicadas = versoes_aplicadas()
+        click.echo(f"Esperadas: {versoes_esperadas()}")
+        click.echo(f"Aplicadas: {aplicadas if aplicadas is not None else '(tabela versao_banco não existe)'}")
+        pendentes = pendencias(aplicadas)
+        click.echo(f"Pendentes: {', '.join(pendentes) if pendentes else 'nenhuma'}")
+
+    @grupo.command('migrar')
+    @click.option('--forcar', is_flag=True, help='Roda tudo mesmo com as versões em dia')
+    def migrar_comando(forcar):
+        """Aplica as migrações pendentes (com a trava de migração)"""
+        resumo = migrar(forcar=forcar)
+        if not resumo['pendentes']:
+            click.echo('Banco já está em dia')
+            return
+        click.echo(f"Aplicado: {', '.join(resumo['pendentes'])}")
+        if resumo['colunas_adicionadas']:
+            click.echo(f"Colunas adicionadas: {', '.join(resumo['colunas_adicionadas'])}")
+        if resumo['indices_criados']:
+            click.echo(f"Índices criados: {', '.join(resumo['indices_criados'])}")
+        if resumo['populadas']:
+            click.echo(f"Populadas: {', '.join(resumo['populadas'])}")
+
+    app.cli.add_command(grupo)
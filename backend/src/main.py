@@ -1,11 +1,19 @@
 import os
 import sys
+import threading
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from flask import Flask, send_from_directory
 from flask_cors import CORS
+from src.asgi import AppLeitura, FonteBanco
 from src.database import db
+from src.services.admissao import controlar_app
+from src.services.lote import registrar_lote
+from src.services.versoes import versoes_dados
+from src.services.metricas import instrumentar_app
+from src.services.perfilamento import perfilar_app
+from src.servidor import executar, prontidao, registrar_prontidao
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
@@ -15,6 +23,11 @@ database_url = os.getenv('DATABASE_URL', f"sqlite:///{os.path.join(os.path.dirna
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Canais de notificação do Google Calendar (src/services/calendar_push.py)
+app.config['GOOGLE_CALENDAR_CHANNELS_FILE'] = os.getenv(
+    'GOOGLE_CALENDAR_CHANNELS_FILE', os.path.join(os.path.dirname(__file__), 'database', 'watch_channels.json')
+)
+
 # Habilita CORS para toda a aplicação
 CORS(app)
 
@@ -26,28 +39,79 @@ from src.models.user import User
 from src.models.funcionario import Funcionario
 from src.models.tarefa import Tarefa
 from src.models.agenda import Agenda
+from src.models.agenda_excecao import AgendaExcecao
+from src.models.demanda import Demanda
+from src.models.tarefa_a_fazer import TarefaAFazer
+from src.models.processo import Processo
+from src.models.versao_banco import VersaoBanco
+from src.database.migracoes import preparar_banco, registrar_comandos
 
 # Importa e registra blueprints
 from src.routes.user import user_bp
 from src.routes.admin import admin_bp
 from src.routes.agenda import agenda_bp
+from src.routes.calendar import calendar_bp
+from src.routes.disponibilidade import disponibilidade_bp
+from src.routes.busca import busca_bp
+from src.routes.demandas import demandas_bp
+from src.routes.processos import processos_bp
+from src.routes.kpis import kpis_bp
+from src.routes.previsao import previsao_bp
+from src.routes.exportacao import exportacao_bp
 
 app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(admin_bp, url_prefix='/api/admin')
 app.register_blueprint(agenda_bp, url_prefix='/api')
+app.register_blueprint(calendar_bp, url_prefix='/api/calendar')
+app.register_blueprint(disponibilidade_bp, url_prefix='/api')
+app.register_blueprint(busca_bp, url_prefix='/api')
+app.register_blueprint(demandas_bp, url_prefix='/api')
+app.register_blueprint(processos_bp, url_prefix='/api')
+app.register_blueprint(kpis_bp, url_prefix='/api')
+app.register_blueprint(previsao_bp, url_prefix='/api')
+app.register_blueprint(exportacao_bp, url_prefix='/api')
+
+_banco_pronto = threading.Event()
+_trava_banco = threading.Lock()
+
+def garantir_banco():
+    """
+    Confere o banco uma vez por processo, na primeira requisição (não no import)
+
+    Com o banco em dia é uma única consulta; se houver migração pendente, só um
+    processo migra (veja src/database/migracoes.py). Com MIGRAR_NA_INICIALIZACAO=0
+    a migração fica só para `flask --app src.main banco migrar`.
+    """
+    if _banco_pronto.is_set():
+        return
+    with _trava_banco:
+        if not _banco_pronto.is_set():
+            with app.app_context():
+                preparar_banco(os.getenv('MIGRAR_NA_INICIALIZACAO', '1') != '0')
+            _banco_pronto.set()
+
+app.before_request(garantir_banco)
+registrar_comandos(app)
 
-# Cria tabelas e popula dados
-def init_database():
+def banco_responde():
     with app.app_context():
-        db.create_all()
-        
-        # Popula o banco apenas se estiver vazio
-        if Funcionario.query.count() == 0:
-            from src.seed_data import seed_database
-            seed_database()
+        db.session.execute(db.text('SELECT 1'))
+        db.session.remove()
+    return True
 
-# Inicializa o banco
-init_database()
+def descartar_conexoes():
+    """Depois do fork, cada processo abre as próprias conexões (sem fechar as do mestre)"""
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+prontidao.registrar('banco', banco_responde)
+registrar_prontidao(app)
+instrumentar_app(app)
+perfilar_app(app)
+admissao = controlar_app(app)
+# Itens do lote em paralelo, cada um com sua conexão (o SQLite em memória tem uma só)
+registrar_lote(app, versao=lambda: versoes_dados.versao(*sorted(db.metadata.tables)),
+               paralelo=':memory:' not in database_url and database_url != 'sqlite://')
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
@@ -65,6 +129,12 @@ def serve(path):
         else:
             return "index.html not found", 404
 
+# Rotas de leitura num event loop, com o resto do app atrás (uvicorn src.main:asgi)
+asgi = AppLeitura(FonteBanco(app, preparar=garantir_banco), wsgi=app, admissao=admissao)
+
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Produção: gunicorn; desenvolvimento: python src/main.py --dev --debug
+    # Com o app pré-carregado, o banco fica pronto no mestre antes do fork
+    garantir_banco()
+    executar(app, 5000, ao_fork=descartar_conexoes)
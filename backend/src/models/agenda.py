@@ -8,6 +8,14 @@ class Agenda(db.Model):
     funcionario_id = db.Column(db.String(50), db.ForeignKey('funcionarios.id'), nullable=False)
     tarefa_id = db.Column(db.String(50), db.ForeignKey('tarefas.id'), nullable=False)
     data = db.Column(db.Date, nullable=True)  # Para agendamentos específicos
+    duracao = db.Column(db.Integer, nullable=True, default=30)  # em minutos
+    recorrencia = db.Column(db.String(100), nullable=True)  # RRULE dos agendamentos sem data (padrão: dias úteis)
+    versao = db.Column(db.Integer, nullable=False, default=1)  # controle de concorrência otimista
+    
+    # Ocorrências alteradas ou canceladas dos agendamentos recorrentes
+    excecoes = db.relationship('AgendaExcecao', backref='agenda_obj', lazy=True, cascade='all, delete-orphan')
+    
+    __mapper_args__ = {'version_id_col': versao}
     
     def __repr__(self):
         return f'<Agenda {self.horario} - {self.funcionario_id}>'
@@ -18,5 +26,8 @@ class Agenda(db.Model):
             'horario': self.horario,
             'funcionario': self.funcionario_id,
             'tarefa': self.tarefa_id,
-            'data': self.data.isoformat() if self.data else None
+            'data': self.data.isoformat() if self.data else None,
+            'duracao': self.duracao or 30,
+            'recorrencia': self.recorrencia,
+            'versao': self.versao
         }
\ No newline at end of file
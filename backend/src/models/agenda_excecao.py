@@ -0,0 +1,29 @@
+from src.database import db
+
+class AgendaExcecao(db.Model):
+    """Alteração ou cancelamento de uma ocorrência de um agendamento recorrente"""
+    __tablename__ = 'agenda_excecoes'
+    __table_args__ = (db.UniqueConstraint('agenda_id', 'data'),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    agenda_id = db.Column(db.Integer, db.ForeignKey('agenda.id', ondelete='CASCADE'), nullable=False, index=True)
+    data = db.Column(db.Date, nullable=False, index=True)
+    cancelado = db.Column(db.Boolean, nullable=False, default=False)
+    # Campos sobrescritos na ocorrência (None mantém o valor do agendamento)
+    horario = db.Column(db.String(10), nullable=True)
+    tarefa_id = db.Column(db.String(50), db.ForeignKey('tarefas.id'), nullable=True)
+    duracao = db.Column(db.Integer, nullable=True)
+
+    def __repr__(self):
+        return f'<AgendaExcecao {self.agenda_id} {self.data}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'agenda': self.agenda_id,
+            'data': self.data.isoformat(),
+            'cancelado': bool(self.cancelado),
+            'horario': self.horario,
+            'tarefa': self.tarefa_id,
+            'duracao': self.duracao
+        }
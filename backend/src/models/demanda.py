@@ -0,0 +1,48 @@
+import datetime
+from src.database import db
+
+IMPORTANCIAS = ('alta', 'media', 'baixa')
+STATUS_DEMANDA = ('pendente', 'em_andamento', 'concluida')
+
+def agora_utc():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+class Demanda(db.Model):
+    __tablename__ = 'demandas'
+    __table_args__ = (
+        # Consultas mais comuns: demandas abertas de um responsável por prazo,
+        # e fila por importância/prazo
+        db.Index('idx_demandas_funcionario_status_prazo', 'funcionario_id', 'status', 'prazo', 'id'),
+        db.Index('idx_demandas_importancia_prazo', 'importancia', 'prazo', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    titulo = db.Column(db.Text, nullable=False)
+    descricao = db.Column(db.Text, nullable=False)
+    funcionario_id = db.Column(db.String(50), db.ForeignKey('funcionarios.id', ondelete='CASCADE'),
+                               nullable=False, index=True)
+    tarefa_id = db.Column(db.String(50), db.ForeignKey('tarefas.id', ondelete='SET NULL'), nullable=True)
+    importancia = db.Column(db.String(10), nullable=False, default='media', index=True)
+    status = db.Column(db.String(20), nullable=False, default='pendente', index=True)
+    prazo = db.Column(db.Date, nullable=False, index=True)
+    observacoes = db.Column(db.Text, nullable=True)
+    data_criacao = db.Column(db.DateTime, nullable=False, default=agora_utc)
+    updated_at = db.Column(db.DateTime, nullable=False, default=agora_utc, onupdate=agora_utc)
+
+    def __repr__(self):
+        return f'<Demanda {self.titulo}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'titulo': self.titulo,
+            'descricao': self.descricao,
+            'funcionario_id': self.funcionario_id,
+            'tarefa_id': self.tarefa_id,
+            'importancia': self.importancia,
+            'status': self.status,
+            'prazo': self.prazo.isoformat() if self.prazo else None,
+            'observacoes': self.observacoes,
+            'data_criacao': self.data_criacao.isoformat() if self.data_criacao else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
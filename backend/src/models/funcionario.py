@@ -8,10 +8,13 @@ class Funcionario(db.Model):
     horario_inicio = db.Column(db.String(10), nullable=True)
     horario_fim = db.Column(db.String(10), nullable=True)
     cor = db.Column(db.String(7), nullable=False)  # Hex color
+    versao = db.Column(db.Integer, nullable=False, default=1)  # controle de concorrência otimista
     
     # Relacionamento com agenda
     agendas = db.relationship('Agenda', backref='funcionario_obj', lazy=True)
     
+    __mapper_args__ = {'version_id_col': versao}
+    
     def __repr__(self):
         return f'<Funcionario {self.nome}>'
     
@@ -21,5 +24,6 @@ class Funcionario(db.Model):
             'nome': self.nome,
             'horarioInicio': self.horario_inicio,
             'horarioFim': self.horario_fim,
-            'cor': self.cor
+            'cor': self.cor,
+            'versao': self.versao
         }
\ No newline at end of file
@@ -0,0 +1,57 @@
+from src.database import db
+from src.models.demanda import agora_utc
+
+class Processo(db.Model):
+    """Passo a passo de uma tarefa, um registro por tarefa (tabela processos do Supabase)"""
+    __tablename__ = 'processos'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    tarefa_id = db.Column(db.String(50), db.ForeignKey('tarefas.id', ondelete='CASCADE'), nullable=False, unique=True)
+    titulo = db.Column(db.Text, nullable=False)
+    descricao = db.Column(db.Text, nullable=True)
+    tempo_estimado = db.Column(db.Text, nullable=True)
+    frequencia = db.Column(db.Text, nullable=True)
+    # Carregados só quando usados: o resumo dos processos não lê os passos
+    passos = db.deferred(db.Column(db.JSON, nullable=False, default=list))
+    observacoes = db.deferred(db.Column(db.JSON, nullable=True, default=list))
+    created_at = db.Column(db.DateTime, nullable=False, default=agora_utc)
+    updated_at = db.Column(db.DateTime, nullable=False, default=agora_utc, onupdate=agora_utc)
+    versao = db.Column(db.Integer, nullable=False, default=1)  # controle de concorrência otimista
+
+    __mapper_args__ = {'version_id_col': versao}
+
+    def __repr__(self):
+        return f'<Processo {self.tarefa_id}>'
+
+    def to_resumo(self):
+        """Campos do processo sem passos e observações"""
+        return {
+            'id': self.tarefa_id,
+            'titulo': self.titulo,
+            'descricao': self.descricao,
+            'tempoEstimado': self.tempo_estimado,
+            'frequencia': self.frequencia,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'versao': self.versao
+        }
+
+    def to_dict(self):
+        """Mesmo formato de cada processo em processos.json (a versão vai no cabeçalho ETag)"""
+        return {
+            'titulo': self.titulo,
+            'descricao': self.descricao,
+            'tempoEstimado': self.tempo_estimado,
+            'frequencia': self.frequencia,
+            'passos': self.passos or [],
+            'observacoes': self.observacoes or []
+        }
+
+    def atualizar(self, dados):
+        """Aplica um processo no formato de processos.json"""
+        self.titulo = dados.get('titulo')
+        self.descricao = dados.get('descricao')
+        self.tempo_estimado = dados.get('tempoEstimado')
+        self.frequencia = dados.get('frequencia')
+        # Listas novas para o SQLAlchemy perceber a mudança nas colunas JSON
+        self.passos = list(dados.get('passos') or [])
+        self.observacoes = list(dados.get('observacoes') or [])
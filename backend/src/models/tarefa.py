@@ -9,10 +9,14 @@ class Tarefa(db.Model):
     tempo_estimado = db.Column(db.Integer, nullable=False)  # em minutos
     descricao = db.Column(db.Text, nullable=True)
     prioridade = db.Column(db.String(20), nullable=False)
+    computar_horas = db.Column(db.Boolean, nullable=False, default=True)  # False em almoço, pausas, indisponibilidade
+    versao = db.Column(db.Integer, nullable=False, default=1)  # controle de concorrência otimista
     
     # Relacionamento com agenda
     agendas = db.relationship('Agenda', backref='tarefa_obj', lazy=True)
     
+    __mapper_args__ = {'version_id_col': versao}
+    
     def __repr__(self):
         return f'<Tarefa {self.nome}>'
     
@@ -23,5 +27,7 @@ class Tarefa(db.Model):
             'categoria': self.categoria,
             'tempoEstimado': self.tempo_estimado,
             'descricao': self.descricao,
-            'prioridade': self.prioridade
+            'prioridade': self.prioridade,
+            'computar_horas': self.computar_horas is not False,
+            'versao': self.versao
         }
\ No newline at end of file
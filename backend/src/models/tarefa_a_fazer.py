@@ -0,0 +1,45 @@
+from src.database import db
+from src.models.demanda import agora_utc
+
+class TarefaAFazer(db.Model):
+    """Tarefa delegada a um funcionário (diferente das tarefas do cronograma)"""
+    __tablename__ = 'tarefas_a_fazer'
+    __table_args__ = (
+        db.Index('idx_tarefas_responsavel_concluida_prazo', 'funcionario_responsavel_id', 'concluida', 'prazo', 'id'),
+        db.Index('idx_tarefas_concluida_prazo', 'concluida', 'prazo', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    titulo = db.Column(db.Text, nullable=False)
+    descricao = db.Column(db.Text, nullable=False)
+    funcionario_responsavel_id = db.Column(db.String(50), db.ForeignKey('funcionarios.id', ondelete='CASCADE'),
+                                           nullable=False, index=True)
+    importancia = db.Column(db.String(10), nullable=False, default='media', index=True)
+    concluida = db.Column(db.Boolean, nullable=False, default=False, index=True)
+    prazo = db.Column(db.Date, nullable=False, index=True)
+    data_conclusao = db.Column(db.DateTime, nullable=True)
+    telefone_whatsapp = db.Column(db.Text, nullable=True)
+    mensagem_whatsapp = db.Column(db.Text, nullable=True)
+    observacoes = db.Column(db.Text, nullable=True)
+    data_criacao = db.Column(db.DateTime, nullable=False, default=agora_utc)
+    updated_at = db.Column(db.DateTime, nullable=False, default=agora_utc, onupdate=agora_utc)
+
+    def __repr__(self):
+        return f'<TarefaAFazer {self.titulo}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'titulo': self.titulo,
+            'descricao': self.descricao,
+            'funcionario_responsavel_id': self.funcionario_responsavel_id,
+            'importancia': self.importancia,
+            'concluida': bool(self.concluida),
+            'prazo': self.prazo.isoformat() if self.prazo else None,
+            'data_conclusao': self.data_conclusao.isoformat() if self.data_conclusao else None,
+            'telefone_whatsapp': self.telefone_whatsapp,
+            'mensagem_whatsapp': self.mensagem_whatsapp,
+            'observacoes': self.observacoes,
+            'data_criacao': self.data_criacao.isoformat() if self.data_criacao else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
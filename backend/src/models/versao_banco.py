@@ -0,0 +1,20 @@
+from src.database import db
+from src.models.demanda import agora_utc
+
+class VersaoBanco(db.Model):
+    """Versões aplicadas ao banco: impressão do schema e versão dos dados iniciais (uma linha por chave)"""
+    __tablename__ = 'versao_banco'
+
+    chave = db.Column(db.String(30), primary_key=True)
+    valor = db.Column(db.String(64), nullable=False)
+    aplicado_em = db.Column(db.DateTime, nullable=False, default=agora_utc, onupdate=agora_utc)
+
+    def __repr__(self):
+        return f'<VersaoBanco {self.chave}={self.valor}>'
+
+    def to_dict(self):
+        return {
+            'chave': self.chave,
+            'valor': self.valor,
+            'aplicado_em': self.aplicado_em.isoformat() if self.aplicado_em else None
+        }
@@ -1,295 +1,425 @@
-import json
-import os
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, send_file
 from flask_cors import CORS
+from src.database import db
+from src.models.funcionario import Funcionario
+from src.models.tarefa import Tarefa
+from src.models.agenda import Agenda
+from src.models.processo import Processo
+from src.services.busca import busca_global, documento_funcionario, documento_processo, documento_tarefa
+from src.services.concorrencia import com_etag, precondicao_criacao, precondicao_falhou, salvar, salvar_novo
+from src.services.horarios import horario_para_minutos, parse_data
+from src.services.perfilamento import perfilador
+from src.services.processos import validar_processo
+from src.services.recorrencia import parse_regra
 
 admin_bp = Blueprint('admin', __name__)
 CORS(admin_bp)  # Habilita CORS para todas as rotas deste blueprint
 
-# Caminhos para os arquivos de dados
-DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-AGENDA_FILE = os.path.join(DATA_DIR, 'agenda.json')
-PROCESSOS_FILE = os.path.join(DATA_DIR, 'processos.json')
-
-def load_json_file(filepath):
-    """Carrega um arquivo JSON"""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-    except json.JSONDecodeError:
-        return {}
-
-def save_json_file(filepath, data):
-    """Salva dados em um arquivo JSON"""
-    try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        return True
-    except Exception as e:
-        print(f"Erro ao salvar arquivo {filepath}: {e}")
-        return False
+# Escritas aceitam If-Match com a versão lida (campo `versao` ou cabeçalho ETag);
+# se o registro mudou desde então, a resposta é 412 com a versão atual
+
+def _campos_obrigatorios(dados, campos):
+    """Mensagem de erro para o primeiro campo ausente, ou None"""
+    for field in campos:
+        if field not in dados:
+            return f'Campo obrigatório: {field}'
+    return None
+
+def _horario_e_duracao(dados):
+    """Mensagem de erro se `horario` ou `duracao` vierem fora do formato, ou None"""
+    if 'horario' in dados and (not isinstance(dados['horario'], str) or horario_para_minutos(dados['horario']) is None):
+        return 'horario deve estar no formato HH:MM (00:00 a 23:59)'
+    duracao = dados.get('duracao')
+    if duracao is not None and (isinstance(duracao, bool) or not isinstance(duracao, int) or not 0 < duracao <= 24 * 60):
+        return 'duracao deve ser um número de minutos entre 1 e 1440'
+    return None
+
+def _data_e_recorrencia(dados):
+    """
+    `data` e `recorrencia` do corpo de um agendamento, se vierem
+
+    Returns:
+        (mensagem de erro ou None, {campo: valor já convertido})
+    """
+    campos = {}
+    if 'data' in dados:
+        if dados['data'] in (None, ''):
+            campos['data'] = None
+        else:
+            campos['data'] = parse_data(dados['data']) if isinstance(dados['data'], str) else None
+            if campos['data'] is None:
+                return 'Data inválida (use AAAA-MM-DD)', {}
+    if 'recorrencia' in dados:
+        recorrencia = dados['recorrencia']
+        if recorrencia is not None and not isinstance(recorrencia, str):
+            return 'recorrencia deve ser texto', {}
+        try:
+            parse_regra(recorrencia)
+        except ValueError as e:
+            return str(e), {}
+        campos['recorrencia'] = recorrencia
+    return None, campos
+
+def _processo_dict(processo):
+    return {'id': processo.tarefa_id, **processo.to_dict()}
 
 # Rotas para Funcionários
 @admin_bp.route('/funcionarios', methods=['GET'])
 def get_funcionarios():
     """Retorna todos os funcionários"""
-    data = load_json_file(AGENDA_FILE)
-    return jsonify(data.get('funcionarios', []))
+    return jsonify([func.to_dict() for func in Funcionario.query.all()])
+
+@admin_bp.route('/funcionarios/<funcionario_id>', methods=['GET'])
+def get_funcionario(funcionario_id):
+    """Retorna um funcionário com seu ETag"""
+    funcionario = db.get_or_404(Funcionario, funcionario_id)
+    return com_etag(jsonify(funcionario.to_dict()), funcionario)
 
 @admin_bp.route('/funcionarios', methods=['POST'])
 def add_funcionario():
     """Adiciona um novo funcionário"""
     funcionario_data = request.json
-    
+
     # Validação básica
-    required_fields = ['id', 'nome', 'horarioInicio', 'horarioFim', 'cor']
-    for field in required_fields:
-        if field not in funcionario_data:
-            return jsonify({'error': f'Campo obrigatório: {field}'}), 400
-    
-    data = load_json_file(AGENDA_FILE)
-    
+    erro = _campos_obrigatorios(funcionario_data, ['id', 'nome', 'horarioInicio', 'horarioFim', 'cor'])
+    if erro:
+        return jsonify({'error': erro}), 400
+
     # Verifica se o ID já existe
-    for funcionario in data.get('funcionarios', []):
-        if funcionario['id'] == funcionario_data['id']:
-            return jsonify({'error': 'ID do funcionário já existe'}), 400
-    
-    # Adiciona o novo funcionário
-    if 'funcionarios' not in data:
-        data['funcionarios'] = []
-    data['funcionarios'].append(funcionario_data)
-    
-    if save_json_file(AGENDA_FILE, data):
-        return jsonify({'message': 'Funcionário adicionado com sucesso'}), 201
-    else:
-        return jsonify({'error': 'Erro ao salvar dados'}), 500
+    if db.session.get(Funcionario, funcionario_data['id']) is not None:
+        return jsonify({'error': 'ID do funcionário já existe'}), 400
+
+    funcionario = Funcionario(
+        id=funcionario_data['id'],
+        nome=funcionario_data['nome'],
+        horario_inicio=funcionario_data['horarioInicio'],
+        horario_fim=funcionario_data['horarioFim'],
+        cor=funcionario_data['cor']
+    )
+    db.session.add(funcionario)
+    db.session.commit()
+
+    busca_global.indexar('funcionario', documento_funcionario(funcionario.to_dict()))
+    return com_etag((jsonify({'message': 'Funcionário adicionado com sucesso'}), 201), funcionario)
 
 @admin_bp.route('/funcionarios/<funcionario_id>', methods=['PUT'])
 def update_funcionario(funcionario_id):
     """Atualiza um funcionário existente"""
     funcionario_data = request.json
-    data = load_json_file(AGENDA_FILE)
-    
-    # Encontra e atualiza o funcionário
-    for i, funcionario in enumerate(data.get('funcionarios', [])):
-        if funcionario['id'] == funcionario_id:
-            # Mantém o ID original
-            funcionario_data['id'] = funcionario_id
-            data['funcionarios'][i] = funcionario_data
-            
-            if save_json_file(AGENDA_FILE, data):
-                return jsonify({'message': 'Funcionário atualizado com sucesso'})
-            else:
-                return jsonify({'error': 'Erro ao salvar dados'}), 500
-    
-    return jsonify({'error': 'Funcionário não encontrado'}), 404
+    funcionario = db.get_or_404(Funcionario, funcionario_id)
+
+    falhou = precondicao_falhou(funcionario, Funcionario.to_dict)
+    if falhou:
+        return falhou
+
+    # Mantém o ID original
+    funcionario.nome = funcionario_data.get('nome', funcionario.nome)
+    funcionario.horario_inicio = funcionario_data.get('horarioInicio', funcionario.horario_inicio)
+    funcionario.horario_fim = funcionario_data.get('horarioFim', funcionario.horario_fim)
+    funcionario.cor = funcionario_data.get('cor', funcionario.cor)
+
+    falhou = salvar(funcionario, Funcionario.to_dict)
+    if falhou:
+        return falhou
+
+    busca_global.indexar('funcionario', documento_funcionario(funcionario.to_dict()))
+    return com_etag(jsonify({'message': 'Funcionário atualizado com sucesso'}), funcionario)
 
 @admin_bp.route('/funcionarios/<funcionario_id>', methods=['DELETE'])
 def delete_funcionario(funcionario_id):
     """Remove um funcionário"""
-    data = load_json_file(AGENDA_FILE)
-    
-    # Remove o funcionário
-    funcionarios = data.get('funcionarios', [])
-    funcionarios_filtrados = [f for f in funcionarios if f['id'] != funcionario_id]
-    
-    if len(funcionarios_filtrados) == len(funcionarios):
-        return jsonify({'error': 'Funcionário não encontrado'}), 404
-    
-    data['funcionarios'] = funcionarios_filtrados
-    
+    funcionario = db.get_or_404(Funcionario, funcionario_id)
+
+    falhou = precondicao_falhou(funcionario, Funcionario.to_dict)
+    if falhou:
+        return falhou
+
     # Remove também as tarefas agendadas para este funcionário
-    agenda = data.get('agenda', [])
-    data['agenda'] = [item for item in agenda if item['funcionario'] != funcionario_id]
-    
-    if save_json_file(AGENDA_FILE, data):
-        return jsonify({'message': 'Funcionário removido com sucesso'})
-    else:
-        return jsonify({'error': 'Erro ao salvar dados'}), 500
+    agendas = list(funcionario.agendas)
+    for item in agendas:
+        db.session.delete(item)
+    db.session.delete(funcionario)
+
+    falhou = salvar(funcionario, Funcionario.to_dict, agendas, Agenda.to_dict)
+    if falhou:
+        return falhou
+
+    busca_global.remover('funcionario', funcionario_id)
+    return jsonify({'message': 'Funcionário removido com sucesso'})
 
 # Rotas para Tarefas
 @admin_bp.route('/tarefas', methods=['GET'])
 def get_tarefas():
     """Retorna todas as tarefas"""
-    data = load_json_file(AGENDA_FILE)
-    return jsonify(data.get('tarefas', []))
+    return jsonify([tarefa.to_dict() for tarefa in Tarefa.query.all()])
+
+@admin_bp.route('/tarefas/<tarefa_id>', methods=['GET'])
+def get_tarefa(tarefa_id):
+    """Retorna uma tarefa com seu ETag"""
+    tarefa = db.get_or_404(Tarefa, tarefa_id)
+    return com_etag(jsonify(tarefa.to_dict()), tarefa)
 
 @admin_bp.route('/tarefas', methods=['POST'])
 def add_tarefa():
     """Adiciona uma nova tarefa"""
     tarefa_data = request.json
-    
+
     # Validação básica
-    required_fields = ['id', 'nome', 'categoria', 'tempoEstimado', 'descricao', 'prioridade']
-    for field in required_fields:
-        if field not in tarefa_data:
-            return jsonify({'error': f'Campo obrigatório: {field}'}), 400
-    
-    data = load_json_file(AGENDA_FILE)
-    
+    erro = _campos_obrigatorios(tarefa_data, ['id', 'nome', 'categoria', 'tempoEstimado', 'descricao', 'prioridade'])
+    if erro:
+        return jsonify({'error': erro}), 400
+
     # Verifica se o ID já existe
-    for tarefa in data.get('tarefas', []):
-        if tarefa['id'] == tarefa_data['id']:
-            return jsonify({'error': 'ID da tarefa já existe'}), 400
-    
-    # Adiciona a nova tarefa
-    if 'tarefas' not in data:
-        data['tarefas'] = []
-    data['tarefas'].append(tarefa_data)
-    
-    if save_json_file(AGENDA_FILE, data):
-        return jsonify({'message': 'Tarefa adicionada com sucesso'}), 201
-    else:
-        return jsonify({'error': 'Erro ao salvar dados'}), 500
+    if db.session.get(Tarefa, tarefa_data['id']) is not None:
+        return jsonify({'error': 'ID da tarefa já existe'}), 400
+
+    tarefa = Tarefa(
+        id=tarefa_data['id'],
+        nome=tarefa_data['nome'],
+        categoria=tarefa_data['categoria'],
+        tempo_estimado=tarefa_data['tempoEstimado'],
+        descricao=tarefa_data['descricao'],
+        prioridade=tarefa_data['prioridade'],
+        computar_horas=tarefa_data.get('computar_horas', True)
+    )
+    db.session.add(tarefa)
+    db.session.commit()
+
+    busca_global.indexar('tarefa', documento_tarefa(tarefa.to_dict()))
+    return com_etag((jsonify({'message': 'Tarefa adicionada com sucesso'}), 201), tarefa)
 
 @admin_bp.route('/tarefas/<tarefa_id>', methods=['PUT'])
 def update_tarefa(tarefa_id):
     """Atualiza uma tarefa existente"""
     tarefa_data = request.json
-    data = load_json_file(AGENDA_FILE)
-    
-    # Encontra e atualiza a tarefa
-    for i, tarefa in enumerate(data.get('tarefas', [])):
-        if tarefa['id'] == tarefa_id:
-            # Mantém o ID original
-            tarefa_data['id'] = tarefa_id
-            data['tarefas'][i] = tarefa_data
-            
-            if save_json_file(AGENDA_FILE, data):
-                return jsonify({'message': 'Tarefa atualizada com sucesso'})
-            else:
-                return jsonify({'error': 'Erro ao salvar dados'}), 500
-    
-    return jsonify({'error': 'Tarefa não encontrada'}), 404
+    tarefa = db.get_or_404(Tarefa, tarefa_id)
+
+    falhou = precondicao_falhou(tarefa, Tarefa.to_dict)
+    if falhou:
+        return falhou
+
+    # Mantém o ID original
+    tarefa.nome = tarefa_data.get('nome', tarefa.nome)
+    tarefa.categoria = tarefa_data.get('categoria', tarefa.categoria)
+    tarefa.tempo_estimado = tarefa_data.get('tempoEstimado', tarefa.tempo_estimado)
+    tarefa.descricao = tarefa_data.get('descricao', tarefa.descricao)
+    tarefa.prioridade = tarefa_data.get('prioridade', tarefa.prioridade)
+    tarefa.computar_horas = tarefa_data.get('computar_horas', tarefa.computar_horas)
+
+    falhou = salvar(tarefa, Tarefa.to_dict)
+    if falhou:
+        return falhou
+
+    busca_global.indexar('tarefa', documento_tarefa(tarefa.to_dict()))
+    return com_etag(jsonify({'message': 'Tarefa atualizada com sucesso'}), tarefa)
 
 @admin_bp.route('/tarefas/<tarefa_id>', methods=['DELETE'])
 def delete_tarefa(tarefa_id):
     """Remove uma tarefa"""
-    data = load_json_file(AGENDA_FILE)
-    
-    # Remove a tarefa
-    tarefas = data.get('tarefas', [])
-    tarefas_filtradas = [t for t in tarefas if t['id'] != tarefa_id]
-    
-    if len(tarefas_filtradas) == len(tarefas):
-        return jsonify({'error': 'Tarefa não encontrada'}), 404
-    
-    data['tarefas'] = tarefas_filtradas
-    
+    tarefa = db.get_or_404(Tarefa, tarefa_id)
+
+    falhou = precondicao_falhou(tarefa, Tarefa.to_dict)
+    if falhou:
+        return falhou
+
     # Remove também os agendamentos desta tarefa
-    agenda = data.get('agenda', [])
-    data['agenda'] = [item for item in agenda if item['tarefa'] != tarefa_id]
-    
-    if save_json_file(AGENDA_FILE, data):
-        return jsonify({'message': 'Tarefa removida com sucesso'})
-    else:
-        return jsonify({'error': 'Erro ao salvar dados'}), 500
+    agendas = list(tarefa.agendas)
+    for item in agendas:
+        db.session.delete(item)
+    db.session.delete(tarefa)
+
+    falhou = salvar(tarefa, Tarefa.to_dict, agendas, Agenda.to_dict)
+    if falhou:
+        return falhou
+
+    busca_global.remover('tarefa', tarefa_id)
+    return jsonify({'message': 'Tarefa removida com sucesso'})
 
 # Rotas para Agenda/Cronograma
 @admin_bp.route('/agenda', methods=['GET'])
 def get_agenda():
     """Retorna toda a agenda"""
-    data = load_json_file(AGENDA_FILE)
-    return jsonify(data.get('agenda', []))
+    return jsonify([item.to_dict() for item in Agenda.query.all()])
 
 @admin_bp.route('/agenda', methods=['POST'])
 def add_agendamento():
     """Adiciona um novo agendamento"""
     agendamento_data = request.json
-    
+
     # Validação básica
-    required_fields = ['horario', 'funcionario', 'tarefa']
-    for field in required_fields:
-        if field not in agendamento_data:
-            return jsonify({'error': f'Campo obrigatório: {field}'}), 400
-    
-    data = load_json_file(AGENDA_FILE)
-    
+    erro = _campos_obrigatorios(agendamento_data, ['horario', 'funcionario', 'tarefa'])
+    if erro:
+        return jsonify({'error': erro}), 400
+
     # Verifica se funcionário e tarefa existem
-    funcionario_existe = any(f['id'] == agendamento_data['funcionario'] for f in data.get('funcionarios', []))
-    tarefa_existe = any(t['id'] == agendamento_data['tarefa'] for t in data.get('tarefas', []))
-    
-    if not funcionario_existe:
+    if db.session.get(Funcionario, agendamento_data['funcionario']) is None:
         return jsonify({'error': 'Funcionário não encontrado'}), 400
-    if not tarefa_existe:
+    if db.session.get(Tarefa, agendamento_data['tarefa']) is None:
         return jsonify({'error': 'Tarefa não encontrada'}), 400
-    
-    # Adiciona o novo agendamento
-    if 'agenda' not in data:
-        data['agenda'] = []
-    data['agenda'].append(agendamento_data)
-    
-    if save_json_file(AGENDA_FILE, data):
-        return jsonify({'message': 'Agendamento adicionado com sucesso'}), 201
-    else:
-        return jsonify({'error': 'Erro ao salvar dados'}), 500
-
-@admin_bp.route('/agenda/<int:index>', methods=['DELETE'])
-def delete_agendamento(index):
-    """Remove um agendamento pelo índice"""
-    data = load_json_file(AGENDA_FILE)
-    agenda = data.get('agenda', [])
-    
-    if index < 0 or index >= len(agenda):
-        return jsonify({'error': 'Agendamento não encontrado'}), 404
-    
-    # Remove o agendamento
-    agenda.pop(index)
-    data['agenda'] = agenda
-    
-    if save_json_file(AGENDA_FILE, data):
-        return jsonify({'message': 'Agendamento removido com sucesso'})
-    else:
-        return jsonify({'error': 'Erro ao salvar dados'}), 500
+    erro = _horario_e_duracao(agendamento_data)
+    if erro:
+        return jsonify({'error': erro}), 400
+    erro, datas = _data_e_recorrencia(agendamento_data)
+    if erro:
+        return jsonify({'error': erro}), 400
+
+    agendamento = Agenda(
+        horario=agendamento_data['horario'],
+        funcionario_id=agendamento_data['funcionario'],
+        tarefa_id=agendamento_data['tarefa'],
+        duracao=agendamento_data.get('duracao', 30),
+        **datas
+    )
+    db.session.add(agendamento)
+    db.session.commit()
+
+    return com_etag((jsonify({'message': 'Agendamento adicionado com sucesso', 'id': agendamento.id}), 201),
+                    agendamento)
+
+@admin_bp.route('/agenda/<int:agenda_id>', methods=['PUT'])
+def update_agendamento(agenda_id):
+    """Atualiza um agendamento (horário, funcionário, tarefa, duração, data ou recorrência)"""
+    agendamento_data = request.json
+    agendamento = db.get_or_404(Agenda, agenda_id)
+
+    falhou = precondicao_falhou(agendamento, Agenda.to_dict)
+    if falhou:
+        return falhou
+
+    if 'funcionario' in agendamento_data and db.session.get(Funcionario, agendamento_data['funcionario']) is None:
+        return jsonify({'error': 'Funcionário não encontrado'}), 400
+    if 'tarefa' in agendamento_data and db.session.get(Tarefa, agendamento_data['tarefa']) is None:
+        return jsonify({'error': 'Tarefa não encontrada'}), 400
+    erro = _horario_e_duracao(agendamento_data)
+    if erro:
+        return jsonify({'error': erro}), 400
+    erro, datas = _data_e_recorrencia(agendamento_data)
+    if erro:
+        return jsonify({'error': erro}), 400
+
+    agendamento.horario = agendamento_data.get('horario', agendamento.horario)
+    agendamento.funcionario_id = agendamento_data.get('funcionario', agendamento.funcionario_id)
+    agendamento.tarefa_id = agendamento_data.get('tarefa', agendamento.tarefa_id)
+    agendamento.duracao = agendamento_data.get('duracao', agendamento.duracao)
+    for campo, valor in datas.items():
+        setattr(agendamento, campo, valor)
+
+    falhou = salvar(agendamento, Agenda.to_dict)
+    if falhou:
+        return falhou
+
+    return com_etag(jsonify({'message': 'Agendamento atualizado com sucesso'}), agendamento)
+
+@admin_bp.route('/agenda/<int:agenda_id>', methods=['DELETE'])
+def delete_agendamento(agenda_id):
+    """Remove um agendamento pelo id"""
+    agendamento = db.get_or_404(Agenda, agenda_id)
+
+    falhou = precondicao_falhou(agendamento, Agenda.to_dict)
+    if falhou:
+        return falhou
+
+    db.session.delete(agendamento)
+    falhou = salvar(agendamento, Agenda.to_dict)
+    if falhou:
+        return falhou
+
+    return jsonify({'message': 'Agendamento removido com sucesso'})
 
 # Rotas para Processos
 @admin_bp.route('/processos', methods=['GET'])
 def get_processos():
     """Retorna todos os processos"""
-    return jsonify(load_json_file(PROCESSOS_FILE))
+    return jsonify({processo.tarefa_id: processo.to_dict() for processo in Processo.query.all()})
 
 @admin_bp.route('/processos/<processo_id>', methods=['PUT'])
 def update_processo(processo_id):
-    """Atualiza um processo existente"""
+    """Cria ou substitui um processo (só o registro deste processo é gravado)"""
     processo_data = request.json
-    data = load_json_file(PROCESSOS_FILE)
-    
-    # Atualiza o processo
-    data[processo_id] = processo_data
-    
-    if save_json_file(PROCESSOS_FILE, data):
-        return jsonify({'message': 'Processo atualizado com sucesso'})
+    erro = validar_processo(processo_data)
+    if erro:
+        return jsonify({'error': erro}), 400
+
+    processo = Processo.query.filter_by(tarefa_id=processo_id).first()
+    if processo is None:
+        if db.session.get(Tarefa, processo_id) is None:
+            return jsonify({'error': 'Tarefa não encontrada'}), 404
+        falhou = precondicao_criacao()
+        if falhou:
+            return falhou
+        processo = Processo(tarefa_id=processo_id)
+        db.session.add(processo)
+        processo.atualizar(processo_data)
+        # Outra criação do mesmo processo pode ter entrado no meio: 412 com a versão dela
+        falhou = salvar_novo(processo, _processo_dict,
+                             lambda: Processo.query.filter_by(tarefa_id=processo_id).first())
     else:
-        return jsonify({'error': 'Erro ao salvar dados'}), 500
+        falhou = precondicao_falhou(processo, _processo_dict)
+        if falhou:
+            return falhou
+        processo.atualizar(processo_data)
+        falhou = salvar(processo, _processo_dict)
+    if falhou:
+        return falhou
+
+    busca_global.indexar('processo', documento_processo(processo_id, processo_data))
+    return com_etag(jsonify({'message': 'Processo atualizado com sucesso'}), processo)
 
 @admin_bp.route('/processos/<processo_id>', methods=['DELETE'])
 def delete_processo(processo_id):
     """Remove um processo"""
-    data = load_json_file(PROCESSOS_FILE)
-    
-    if processo_id not in data:
+    processo = Processo.query.filter_by(tarefa_id=processo_id).first()
+    if processo is None:
         return jsonify({'error': 'Processo não encontrado'}), 404
-    
-    del data[processo_id]
-    
-    if save_json_file(PROCESSOS_FILE, data):
-        return jsonify({'message': 'Processo removido com sucesso'})
-    else:
-        return jsonify({'error': 'Erro ao salvar dados'}), 500
+
+    falhou = precondicao_falhou(processo, _processo_dict)
+    if falhou:
+        return falhou
+
+    db.session.delete(processo)
+    falhou = salvar(processo, _processo_dict)
+    if falhou:
+        return falhou
+
+    busca_global.remover('processo', processo_id)
+    return jsonify({'message': 'Processo removido com sucesso'})
 
 # Rota para obter dados completos
 @admin_bp.route('/dados-completos', methods=['GET'])
 def get_dados_completos():
     """Retorna todos os dados da aplicação"""
-    agenda_data = load_json_file(AGENDA_FILE)
-    processos_data = load_json_file(PROCESSOS_FILE)
-    
     return jsonify({
-        'funcionarios': agenda_data.get('funcionarios', []),
-        'tarefas': agenda_data.get('tarefas', []),
-        'agenda': agenda_data.get('agenda', []),
-        'processos': processos_data
+        'funcionarios': [func.to_dict() for func in Funcionario.query.all()],
+        'tarefas': [tarefa.to_dict() for tarefa in Tarefa.query.all()],
+        'agenda': [item.to_dict() for item in Agenda.query.all()],
+        'processos': {processo.tarefa_id: processo.to_dict() for processo in Processo.query.all()}
     })
 
+# Capturas de perfilamento (veja src/services/perfilamento.py)
+def _capturas_autorizadas():
+    """Com PROFILE_TOKEN definido, exige `Authorization: Bearer <token>`"""
+    if not perfilador.token:
+        return True
+    autorizacao = request.headers.get('Authorization', '')
+    return autorizacao.startswith('Bearer ') and perfilador.token_confere(autorizacao[7:])
+
+@admin_bp.route('/capturas', methods=['GET'])
+def listar_capturas():
+    """Lista as capturas de perfil e de requisições lentas, da mais recente para a mais antiga"""
+    if not _capturas_autorizadas():
+        return jsonify({'error': 'Token de perfilamento inválido'}), 403
+    return jsonify(perfilador.listar())
+
+@admin_bp.route('/capturas/<captura_id>', methods=['GET'])
+def baixar_captura(captura_id):
+    """Baixa uma captura: JSON (padrão) ou, com ?formato=prof, o arquivo do cProfile"""
+    if not _capturas_autorizadas():
+        return jsonify({'error': 'Token de perfilamento inválido'}), 403
+    formato = request.args.get('formato', 'json')
+    caminho = perfilador.caminho(captura_id, formato)
+    if caminho is None:
+        return jsonify({'error': 'Captura não encontrada'}), 404
+    if formato == 'prof':
+        return send_file(caminho, mimetype='application/octet-stream', as_attachment=True,
+                         download_name=f'{captura_id}.prof')
+    return send_file(caminho, mimetype='application/json', download_name=f'{captura_id}.json')
@@ -1,11 +1,27 @@
-from flask import Blueprint, jsonify
+import datetime
+from itertools import islice
+from flask import Blueprint, Response, jsonify, request
 from src.database import db
 from src.models.funcionario import Funcionario
 from src.models.tarefa import Tarefa
 from src.models.agenda import Agenda
+from src.models.agenda_excecao import AgendaExcecao
+from src.services.ics_feed import ics_feed_renderer, http_date
+from src.services.gerador_agenda import (
+    MAX_DIAS, Atribuicao, GeradorAgenda, atribuicoes_do_cronograma, dias_uteis, fixos_do_cronograma,
+    validar_entrada
+)
+from src.services.horarios import data_do_parametro, horario_para_minutos, parse_data
+from src.services.metricas import metricas
+from src.services.recorrencia import cache_janelas, expandir, parse_regra
+from src.services.requisicao import corpo_objeto
+from src.services.versoes import versoes_dados
+from src.models.processo import Processo
 
 agenda_bp = Blueprint('agenda', __name__)
 
+metricas.registrar_cache('janelas_agenda', cache_janelas)
+
 @agenda_bp.route('/funcionarios', methods=['GET'])
 def get_funcionarios():
     """Retorna todos os funcionários"""
@@ -40,4 +56,251 @@ def get_funcionario(funcionario_id):
 def get_tarefa(tarefa_id):
     """Retorna uma tarefa específica"""
     tarefa = Tarefa.query.get_or_404(tarefa_id)
-    return jsonify(tarefa.to_dict())
\ No newline at end of file
+    return jsonify(tarefa.to_dict())
+
+def _linhas_feed(funcionario_id=None):
+    """Linhas usadas nos feeds ICS, com os campos de funcionário e tarefa e, por último, as exceções"""
+    query = db.session.query(
+        Agenda.id, Agenda.horario, Agenda.data, Agenda.duracao, Agenda.recorrencia,
+        Funcionario.id, Funcionario.nome,
+        Tarefa.id, Tarefa.nome, Tarefa.categoria, Tarefa.descricao
+    ).join(Funcionario, Agenda.funcionario_id == Funcionario.id
+    ).join(Tarefa, Agenda.tarefa_id == Tarefa.id)
+    excecoes = db.session.query(
+        AgendaExcecao.agenda_id, AgendaExcecao.data, AgendaExcecao.cancelado, AgendaExcecao.horario,
+        AgendaExcecao.duracao, AgendaExcecao.tarefa_id, Tarefa.nome, Tarefa.categoria, Tarefa.descricao
+    ).join(Agenda, AgendaExcecao.agenda_id == Agenda.id
+    ).outerjoin(Tarefa, AgendaExcecao.tarefa_id == Tarefa.id
+    ).filter(Agenda.data.is_(None))
+
+    if funcionario_id:
+        query = query.filter(Agenda.funcionario_id == funcionario_id)
+        excecoes = excecoes.filter(Agenda.funcionario_id == funcionario_id)
+
+    por_agenda = {}
+    for agenda_id, *excecao in excecoes.order_by(AgendaExcecao.agenda_id, AgendaExcecao.data):
+        excecao[1] = bool(excecao[1])
+        por_agenda.setdefault(agenda_id, []).append(tuple(excecao))
+    return [tuple(row) + (tuple(por_agenda.get(row[0], ())),) for row in query.order_by(Agenda.id).all()]
+
+def _responder_feed(feed_key, nome_calendario, linhas):
+    """Responde o feed ICS, ou 304 se o cliente já tem a versão atual"""
+    etag, last_modified = ics_feed_renderer.feed_etag(feed_key, linhas)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(last_modified),
+        'Cache-Control': 'no-cache'
+    }
+
+    if request.if_none_match:
+        nao_modificado = request.if_none_match.contains(etag.strip('"'))
+    else:
+        nao_modificado = bool(request.if_modified_since and request.if_modified_since >= last_modified)
+    if nao_modificado:
+        return Response(status=304, headers=headers)
+
+    return Response(
+        ics_feed_renderer.render(nome_calendario, linhas),
+        mimetype='text/calendar',
+        headers=headers
+    )
+
+@agenda_bp.route('/agenda/funcionario/<funcionario_id>.ics', methods=['GET'])
+def get_agenda_funcionario_ics(funcionario_id):
+    """Feed ICS (assinatura somente leitura) da agenda de um funcionário"""
+    funcionario = Funcionario.query.get_or_404(funcionario_id)
+    return _responder_feed(f'funcionario:{funcionario_id}', f'Agenda - {funcionario.nome}',
+                           _linhas_feed(funcionario_id))
+
+@agenda_bp.route('/agenda.ics', methods=['GET'])
+def get_agenda_ics():
+    """Feed ICS (assinatura somente leitura) da agenda de toda a equipe"""
+    linhas = _linhas_feed()
+    ics_feed_renderer.prune(linha[0] for linha in linhas)
+    return _responder_feed('equipe', 'Agenda da equipe', linhas)
+
+@agenda_bp.route('/agenda/gerar', methods=['POST'])
+def gerar_agenda():
+    """
+    Gera uma proposta de agenda para a semana (não salva nada)
+
+    Corpo (todos opcionais):
+        inicio: primeiro dia (YYYY-MM-DD); padrão: próxima segunda-feira
+        dias: quantidade de dias úteis (padrão 5, de 1 a 31)
+        ausencias: [{funcionario, dataInicio, dataFim, tipo, status}]
+        fixos: [{funcionario, tarefa, horario, duracao}]; padrão: reuniões e pausas do cronograma
+        atribuicoes: [{funcionario, tarefa, minutos}]; padrão: quem faz cada tarefa no cronograma
+        tempo_limite: segundos para a fase de melhoria (padrão 1)
+        melhorar: false para usar só a heurística gulosa
+    """
+    dados, erro = corpo_objeto()
+    if erro:
+        return erro
+
+    try:
+        if dados.get('inicio'):
+            inicio = datetime.date.fromisoformat(dados['inicio'])
+        else:
+            hoje = datetime.date.today()
+            inicio = hoje + datetime.timedelta(days=7 - hoje.weekday())
+        quantidade_dias = int(dados.get('dias', 5))
+        tempo_limite = min(float(dados.get('tempo_limite', 1.0)), 10.0)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Parâmetros inválidos'}), 400
+    if not 1 <= quantidade_dias <= MAX_DIAS:
+        return jsonify({'error': f'dias deve estar entre 1 e {MAX_DIAS}'}), 400
+    if not isinstance(dados.get('melhorar', True), bool):
+        return jsonify({'error': 'melhorar deve ser true ou false'}), 400
+    erro = validar_entrada(dados.get('atribuicoes', []), dados.get('ausencias', []), dados.get('fixos', []))
+    if erro:
+        return jsonify({'error': erro}), 400
+
+    funcionarios = [func.to_dict() for func in Funcionario.query.all()]
+    tarefas = [tarefa.to_dict() for tarefa in Tarefa.query.all()]
+    cronograma = [item.to_dict() for item in Agenda.query.filter(Agenda.data.is_(None)).all()]
+
+    if 'atribuicoes' in dados:
+        atribuicoes = [
+            Atribuicao(a['funcionario'], a['tarefa'], int(a.get('minutos', 30)))
+            for a in dados['atribuicoes']
+        ]
+    else:
+        atribuicoes = atribuicoes_do_cronograma(cronograma, {t['id']: t for t in tarefas})
+
+    gerador = GeradorAgenda(
+        funcionarios,
+        tarefas,
+        {processo.tarefa_id: processo.frequencia for processo in Processo.query.all()},
+        atribuicoes,
+        dias_uteis(inicio, quantidade_dias),
+        ausencias=dados.get('ausencias', []),
+        fixos=dados.get('fixos', fixos_do_cronograma(cronograma))
+    )
+    proposta = gerador.gerar(tempo_limite=tempo_limite, melhorar=dados.get('melhorar', True))
+    return jsonify(proposta.to_dict())
+
+@agenda_bp.route('/agenda/ocorrencias', methods=['GET'])
+def get_ocorrencias():
+    """
+    Ocorrências concretas da agenda em um intervalo de datas
+
+    Junta os agendamentos recorrentes (sem data), suas exceções e os
+    agendamentos avulsos do intervalo, em ordem de data e horário.
+
+    Parâmetros:
+        inicio, fim: datas YYYY-MM-DD (padrão: hoje até 6 dias depois; máximo 366 dias)
+        funcionario: filtra por funcionário
+        limite: quantidade máxima de ocorrências (a expansão para ao atingir o limite)
+    """
+    try:
+        inicio = data_do_parametro(request.args.get('inicio'), 'inicio') or datetime.date.today()
+        fim = data_do_parametro(request.args.get('fim'), 'fim') or inicio + datetime.timedelta(days=6)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    funcionario_id = request.args.get('funcionario')
+    limite = request.args.get('limite', type=int)
+
+    if fim < inicio or (fim - inicio).days >= 366:
+        return jsonify({'error': 'Intervalo de datas inválido (máximo 366 dias)'}), 400
+    if limite is not None and limite <= 0:
+        return jsonify({'error': 'limite deve ser positivo'}), 400
+
+    chave = (inicio, fim, funcionario_id, limite, versoes_dados.versao('agenda', 'agenda_excecoes'))
+    ocorrencias = cache_janelas.get(chave)
+    if ocorrencias is None:
+        modelos = Agenda.query.filter(Agenda.data.is_(None))
+        avulsos = Agenda.query.filter(Agenda.data.between(inicio, fim)).order_by(Agenda.data)
+        if funcionario_id:
+            modelos = modelos.filter_by(funcionario_id=funcionario_id)
+            avulsos = avulsos.filter_by(funcionario_id=funcionario_id)
+        modelos = [item.to_dict() for item in modelos.all()]
+
+        excecoes = {}
+        if modelos:
+            query = AgendaExcecao.query.filter(
+                AgendaExcecao.data.between(inicio, fim),
+                AgendaExcecao.agenda_id.in_([m['id'] for m in modelos])
+            )
+            excecoes = {(e.agenda_id, e.data.isoformat()): e.to_dict() for e in query.all()}
+
+        gerador = expandir(modelos, excecoes, (item.to_dict() for item in avulsos.yield_per(500)), inicio, fim)
+        ocorrencias = list(islice(gerador, limite))
+        cache_janelas.put(chave, ocorrencias)
+
+    return jsonify(ocorrencias)
+
+def _get_modelo(agenda_id):
+    """Agendamento recorrente (sem data) ou None"""
+    item = db.session.get(Agenda, agenda_id)
+    return item if item is not None and item.data is None else None
+
+@agenda_bp.route('/agenda/<int:agenda_id>/recorrencia', methods=['PUT'])
+def update_recorrencia(agenda_id):
+    """Define a regra de recorrência (RRULE, 'diaria', 'dias_uteis' ou null) de um agendamento sem data"""
+    item = _get_modelo(agenda_id)
+    if item is None:
+        return jsonify({'error': 'Agendamento recorrente não encontrado'}), 404
+
+    dados, erro = corpo_objeto()
+    if erro:
+        return erro
+    recorrencia = dados.get('recorrencia')
+    if recorrencia is not None and not isinstance(recorrencia, str):
+        return jsonify({'error': 'recorrencia deve ser um texto ou null'}), 400
+    try:
+        parse_regra(recorrencia)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    item.recorrencia = recorrencia
+    db.session.commit()
+    return jsonify(item.to_dict())
+
+@agenda_bp.route('/agenda/<int:agenda_id>/excecoes', methods=['POST'])
+def add_excecao(agenda_id):
+    """
+    Altera ou cancela uma ocorrência de um agendamento recorrente
+
+    Corpo: {data, cancelado?, horario?, tarefa?, duracao?}; uma nova exceção na
+    mesma data substitui a anterior.
+    """
+    if _get_modelo(agenda_id) is None:
+        return jsonify({'error': 'Agendamento recorrente não encontrado'}), 404
+
+    dados, erro = corpo_objeto()
+    if erro:
+        return erro
+    data = parse_data(dados.get('data'))
+    if data is None:
+        return jsonify({'error': 'data é obrigatória (YYYY-MM-DD)'}), 400
+    if dados.get('horario') and horario_para_minutos(dados['horario']) is None:
+        return jsonify({'error': 'horario deve estar no formato HH:MM (00:00 a 23:59)'}), 400
+    duracao = dados.get('duracao')
+    if duracao is not None and (isinstance(duracao, bool) or not isinstance(duracao, int) or duracao <= 0):
+        return jsonify({'error': 'duracao deve ser um número positivo de minutos'}), 400
+    if dados.get('tarefa') not in (None, '') and (not isinstance(dados['tarefa'], str) or db.session.get(Tarefa, dados['tarefa']) is None):
+        return jsonify({'error': 'Tarefa não encontrada'}), 400
+    if not isinstance(dados.get('cancelado', False), bool):
+        return jsonify({'error': 'cancelado deve ser true ou false'}), 400
+
+    excecao = AgendaExcecao.query.filter_by(agenda_id=agenda_id, data=data).first()
+    if excecao is None:
+        excecao = AgendaExcecao(agenda_id=agenda_id, data=data)
+        db.session.add(excecao)
+    excecao.cancelado = dados.get('cancelado', False)
+    excecao.horario = dados.get('horario')
+    excecao.tarefa_id = dados.get('tarefa') or None
+    excecao.duracao = dados.get('duracao')
+    db.session.commit()
+    return jsonify(excecao.to_dict()), 201
+
+@agenda_bp.route('/agenda/<int:agenda_id>/excecoes/<data>', methods=['DELETE'])
+def delete_excecao(agenda_id, data):
+    """Remove a exceção de uma data (a ocorrência volta a seguir a regra)"""
+    excecao = AgendaExcecao.query.filter_by(agenda_id=agenda_id, data=parse_data(data)).first()
+    if excecao is None:
+        return jsonify({'error': 'Exceção não encontrada'}), 404
+
+    db.session.delete(excecao)
+    db.session.commit()
+    return jsonify({'message': 'Exceção removida com sucesso'})
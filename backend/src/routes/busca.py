@@ -0,0 +1,45 @@
+import time
+from flask import Blueprint, request, jsonify
+from src.services.busca import busca_global, documento_funcionario, documento_processo, documento_tarefa
+from src.models.funcionario import Funcionario
+from src.models.tarefa import Tarefa
+from src.models.processo import Processo
+
+busca_bp = Blueprint('busca', __name__)
+
+# Fontes do índice: os mesmos dados editados pelas rotas de admin
+busca_global.registrar_fonte(
+    'funcionario', lambda: [documento_funcionario(f.to_dict()) for f in Funcionario.query.all()]
+)
+busca_global.registrar_fonte(
+    'tarefa', lambda: [documento_tarefa(t.to_dict()) for t in Tarefa.query.all()]
+)
+busca_global.registrar_fonte(
+    'processo', lambda: [documento_processo(p.tarefa_id, p.to_dict()) for p in Processo.query.all()]
+)
+
+@busca_bp.route('/search', methods=['GET'])
+def search():
+    """
+    Busca global
+
+    Parâmetros:
+        q: texto da consulta (sem diferenciar acentos; aceita prefixos e erros de digitação)
+        tipos: filtra por tipos separados por vírgula (funcionario, tarefa, processo, demanda, tarefa_a_fazer)
+        limite: máximo de resultados (padrão 20, máximo 100)
+    """
+    consulta = request.args.get('q', '').strip()
+    if not consulta:
+        return jsonify({'error': 'Parâmetro q é obrigatório'}), 400
+
+    tipos = [t.strip() for t in request.args.get('tipos', '').split(',') if t.strip()]
+    limite = min(max(request.args.get('limite', 20, type=int), 1), 100)
+
+    inicio = time.perf_counter()
+    resultados = busca_global.buscar(consulta, tipos, limite)
+    return jsonify({
+        'query': consulta,
+        'resultados': resultados,
+        'total': len(resultados),
+        'tempo_ms': round((time.perf_counter() - inicio) * 1000, 2)
+    })
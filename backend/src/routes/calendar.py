@@ -0,0 +1,204 @@
+import hashlib
+import hmac
+import json
+import os
+from flask import Blueprint, request, jsonify
+from src.services.calendar_push import calendar_push_sync
+from src.services.google_calendar import calendar_service_pool
+
+calendar_bp = Blueprint('calendar', __name__)
+
+# URL pública (HTTPS) para onde o Google envia as notificações
+WEBHOOK_URL = os.getenv('GOOGLE_CALENDAR_WEBHOOK_URL', '')
+
+@calendar_bp.record_once
+def configure_channels(state):
+    """Carrega os canais salvos do arquivo configurado (GOOGLE_CALENDAR_CHANNELS_FILE); sem ele, só em memória"""
+    if state.app.config.get('GOOGLE_CALENDAR_CHANNELS_FILE'):
+        calendar_push_sync.registry.configure(state.app.config['GOOGLE_CALENDAR_CHANNELS_FILE'])
+
+@calendar_bp.before_app_request
+def resume_channels():
+    """
+    Agenda as renovações no processo que atende (uma vez por processo)
+
+    Não roda no registro do blueprint: com preload_app, ele acontece no
+    mestre do gunicorn, e os timers não sobrevivem ao fork.
+    """
+    calendar_push_sync.registry.resume()
+
+@calendar_bp.route('/notificacoes', methods=['POST'])
+def receive_notification():
+    """Recebe notificações dos canais de watch do Google Calendar"""
+    if not calendar_push_sync.handle_notification(request.headers):
+        # Canal desconhecido ou token errado. O canal não é encerrado no Google: um
+        # processo com o registro desatualizado (outro worker, ou antes do resume())
+        # derrubaria um canal ativo. Canais órfãos expiram sozinhos.
+        return jsonify({'error': 'Canal inválido'}), 404
+
+    # Responde rápido: a busca das mudanças roda em segundo plano
+    return '', 200
+
+@calendar_bp.route('/canais', methods=['GET'])
+def get_canais():
+    """Lista os canais de notificação ativos"""
+    canais = [
+        {key: value for key, value in canal.items() if key != 'token'}
+        for canal in calendar_push_sync.registry.channels()
+    ]
+    return jsonify(canais)
+
+@calendar_bp.route('/canais', methods=['POST'])
+def add_canal():
+    """Abre um canal de notificações para um calendário"""
+    dados = request.json or {}
+    calendar_id = dados.get('calendar_id', 'primary')
+    address = dados.get('address') or WEBHOOK_URL
+    usuario = dados.get('usuario')
+
+    if usuario:
+        negado = _exigir_dono(usuario)
+        if negado:
+            return negado
+    if not address:
+        return jsonify({'error': 'Campo obrigatório: address (ou GOOGLE_CALENDAR_WEBHOOK_URL)'}), 400
+    if usuario and not calendar_service_pool.get(usuario).is_authenticated():
+        return jsonify({'error': 'Conta do Google não conectada'}), 409
+
+    canal = calendar_push_sync.subscribe(calendar_id, address, usuario)
+    if not canal:
+        return jsonify({'error': 'Não foi possível abrir o canal'}), 502
+
+    canal.pop('token', None)
+    return jsonify(canal), 201
+
+@calendar_bp.route('/canais/<channel_id>', methods=['DELETE'])
+def delete_canal(channel_id):
+    """Encerra um canal de notificações"""
+    canal = calendar_push_sync.registry.get(channel_id)
+    if not canal:
+        return jsonify({'error': 'Canal não encontrado'}), 404
+    if canal.get('usuario'):
+        negado = _exigir_dono(canal['usuario'])
+        if negado:
+            return negado
+
+    calendar_push_sync.registry.stop(channel_id)
+    return jsonify({'message': 'Canal encerrado com sucesso'})
+
+@calendar_bp.route('/eventos/<calendar_id>', methods=['GET'])
+def get_eventos_externos(calendar_id):
+    """Retorna os eventos externos do calendário mantidos atualizados por push (?usuario= para a conta de um usuário)"""
+    usuario = request.args.get('usuario')
+    if usuario:
+        negado = _exigir_dono(usuario)
+        if negado:
+            return negado
+    return jsonify(calendar_push_sync.get_events(calendar_id, usuario))
+
+# Contas por usuário (calendar_service_pool)
+
+def token_do_usuario(usuario):
+    """Token de acesso às rotas da conta do usuário: HMAC do nome com CALENDAR_AUTH_SECRET"""
+    segredo = os.getenv('CALENDAR_AUTH_SECRET', '')
+    return hmac.new(segredo.encode(), usuario.encode(), hashlib.sha256).hexdigest()
+
+def _exigir_dono(usuario=None):
+    """
+    Exige `Authorization: Bearer <token>` do próprio usuário ou do admin
+
+    O token do admin é o próprio CALENDAR_AUTH_SECRET; o de cada usuário vem
+    de token_do_usuario (GET /contas/<usuario>/token, só para o admin). Sem o
+    segredo configurado, as rotas de conta ficam fechadas.
+
+    Returns:
+        None se autorizado, senão a resposta de erro
+    """
+    segredo = os.getenv('CALENDAR_AUTH_SECRET', '')
+    if not segredo:
+        return jsonify({'error': 'Autenticação das contas não configurada (CALENDAR_AUTH_SECRET)'}), 503
+    autorizacao = request.headers.get('Authorization', '')
+    if not autorizacao.startswith('Bearer '):
+        return jsonify({'error': 'Envie Authorization: Bearer <token>'}), 401
+    token = autorizacao[7:].encode()
+    if hmac.compare_digest(token, segredo.encode()):
+        return None
+    if usuario is not None and hmac.compare_digest(token, token_do_usuario(usuario).encode()):
+        return None
+    return jsonify({'error': 'Acesso negado à conta deste usuário'}), 403
+
+def _client_config():
+    """Configuração do cliente OAuth: do corpo ou do credentials.json"""
+    dados = request.get_json(silent=True) or {}
+    if dados.get('client_config'):
+        return dados['client_config']
+    try:
+        with open('credentials.json', 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+@calendar_bp.route('/contas/<usuario>', methods=['GET'])
+def get_conta(usuario):
+    """Diz se o usuário já conectou a conta do Google"""
+    negado = _exigir_dono(usuario)
+    if negado:
+        return negado
+    return jsonify({'usuario': usuario, 'conectado': calendar_service_pool.get(usuario).is_authenticated()})
+
+@calendar_bp.route('/contas/<usuario>/conectar', methods=['POST'])
+def conectar_conta(usuario):
+    """Inicia o OAuth do usuário; devolve a URL de autorização do Google"""
+    negado = _exigir_dono(usuario)
+    if negado:
+        return negado
+    client_config = _client_config()
+    if not client_config:
+        return jsonify({'error': 'Envie client_config ou configure credentials.json'}), 400
+    try:
+        url = calendar_service_pool.get(usuario).setup_oauth_flow(client_config)
+    except Exception:
+        return jsonify({'error': 'Não foi possível iniciar a autorização'}), 502
+    return jsonify({'authorization_url': url})
+
+@calendar_bp.route('/oauth/callback', methods=['GET'])
+def oauth_callback():
+    """Destino do redirecionamento do Google (GOOGLE_OAUTH_REDIRECT_URI)"""
+    code, state = request.args.get('code'), request.args.get('state')
+    if not code or not state:
+        return jsonify({'error': request.args.get('error') or 'Parâmetros code e state obrigatórios'}), 400
+    usuario = calendar_service_pool.handle_oauth_callback(code, state)
+    if usuario is None:
+        return jsonify({'error': 'Autorização inválida ou expirada'}), 400
+    return jsonify({'usuario': usuario, 'conectado': True})
+
+@calendar_bp.route('/contas/<usuario>/calendarios', methods=['GET'])
+def get_calendarios(usuario):
+    """Calendários da conta do usuário"""
+    negado = _exigir_dono(usuario)
+    if negado:
+        return negado
+    service = calendar_service_pool.get(usuario)
+    if not service.is_authenticated():
+        return jsonify({'error': 'Conta do Google não conectada'}), 409
+    return jsonify(service.get_calendars())
+
+@calendar_bp.route('/contas/<usuario>', methods=['DELETE'])
+def desconectar_conta(usuario):
+    """Encerra os canais do usuário e remove as credenciais"""
+    negado = _exigir_dono(usuario)
+    if negado:
+        return negado
+    for canal in calendar_push_sync.registry.channels():
+        if canal.get('usuario') == usuario:
+            calendar_push_sync.registry.stop(canal['id'])
+    calendar_service_pool.disconnect(usuario)
+    return jsonify({'message': 'Conta desconectada'})
+
+@calendar_bp.route('/contas/<usuario>/token', methods=['GET'])
+def get_token_conta(usuario):
+    """Token do usuário para as rotas da conta dele (só o admin)"""
+    negado = _exigir_dono()
+    if negado:
+        return negado
+    return jsonify({'usuario': usuario, 'token': token_do_usuario(usuario)})
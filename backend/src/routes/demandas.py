@@ -0,0 +1,366 @@
+import datetime
+from flask import Blueprint, request, jsonify
+from sqlalchemy import case, func, update
+from src.database import db
+from src.models.funcionario import Funcionario
+from src.models.tarefa import Tarefa
+from src.models.demanda import Demanda, IMPORTANCIAS, STATUS_DEMANDA, agora_utc
+from src.models.tarefa_a_fazer import TarefaAFazer
+from src.services.busca import busca_global, documento_demanda, documento_tarefa_a_fazer
+from src.services.horarios import parse_data
+from src.services.paginacao import paginar
+from src.services.requisicao import corpo_objeto
+from src.services.versoes import versoes_dados
+
+demandas_bp = Blueprint('demandas', __name__)
+
+# Tamanho de página padrão e máximo das listagens
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 200
+
+busca_global.registrar_fonte('demanda', lambda: [documento_demanda(d.to_dict()) for d in Demanda.query.all()])
+busca_global.registrar_fonte(
+    'tarefa_a_fazer', lambda: [documento_tarefa_a_fazer(t.to_dict()) for t in TarefaAFazer.query.all()]
+)
+
+def _lista(nome):
+    """Parâmetro de query com valores separados por vírgula"""
+    return [v.strip() for v in request.args.get(nome, '').split(',') if v.strip()]
+
+def _booleano(nome):
+    valor = request.args.get(nome)
+    if valor is None:
+        return None
+    return valor.lower() in ('1', 'true', 'sim')
+
+def _rank_importancia(coluna):
+    """alta=0, media=1, baixa=2 (ordem crescente = mais importante primeiro)"""
+    return case({'alta': 0, 'media': 1, 'baixa': 2}, value=coluna, else_=3)
+
+def _chaves_ordenacao(modelo, ordem):
+    """Expressões de ordenação e como extrair o valor de cada uma do objeto"""
+    id_chave = (modelo.id, lambda obj: obj.id)
+    if ordem == 'prazo':
+        return [(modelo.prazo, lambda obj: obj.prazo), id_chave]
+    if ordem == 'data_criacao':
+        return [(modelo.data_criacao, lambda obj: obj.data_criacao), id_chave]
+    if ordem == 'importancia':
+        rank = {'alta': 0, 'media': 1, 'baixa': 2}
+        return [
+            (_rank_importancia(modelo.importancia), lambda obj: rank.get(obj.importancia, 3)),
+            (modelo.prazo, lambda obj: obj.prazo),
+            id_chave
+        ]
+    return None
+
+def _listar(query, modelo):
+    """Ordena e pagina a consulta conforme ordem, direcao, limite e cursor"""
+    chaves = _chaves_ordenacao(modelo, request.args.get('ordem', 'prazo'))
+    if chaves is None:
+        return jsonify({'error': "ordem deve ser 'prazo', 'data_criacao' ou 'importancia'"}), 400
+
+    limite = min(max(request.args.get('limite', LIMITE_PADRAO, type=int), 1), LIMITE_MAXIMO)
+    descendente = request.args.get('direcao', 'asc') == 'desc'
+    try:
+        itens, proximo = paginar(query, chaves, descendente, limite, request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({'itens': [item.to_dict() for item in itens], 'proximo_cursor': proximo})
+
+def _contar(query, colunas_grupo):
+    """Contagens agrupadas (GROUP BY no banco, sem carregar as linhas)"""
+    colunas = [coluna for _, coluna in colunas_grupo]
+    linhas = query.with_entities(*colunas, func.count()).group_by(*colunas).all()
+    return [
+        {**{nome: valor for (nome, _), valor in zip(colunas_grupo, linha[:-1])}, 'total': linha[-1]}
+        for linha in linhas
+    ]
+
+def _validar(dados, obrigatorios, modelo_funcionario_campo):
+    """Valida campos comuns de demandas e tarefas a fazer; retorna mensagem de erro ou None"""
+    for campo, valor in dados.items():
+        if isinstance(valor, (dict, list)):
+            return f'{campo} não pode ser objeto nem lista'
+    for campo in obrigatorios:
+        if not dados.get(campo):
+            return f'Campo obrigatório: {campo}'
+    if 'importancia' in dados and dados['importancia'] not in IMPORTANCIAS:
+        return f"importancia deve ser uma de: {', '.join(IMPORTANCIAS)}"
+    if 'prazo' in dados and parse_data(dados['prazo']) is None:
+        return 'prazo deve estar no formato YYYY-MM-DD'
+    funcionario_id = dados.get(modelo_funcionario_campo)
+    if funcionario_id and (not isinstance(funcionario_id, str) or db.session.get(Funcionario, funcionario_id) is None):
+        return 'Funcionário não encontrado'
+    if 'concluida' in dados and not isinstance(dados['concluida'], bool):
+        return 'concluida deve ser true ou false'
+    return None
+
+def _aplicar(obj, dados, campos):
+    for campo in campos:
+        if campo in dados:
+            valor = dados[campo]
+            setattr(obj, campo, parse_data(valor) if campo == 'prazo' else valor)
+
+# Demandas
+
+CAMPOS_DEMANDA = ('titulo', 'descricao', 'funcionario_id', 'tarefa_id', 'importancia', 'status', 'prazo', 'observacoes')
+
+def _filtrar_demandas():
+    """
+    Filtros de demandas a partir da query string:
+    status, importancia, funcionario (listas separadas por vírgula), tarefa,
+    atrasadas=true (prazo vencido e não concluída), prazo_de, prazo_ate
+    """
+    query = Demanda.query
+    if _lista('funcionario'):
+        query = query.filter(Demanda.funcionario_id.in_(_lista('funcionario')))
+    if _lista('status'):
+        query = query.filter(Demanda.status.in_(_lista('status')))
+    if _lista('importancia'):
+        query = query.filter(Demanda.importancia.in_(_lista('importancia')))
+    if request.args.get('tarefa'):
+        query = query.filter(Demanda.tarefa_id == request.args['tarefa'])
+    if _booleano('atrasadas'):
+        query = query.filter(Demanda.prazo < datetime.date.today(), Demanda.status != 'concluida')
+    if parse_data(request.args.get('prazo_de')):
+        query = query.filter(Demanda.prazo >= parse_data(request.args['prazo_de']))
+    if parse_data(request.args.get('prazo_ate')):
+        query = query.filter(Demanda.prazo <= parse_data(request.args['prazo_ate']))
+    return query
+
+@demandas_bp.route('/demandas', methods=['GET'])
+def get_demandas():
+    """
+    Lista demandas filtradas, ordenadas e paginadas por cursor
+
+    Parâmetros: filtros de _filtrar_demandas, ordem (prazo, data_criacao,
+    importancia), direcao (asc/desc), limite e cursor (proximo_cursor da página anterior)
+    """
+    return _listar(_filtrar_demandas(), Demanda)
+
+@demandas_bp.route('/demandas/contagens', methods=['GET'])
+def get_contagens_demandas():
+    """Contagens para dashboards: por grupo (agrupar=status,importancia,funcionario), total e atrasadas"""
+    grupos = {'status': Demanda.status, 'importancia': Demanda.importancia, 'funcionario': Demanda.funcionario_id}
+    agrupar = _lista('agrupar') or ['status']
+    if any(g not in grupos for g in agrupar):
+        return jsonify({'error': f"agrupar aceita: {', '.join(grupos)}"}), 400
+
+    query = _filtrar_demandas()
+    atrasadas = query.filter(Demanda.prazo < datetime.date.today(), Demanda.status != 'concluida')
+    return jsonify({
+        'total': query.count(),
+        'atrasadas': atrasadas.count(),
+        'grupos': _contar(query, [(g, grupos[g]) for g in agrupar])
+    })
+
+@demandas_bp.route('/demandas/<int:demanda_id>', methods=['GET'])
+def get_demanda(demanda_id):
+    demanda = db.get_or_404(Demanda, demanda_id)
+    return jsonify(demanda.to_dict())
+
+@demandas_bp.route('/demandas', methods=['POST'])
+def add_demanda():
+    """Cria uma demanda"""
+    dados, erro = corpo_objeto()
+    if erro:
+        return erro
+    erro = _validar(dados, ['titulo', 'descricao', 'funcionario_id', 'prazo'], 'funcionario_id')
+    if not erro and dados.get('status', 'pendente') not in STATUS_DEMANDA:
+        erro = f"status deve ser um de: {', '.join(STATUS_DEMANDA)}"
+    if not erro and dados.get('tarefa_id') and (
+            not isinstance(dados['tarefa_id'], str) or db.session.get(Tarefa, dados['tarefa_id']) is None):
+        erro = 'Tarefa não encontrada'
+    if erro:
+        return jsonify({'error': erro}), 400
+
+    demanda = Demanda()
+    _aplicar(demanda, dados, CAMPOS_DEMANDA)
+    db.session.add(demanda)
+    db.session.commit()
+    busca_global.indexar('demanda', documento_demanda(demanda.to_dict()))
+    return jsonify(demanda.to_dict()), 201
+
+@demandas_bp.route('/demandas/<int:demanda_id>', methods=['PUT', 'PATCH'])
+def update_demanda(demanda_id):
+    """Atualiza os campos enviados de uma demanda"""
+    demanda = db.get_or_404(Demanda, demanda_id)
+    dados, erro = corpo_objeto()
+    if erro:
+        return erro
+    erro = _validar(dados, [], 'funcionario_id')
+    if not erro and 'status' in dados and dados['status'] not in STATUS_DEMANDA:
+        erro = f"status deve ser um de: {', '.join(STATUS_DEMANDA)}"
+    if erro:
+        return jsonify({'error': erro}), 400
+
+    _aplicar(demanda, dados, CAMPOS_DEMANDA)
+    db.session.commit()
+    busca_global.indexar('demanda', documento_demanda(demanda.to_dict()))
+    return jsonify(demanda.to_dict())
+
+@demandas_bp.route('/demandas/<int:demanda_id>', methods=['DELETE'])
+def delete_demanda(demanda_id):
+    demanda = db.get_or_404(Demanda, demanda_id)
+    db.session.delete(demanda)
+    db.session.commit()
+    busca_global.remover('demanda', demanda_id)
+    return jsonify({'message': 'Demanda removida com sucesso'})
+
+@demandas_bp.route('/demandas/status', methods=['POST'])
+def update_status_demandas():
+    """
+    Muda o status de várias demandas em um único UPDATE
+
+    Corpo: {ids: [...], status}
+    """
+    dados, erro = corpo_objeto()
+    if erro:
+        return erro
+    if dados.get('status') not in STATUS_DEMANDA:
+        return jsonify({'error': f"status deve ser um de: {', '.join(STATUS_DEMANDA)}"}), 400
+    ids = dados.get('ids')
+    if not isinstance(ids, list) or not ids or not all(type(i) is int for i in ids):
+        return jsonify({'error': 'ids deve ser uma lista de inteiros'}), 400
+
+    resultado = db.session.execute(
+        update(Demanda)
+        .where(Demanda.id.in_(ids))
+        .values(status=dados['status'], updated_at=agora_utc())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    versoes_dados.incrementar(Demanda.__tablename__)
+    return jsonify({'atualizadas': resultado.rowcount})
+
+# Tarefas a fazer
+
+CAMPOS_TAREFA_A_FAZER = ('titulo', 'descricao', 'funcionario_responsavel_id', 'importancia', 'prazo',
+                         'telefone_whatsapp', 'mensagem_whatsapp', 'observacoes')
+
+def _filtrar_tarefas_a_fazer():
+    """
+    Filtros de tarefas a fazer a partir da query string:
+    funcionario, importancia (listas), concluida=true/false,
+    atrasadas=true (prazo vencido e não concluída), prazo_de, prazo_ate
+    """
+    query = TarefaAFazer.query
+    if _lista('funcionario'):
+        query = query.filter(TarefaAFazer.funcionario_responsavel_id.in_(_lista('funcionario')))
+    if _lista('importancia'):
+        query = query.filter(TarefaAFazer.importancia.in_(_lista('importancia')))
+    if _booleano('concluida') is not None:
+        query = query.filter(TarefaAFazer.concluida == _booleano('concluida'))
+    if _booleano('atrasadas'):
+        query = query.filter(TarefaAFazer.prazo < datetime.date.today(), TarefaAFazer.concluida.is_(False))
+    if parse_data(request.args.get('prazo_de')):
+        query = query.filter(TarefaAFazer.prazo >= parse_data(request.args['prazo_de']))
+    if parse_data(request.args.get('prazo_ate')):
+        query = query.filter(TarefaAFazer.prazo <= parse_data(request.args['prazo_ate']))
+    return query
+
+@demandas_bp.route('/tarefas-a-fazer', methods=['GET'])
+def get_tarefas_a_fazer():
+    """Lista tarefas a fazer filtradas, ordenadas e paginadas por cursor (mesmos parâmetros de /demandas)"""
+    return _listar(_filtrar_tarefas_a_fazer(), TarefaAFazer)
+
+@demandas_bp.route('/tarefas-a-fazer/contagens', methods=['GET'])
+def get_contagens_tarefas_a_fazer():
+    """Contagens para dashboards: por grupo (agrupar=concluida,importancia,funcionario), total e atrasadas"""
+    grupos = {
+        'concluida': TarefaAFazer.concluida,
+        'importancia': TarefaAFazer.importancia,
+        'funcionario': TarefaAFazer.funcionario_responsavel_id
+    }
+    agrupar = _lista('agrupar') or ['concluida']
+    if any(g not in grupos for g in agrupar):
+        return jsonify({'error': f"agrupar aceita: {', '.join(grupos)}"}), 400
+
+    query = _filtrar_tarefas_a_fazer()
+    atrasadas = query.filter(TarefaAFazer.prazo < datetime.date.today(), TarefaAFazer.concluida.is_(False))
+    return jsonify({
+        'total': query.count(),
+        'atrasadas': atrasadas.count(),
+        'grupos': _contar(query, [(g, grupos[g]) for g in agrupar])
+    })
+
+@demandas_bp.route('/tarefas-a-fazer/<int:tarefa_id>', methods=['GET'])
+def get_tarefa_a_fazer(tarefa_id):
+    tarefa = db.get_or_404(TarefaAFazer, tarefa_id)
+    return jsonify(tarefa.to_dict())
+
+@demandas_bp.route('/tarefas-a-fazer', methods=['POST'])
+def add_tarefa_a_fazer():
+    """Cria uma tarefa a fazer"""
+    dados, erro = corpo_objeto()
+    if erro:
+        return erro
+    erro = _validar(dados, ['titulo', 'descricao', 'funcionario_responsavel_id', 'prazo'],
+                    'funcionario_responsavel_id')
+    if erro:
+        return jsonify({'error': erro}), 400
+
+    tarefa = TarefaAFazer(concluida=dados.get('concluida', False))
+    _aplicar(tarefa, dados, CAMPOS_TAREFA_A_FAZER)
+    if tarefa.concluida:
+        tarefa.data_conclusao = agora_utc()
+    db.session.add(tarefa)
+    db.session.commit()
+    busca_global.indexar('tarefa_a_fazer', documento_tarefa_a_fazer(tarefa.to_dict()))
+    return jsonify(tarefa.to_dict()), 201
+
+@demandas_bp.route('/tarefas-a-fazer/<int:tarefa_id>', methods=['PUT', 'PATCH'])
+def update_tarefa_a_fazer(tarefa_id):
+    """Atualiza os campos enviados de uma tarefa a fazer"""
+    tarefa = db.get_or_404(TarefaAFazer, tarefa_id)
+    dados, erro = corpo_objeto()
+    if erro:
+        return erro
+    erro = _validar(dados, [], 'funcionario_responsavel_id')
+    if erro:
+        return jsonify({'error': erro}), 400
+
+    _aplicar(tarefa, dados, CAMPOS_TAREFA_A_FAZER)
+    if 'concluida' in dados and dados['concluida'] != tarefa.concluida:
+        tarefa.concluida = dados['concluida']
+        tarefa.data_conclusao = agora_utc() if tarefa.concluida else None
+    db.session.commit()
+    busca_global.indexar('tarefa_a_fazer', documento_tarefa_a_fazer(tarefa.to_dict()))
+    return jsonify(tarefa.to_dict())
+
+@demandas_bp.route('/tarefas-a-fazer/<int:tarefa_id>', methods=['DELETE'])
+def delete_tarefa_a_fazer(tarefa_id):
+    tarefa = db.get_or_404(TarefaAFazer, tarefa_id)
+    db.session.delete(tarefa)
+    db.session.commit()
+    busca_global.remover('tarefa_a_fazer', tarefa_id)
+    return jsonify({'message': 'Tarefa removida com sucesso'})
+
+@demandas_bp.route('/tarefas-a-fazer/concluir', methods=['POST'])
+def concluir_tarefas_a_fazer():
+    """
+    Marca várias tarefas como concluídas (ou reabre) em um único UPDATE
+
+    Corpo: {ids: [...], concluida: true}
+    """
+    dados, erro = corpo_objeto()
+    if erro:
+        return erro
+    ids = dados.get('ids')
+    if not isinstance(ids, list) or not ids or not all(type(i) is int for i in ids):
+        return jsonify({'error': 'ids deve ser uma lista de inteiros'}), 400
+
+    concluida = dados.get('concluida', True)
+    if not isinstance(concluida, bool):
+        return jsonify({'error': 'concluida deve ser true ou false'}), 400
+    agora = agora_utc()
+    resultado = db.session.execute(
+        update(TarefaAFazer)
+        .where(TarefaAFazer.id.in_(ids), TarefaAFazer.concluida.is_(not concluida))
+        .values(concluida=concluida, data_conclusao=agora if concluida else None, updated_at=agora)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    versoes_dados.incrementar(TarefaAFazer.__tablename__)
+    return jsonify({'atualizadas': resultado.rowcount})
@@ -0,0 +1,88 @@
+import datetime
+from flask import Blueprint, request, jsonify
+from src.models.funcionario import Funcionario
+from src.models.agenda import Agenda
+from src.models.agenda_excecao import AgendaExcecao
+from src.services.disponibilidade import MAX_DIAS_CONSULTA, grade_disponibilidade, intervalo_de_dias
+from src.services.horarios import data_do_parametro, horario_para_minutos
+
+disponibilidade_bp = Blueprint('disponibilidade', __name__)
+
+MINUTOS_POR_DIA = 24 * 60
+
+def _garantir_grade():
+    """Monta a grade a partir do banco na primeira consulta"""
+    if not grade_disponibilidade.carregada:
+        grade_disponibilidade.carregar(
+            [func.to_dict() for func in Funcionario.query.all()],
+            [item.to_dict() for item in Agenda.query.all()],
+            [excecao.to_dict() for excecao in AgendaExcecao.query.all()]
+        )
+
+@disponibilidade_bp.route('/disponibilidade', methods=['GET'])
+def get_disponibilidade():
+    """
+    Janelas livres da equipe
+
+    Parâmetros:
+        funcionarios: IDs separados por vírgula (padrão: todos)
+        inicio, fim: datas YYYY-MM-DD (padrão: hoje até 4 dias depois)
+        duracao: minutos mínimos da janela (padrão 30, máximo 1440)
+        modo: 'todos' (todos livres juntos, padrão) ou 'qualquer' (cada um separadamente)
+        de, ate: limitam o trecho do dia (HH:MM)
+        horario: se informado, responde quem está livre nesse horário por `duracao` minutos
+    """
+    _garantir_grade()
+
+    try:
+        inicio = data_do_parametro(request.args.get('inicio'), 'inicio') or datetime.date.today()
+        fim = data_do_parametro(request.args.get('fim'), 'fim') or inicio + datetime.timedelta(days=4)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        duracao = int(request.args.get('duracao', 30))
+    except ValueError:
+        duracao = None
+    modo = request.args.get('modo', 'todos')
+
+    if fim < inicio or (fim - inicio).days >= MAX_DIAS_CONSULTA:
+        return jsonify({'error': f'Intervalo de datas inválido (máximo {MAX_DIAS_CONSULTA} dias)'}), 400
+    if duracao is None or not 0 < duracao <= MINUTOS_POR_DIA:
+        return jsonify({'error': f'duracao deve ser um número de minutos entre 1 e {MINUTOS_POR_DIA}'}), 400
+    if modo not in ('todos', 'qualquer'):
+        return jsonify({'error': "modo deve ser 'todos' ou 'qualquer'"}), 400
+
+    horarios = {}
+    for nome in ('horario', 'de', 'ate'):
+        if request.args.get(nome):
+            horarios[nome] = horario_para_minutos(request.args[nome])
+            if horarios[nome] is None:
+                return jsonify({'error': f'{nome} deve estar no formato HH:MM (00:00 a 23:59)'}), 400
+    if horarios.get('de') is not None and horarios.get('ate') is not None and horarios['ate'] <= horarios['de']:
+        return jsonify({'error': 'ate deve ser depois de de'}), 400
+
+    conhecidos = grade_disponibilidade.funcionarios()
+    if request.args.get('funcionarios'):
+        funcionarios = [f.strip() for f in request.args['funcionarios'].split(',') if f.strip()]
+        desconhecidos = [f for f in funcionarios if f not in conhecidos]
+        if desconhecidos:
+            return jsonify({'error': f"Funcionários não encontrados: {', '.join(desconhecidos)}"}), 404
+    else:
+        funcionarios = conhecidos
+
+    dias = intervalo_de_dias(inicio, fim)
+
+    if 'horario' in horarios:
+        return jsonify({
+            'horario': request.args['horario'],
+            'duracao': duracao,
+            'livres': grade_disponibilidade.livres_em(funcionarios, dias, horarios['horario'], duracao)
+        })
+
+    return jsonify({
+        'modo': modo,
+        'duracao': duracao,
+        'janelas': grade_disponibilidade.janelas_livres(
+            funcionarios, dias, duracao, modo, horarios.get('de'), horarios.get('ate')
+        )
+    })
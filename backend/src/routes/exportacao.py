@@ -0,0 +1,189 @@
+import datetime
+import os
+import tempfile
+from flask import Blueprint, Response, current_app, jsonify, request, send_file, stream_with_context, url_for
+from src.models.funcionario import Funcionario
+from src.models.tarefa import Tarefa
+from src.models.agenda import Agenda
+from src.models.agenda_excecao import AgendaExcecao
+from src.services.exportacao import (
+    FORMATOS, escrever_xlsx, gerar_csv, gravar, linhas_exportacao, relatorio, tarefas_exportacao
+)
+from src.services.horarios import data_do_parametro
+from src.services.recorrencia import expandir
+from src.services.requisicao import corpo_objeto
+
+exportacao_bp = Blueprint('exportacao', __name__)
+
+# Maior intervalo aceito (dias)
+MAX_DIAS_EXPORTACAO = 3660
+
+# XLSX precisa terminar o arquivo antes do download; acima disso, use /export/tarefas
+MAX_DIAS_XLSX_SINCRONO = 93
+
+def _lista(valor):
+    """Filtro separado por vírgula (query string) ou lista de textos (corpo JSON); None se inválido"""
+    if isinstance(valor, list):
+        return [v.strip() for v in valor if v.strip()] if all(isinstance(v, str) for v in valor) else None
+    if valor is not None and not isinstance(valor, str):
+        return None
+    return [v.strip() for v in (valor or '').split(',') if v.strip()]
+
+def _parametros(dados):
+    """Lê formato, intervalo e filtros; devolve (parâmetros, None) ou (None, resposta de erro)"""
+    formato = dados.get('formato', 'csv')
+    hoje = datetime.date.today()
+    try:
+        inicio = data_do_parametro(dados.get('inicio'), 'inicio') or hoje.replace(day=1)
+        fim = data_do_parametro(dados.get('fim'), 'fim') or hoje
+    except ValueError as e:
+        return None, (jsonify({'error': str(e)}), 400)
+    funcionarios = _lista(dados.get('funcionarios'))
+    categorias = _lista(dados.get('categorias'))
+
+    if funcionarios is None or categorias is None:
+        return None, (jsonify({'error': 'funcionarios e categorias devem ser textos separados por vírgula'}), 400)
+    if not isinstance(formato, str) or formato not in FORMATOS:
+        return None, (jsonify({'error': f"formato deve ser um de: {', '.join(FORMATOS)}"}), 400)
+    if fim < inicio:
+        return None, (jsonify({'error': 'fim não pode ser antes de inicio'}), 400)
+    if (fim - inicio).days >= MAX_DIAS_EXPORTACAO:
+        return None, (jsonify({'error': f'Intervalo de datas longo demais (máximo {MAX_DIAS_EXPORTACAO} dias)'}), 400)
+    return {
+        'formato': formato,
+        'inicio': inicio,
+        'fim': fim,
+        'funcionarios': funcionarios or None,
+        'categorias': set(categorias) if categorias else None
+    }, None
+
+def _linhas(parametros):
+    """
+    Linhas da exportação, geradas dia a dia
+
+    Os agendamentos datados vêm de um cursor ordenado por data (lidos em lotes);
+    os modelos recorrentes e suas exceções do intervalo são poucos e ficam em memória.
+    """
+    inicio, fim = parametros['inicio'], parametros['fim']
+    funcionarios = {f.id: f.to_dict() for f in Funcionario.query.all()}
+    tarefas = {t.id: t.to_dict() for t in Tarefa.query.all()}
+
+    modelos = Agenda.query.filter(Agenda.data.is_(None))
+    avulsos = Agenda.query.filter(Agenda.data.between(inicio, fim)).order_by(Agenda.data)
+    if parametros['funcionarios']:
+        modelos = modelos.filter(Agenda.funcionario_id.in_(parametros['funcionarios']))
+        avulsos = avulsos.filter(Agenda.funcionario_id.in_(parametros['funcionarios']))
+    if parametros['categorias']:
+        # Exceções podem trocar a tarefa de um modelo, então os modelos são filtrados por ocorrência
+        avulsos = avulsos.filter(Agenda.tarefa_id.in_(
+            [t['id'] for t in tarefas.values() if t['categoria'] in parametros['categorias']]
+        ))
+    modelos = [item.to_dict() for item in modelos.all()]
+
+    excecoes = {}
+    if modelos:
+        query = AgendaExcecao.query.filter(
+            AgendaExcecao.data.between(inicio, fim),
+            AgendaExcecao.agenda_id.in_([m['id'] for m in modelos])
+        )
+        excecoes = {(e.agenda_id, e.data.isoformat()): e.to_dict() for e in query.all()}
+
+    ocorrencias = expandir(modelos, excecoes, (item.to_dict() for item in avulsos.yield_per(1000)), inicio, fim)
+    return linhas_exportacao(ocorrencias, funcionarios, tarefas, parametros['categorias'])
+
+def _nome_arquivo(parametros):
+    return f"cronograma_{parametros['inicio'].isoformat()}_{parametros['fim'].isoformat()}.{parametros['formato']}"
+
+@exportacao_bp.route('/export', methods=['GET'])
+def exportar():
+    """
+    Exporta o cronograma do intervalo
+
+    Parâmetros:
+        formato: csv (padrão), xlsx ou json (relatório agregado, pronto para PDF)
+        inicio, fim: datas YYYY-MM-DD (padrão: início do mês até hoje)
+        funcionarios, categorias: filtros separados por vírgula
+
+    O CSV é enviado em blocos enquanto é gerado. Intervalos longos em XLSX
+    devem usar POST /api/export/tarefas.
+    """
+    parametros, erro = _parametros(request.args)
+    if erro:
+        return erro
+    formato = parametros['formato']
+    cabecalhos = {'Content-Disposition': f'attachment; filename="{_nome_arquivo(parametros)}"'}
+
+    if formato == 'csv':
+        return Response(stream_with_context(gerar_csv(_linhas(parametros))),
+                        content_type=FORMATOS['csv'][0], headers=cabecalhos)
+
+    if formato == 'json':
+        return jsonify(relatorio(_linhas(parametros), parametros['inicio'], parametros['fim']))
+
+    if (parametros['fim'] - parametros['inicio']).days >= MAX_DIAS_XLSX_SINCRONO:
+        return jsonify({
+            'error': f'XLSX com mais de {MAX_DIAS_XLSX_SINCRONO} dias deve ser gerado em segundo plano',
+            'tarefas': url_for('exportacao.criar_tarefa_exportacao')
+        }), 413
+
+    descritor, caminho = tempfile.mkstemp(suffix='.xlsx')
+    os.close(descritor)
+    try:
+        escrever_xlsx(_linhas(parametros), caminho)
+    except Exception:
+        os.remove(caminho)
+        raise
+
+    def enviar():
+        try:
+            with open(caminho, 'rb') as arquivo:
+                while True:
+                    bloco = arquivo.read(64 * 1024)
+                    if not bloco:
+                        break
+                    yield bloco
+        finally:
+            os.remove(caminho)
+
+    return Response(enviar(), mimetype=FORMATOS['xlsx'][0], headers=cabecalhos)
+
+@exportacao_bp.route('/export/tarefas', methods=['POST'])
+def criar_tarefa_exportacao():
+    """Agenda uma exportação em segundo plano (mesmos parâmetros de GET /export, no corpo JSON; filtros também como lista)"""
+    dados, erro = corpo_objeto()
+    if erro:
+        return erro
+    parametros, erro = _parametros(dados)
+    if erro:
+        return erro
+
+    app = current_app._get_current_object()
+
+    def executar(destino):
+        with app.app_context():
+            return gravar(parametros['formato'], _linhas(parametros), destino, parametros['inicio'], parametros['fim'])
+
+    tarefa = tarefas_exportacao.criar(parametros['formato'], executar, _nome_arquivo(parametros))
+    local = url_for('exportacao.status_tarefa_exportacao', tarefa_id=tarefa['id'])
+    return jsonify({**tarefa, 'status_url': local}), 202, {'Location': local}
+
+@exportacao_bp.route('/export/tarefas/<tarefa_id>', methods=['GET'])
+def status_tarefa_exportacao(tarefa_id):
+    """Estado da exportação; quando concluída, traz o link de download"""
+    tarefa = tarefas_exportacao.descrever(tarefa_id)
+    if tarefa is None:
+        return jsonify({'error': 'Exportação não encontrada ou expirada'}), 404
+    if tarefa['status'] == 'concluida':
+        tarefa['download'] = url_for('exportacao.baixar_exportacao', tarefa_id=tarefa_id)
+    return jsonify(tarefa)
+
+@exportacao_bp.route('/export/tarefas/<tarefa_id>/arquivo', methods=['GET'])
+def baixar_exportacao(tarefa_id):
+    """Baixa o arquivo de uma exportação concluída"""
+    tarefa = tarefas_exportacao.obter(tarefa_id)
+    if tarefa is None:
+        return jsonify({'error': 'Exportação não encontrada ou expirada'}), 404
+    if tarefa['status'] != 'concluida':
+        return jsonify({'error': 'Exportação ainda não concluída', 'status': tarefa['status']}), 409
+    return send_file(tarefa['caminho'], mimetype=FORMATOS[tarefa['formato']][0],
+                     as_attachment=True, download_name=tarefa['nome_arquivo'])
@@ -0,0 +1,89 @@
+import datetime
+import sys
+from flask import Blueprint, request, jsonify
+from src.database import db
+from src.models.funcionario import Funcionario
+from src.models.tarefa import Tarefa
+from src.models.agenda import Agenda
+from src.models.agenda_excecao import AgendaExcecao
+from src.services.horarios import data_do_parametro
+from src.services.metricas import metricas
+from src.services.requisicao import numero_do_parametro
+from src.services.versoes import versoes_dados
+
+kpis_bp = Blueprint('kpis', __name__)
+
+# Tabelas que alimentam os indicadores (a versão delas entra na chave do cache)
+TABELAS_KPI = ('funcionarios', 'tarefas', 'agenda', 'agenda_excecoes')
+
+def _metricas_cache_kpis():
+    # O serviço só é carregado na primeira consulta; até lá não há cache a reportar
+    servico = sys.modules.get('src.services.kpis')
+    if servico is None:
+        return []
+    resultados = servico.motor_kpis.resultados
+    return [
+        ('workspace_cache_consultas_total', ('kpis', 'acerto'), resultados.acertos),
+        ('workspace_cache_consultas_total', ('kpis', 'falta'), resultados.faltas),
+    ]
+
+metricas.registrar_coletor(_metricas_cache_kpis)
+
+def carregar_tabela():
+    """Lê só as colunas usadas, como tuplas (sem montar objetos do ORM)"""
+    # Importado aqui para o NumPy não pesar no início do processo
+    from src.services.kpis import TabelaAgenda
+
+    return TabelaAgenda(
+        db.session.query(Funcionario.id, Funcionario.nome, Funcionario.horario_inicio, Funcionario.horario_fim)
+        .order_by(Funcionario.id).all(),
+        db.session.query(Tarefa.id, Tarefa.nome, Tarefa.categoria, Tarefa.computar_horas).all(),
+        db.session.query(Agenda.id, Agenda.funcionario_id, Agenda.tarefa_id, Agenda.horario, Agenda.duracao,
+                         Agenda.data, Agenda.recorrencia).all(),
+        db.session.query(AgendaExcecao.agenda_id, AgendaExcecao.data, AgendaExcecao.cancelado,
+                         AgendaExcecao.horario, AgendaExcecao.tarefa_id, AgendaExcecao.duracao).all()
+    )
+
+@kpis_bp.route('/kpis', methods=['GET'])
+def get_kpis():
+    """
+    Indicadores do cronograma no intervalo
+
+    Parâmetros:
+        inicio, fim: datas YYYY-MM-DD (padrão: últimos 28 dias até hoje)
+        funcionarios: IDs separados por vírgula (padrão: todos)
+        limite_sobrecarga: fração da capacidade diária acima da qual o dia é sobrecarga (padrão 1.0)
+        lacuna_minima: menor lacuna de ociosidade listada, em minutos (padrão 60)
+    """
+    from src.services.kpis import LACUNA_MINIMA, LIMITE_SOBRECARGA, MAX_DIAS_KPI, motor_kpis
+
+    try:
+        fim = data_do_parametro(request.args.get('fim'), 'fim') or datetime.date.today()
+        inicio = data_do_parametro(request.args.get('inicio'), 'inicio') or fim - datetime.timedelta(days=27)
+        limite_sobrecarga = numero_do_parametro('limite_sobrecarga', LIMITE_SOBRECARGA)
+        lacuna_minima = numero_do_parametro('lacuna_minima', LACUNA_MINIMA, int)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if fim < inicio:
+        return jsonify({'error': 'fim não pode ser antes de inicio'}), 400
+    if (fim - inicio).days >= MAX_DIAS_KPI:
+        return jsonify({'error': f'Intervalo de datas longo demais (máximo {MAX_DIAS_KPI} dias)'}), 400
+    if limite_sobrecarga <= 0:
+        return jsonify({'error': 'limite_sobrecarga deve ser um número positivo'}), 400
+    if lacuna_minima <= 0:
+        return jsonify({'error': 'lacuna_minima deve ser um número positivo de minutos'}), 400
+
+    versao = versoes_dados.versao(*TABELAS_KPI)
+    funcionarios = None
+    if request.args.get('funcionarios'):
+        funcionarios = [f.strip() for f in request.args['funcionarios'].split(',') if f.strip()]
+        conhecidos = set(motor_kpis.tabela(versao, carregar_tabela).funcionarios)
+        desconhecidos = [f for f in funcionarios if f not in conhecidos]
+        if desconhecidos:
+            return jsonify({'error': f"Funcionários não encontrados: {', '.join(desconhecidos)}"}), 404
+
+    return jsonify(motor_kpis.kpis(
+        versao, carregar_tabela, inicio, fim, funcionarios,
+        limite_sobrecarga=limite_sobrecarga, lacuna_minima=lacuna_minima
+    ))
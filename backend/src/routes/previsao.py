@@ -0,0 +1,69 @@
+import datetime
+import time
+from flask import Blueprint, request, jsonify
+from src.database import db
+from src.models.demanda import Demanda
+from src.models.tarefa_a_fazer import TarefaAFazer
+from src.routes.kpis import TABELAS_KPI, carregar_tabela
+from src.services.horarios import data_do_parametro
+from src.services.requisicao import numero_do_parametro
+from src.services.versoes import versoes_dados
+
+previsao_bp = Blueprint('previsao', __name__)
+
+# Além das tabelas do cronograma, as entregas concluídas entram no ajuste
+TABELAS_PREVISAO = TABELAS_KPI + ('tarefas_a_fazer', 'demandas')
+
+def carregar_entregas():
+    """(funcionário, momento da conclusão) das tarefas a fazer e demandas concluídas"""
+    tarefas = db.session.query(TarefaAFazer.funcionario_responsavel_id, TarefaAFazer.data_conclusao) \
+        .filter(TarefaAFazer.concluida.is_(True), TarefaAFazer.data_conclusao.isnot(None)).all()
+    demandas = db.session.query(Demanda.funcionario_id, Demanda.updated_at) \
+        .filter(Demanda.status == 'concluida').all()
+    return tarefas + demandas
+
+@previsao_bp.route('/previsao', methods=['GET'])
+def get_previsao():
+    """
+    Projeção de carga para os próximos dias
+
+    Parâmetros:
+        inicio: primeiro dia previsto, YYYY-MM-DD (padrão: próxima segunda-feira; não pode ser antes de hoje)
+        dias: quantidade de dias (padrão 7, máximo 28)
+        funcionarios: IDs separados por vírgula (padrão: todos)
+        limite_sobrecarga: fração da capacidade da hora acima da qual a hora é sobrecarga (padrão 1.0)
+    """
+    # Importado aqui para o NumPy não pesar no início do processo
+    from src.services.previsao import LIMITE_SOBRECARGA, MAX_DIAS_PREVISAO, prever_semana, previsao_carga
+
+    hoje = datetime.date.today()
+    try:
+        inicio = data_do_parametro(request.args.get('inicio'), 'inicio') or hoje + datetime.timedelta(days=7 - hoje.weekday())
+        dias = numero_do_parametro('dias', 7, int)
+        limite_sobrecarga = numero_do_parametro('limite_sobrecarga', LIMITE_SOBRECARGA)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if inicio < hoje:
+        return jsonify({'error': 'inicio não pode ser antes de hoje'}), 400
+    if not 1 <= dias <= MAX_DIAS_PREVISAO:
+        return jsonify({'error': f'dias deve estar entre 1 e {MAX_DIAS_PREVISAO}'}), 400
+    if limite_sobrecarga <= 0:
+        return jsonify({'error': 'limite_sobrecarga deve ser um número positivo'}), 400
+
+    comeco = time.perf_counter()
+    ajuste, info = previsao_carga.ajuste(versoes_dados.versao(*TABELAS_PREVISAO), carregar_tabela,
+                                         carregar_entregas, hoje)
+    info['tempo_ms'] = round((time.perf_counter() - comeco) * 1000, 2)
+
+    funcionarios = None
+    if request.args.get('funcionarios'):
+        funcionarios = [f.strip() for f in request.args['funcionarios'].split(',') if f.strip()]
+        desconhecidos = [f for f in funcionarios if f not in ajuste.tabela.funcionarios]
+        if desconhecidos:
+            return jsonify({'error': f"Funcionários não encontrados: {', '.join(desconhecidos)}"}), 404
+
+    return jsonify({
+        **prever_semana(ajuste, inicio, dias, funcionarios, limite_sobrecarga),
+        'ajuste': info
+    })
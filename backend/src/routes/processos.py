@@ -0,0 +1,65 @@
+from flask import Blueprint, request, jsonify
+from src.models.processo import Processo
+from src.services.busca import busca_global, documento_processo
+from src.services.concorrencia import com_etag, precondicao_falhou, salvar
+from src.services.processos import aplicar_operacoes, merge_patch, validar_processo
+
+processos_bp = Blueprint('processos', __name__)
+
+MERGE_PATCH = 'application/merge-patch+json'
+
+@processos_bp.route('/processos', methods=['GET'])
+def get_processos_resumo():
+    """Lista os processos sem os passos (os passos nem são lidos do banco)"""
+    processos = Processo.query.order_by(Processo.tarefa_id).all()
+    return jsonify([processo.to_resumo() for processo in processos])
+
+@processos_bp.route('/processos/<tarefa_id>', methods=['GET'])
+def get_processo(tarefa_id):
+    """Retorna um processo completo (o ETag vai no cabeçalho, para o If-Match do PATCH)"""
+    processo = Processo.query.filter_by(tarefa_id=tarefa_id).first_or_404()
+    return com_etag(jsonify(processo.to_dict()), processo)
+
+@processos_bp.route('/processos/<tarefa_id>', methods=['PATCH'])
+def patch_processo(tarefa_id):
+    """
+    Edita um processo sem reenviar tudo
+
+    - Content-Type application/merge-patch+json: JSON Merge Patch (RFC 7386)
+      sobre o processo; listas (passos, observacoes) são substituídas inteiras
+    - Content-Type application/json com {"operacoes": [...]}: operações sobre
+      os passos (inserir, editar, remover, mover), ver aplicar_operacoes
+
+    Com If-Match, responde 412 se o processo mudou desde a leitura.
+    """
+    processo = Processo.query.filter_by(tarefa_id=tarefa_id).first_or_404()
+    falhou = precondicao_falhou(processo, Processo.to_dict)
+    if falhou:
+        return falhou
+
+    corpo = request.get_json(force=True, silent=True)
+    if corpo is None:
+        return jsonify({'error': 'Corpo JSON inválido'}), 400
+
+    atual = processo.to_dict()
+    if request.mimetype == MERGE_PATCH:
+        novo = merge_patch(atual, corpo)
+    elif isinstance(corpo, dict) and isinstance(corpo.get('operacoes'), list):
+        try:
+            novo = {**atual, 'passos': aplicar_operacoes(atual['passos'], corpo['operacoes'])}
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    else:
+        return jsonify({'error': f'Use {MERGE_PATCH} ou {{"operacoes": [...]}}'}), 415
+
+    erro = validar_processo(novo)
+    if erro:
+        return jsonify({'error': erro}), 400
+
+    processo.atualizar(novo)
+    falhou = salvar(processo, Processo.to_dict)
+    if falhou:
+        return falhou
+
+    busca_global.indexar('processo', documento_processo(tarefa_id, novo))
+    return com_etag(jsonify(processo.to_dict()), processo)
@@ -4,13 +4,15 @@ from src.database import db
 from src.models.funcionario import Funcionario
 from src.models.tarefa import Tarefa
 from src.models.agenda import Agenda
+from src.models.processo import Processo
+from src.services.metricas import medir_arquivo_json
 
 def seed_database():
     """Popula o banco de dados com os dados iniciais"""
     try:
         # Carrega dados do JSON
         data_path = os.path.join(os.path.dirname(__file__), 'data', 'agenda.json')
-        with open(data_path, 'r', encoding='utf-8') as f:
+        with medir_arquivo_json(data_path, 'carregar'), open(data_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
         print("Populando banco de dados...")
@@ -34,7 +36,8 @@ def seed_database():
                 categoria=tarefa_data['categoria'],
                 tempo_estimado=tarefa_data['tempoEstimado'],
                 descricao=tarefa_data['descricao'],
-                prioridade=tarefa_data['prioridade']
+                prioridade=tarefa_data['prioridade'],
+                computar_horas=tarefa_data.get('computar_horas', True)
             )
             db.session.add(tarefa)
         
@@ -43,7 +46,8 @@ def seed_database():
             agenda = Agenda(
                 horario=agenda_data['horario'],
                 funcionario_id=agenda_data['funcionario'],
-                tarefa_id=agenda_data['tarefa']
+                tarefa_id=agenda_data['tarefa'],
+                duracao=agenda_data.get('duracao', 30)
             )
             db.session.add(agenda)
         
@@ -53,4 +57,24 @@ def seed_database():
         
     except Exception as e:
         print(f"❌ Erro ao popular banco: {e}")
-        db.session.rollback()
\ No newline at end of file
+        db.session.rollback()
+
+def seed_processos():
+    """Popula a tabela de processos a partir de processos.json"""
+    try:
+        data_path = os.path.join(os.path.dirname(__file__), 'data', 'processos.json')
+        with medir_arquivo_json(data_path, 'carregar'), open(data_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        print("Populando processos...")
+        for tarefa_id, processo_data in data.items():
+            processo = Processo(tarefa_id=tarefa_id)
+            processo.atualizar(processo_data)
+            db.session.add(processo)
+
+        db.session.commit()
+        print("✅ Processos populados com sucesso!")
+
+    except Exception as e:
+        print(f"❌ Erro ao popular processos: {e}")
+        db.session.rollback()
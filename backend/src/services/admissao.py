@@ -0,0 +1,340 @@
+"""
+Controle de admissão
+Limita cada cliente com baldes de fichas por classe de rota (leitura, escrita,
+sync) e limita as requisições simultâneas do processo, com uma fila curta.
+Quem passa do limite recebe 429 na hora; com o processo cheio e a fila
+lotada (ou a espera esgotada), 503. As duas respostas levam Retry-After.
+
+A checagem roda como middleware WSGI, antes do Flask: recusar custa alguns
+microssegundos e não toca em banco nem arquivos. Assim uma aba presa num
+loop em /api/admin/dados-completos gasta as próprias fichas e não atrasa os
+outros clientes.
+
+Os limites são por processo: com vários processos do gunicorn, cada um
+conta à parte (o limite efetivo de um cliente é o configurado vezes o
+número de processos que o atendem).
+
+Variáveis de ambiente:
+    ADMISSAO                   '0' desliga (padrão: ligado)
+    ADMISSAO_LEITURA           taxa/rajada das leituras, em requisições por segundo (padrão 20/40)
+    ADMISSAO_ESCRITA           taxa/rajada das escritas (padrão 5/20)
+    ADMISSAO_SYNC              taxa/rajada de sincronização, exportação e dumps completos (padrão 0.2/3)
+    ADMISSAO_MAX_SIMULTANEAS   requisições em andamento por processo (padrão 32)
+    ADMISSAO_MAX_SYNC          das quais de sync (padrão 2): rotas caras não tomam todas as vagas
+    ADMISSAO_FILA              requisições esperando vaga (padrão 64)
+    ADMISSAO_ESPERA_MS         espera máxima na fila (padrão 500)
+    ADMISSAO_CABECALHO_CLIENTE cabeçalho que identifica o usuário (ex.: X-User-Id, posto
+                               por um proxy autenticado); sem ele, o cliente é o IP
+    ADMISSAO_PROXIES           proxies confiáveis na frente do app (padrão 1 no Render, que
+                               define RENDER; 0 nos demais): o IP do cliente é o que o
+                               proxy mais externo acrescentou ao X-Forwarded-For. Com 0,
+                               vale o REMOTE_ADDR, que atrás de um proxy é o mesmo para todos
+
+A vaga de execução é conferida antes do balde: uma requisição recusada com
+503 não gasta ficha do cliente.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.services.metricas import metricas
+
+# Rotas fora do controle: sondas, métricas, acompanhamento de mudanças (conexões
+# longas e baratas) e notificações do Google (que já vêm autenticadas pelo canal)
+ISENTAS = ('/api/health', '/health', '/api/ready', '/metrics', '/api/mudancas', '/api/calendar/notificacoes')
+
+# Rotas caras ou de sincronização, com limite próprio: (método, caminho exato) e
+# (método, prefixo). Consultas baratas das mesmas áreas (situação de uma
+# exportação, lista de canais, eventos em cache) são leituras comuns, já que
+# o painel as consulta em intervalos curtos.
+ROTAS_SYNC = frozenset({
+    ('GET', '/api/export'),
+    ('POST', '/api/export/tarefas'),
+    ('POST', '/api/agenda/gerar'),
+    ('GET', '/api/admin/dados-completos'),
+    ('POST', '/api/calendar/canais'),
+})
+PREFIXOS_SYNC = (('DELETE', '/api/calendar/canais/'),)
+
+# POSTs que só leem (os itens de um lote são cobrados um a um)
+ROTAS_LEITURA = ('/api/batch',)
+
+CLASSES = ('leitura', 'escrita', 'sync')
+
+_LIMITES_PADRAO = {'leitura': (20.0, 40.0), 'escrita': (5.0, 20.0), 'sync': (0.2, 3.0)}
+
+
+def classificar(metodo: str, caminho: str) -> Optional[str]:
+    """Classe da rota, ou None para rotas fora do controle"""
+    if metodo == 'OPTIONS' or any(caminho == r or caminho.startswith(r + '/') for r in ISENTAS):
+        return None
+    chave = ('GET' if metodo == 'HEAD' else metodo, caminho.rstrip('/') or '/')
+    if chave in ROTAS_SYNC or any(metodo == m and caminho.startswith(p) for m, p in PREFIXOS_SYNC):
+        return 'sync'
+    return 'leitura' if metodo in ('GET', 'HEAD') or caminho in ROTAS_LEITURA else 'escrita'
+
+
+def _limite(valor: Optional[str], padrao: Tuple[float, float]) -> Tuple[float, float]:
+    """'taxa/rajada' (ex.: '20/40'); só a taxa usa rajada = 2 x taxa"""
+    if not valor:
+        return padrao
+    try:
+        taxa, _, rajada = valor.partition('/')
+        taxa = float(taxa)
+        return taxa, float(rajada) if rajada else max(2 * taxa, 1.0)
+    except ValueError:
+        return padrao
+
+
+def _env_int(nome: str, padrao: int) -> int:
+    try:
+        return int(os.environ[nome])
+    except (KeyError, ValueError):
+        return padrao
+
+
+class ControleAdmissao:
+    """
+    Baldes de fichas por (classe, cliente) e vagas de execução do processo
+
+    Cada balde enche `taxa` fichas por segundo até `rajada`; uma requisição
+    gasta uma ficha. Baldes cheios são descartados quando há clientes demais,
+    já que um balde cheio é igual a um balde novo.
+    """
+
+    def __init__(self, limites: Optional[Dict[str, Tuple[float, float]]] = None, max_simultaneas: int = 32,
+                 max_sync: int = 2, fila: int = 64, espera_max: float = 0.5, max_clientes: int = 10000,
+                 cabecalho_cliente: Optional[str] = None, proxies: int = 0):
+        self.limites = dict(_LIMITES_PADRAO, **(limites or {}))
+        self.max_simultaneas = max_simultaneas
+        self.max_sync = max_sync
+        self.fila = fila
+        self.espera_max = espera_max
+        self.max_clientes = max_clientes
+        self.cabecalho_cliente = cabecalho_cliente
+        self.proxies = proxies
+        self._lock = threading.Lock()
+        self._vagas = threading.Condition(self._lock)
+        self._baldes: Dict[Tuple[str, str], List[float]] = {}
+        self.em_andamento = 0
+        self.sync_em_andamento = 0
+        self.na_fila = 0
+        self.decisoes: Dict[Tuple[str, str], int] = {}
+
+    @classmethod
+    def do_ambiente(cls) -> 'ControleAdmissao':
+        return cls(
+            limites={classe: _limite(os.getenv(f'ADMISSAO_{classe.upper()}'), padrao)
+                     for classe, padrao in _LIMITES_PADRAO.items()},
+            max_simultaneas=max(_env_int('ADMISSAO_MAX_SIMULTANEAS', 32), 1),
+            max_sync=max(_env_int('ADMISSAO_MAX_SYNC', 2), 1),
+            fila=max(_env_int('ADMISSAO_FILA', 64), 0),
+            espera_max=max(_env_int('ADMISSAO_ESPERA_MS', 500), 0) / 1000,
+            cabecalho_cliente=os.getenv('ADMISSAO_CABECALHO_CLIENTE') or None,
+            proxies=max(_env_int('ADMISSAO_PROXIES', 1 if os.getenv('RENDER') else 0), 0),
+        )
+
+    def cliente(self, ip: Optional[str], cabecalho: Callable[[str], Optional[str]]) -> str:
+        """
+        Identidade do cliente: o usuário (se houver cabeçalho configurado) ou o IP
+
+        Atrás de `proxies` proxies confiáveis, o IP é o `proxies`-ésimo a partir
+        do fim do X-Forwarded-For: os anteriores vêm do próprio cliente e podem
+        ser forjados.
+        """
+        if self.cabecalho_cliente:
+            usuario = cabecalho(self.cabecalho_cliente)
+            if usuario:
+                return 'usuario:' + usuario
+        if self.proxies:
+            encaminhados = [i.strip() for i in (cabecalho('X-Forwarded-For') or '').split(',') if i.strip()]
+            if encaminhados:
+                return encaminhados[-min(self.proxies, len(encaminhados))]
+        return ip or 'desconhecido'
+
+    def _contar(self, classe: str, resultado: str):
+        # Chamado com a trava
+        chave = (classe, resultado)
+        self.decisoes[chave] = self.decisoes.get(chave, 0) + 1
+
+    def limitar(self, classe: str, cliente: str, agora: Optional[float] = None) -> Optional[float]:
+        """Gasta uma ficha; devolve None se havia ficha, ou os segundos até a próxima"""
+        taxa, rajada = self.limites[classe]
+        agora = time.monotonic() if agora is None else agora
+        chave = (classe, cliente)
+        with self._lock:
+            balde = self._baldes.get(chave)
+            if balde is None:
+                if len(self._baldes) >= self.max_clientes:
+                    self._podar(agora)
+                balde = self._baldes[chave] = [rajada, agora]
+            else:
+                balde[0] = min(rajada, balde[0] + (agora - balde[1]) * taxa)
+                balde[1] = agora
+            if balde[0] >= 1:
+                balde[0] -= 1
+                return None
+            self._contar(classe, 'limitada')
+            return (1 - balde[0]) / taxa if taxa > 0 else 60.0
+
+    def _podar(self, agora: float):
+        # Chamado com a trava: remove os baldes que já teriam enchido
+        for chave, (fichas, ultimo) in list(self._baldes.items()):
+            taxa, rajada = self.limites[chave[0]]
+            if fichas + (agora - ultimo) * taxa >= rajada:
+                del self._baldes[chave]
+        if len(self._baldes) >= self.max_clientes:
+            # Todos ativos: esquece os criados há mais tempo (perdem só o histórico recente)
+            for chave in list(self._baldes)[:len(self._baldes) // 2]:
+                del self._baldes[chave]
+
+    def _cabe(self, classe: str) -> bool:
+        # Chamado com a trava
+        if self.em_andamento >= self.max_simultaneas:
+            return False
+        return classe != 'sync' or self.sync_em_andamento < self.max_sync
+
+    def entrar(self, classe: str) -> bool:
+        """Ocupa uma vaga de execução, esperando na fila até `espera_max`; False se não conseguiu"""
+        with self._vagas:
+            if self._cabe(classe):
+                self._ocupar(classe, 'aceita')
+                return True
+            if self.na_fila >= self.fila:
+                self._contar(classe, 'sobrecarga')
+                return False
+            self.na_fila += 1
+            try:
+                limite = time.monotonic() + self.espera_max
+                while not self._cabe(classe):
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        self._contar(classe, 'fila_esgotada')
+                        return False
+                    self._vagas.wait(restante)
+                self._ocupar(classe, 'aceita_da_fila')
+                return True
+            finally:
+                self.na_fila -= 1
+
+    def _ocupar(self, classe: str, resultado: str):
+        # Chamado com a trava
+        self.em_andamento += 1
+        if classe == 'sync':
+            self.sync_em_andamento += 1
+        self._contar(classe, resultado)
+
+    def sair(self, classe: str):
+        with self._vagas:
+            self.em_andamento -= 1
+            if classe == 'sync':
+                self.sync_em_andamento -= 1
+            # Quem espera pode ser de outra classe (um sync não cabe onde uma leitura cabe)
+            self._vagas.notify_all()
+
+    def estado(self) -> Iterable[Tuple[str, Tuple[str, ...], float]]:
+        """Contadores no formato dos coletores de src/services/metricas.py"""
+        with self._lock:
+            decisoes = list(self.decisoes.items())
+            medidas = [
+                ('workspace_admissao_em_andamento', (), self.em_andamento),
+                ('workspace_admissao_fila', (), self.na_fila),
+                ('workspace_admissao_clientes', (), len(self._baldes)),
+            ]
+        return [('workspace_admissao_decisoes_total', chave, total) for chave, total in decisoes] + medidas
+
+
+def resposta_recusada(status: int, espera: float) -> Tuple[str, List[Tuple[str, str]], bytes]:
+    """(status, cabeçalhos, corpo) de um 429/503"""
+    segundos = max(int(math.ceil(espera)), 1)
+    if status == 429:
+        linha, mensagem = '429 Too Many Requests', 'Muitas requisições; tente de novo mais tarde'
+    else:
+        linha, mensagem = '503 Service Unavailable', 'Servidor sobrecarregado; tente de novo mais tarde'
+    corpo = json.dumps({'error': mensagem, 'retry_after': segundos}, ensure_ascii=False).encode('utf-8')
+    return linha, [
+        ('Content-Type', 'application/json'),
+        ('Content-Length', str(len(corpo))),
+        ('Retry-After', str(segundos)),
+        ('Access-Control-Allow-Origin', '*'),
+    ], corpo
+
+
+class _Liberar:
+    """Iterável de resposta que devolve a vaga quando o servidor termina de enviar"""
+
+    def __init__(self, resposta, liberar: Callable[[], None]):
+        self._resposta = resposta
+        self._liberar = liberar
+
+    def __iter__(self):
+        return iter(self._resposta)
+
+    def close(self):
+        try:
+            if hasattr(self._resposta, 'close'):
+                self._resposta.close()
+        finally:
+            liberar, self._liberar = self._liberar, None
+            if liberar:
+                liberar()
+
+
+class MiddlewareAdmissao:
+    """Middleware WSGI que aplica o controle de admissão antes do app"""
+
+    def __init__(self, wsgi_app, controle: ControleAdmissao):
+        self.wsgi_app = wsgi_app
+        self.controle = controle
+
+    def __call__(self, environ, start_response):
+        classe = classificar(environ.get('REQUEST_METHOD', 'GET'), environ.get('PATH_INFO', '/'))
+        if classe is None:
+            return self.wsgi_app(environ, start_response)
+
+        cliente = self.controle.cliente(environ.get('REMOTE_ADDR'),
+                                        lambda nome: environ.get('HTTP_' + nome.upper().replace('-', '_')))
+        if environ.get('workspace.lote'):
+            # Item de um lote (src/services/lote.py): a requisição do lote já ocupa a vaga
+            espera = self.controle.limitar(classe, cliente)
+            if espera is not None:
+                return self._recusar(start_response, 429, espera)
+            return self.wsgi_app(environ, start_response)
+
+        # Vaga antes da ficha: um 503 não gasta o balde do cliente
+        if not self.controle.entrar(classe):
+            return self._recusar(start_response, 503, 1)
+        espera = self.controle.limitar(classe, cliente)
+        if espera is not None:
+            self.controle.sair(classe)
+            return self._recusar(start_response, 429, espera)
+        try:
+            resposta = self.wsgi_app(environ, start_response)
+        except BaseException:
+            self.controle.sair(classe)
+            raise
+        return _Liberar(resposta, lambda: self.controle.sair(classe))
+
+    def _recusar(self, start_response, status: int, espera: float):
+        linha, cabecalhos, corpo = resposta_recusada(status, espera)
+        start_response(linha, cabecalhos)
+        return [corpo]
+
+
+def controlar_app(app, controle: Optional[ControleAdmissao] = None) -> Optional[ControleAdmissao]:
+    """
+    Coloca o controle de admissão na frente do app Flask e expõe os contadores em /metrics
+
+    Devolve o controle (None com ADMISSAO=0), para a superfície ASGI usar os mesmos baldes.
+    """
+    if controle is None:
+        if os.getenv('ADMISSAO', '1') == '0':
+            return None
+        controle = ControleAdmissao.do_ambiente()
+    app.wsgi_app = MiddlewareAdmissao(app.wsgi_app, controle)
+    metricas.registrar_coletor(controle.estado)
+    return controle
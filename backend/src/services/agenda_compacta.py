@@ -0,0 +1,224 @@
+"""
+Agenda compacta, só para leitura
+Guarda os agendamentos em colunas paralelas (`array`) em vez de uma lista de
+dicionários: minuto de início, índice do funcionário, índice da tarefa,
+duração e data (ordinal), com os ids de funcionários e tarefas numa tabela
+só. Os agendamentos ficam agrupados por funcionário e por data (permutação
+mais offsets), e as respostas JSON da agenda inteira e de cada funcionário
+são codificadas uma vez, na carga: /api/agenda/funcionario/<id> vira uma
+consulta num dicionário.
+
+Agendamentos com campos além de horario, funcionario, tarefa, duracao e
+data (ex.: recorrencia), ou com valores fora do formato esperado, ficam
+guardados como vieram, à parte; as colunas deles só servem para agrupar.
+
+Usado pelo app_simple.py e pelo minimal_api.py, que carregam os dados uma
+vez. As funções da Vercel em api/ já servem bytes gerados no build
+(api/_dados.py), sem linhas em memória.
+"""
+
+import datetime
+import json
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+CAMPOS = frozenset(('data', 'duracao', 'funcionario', 'horario', 'tarefa'))
+
+# Marcadores de ausência nas colunas
+SEM_DURACAO = -1
+SEM_DATA = 0
+SEM_ID = 0xFFFF
+
+_HORARIOS = [f'{minuto // 60:02d}:{minuto % 60:02d}' for minuto in range(24 * 60)]
+
+
+def _json(dados) -> str:
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+def _minuto(horario) -> Optional[int]:
+    """'HH:MM' -> minutos desde 00:00 (None fora desse formato exato)"""
+    if not isinstance(horario, str) or len(horario) != 5 or horario[2] != ':':
+        return None
+    try:
+        minuto = int(horario[:2]) * 60 + int(horario[3:])
+    except ValueError:
+        return None
+    return minuto if 0 <= minuto < 24 * 60 and _HORARIOS[minuto] == horario else None
+
+
+def _ordinal(data) -> Optional[int]:
+    """'AAAA-MM-DD' -> date.toordinal() (None fora desse formato exato)"""
+    if not isinstance(data, str) or len(data) != 10:
+        return None
+    try:
+        dia = datetime.date.fromisoformat(data)
+    except ValueError:
+        return None
+    return dia.toordinal() if dia.isoformat() == data else None
+
+
+class TabelaIds:
+    """Ids (internados) <-> índices de 16 bits, com o id já codificado em JSON (até 65.535 ids)"""
+
+    def __init__(self, ids: Sequence[str] = ()):
+        self.ids: List[str] = []
+        self.json: List[str] = []
+        self.indices: Dict[str, int] = {}
+        for id_ in ids:
+            self.indice(id_)
+
+    def indice(self, id_) -> int:
+        if not isinstance(id_, str):
+            return SEM_ID
+        indice = self.indices.get(id_)
+        if indice is None:
+            if len(self.ids) >= SEM_ID:
+                return SEM_ID
+            id_ = sys.intern(id_)
+            indice = self.indices[id_] = len(self.ids)
+            self.ids.append(id_)
+            self.json.append(json.dumps(id_, ensure_ascii=False))
+        return indice
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def _agrupar(chaves: array, grupos: int) -> Tuple[array, array]:
+    """
+    Ordenação por contagem: (ordem, offsets), com as linhas do grupo g em
+    ordem[offsets[g]:offsets[g + 1]], na ordem original
+    """
+    contagens = [0] * (grupos + 1)
+    for chave in chaves:
+        contagens[chave + 1] += 1
+    for grupo in range(grupos):
+        contagens[grupo + 1] += contagens[grupo]
+    offsets = array('I', contagens)
+    proximas = contagens[:-1]
+    ordem = array('I', bytes(4 * len(chaves)))
+    for linha, chave in enumerate(chaves):
+        ordem[proximas[chave]] = linha
+        proximas[chave] += 1
+    return ordem, offsets
+
+
+class AgendaCompacta:
+    """
+    Agendamentos em colunas, agrupados por funcionário e por data
+
+    Colunas (uma posição por agendamento, na ordem original):
+        inicio       minuto do dia (int16)
+        funcionario  índice em `funcionarios` (uint16; SEM_ID se não for texto)
+        tarefa       índice em `tarefas` (uint16)
+        duracao      minutos (int16; SEM_DURACAO se ausente)
+        data         date.toordinal() (int32; SEM_DATA nos agendamentos sem data)
+    """
+
+    def __init__(self, agenda: Sequence[Dict], funcionarios: Sequence[Dict] = (), tarefas: Sequence[Dict] = ()):
+        self.funcionarios = TabelaIds([f['id'] for f in funcionarios if isinstance(f.get('id'), str)])
+        self.tarefas = TabelaIds([t['id'] for t in tarefas if isinstance(t.get('id'), str)])
+        self.inicio = array('h')
+        self.funcionario = array('H')
+        self.tarefa = array('H')
+        self.duracao = array('h')
+        self.data = array('i')
+        # Agendamentos fora do formato das colunas, guardados como vieram
+        self.extras: Dict[int, Dict] = {}
+
+        codificados: List[str] = []
+        for linha, item in enumerate(agenda):
+            codificados.append(self._adicionar(linha, item))
+
+        # Agrupamento por funcionário (SEM_ID vira o último grupo, que ninguém consulta)
+        chaves = array('H', (min(f, len(self.funcionarios)) for f in self.funcionario))
+        self.ordem_funcionario, self.offsets_funcionario = _agrupar(chaves, len(self.funcionarios) + 1)
+
+        # Agrupamento por data (só os datados)
+        self.datas = array('i', sorted(set(self.data) - {SEM_DATA}))
+        posicao = {data: n for n, data in enumerate(self.datas)}
+        chaves = array('I', (posicao.get(data, len(self.datas)) for data in self.data))
+        self.ordem_data, self.offsets_data = _agrupar(chaves, len(self.datas) + 1)
+
+        # Respostas codificadas uma vez
+        self.json_agenda = ('[' + ','.join(codificados) + ']').encode('utf-8')
+        self.json_por_funcionario: Dict[str, bytes] = {}
+        for indice, id_ in enumerate(self.funcionarios.ids):
+            linhas = self.ordem_funcionario[self.offsets_funcionario[indice]:self.offsets_funcionario[indice + 1]]
+            self.json_por_funcionario[id_] = ('[' + ','.join([codificados[n] for n in linhas]) + ']').encode('utf-8')
+
+    def _adicionar(self, linha: int, item: Dict) -> str:
+        """Acrescenta o agendamento às colunas; devolve ele codificado em JSON"""
+        funcionario = self.funcionarios.indice(item.get('funcionario'))
+        tarefa = self.tarefas.indice(item.get('tarefa'))
+        minuto = _minuto(item.get('horario'))
+        ordinal = _ordinal(item['data']) if 'data' in item else SEM_DATA
+        duracao = item['duracao'] if 'duracao' in item else SEM_DURACAO
+        compacto = (
+            CAMPOS.issuperset(item) and minuto is not None and funcionario != SEM_ID and tarefa != SEM_ID
+            and ordinal is not None
+            and ('duracao' not in item or (type(duracao) is int and 0 <= duracao < 0x8000))
+        )
+        self.funcionario.append(funcionario)
+        self.tarefa.append(tarefa)
+        if not compacto:
+            self.inicio.append(0)
+            self.duracao.append(SEM_DURACAO)
+            self.data.append(SEM_DATA)
+            self.extras[linha] = item
+            return _json(item)
+
+        self.inicio.append(minuto)
+        self.duracao.append(duracao)
+        self.data.append(ordinal)
+        # Mesmas chaves, em ordem alfabética, que _json(item) produziria
+        partes = []
+        if ordinal != SEM_DATA:
+            partes.append('"data":"' + item['data'] + '"')
+        if duracao != SEM_DURACAO:
+            partes.append('"duracao":' + str(duracao))
+        partes.append('"funcionario":' + self.funcionarios.json[funcionario])
+        partes.append('"horario":"' + _HORARIOS[minuto] + '"')
+        partes.append('"tarefa":' + self.tarefas.json[tarefa])
+        return '{' + ','.join(partes) + '}'
+
+    def __len__(self):
+        return len(self.inicio)
+
+    def linha(self, n: int) -> Dict:
+        """Agendamento n como dicionário (no formato original)"""
+        extra = self.extras.get(n)
+        if extra is not None:
+            return extra
+        item = {'horario': _HORARIOS[self.inicio[n]], 'funcionario': self.funcionarios.ids[self.funcionario[n]],
+                'tarefa': self.tarefas.ids[self.tarefa[n]]}
+        if self.duracao[n] != SEM_DURACAO:
+            item['duracao'] = self.duracao[n]
+        if self.data[n] != SEM_DATA:
+            item['data'] = datetime.date.fromordinal(self.data[n]).isoformat()
+        return item
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self.linha(n) for n in range(len(self)))
+
+    def do_funcionario(self, funcionario_id: str) -> List[Dict]:
+        indice = self.funcionarios.indices.get(funcionario_id)
+        if indice is None:
+            return []
+        inicio, fim = self.offsets_funcionario[indice], self.offsets_funcionario[indice + 1]
+        return [self.linha(n) for n in self.ordem_funcionario[inicio:fim]]
+
+    def do_dia(self, data: datetime.date) -> List[Dict]:
+        """Agendamentos datados do dia (os sem data, recorrentes, ficam de fora)"""
+        ordinal = data.toordinal()
+        posicao = bisect_left(self.datas, ordinal)
+        if posicao == len(self.datas) or self.datas[posicao] != ordinal:
+            return []
+        inicio, fim = self.offsets_data[posicao], self.offsets_data[posicao + 1]
+        return [self.linha(n) for n in self.ordem_data[inicio:fim]]
+
+    def json_do_funcionario(self, funcionario_id: str) -> bytes:
+        return self.json_por_funcionario.get(funcionario_id, b'[]')
@@ -0,0 +1,324 @@
+"""
+Busca textual no servidor
+Índice invertido em memória sobre tarefas, processos (com passos, recursos e
+observações), funcionários, demandas e tarefas a fazer, com ranking BM25
+"""
+
+import bisect
+import math
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Palavras muito comuns que não ajudam a diferenciar documentos
+STOPWORDS = {
+    'a', 'o', 'as', 'os', 'de', 'da', 'do', 'das', 'dos', 'e', 'em', 'no', 'na', 'nos', 'nas',
+    'um', 'uma', 'para', 'pra', 'por', 'com', 'se', 'que', 'ao', 'aos', 'ou',
+}
+
+# Parâmetros do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Peso de cada tipo de correspondência de um termo da consulta
+PESO_EXATO = 1.0
+PESO_PREFIXO = 0.8
+PESO_TYPO = 0.6
+
+# Máximo de termos do vocabulário considerados para um prefixo
+MAX_EXPANSOES_PREFIXO = 50
+
+_TOKEN = re.compile(r'\w+')
+
+Chave = Tuple[str, str]
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas e sem acentos ("Reunião" -> "reuniao")"""
+    decomposto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def tokenizar(texto: Optional[str]) -> List[str]:
+    return [t for t in _TOKEN.findall(normalizar(texto or '')) if t not in STOPWORDS]
+
+
+def _delecoes(termo: str) -> Set[str]:
+    """Variações do termo com uma letra a menos (vizinhança de distância 1)"""
+    return {termo[:i] + termo[i + 1:] for i in range(len(termo))}
+
+
+def _distancia_ate_1(a: str, b: str) -> bool:
+    """True se a e b diferem por no máximo uma inserção, remoção, troca ou transposição"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diferencas = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diferencas) == 1:
+            return True
+        return (len(diferencas) == 2 and diferencas[1] == diferencas[0] + 1
+                and a[diferencas[0]] == b[diferencas[1]] and a[diferencas[1]] == b[diferencas[0]])
+    if len(a) > len(b):
+        a, b = b, a
+    return any(b[:i] + b[i + 1:] == a for i in range(len(b)))
+
+
+class IndiceBusca:
+    """
+    Índice invertido com ranking BM25
+
+    Cada documento tem campos com peso (ex.: título pesa mais que descrição);
+    a frequência de um termo no documento é a soma ponderada das ocorrências.
+    Os termos são normalizados sem acento, então "reuniao" encontra "Reunião".
+
+    Cada termo da consulta casa com:
+    - o próprio termo
+    - termos que começam com ele (o usuário ainda está digitando)
+    - termos a uma letra de distância (erros de digitação), para termos com 4+ letras
+
+    Todos os termos da consulta precisam casar; se nenhum documento casa com
+    todos, o resultado cai para documentos que casam com qualquer termo.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.carregado = False
+        self._postings: Dict[str, Dict[Chave, float]] = {}
+        self._vocabulario: List[str] = []
+        self._delecoes: Dict[str, Set[str]] = defaultdict(set)
+        self._documentos: Dict[Chave, Dict] = {}
+        self._termos_doc: Dict[Chave, Dict[str, float]] = {}
+        self._tamanho_doc: Dict[Chave, float] = {}
+        self._tamanho_total = 0.0
+
+    # Manutenção
+
+    def adicionar(self, tipo: str, doc_id, campos: Iterable[Tuple[Optional[str], float]], exibicao: Dict):
+        """
+        Indexa (ou reindexa) um documento
+
+        Args:
+            campos: pares (texto, peso)
+            exibicao: dados devolvidos nos resultados (título, subtítulo...)
+        """
+        chave = (tipo, str(doc_id))
+        frequencias: Dict[str, float] = defaultdict(float)
+        for texto, peso in campos:
+            for termo in tokenizar(texto):
+                frequencias[termo] += peso
+
+        with self._lock:
+            self.remover(tipo, doc_id)
+            for termo, frequencia in frequencias.items():
+                if termo not in self._postings:
+                    self._postings[termo] = {}
+                    bisect.insort(self._vocabulario, termo)
+                    for variacao in _delecoes(termo):
+                        self._delecoes[variacao].add(termo)
+                self._postings[termo][chave] = frequencia
+            self._termos_doc[chave] = dict(frequencias)
+            self._documentos[chave] = {'tipo': tipo, 'id': doc_id, **exibicao}
+            self._tamanho_doc[chave] = sum(frequencias.values())
+            self._tamanho_total += self._tamanho_doc[chave]
+
+    def remover(self, tipo: str, doc_id):
+        chave = (tipo, str(doc_id))
+        with self._lock:
+            termos = self._termos_doc.pop(chave, None)
+            if termos is None:
+                return
+            self._documentos.pop(chave, None)
+            self._tamanho_total -= self._tamanho_doc.pop(chave, 0.0)
+            for termo in termos:
+                postings = self._postings.get(termo)
+                if postings is None:
+                    continue
+                postings.pop(chave, None)
+                if not postings:
+                    del self._postings[termo]
+                    posicao = bisect.bisect_left(self._vocabulario, termo)
+                    if posicao < len(self._vocabulario) and self._vocabulario[posicao] == termo:
+                        self._vocabulario.pop(posicao)
+                    for variacao in _delecoes(termo):
+                        self._delecoes[variacao].discard(termo)
+                        if not self._delecoes[variacao]:
+                            del self._delecoes[variacao]
+
+    def limpar(self):
+        with self._lock:
+            self.__init__()
+
+    def __len__(self):
+        return len(self._documentos)
+
+    # Consulta
+
+    def _expandir(self, termo: str) -> Dict[str, float]:
+        """Termos do vocabulário que casam com o termo da consulta, com o peso da correspondência"""
+        expansoes: Dict[str, float] = {}
+
+        inicio = bisect.bisect_left(self._vocabulario, termo)
+        for candidato in self._vocabulario[inicio:inicio + MAX_EXPANSOES_PREFIXO]:
+            if not candidato.startswith(termo):
+                break
+            expansoes[candidato] = PESO_EXATO if candidato == termo else PESO_PREFIXO
+
+        if len(termo) >= 4 and termo not in expansoes:
+            candidatos = set(self._delecoes.get(termo, ()))
+            for variacao in _delecoes(termo) | {termo}:
+                if variacao in self._postings:
+                    candidatos.add(variacao)
+                candidatos |= self._delecoes.get(variacao, set())
+            for candidato in candidatos:
+                if candidato not in expansoes and _distancia_ate_1(termo, candidato):
+                    expansoes[candidato] = PESO_TYPO
+        return expansoes
+
+    def buscar(self, consulta: str, tipos: Optional[Iterable[str]] = None, limite: int = 20) -> List[Dict]:
+        termos = list(dict.fromkeys(tokenizar(consulta)))
+        if not termos:
+            return []
+        tipos = set(tipos) if tipos else None
+
+        with self._lock:
+            total_docs = len(self._documentos)
+            if total_docs == 0:
+                return []
+            tamanho_medio = self._tamanho_total / total_docs
+
+            pontuacao_por_termo: List[Dict[Chave, float]] = []
+            for termo in termos:
+                pontuacao: Dict[Chave, float] = defaultdict(float)
+                for candidato, peso in self._expandir(termo).items():
+                    postings = self._postings[candidato]
+                    idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for chave, frequencia in postings.items():
+                        if tipos and chave[0] not in tipos:
+                            continue
+                        tf = frequencia * (BM25_K1 + 1) / (
+                            frequencia + BM25_K1 * (1 - BM25_B + BM25_B * self._tamanho_doc[chave] / tamanho_medio)
+                        )
+                        # Um documento conta a melhor correspondência de cada termo da consulta
+                        pontuacao[chave] = max(pontuacao[chave], peso * idf * tf)
+                pontuacao_por_termo.append(pontuacao)
+
+            todos = set.intersection(*(set(p) for p in pontuacao_por_termo))
+            chaves = todos or set().union(*pontuacao_por_termo)
+            resultados = [
+                (sum(p.get(chave, 0.0) for p in pontuacao_por_termo), chave)
+                for chave in chaves
+            ]
+            resultados.sort(key=lambda r: (-r[0], r[1]))
+            return [
+                {**self._documentos[chave], 'score': round(score, 4)}
+                for score, chave in resultados[:limite]
+            ]
+
+
+# Montagem dos documentos de cada tipo: dados -> (id, campos, exibição)
+
+def documento_funcionario(funcionario: Dict):
+    return funcionario['id'], [
+        (funcionario.get('nome'), 3.0),
+        (funcionario.get('id'), 1.0),
+    ], {
+        'titulo': funcionario.get('nome'),
+        'subtitulo': f"{funcionario.get('horarioInicio') or ''} - {funcionario.get('horarioFim') or ''}".strip(' -')
+    }
+
+
+def documento_tarefa(tarefa: Dict):
+    return tarefa['id'], [
+        (tarefa.get('nome'), 3.0),
+        (tarefa.get('descricao'), 1.0),
+        (tarefa.get('categoria'), 1.0),
+    ], {'titulo': tarefa.get('nome'), 'subtitulo': tarefa.get('descricao')}
+
+
+def documento_processo(processo_id: str, processo: Dict):
+    campos = [
+        (processo.get('titulo'), 3.0),
+        (processo.get('descricao'), 1.5),
+    ]
+    for passo in processo.get('passos') or []:
+        campos.append((passo.get('titulo'), 1.5))
+        campos.append((passo.get('descricao'), 1.0))
+        campos.extend((recurso, 1.0) for recurso in passo.get('recursos') or [])
+    campos.extend((observacao, 0.5) for observacao in processo.get('observacoes') or [])
+    return processo_id, campos, {'titulo': processo.get('titulo'), 'subtitulo': processo.get('descricao')}
+
+
+def documento_demanda(demanda: Dict):
+    return demanda['id'], [
+        (demanda.get('titulo'), 3.0),
+        (demanda.get('descricao'), 1.0),
+        (demanda.get('observacoes'), 0.5),
+    ], {'titulo': demanda.get('titulo'), 'subtitulo': demanda.get('descricao')}
+
+
+def documento_tarefa_a_fazer(tarefa: Dict):
+    return tarefa['id'], [
+        (tarefa.get('titulo'), 3.0),
+        (tarefa.get('descricao'), 1.0),
+        (tarefa.get('observacoes'), 0.5),
+        (tarefa.get('mensagem_whatsapp'), 0.5),
+    ], {'titulo': tarefa.get('titulo'), 'subtitulo': tarefa.get('descricao')}
+
+
+class BuscaGlobal:
+    """
+    Índice global com as fontes de cada tipo de documento
+
+    Cada fonte devolve a lista de documentos já montados (id, campos,
+    exibição); o índice é carregado na primeira busca e depois mantido pelas
+    rotas que escrevem (indexar/remover).
+    """
+
+    def __init__(self):
+        self.indice = IndiceBusca()
+        self._fontes: Dict[str, Callable[[], Iterable[Tuple]]] = {}
+        self._lock = threading.Lock()
+
+    def registrar_fonte(self, tipo: str, fonte: Callable[[], Iterable[Tuple]]):
+        self._fontes[tipo] = fonte
+        if self.indice.carregado:
+            self._carregar_tipo(tipo)
+
+    def carregar(self):
+        with self._lock:
+            if self.indice.carregado:
+                return
+            for tipo in self._fontes:
+                self._carregar_tipo(tipo)
+            self.indice.carregado = True
+
+    def recarregar(self):
+        with self._lock:
+            self.indice.limpar()
+        self.carregar()
+
+    def _carregar_tipo(self, tipo: str):
+        for doc_id, campos, exibicao in self._fontes[tipo]():
+            self.indice.adicionar(tipo, doc_id, campos, exibicao)
+
+    def indexar(self, tipo: str, documento: Tuple):
+        """Atualiza um documento (ignorado até o índice ser carregado)"""
+        if self.indice.carregado:
+            doc_id, campos, exibicao = documento
+            self.indice.adicionar(tipo, doc_id, campos, exibicao)
+
+    def remover(self, tipo: str, doc_id):
+        if self.indice.carregado:
+            self.indice.remover(tipo, doc_id)
+
+    def buscar(self, consulta: str, tipos: Optional[Iterable[str]] = None, limite: int = 20) -> List[Dict]:
+        self.carregar()
+        return self.indice.buscar(consulta, tipos, limite)
+
+
+# Instância global usada pelas rotas
+busca_global = BuscaGlobal()
@@ -0,0 +1,361 @@
+"""
+Notificações push do Google Calendar
+Recebe avisos dos canais de watch e busca apenas as mudanças (syncToken),
+substituindo a varredura periódica de sync_google_to_workspace
+"""
+
+import os
+import json
+import time
+import uuid
+import secrets
+import threading
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from src.services.google_calendar import (
+    CalendarServicePool, GoogleCalendarService, calendar_service_pool, google_calendar_service
+)
+from src.services.metricas import medir_arquivo_json
+from src.services.perfilamento import perfilador
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDebouncer:
+    """
+    Agrupa rajadas de notificações por chave em uma única execução
+
+    A primeira notificação agenda o callback para daqui a `delay` segundos; as
+    seguintes, dentro dessa janela, não agendam nada novo. Notificações que
+    chegam enquanto o callback está rodando marcam a chave como "suja" e geram
+    uma nova execução ao final, então nenhuma mudança é perdida.
+    """
+
+    def __init__(self, callback: Callable[[Hashable], Any], delay: float = 2.0):
+        self.callback = callback
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._pending: Dict[str, threading.Timer] = {}
+        self._running = set()
+        self._dirty = set()
+
+    def notify(self, key: Hashable):
+        """Registra uma notificação para a chave"""
+        with self._lock:
+            if key in self._running:
+                self._dirty.add(key)
+                return
+            if key not in self._pending:
+                self._schedule(key)
+
+    def _schedule(self, key: Hashable):
+        timer = threading.Timer(self.delay, self._fire, args=(key,))
+        timer.daemon = True
+        self._pending[key] = timer
+        timer.start()
+
+    def _fire(self, key: Hashable):
+        with self._lock:
+            self._pending.pop(key, None)
+            self._running.add(key)
+
+        try:
+            self.callback(key)
+        except Exception as e:
+            logger.error(f"Erro ao processar notificações de {key}: {e}")
+        finally:
+            with self._lock:
+                self._running.discard(key)
+                if key in self._dirty:
+                    self._dirty.discard(key)
+                    self._schedule(key)
+
+    def pending(self) -> List[Hashable]:
+        """Chaves com execução agendada ou em andamento"""
+        with self._lock:
+            return sorted(set(self._pending) | self._running)
+
+    def cancel_all(self):
+        """Cancela as execuções agendadas"""
+        with self._lock:
+            for timer in self._pending.values():
+                timer.cancel()
+            self._pending.clear()
+            self._dirty.clear()
+
+
+class ChannelRegistry:
+    """
+    Registro dos canais de watch ativos, com renovação antes de expirar
+
+    Os canais são salvos em arquivo para que, após reiniciar o processo,
+    ainda seja possível validar notificações e encerrar canais antigos. Sem
+    `channels_file`, o registro fica só em memória até `configure`.
+    Canais com `usuario` usam o serviço daquele usuário no `pool`; os demais,
+    o serviço da conta única.
+
+    As renovações são timers do processo: com o gunicorn pré-carregando o app
+    no mestre, `resume` precisa rodar em cada processo depois do fork (timers
+    herdados do mestre não existem no filho). Uma renovação que falha é
+    tentada de novo com espera crescente (`retry_base` a `retry_max` segundos).
+    """
+
+    def __init__(self, service: GoogleCalendarService, channels_file: Optional[str] = None,
+                 ttl_seconds: int = 7 * 24 * 3600, renew_margin: int = 3600,
+                 pool: Optional[CalendarServicePool] = None, retry_base: float = 60, retry_max: float = 1800):
+        self.service = service
+        self.pool = pool
+        self.channels_file = channels_file
+        self.ttl_seconds = ttl_seconds
+        self.renew_margin = renew_margin
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._lock = threading.Lock()
+        self._channels: Dict[str, Dict[str, Any]] = self._load()
+        self._timers: Dict[str, threading.Timer] = {}
+        self._timers_pid: Optional[int] = None
+        self._failures: Dict[str, int] = {}
+
+    def configure(self, channels_file: str):
+        """Define o arquivo dos canais e carrega os salvos nele (não agenda renovações)"""
+        with self._lock:
+            self.channels_file = channels_file
+            self._channels = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self.channels_file and os.path.exists(self.channels_file):
+            with medir_arquivo_json(self.channels_file, 'carregar'), open(self.channels_file, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def _save(self):
+        if not self.channels_file:
+            return
+        os.makedirs(os.path.dirname(self.channels_file) or '.', exist_ok=True)
+        with medir_arquivo_json(self.channels_file, 'salvar'), open(self.channels_file, 'w') as f:
+            json.dump(self._channels, f)
+
+    def service_for(self, usuario: Optional[str]) -> GoogleCalendarService:
+        """Serviço da conta do usuário (ou da conta única, sem usuário)"""
+        if usuario and self.pool is not None:
+            return self.pool.get(usuario)
+        return self.service
+
+    def get(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            channel = self._channels.get(channel_id)
+            return dict(channel) if channel else None
+
+    def channels(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(channel) for channel in self._channels.values()]
+
+    def watch(self, calendar_id: str, address: str, usuario: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Abre um canal para o calendário (da conta do usuário, se informado) e agenda sua renovação
+
+        Returns:
+            Canal registrado ou None se o Google recusou o watch
+        """
+        channel_id = uuid.uuid4().hex
+        token = secrets.token_urlsafe(24)
+        result = self.service_for(usuario).watch_events(calendar_id, channel_id, address, token, self.ttl_seconds)
+        if not result:
+            return None
+
+        expiration_ms = int(result.get('expiration') or (time.time() + self.ttl_seconds) * 1000)
+        channel = {
+            'id': channel_id,
+            'calendar_id': calendar_id,
+            'usuario': usuario,
+            'address': address,
+            'token': token,
+            'resource_id': result.get('resourceId'),
+            'expiration': expiration_ms / 1000
+        }
+
+        with self._lock:
+            self._channels[channel_id] = channel
+            self._save()
+        self._schedule_renewal(channel)
+
+        logger.info(f"Canal {channel_id} aberto para {calendar_id}")
+        return dict(channel)
+
+    def stop(self, channel_id: str) -> bool:
+        """Encerra o canal no Google e remove do registro"""
+        with self._lock:
+            channel = self._channels.pop(channel_id, None)
+            timer = self._timers.pop(channel_id, None)
+            self._failures.pop(channel_id, None)
+            if channel:
+                self._save()
+
+        if timer:
+            timer.cancel()
+        if not channel:
+            return False
+        return self.service_for(channel.get('usuario')).stop_channel(channel_id, channel['resource_id'])
+
+    def renew(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        """Abre um canal novo para o mesmo calendário e encerra o antigo"""
+        channel = self.get(channel_id)
+        if not channel:
+            return None
+
+        try:
+            new_channel = self.watch(channel['calendar_id'], channel['address'], channel.get('usuario'))
+        except Exception as e:
+            logger.error(f"Erro ao renovar canal {channel_id}: {e}")
+            new_channel = None
+        if new_channel:
+            # O canal antigo só é encerrado depois que o novo existe, sem janela cega
+            self.stop(channel_id)
+            return new_channel
+
+        with self._lock:
+            failures = self._failures[channel_id] = self._failures.get(channel_id, 0) + 1
+        delay = min(self.retry_base * 2 ** (failures - 1), self.retry_max)
+        logger.error(f"Falha ao renovar canal {channel_id} (tentativa {failures}); nova tentativa em {delay:.0f}s")
+        self._schedule(channel_id, delay)
+        return None
+
+    def resume(self):
+        """
+        Agenda a renovação dos canais registrados neste processo
+
+        Idempotente e barato depois da primeira chamada no processo: pode rodar
+        a cada requisição. Depois de um fork, descarta os timers herdados (as
+        threads ficaram no processo pai) e agenda de novo.
+        """
+        if self._timers_pid == os.getpid():
+            return
+        with self._lock:
+            if self._timers_pid == os.getpid():
+                return
+            self._timers_pid = os.getpid()
+            self._timers.clear()
+        for channel in self.channels():
+            self._schedule_renewal(channel)
+
+    def renew_expiring(self) -> int:
+        """Renova todos os canais que expiram dentro da margem (ex.: após reiniciar)"""
+        limit = time.time() + self.renew_margin
+        expiring = [c['id'] for c in self.channels() if c['expiration'] <= limit]
+        return sum(1 for channel_id in expiring if self.renew(channel_id))
+
+    def _schedule_renewal(self, channel: Dict[str, Any]):
+        self._schedule(channel['id'], max(channel['expiration'] - self.renew_margin - time.time(), 0))
+
+    def _schedule(self, channel_id: str, delay: float):
+        timer = threading.Timer(delay, self.renew, args=(channel_id,))
+        timer.daemon = True
+        with self._lock:
+            if channel_id not in self._channels:
+                return
+            self._timers[channel_id] = timer
+        timer.start()
+
+    def shutdown(self):
+        """Cancela as renovações agendadas (os canais continuam registrados)"""
+        with self._lock:
+            timers = list(self._timers.values())
+            self._timers.clear()
+            self._timers_pid = None
+        for timer in timers:
+            timer.cancel()
+
+
+class CalendarPushSync:
+    """
+    Mantém uma cópia dos eventos externos de cada calendário atualizada por push
+
+    Cada notificação válida entra no debouncer; quando ele dispara, uma única
+    chamada incremental (syncToken) traz as mudanças do calendário. Calendários
+    de contas de usuários (pool) ficam separados por (usuário, calendário).
+    """
+
+    def __init__(self, service: GoogleCalendarService, registry: Optional[ChannelRegistry] = None,
+                 debounce_seconds: float = 2.0, pool: Optional[CalendarServicePool] = None):
+        self.service = service
+        self.registry = registry or ChannelRegistry(service, pool=pool)
+        self.debouncer = NotificationDebouncer(self._fetch_key, debounce_seconds)
+        self._lock = threading.Lock()
+        # Chaves (usuário ou '', calendar_id)
+        self._sync_tokens: Dict[Tuple[str, str], Optional[str]] = {}
+        self._events: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+        self._listeners: List[Callable[[str, List[Dict[str, Any]], List[str]], Any]] = []
+
+    def add_listener(self, listener: Callable[[str, List[Dict[str, Any]], List[str]], Any]):
+        """Registra função chamada com (calendar_id, eventos alterados, IDs removidos)"""
+        self._listeners.append(listener)
+
+    def subscribe(self, calendar_id: str, address: str, usuario: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Faz a carga inicial do calendário e abre o canal de notificações"""
+        self.fetch_changes(calendar_id, usuario)
+        return self.registry.watch(calendar_id, address, usuario)
+
+    def handle_notification(self, headers: Dict[str, str]) -> bool:
+        """
+        Valida os cabeçalhos de uma notificação do Google e agenda a busca
+
+        Returns:
+            False se o canal for desconhecido ou o token não conferir
+        """
+        channel = self.registry.get(headers.get('X-Goog-Channel-ID', ''))
+        if not channel or not secrets.compare_digest(channel['token'], headers.get('X-Goog-Channel-Token', '')):
+            return False
+
+        # 'sync' é só a confirmação de abertura do canal
+        if headers.get('X-Goog-Resource-State') != 'sync':
+            self.debouncer.notify((channel.get('usuario') or '', channel['calendar_id']))
+        return True
+
+    def _fetch_key(self, key: Tuple[str, str]):
+        usuario, calendar_id = key
+        self.fetch_changes(calendar_id, usuario or None)
+
+    @perfilador.tarefa('calendar_push.fetch_changes')
+    def fetch_changes(self, calendar_id: str, usuario: Optional[str] = None):
+        """Busca as mudanças desde o último syncToken e aplica na cópia local"""
+        key = (usuario or '', calendar_id)
+        service = self.registry.service_for(usuario)
+        with self._lock:
+            sync_token = self._sync_tokens.get(key)
+
+        changes, next_token = service.list_event_changes(calendar_id, sync_token)
+
+        updated, removed = [], []
+        with self._lock:
+            events = self._events.setdefault(key, {})
+            if sync_token is None:
+                events.clear()
+            for change in changes:
+                if change.get('status') == 'cancelled':
+                    if events.pop(change['id'], None) is not None:
+                        removed.append(change['id'])
+                    continue
+                ws_event = service._convert_google_to_workspace_event(change)
+                if ws_event:
+                    events[change['id']] = ws_event
+                    updated.append(ws_event)
+            self._sync_tokens[key] = next_token
+
+        for listener in self._listeners:
+            listener(calendar_id, updated, removed)
+
+        logger.info(f"{calendar_id}: {len(updated)} eventos alterados, {len(removed)} removidos")
+
+    def get_events(self, calendar_id: str, usuario: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Eventos externos conhecidos do calendário, no formato do Workspace"""
+        with self._lock:
+            return list(self._events.get((usuario or '', calendar_id), {}).values())
+
+
+# Instância global usada pelas rotas
+calendar_push_sync = CalendarPushSync(
+    google_calendar_service,
+    debounce_seconds=float(os.getenv('GOOGLE_CALENDAR_PUSH_DEBOUNCE', '2')),
+    pool=calendar_service_pool
+)
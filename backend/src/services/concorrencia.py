@@ -0,0 +1,126 @@
+"""
+Controle de concorrência otimista
+Cada registro versionado tem a coluna `versao` (version_id_col do SQLAlchemy):
+o UPDATE/DELETE só afeta a linha se a versão ainda for a lida, então escritas
+concorrentes em registros diferentes não esperam umas pelas outras e uma
+escrita baseada em dados antigos falha em vez de sobrescrever a outra
+"""
+
+from typing import Callable, Iterable, Optional
+
+from flask import jsonify, request
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.database import db
+
+
+def etag(obj) -> str:
+    """ETag (forte) da versão atual do registro"""
+    return f'"{obj.versao}"'
+
+
+def com_etag(resposta, obj):
+    """Acrescenta o ETag do registro à resposta (objeto Response ou tupla (Response, status))"""
+    alvo = resposta[0] if isinstance(resposta, tuple) else resposta
+    alvo.headers['ETag'] = etag(obj)
+    return resposta
+
+
+def precondicao_falhou(obj, representar: Callable) -> Optional[tuple]:
+    """
+    Confere o If-Match da requisição com a versão do registro
+
+    Sem If-Match a escrita segue (a versão lida ainda protege contra escritas
+    concorrentes entre a leitura e o commit). If-None-Match: * (só criar)
+    falha, já que o registro existe.
+
+    Returns:
+        Resposta 412 com a representação atual, ou None se a escrita pode seguir
+    """
+    if request.if_none_match.star_tag:
+        return _resposta_412(obj, representar)
+    if not request.if_match or request.if_match.star_tag:
+        return None
+    if request.if_match.contains(str(obj.versao)):
+        return None
+    return _resposta_412(obj, representar)
+
+
+def salvar(obj, representar: Callable, dependentes: Iterable = (),
+           representar_dependente: Optional[Callable] = None) -> Optional[tuple]:
+    """
+    Faz o commit; se outra escrita mudou o registro no meio tempo, desfaz e responde 412
+
+    `dependentes` são os registros versionados removidos junto (cascata). Se o
+    conflito foi num deles e o registro principal continua na versão lida, a
+    resposta é 409 com o dependente atual: um 412 com o ETag do principal
+    faria o cliente repetir com uma versão que já é a certa.
+
+    Returns:
+        Resposta 412/409 ou None se o commit deu certo
+    """
+    modelo, identidade, versao = type(obj), db.inspect(obj).identity, obj.versao
+    lidos = [(type(item), db.inspect(item).identity, item.versao) for item in dependentes]
+    try:
+        db.session.commit()
+        return None
+    except StaleDataError:
+        db.session.rollback()
+        atual = db.session.get(modelo, identidade, populate_existing=True)
+        if atual is None:
+            return jsonify({'error': 'Registro removido por outra edição'}), 404
+        if atual.versao == versao:
+            for modelo_dep, identidade_dep, versao_dep in lidos:
+                dependente = db.session.get(modelo_dep, identidade_dep, populate_existing=True)
+                if dependente is None or dependente.versao != versao_dep:
+                    return _resposta_409(dependente, representar_dependente)
+        return _resposta_412(atual, representar)
+
+
+def precondicao_criacao() -> Optional[tuple]:
+    """
+    Confere as precondições de uma escrita que vai criar o registro
+
+    If-Match (qualquer valor, inclusive *) exige um registro que ainda não
+    existe: 412.
+    """
+    if request.if_match:
+        return jsonify({'error': 'O registro não existe; recarregue e tente de novo', 'atual': None}), 412
+    return None
+
+
+def salvar_novo(obj, representar: Callable, buscar_atual: Callable) -> Optional[tuple]:
+    """
+    Faz o commit de um registro novo; se outra escrita criou o mesmo registro
+    no meio tempo, desfaz e responde 412 com o que ela gravou
+
+    Returns:
+        Resposta 412 ou None se o commit deu certo
+    """
+    try:
+        db.session.commit()
+        return None
+    except IntegrityError:
+        db.session.rollback()
+        atual = buscar_atual()
+        if atual is None:
+            raise
+        return _resposta_412(atual, representar)
+
+
+def _resposta_412(obj, representar: Callable) -> tuple:
+    resposta = jsonify({
+        'error': 'O registro foi alterado por outra pessoa; recarregue e tente de novo',
+        'atual': representar(obj)
+    })
+    resposta.headers['ETag'] = etag(obj)
+    return resposta, 412
+
+
+def _resposta_409(dependente, representar: Optional[Callable]) -> tuple:
+    conflito = representar(dependente) if dependente is not None and representar else None
+    return jsonify({
+        'error': 'Um registro vinculado foi alterado ou removido por outra pessoa; tente de novo',
+        'conflito': conflito
+    }), 409
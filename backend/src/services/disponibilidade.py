@@ -0,0 +1,298 @@
+"""
+Grade de disponibilidade da equipe
+Mantém, por funcionário, os slots de 30 minutos ocupados em bits de um inteiro
+para responder "quem está livre" sem varrer a agenda
+"""
+
+import datetime
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.services.horarios import (
+    SLOT_MINUTOS, SLOTS_POR_DIA, inicios_livres, mascara_agendamento, mascara_expediente,
+    menor_bit, minutos_para_horario, parse_data
+)
+from src.services.recorrencia import parse_regra
+
+# Cada dia ocupa SLOTS_POR_DIA bits e um bit zerado de separação, para que
+# janelas livres nunca atravessem a meia-noite ao juntar vários dias
+PASSO_DIA = SLOTS_POR_DIA + 1
+
+# Maior intervalo aceito em uma consulta (dias)
+MAX_DIAS_CONSULTA = 366
+
+
+class GradeDisponibilidade:
+    """
+    Disponibilidade de cada funcionário em bits
+
+    - expediente: slots de trabalho do funcionário (dias úteis)
+    - modelos: agendamentos sem data, que ocupam os dias da sua regra de
+      recorrência, com as exceções (ocorrências alteradas ou canceladas)
+    - datados: agendamentos de um dia específico
+
+    Cada agendamento guarda sua própria máscara, então inserir, alterar ou
+    remover um agendamento só recalcula o dia dele. Agendamentos com horário
+    inválido (ex.: "flexible") não ocupam slots. Almoço, Indisponível e pausas
+    são agendamentos como os outros e bloqueiam a grade normalmente.
+
+    Para consultar vários dias de uma vez, as grades diárias são concatenadas
+    em um único inteiro; AND/OR entre funcionários e os deslocamentos que
+    procuram sequências livres rodam sobre o intervalo inteiro.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.carregada = False
+        self._expediente: Dict[str, int] = {}
+        self._modelos: Dict[str, Dict[int, Dict]] = {}
+        self._excecoes: Dict[Tuple[int, datetime.date], Dict] = {}
+        self._excecoes_por_id: Dict[int, Tuple[int, datetime.date]] = {}
+        self._datados: Dict[Tuple[str, datetime.date], Dict[int, int]] = {}
+        self._linhas: Dict[int, Tuple[str, Optional[datetime.date]]] = {}
+        self._ocupado_datado: Dict[Tuple[str, datetime.date], int] = {}
+
+    # Montagem e atualização
+
+    def carregar(self, funcionarios: Iterable[Dict], agenda: Iterable[Dict], excecoes: Iterable[Dict] = ()):
+        """Reconstrói a grade inteira (funcionários, agenda e exceções no formato to_dict)"""
+        with self._lock:
+            self.__init__()
+            for funcionario in funcionarios:
+                self.atualizar_funcionario(funcionario)
+            for item in agenda:
+                self.aplicar_agendamento(item)
+            for excecao in excecoes:
+                self.aplicar_excecao(excecao)
+            self.carregada = True
+
+    def atualizar_funcionario(self, funcionario: Dict):
+        with self._lock:
+            self._expediente[funcionario['id']] = mascara_expediente(
+                funcionario.get('horarioInicio'), funcionario.get('horarioFim')
+            )
+
+    def remover_funcionario(self, funcionario_id: str):
+        with self._lock:
+            self._expediente.pop(funcionario_id, None)
+
+    def aplicar_agendamento(self, item: Dict):
+        """Insere ou atualiza um agendamento (formato Agenda.to_dict)"""
+        data = parse_data(item.get('data'))
+
+        with self._lock:
+            self.remover_agendamento(item['id'])
+            self._linhas[item['id']] = (item['funcionario'], data)
+            if data is None:
+                self._modelos.setdefault(item['funcionario'], {})[item['id']] = {
+                    'horario': item.get('horario'),
+                    'duracao': item.get('duracao'),
+                    'mascara': mascara_agendamento(item.get('horario'), item.get('duracao')),
+                    'regra': parse_regra(item.get('recorrencia'))
+                }
+            else:
+                chave = (item['funcionario'], data)
+                self._datados.setdefault(chave, {})[item['id']] = \
+                    mascara_agendamento(item.get('horario'), item.get('duracao'))
+                self._recalcular(chave)
+
+    def remover_agendamento(self, agenda_id: int):
+        with self._lock:
+            linha = self._linhas.pop(agenda_id, None)
+            if linha is None:
+                return
+            funcionario_id, data = linha
+            if data is None:
+                self._modelos.get(funcionario_id, {}).pop(agenda_id, None)
+            else:
+                self._datados.get(linha, {}).pop(agenda_id, None)
+                self._recalcular(linha)
+
+    def aplicar_excecao(self, excecao: Dict):
+        """Insere ou atualiza uma exceção de agendamento recorrente (formato AgendaExcecao.to_dict)"""
+        with self._lock:
+            self.remover_excecao(excecao['id'])
+            chave = (excecao['agenda'], parse_data(excecao['data']))
+            self._excecoes[chave] = excecao
+            self._excecoes_por_id[excecao['id']] = chave
+
+    def remover_excecao(self, excecao_id: int):
+        with self._lock:
+            chave = self._excecoes_por_id.pop(excecao_id, None)
+            if chave is not None:
+                self._excecoes.pop(chave, None)
+
+    def _recalcular(self, chave: Tuple[str, datetime.date]):
+        ocupado = 0
+        for mascara in self._datados.get(chave, {}).values():
+            ocupado |= mascara
+        if ocupado:
+            self._ocupado_datado[chave] = ocupado
+        else:
+            self._ocupado_datado.pop(chave, None)
+            self._datados.pop(chave, None)
+
+    def _ocupado_modelos(self, funcionario_id: str, dia: datetime.date) -> int:
+        ocupado = 0
+        for agenda_id, modelo in self._modelos.get(funcionario_id, {}).items():
+            excecao = self._excecoes.get((agenda_id, dia))
+            if excecao is None:
+                if modelo['regra'].ocorre_em(dia):
+                    ocupado |= modelo['mascara']
+            elif not excecao['cancelado']:
+                ocupado |= mascara_agendamento(excecao['horario'] or modelo['horario'],
+                                               excecao['duracao'] or modelo['duracao'])
+        return ocupado
+
+    # Consultas
+
+    def livre(self, funcionario_id: str, dia: datetime.date) -> int:
+        """Slots livres do funcionário no dia (fins de semana não têm expediente)"""
+        if dia.weekday() >= 5:
+            return 0
+        with self._lock:
+            ocupado = self._ocupado_modelos(funcionario_id, dia) | \
+                self._ocupado_datado.get((funcionario_id, dia), 0)
+            return self._expediente.get(funcionario_id, 0) & ~ocupado
+
+    def livre_no_periodo(self, funcionario_id: str, dias: List[datetime.date]) -> int:
+        """Grades livres dos dias concatenadas (dia i começa no bit i * PASSO_DIA)"""
+        grade = 0
+        for i, dia in enumerate(dias):
+            grade |= self.livre(funcionario_id, dia) << (i * PASSO_DIA)
+        return grade
+
+    def funcionarios(self) -> List[str]:
+        with self._lock:
+            return list(self._expediente)
+
+    def janelas_livres(self, funcionarios: List[str], dias: List[datetime.date], duracao: int,
+                       modo: str = 'todos', limite_inicio: Optional[int] = None,
+                       limite_fim: Optional[int] = None) -> List[Dict]:
+        """
+        Janelas livres de pelo menos `duracao` minutos
+
+        Args:
+            modo: 'todos' (todos livres ao mesmo tempo) ou 'qualquer'
+                  (janelas de cada funcionário separadamente)
+            limite_inicio/limite_fim: restringem a busca a um trecho do dia (minutos)
+        """
+        slots = -(-duracao // SLOT_MINUTOS)
+        filtro = self._filtro_diario(len(dias), limite_inicio, limite_fim)
+        grades = {f: self.livre_no_periodo(f, dias) & filtro for f in funcionarios}
+
+        if modo == 'todos':
+            comum = filtro if funcionarios else 0
+            for grade in grades.values():
+                comum &= grade
+            grupos = [(funcionarios, comum)]
+        else:
+            grupos = [([f], grade) for f, grade in grades.items()]
+
+        janelas = []
+        for membros, grade in grupos:
+            for inicio, tamanho in self._sequencias(grade, slots):
+                dia, slot = divmod(inicio, PASSO_DIA)
+                janelas.append({
+                    'data': dias[dia].isoformat(),
+                    'inicio': minutos_para_horario(slot * SLOT_MINUTOS),
+                    'fim': minutos_para_horario((slot + tamanho) * SLOT_MINUTOS),
+                    'duracao': tamanho * SLOT_MINUTOS,
+                    'funcionarios': list(membros)
+                })
+        janelas.sort(key=lambda j: (j['data'], j['inicio'], j['funcionarios']))
+        return janelas
+
+    def livres_em(self, funcionarios: List[str], dias: List[datetime.date], horario_minutos: int,
+                  duracao: int) -> Dict[str, List[str]]:
+        """Quem está livre a partir do horário por `duracao` minutos, em cada dia"""
+        slots = -(-duracao // SLOT_MINUTOS)
+        slot = horario_minutos // SLOT_MINUTOS
+        bits = sum(1 << (i * PASSO_DIA + slot) for i in range(len(dias)))
+
+        resultado = {dia.isoformat(): [] for dia in dias}
+        for funcionario_id in funcionarios:
+            disponiveis = inicios_livres(self.livre_no_periodo(funcionario_id, dias), slots) & bits
+            while disponiveis:
+                bit = menor_bit(disponiveis)
+                resultado[dias[bit // PASSO_DIA].isoformat()].append(funcionario_id)
+                disponiveis &= disponiveis - 1
+        return resultado
+
+    @staticmethod
+    def _filtro_diario(quantidade_dias: int, limite_inicio: Optional[int], limite_fim: Optional[int]) -> int:
+        primeiro = (limite_inicio or 0) // SLOT_MINUTOS
+        ultimo = SLOTS_POR_DIA if limite_fim is None else -(-limite_fim // SLOT_MINUTOS)
+        dia = ((1 << max(ultimo - primeiro, 0)) - 1) << primeiro
+        filtro = 0
+        for i in range(quantidade_dias):
+            filtro |= dia << (i * PASSO_DIA)
+        return filtro
+
+    @staticmethod
+    def _sequencias(grade: int, minimo: int):
+        """Sequências máximas de bits ligados com pelo menos `minimo` bits: (início, tamanho)"""
+        candidatos = inicios_livres(grade, minimo)
+        while candidatos:
+            inicio = menor_bit(candidatos)
+            # Volta ao começo da sequência e mede até o primeiro bit zerado
+            resto = grade >> inicio
+            tamanho = (~resto & (resto + 1)).bit_length() - 1
+            yield inicio, tamanho
+            candidatos &= ~(((1 << tamanho) - 1) << inicio)
+
+
+def intervalo_de_dias(inicio: datetime.date, fim: datetime.date) -> List[datetime.date]:
+    """Dias de inicio a fim (inclusive)"""
+    return [inicio + datetime.timedelta(days=i) for i in range((fim - inicio).days + 1)]
+
+
+# Instância global usada pelas rotas
+grade_disponibilidade = GradeDisponibilidade()
+
+
+# Atualização incremental: mudanças feitas pelo ORM são aplicadas na grade
+# quando a transação é confirmada (e descartadas em rollback). Atualizações em
+# massa (query.update/delete) não passam por aqui; nesses casos chame
+# grade_disponibilidade.carregar de novo.
+
+_CHAVE_SESSAO = 'disponibilidade_pendente'
+
+
+@event.listens_for(Session, 'after_flush')
+def _registrar_mudancas(session, flush_context):
+    if not grade_disponibilidade.carregada:
+        return
+    from src.models.agenda import Agenda
+    from src.models.agenda_excecao import AgendaExcecao
+    from src.models.funcionario import Funcionario
+
+    pendentes = session.info.setdefault(_CHAVE_SESSAO, [])
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Agenda):
+            pendentes.append((grade_disponibilidade.aplicar_agendamento, obj.to_dict()))
+        elif isinstance(obj, AgendaExcecao):
+            pendentes.append((grade_disponibilidade.aplicar_excecao, obj.to_dict()))
+        elif isinstance(obj, Funcionario):
+            pendentes.append((grade_disponibilidade.atualizar_funcionario, obj.to_dict()))
+    for obj in session.deleted:
+        if isinstance(obj, Agenda):
+            pendentes.append((grade_disponibilidade.remover_agendamento, obj.id))
+        elif isinstance(obj, AgendaExcecao):
+            pendentes.append((grade_disponibilidade.remover_excecao, obj.id))
+        elif isinstance(obj, Funcionario):
+            pendentes.append((grade_disponibilidade.remover_funcionario, obj.id))
+
+
+@event.listens_for(Session, 'after_commit')
+def _aplicar_mudancas(session):
+    for funcao, argumento in session.info.pop(_CHAVE_SESSAO, []):
+        funcao(argumento)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_mudancas(session):
+    session.info.pop(_CHAVE_SESSAO, None)
@@ -0,0 +1,310 @@
+"""
+Exportação do cronograma
+Gera CSV, XLSX e um relatório JSON pré-agregado a partir de um iterador de
+ocorrências, uma linha por vez: nada aqui guarda o conjunto inteiro em memória.
+Exportações grandes rodam como tarefas em segundo plano, gravando em arquivo
+temporário que depois é baixado
+"""
+
+import csv
+import datetime
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set
+
+from src.services.horarios import DURACAO_PADRAO, horario_para_minutos, minutos_para_horario
+
+logger = logging.getLogger(__name__)
+
+FORMATOS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'json': ('application/json', 'json'),
+}
+
+# (chave da linha, título da coluna)
+COLUNAS = [
+    ('data', 'Data'),
+    ('horario', 'Início'),
+    ('fim', 'Fim'),
+    ('duracao', 'Duração (min)'),
+    ('funcionario', 'Funcionário (ID)'),
+    ('funcionario_nome', 'Funcionário'),
+    ('tarefa', 'Tarefa (ID)'),
+    ('tarefa_nome', 'Tarefa'),
+    ('categoria', 'Categoria'),
+    ('computar_horas', 'Computa horas'),
+    ('recorrente', 'Recorrente'),
+    ('excecao', 'Exceção'),
+]
+
+# Linhas acumuladas antes de cada envio do CSV
+LINHAS_POR_BLOCO = 500
+
+DIAS_SEMANA = ['segunda', 'terça', 'quarta', 'quinta', 'sexta', 'sábado', 'domingo']
+
+
+def linhas_exportacao(ocorrencias: Iterable[Dict], funcionarios: Dict[str, Dict], tarefas: Dict[str, Dict],
+                      categorias: Optional[Set[str]] = None) -> Iterator[Dict]:
+    """
+    Ocorrências (formato de expandir) com nomes, categoria e fim, filtradas por categoria
+
+    Ocorrências de tarefas ou funcionários que não existem mais ficam de fora.
+    """
+    for ocorrencia in ocorrencias:
+        tarefa = tarefas.get(ocorrencia['tarefa'])
+        funcionario = funcionarios.get(ocorrencia['funcionario'])
+        if tarefa is None or funcionario is None:
+            continue
+        if categorias is not None and tarefa['categoria'] not in categorias:
+            continue
+        duracao = ocorrencia.get('duracao') or DURACAO_PADRAO
+        inicio = horario_para_minutos(ocorrencia['horario'])
+        yield {
+            'data': ocorrencia['data'],
+            'horario': ocorrencia['horario'],
+            'fim': minutos_para_horario((inicio + duracao) % (24 * 60)) if inicio is not None else '',
+            'duracao': duracao,
+            'funcionario': funcionario['id'],
+            'funcionario_nome': funcionario['nome'],
+            'tarefa': tarefa['id'],
+            'tarefa_nome': tarefa['nome'],
+            'categoria': tarefa['categoria'],
+            'computar_horas': tarefa.get('computar_horas', True),
+            'recorrente': ocorrencia.get('modelo') is not None,
+            'excecao': bool(ocorrencia.get('excecao'))
+        }
+
+
+def gerar_csv(linhas: Iterable[Dict]) -> Iterator[str]:
+    """CSV em blocos de LINHAS_POR_BLOCO linhas (com BOM, para o Excel reconhecer UTF-8)"""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    buffer.write('\ufeff')
+    escritor.writerow([titulo for _, titulo in COLUNAS])
+    for i, linha in enumerate(linhas, 1):
+        escritor.writerow([_texto(linha[chave]) for chave, _ in COLUNAS])
+        if i % LINHAS_POR_BLOCO == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _texto(valor):
+    if isinstance(valor, bool):
+        return 'sim' if valor else 'não'
+    return valor
+
+
+def escrever_xlsx(linhas: Iterable[Dict], destino: str) -> int:
+    """
+    Grava a planilha em `destino` no modo de memória constante do XlsxWriter
+    (cada linha vai para o disco assim que a próxima começa)
+
+    Returns:
+        Quantidade de linhas gravadas
+    """
+    import xlsxwriter
+
+    livro = xlsxwriter.Workbook(destino, {'constant_memory': True})
+    try:
+        planilha = livro.add_worksheet('Cronograma')
+        negrito = livro.add_format({'bold': True})
+        for coluna, (_, titulo) in enumerate(COLUNAS):
+            planilha.write(0, coluna, titulo, negrito)
+        planilha.freeze_panes(1, 0)
+
+        total = 0
+        for total, linha in enumerate(linhas, 1):
+            for coluna, (chave, _) in enumerate(COLUNAS):
+                planilha.write(total, coluna, _texto(linha[chave]))
+        return total
+    finally:
+        livro.close()
+
+
+def relatorio(linhas: Iterable[Dict], inicio: datetime.date, fim: datetime.date) -> Dict:
+    """
+    Relatório pré-agregado (pronto para montar um PDF): totais por funcionário,
+    categoria, dia e dia da semana, acumulados enquanto as linhas passam
+    """
+    funcionarios = {}
+    categorias = defaultdict(lambda: {'agendamentos': 0, 'minutos': 0})
+    dias = defaultdict(lambda: {'agendamentos': 0, 'minutos': 0})
+    dias_semana = [{'agendamentos': 0, 'minutos': 0} for _ in range(7)]
+    total = {'agendamentos': 0, 'minutos': 0, 'minutos_computados': 0}
+
+    for linha in linhas:
+        minutos = linha['duracao']
+        computa = linha['computar_horas']
+        func = funcionarios.setdefault(linha['funcionario'], {
+            'id': linha['funcionario'], 'nome': linha['funcionario_nome'],
+            'agendamentos': 0, 'minutos': 0, 'minutos_computados': 0, 'categorias': defaultdict(int)
+        })
+        for acumulado in (func, total):
+            acumulado['agendamentos'] += 1
+            acumulado['minutos'] += minutos
+            acumulado['minutos_computados'] += minutos if computa else 0
+        func['categorias'][linha['categoria']] += minutos
+        for acumulado in (categorias[linha['categoria']], dias[linha['data']],
+                          dias_semana[datetime.date.fromisoformat(linha['data']).weekday()]):
+            acumulado['agendamentos'] += 1
+            acumulado['minutos'] += minutos
+
+    def horas(minutos):
+        return round(minutos / 60, 2)
+
+    return {
+        'titulo': 'Relatório do cronograma',
+        'periodo': {'inicio': inicio.isoformat(), 'fim': fim.isoformat()},
+        'gerado_em': datetime.datetime.now().isoformat(timespec='seconds'),
+        'totais': {
+            'agendamentos': total['agendamentos'],
+            'horas': horas(total['minutos']),
+            'horas_computadas': horas(total['minutos_computados'])
+        },
+        'por_funcionario': [
+            {
+                'id': func['id'],
+                'nome': func['nome'],
+                'agendamentos': func['agendamentos'],
+                'horas': horas(func['minutos']),
+                'horas_computadas': horas(func['minutos_computados']),
+                'horas_por_categoria': {c: horas(m) for c, m in sorted(func['categorias'].items())}
+            }
+            for func in sorted(funcionarios.values(), key=lambda f: f['nome'])
+        ],
+        'por_categoria': [
+            {
+                'categoria': categoria,
+                'agendamentos': valores['agendamentos'],
+                'horas': horas(valores['minutos']),
+                'percentual': round(valores['minutos'] / total['minutos'] * 100, 1) if total['minutos'] else 0.0
+            }
+            for categoria, valores in sorted(categorias.items(), key=lambda c: -c[1]['minutos'])
+        ],
+        'por_dia': [
+            {'data': data, 'agendamentos': valores['agendamentos'], 'horas': horas(valores['minutos'])}
+            for data, valores in sorted(dias.items())
+        ],
+        'por_dia_semana': [
+            {'dia': DIAS_SEMANA[i], 'agendamentos': valores['agendamentos'], 'horas': horas(valores['minutos'])}
+            for i, valores in enumerate(dias_semana)
+        ]
+    }
+
+
+def gravar(formato: str, linhas: Iterable[Dict], destino: str, inicio: datetime.date, fim: datetime.date) -> int:
+    """Grava a exportação em arquivo; devolve quantas linhas foram processadas"""
+    contador = [0]
+
+    def contando(itens):
+        for item in itens:
+            contador[0] += 1
+            yield item
+
+    if formato == 'xlsx':
+        return escrever_xlsx(linhas, destino)
+    with open(destino, 'w', encoding='utf-8', newline='') as arquivo:
+        if formato == 'csv':
+            for bloco in gerar_csv(contando(linhas)):
+                arquivo.write(bloco)
+        else:
+            json.dump(relatorio(contando(linhas), inicio, fim), arquivo, ensure_ascii=False)
+    return contador[0]
+
+
+class TarefasExportacao:
+    """
+    Exportações em segundo plano
+
+    Cada tarefa roda numa thread e grava num arquivo da pasta temporária; o
+    arquivo e o registro expiram depois de `validade` segundos. A limpeza roda
+    ao criar, consultar ou baixar uma exportação e num timer ao fim de cada
+    uma, para os arquivos não ficarem na pasta se ninguém voltar. O registro
+    fica na memória do processo.
+    """
+
+    def __init__(self, pasta: Optional[str] = None, validade: int = 3600):
+        self.pasta = pasta or os.path.join(tempfile.gettempdir(), 'workspace-exportacoes')
+        self.validade = validade
+        self._lock = threading.Lock()
+        self._tarefas: Dict[str, Dict] = {}
+
+    def criar(self, formato: str, executar: Callable[[str], int], nome_arquivo: str) -> Dict:
+        """
+        Agenda a exportação
+
+        Args:
+            executar: recebe o caminho de destino, grava o arquivo e devolve a quantidade de linhas
+        """
+        self.limpar_expiradas()
+        os.makedirs(self.pasta, exist_ok=True)
+        tarefa_id = uuid.uuid4().hex
+        tarefa = {
+            'id': tarefa_id,
+            'formato': formato,
+            'status': 'pendente',
+            'linhas': None,
+            'erro': None,
+            'criada_em': time.time(),
+            'concluida_em': None,
+            'nome_arquivo': nome_arquivo,
+            'caminho': os.path.join(self.pasta, f'{tarefa_id}.{FORMATOS[formato][1]}')
+        }
+        with self._lock:
+            self._tarefas[tarefa_id] = tarefa
+
+        thread = threading.Thread(target=self._executar, args=(tarefa, executar), daemon=True)
+        thread.start()
+        return self.descrever(tarefa_id)
+
+    def _executar(self, tarefa: Dict, executar: Callable[[str], int]):
+        tarefa['status'] = 'executando'
+        try:
+            tarefa['linhas'] = executar(tarefa['caminho'])
+            tarefa['status'] = 'concluida'
+        except Exception as e:
+            logger.exception('Erro na exportação %s', tarefa['id'])
+            tarefa['status'] = 'erro'
+            tarefa['erro'] = str(e)
+        tarefa['concluida_em'] = time.time()
+        timer = threading.Timer(self.validade + 1, self.limpar_expiradas)
+        timer.daemon = True
+        timer.start()
+
+    def obter(self, tarefa_id: str) -> Optional[Dict]:
+        self.limpar_expiradas()
+        with self._lock:
+            return self._tarefas.get(tarefa_id)
+
+    def descrever(self, tarefa_id: str) -> Optional[Dict]:
+        """Estado público da tarefa (sem o caminho do arquivo)"""
+        tarefa = self.obter(tarefa_id)
+        if tarefa is None:
+            return None
+        return {chave: valor for chave, valor in tarefa.items() if chave != 'caminho'}
+
+    def limpar_expiradas(self):
+        limite = time.time() - self.validade
+        with self._lock:
+            expiradas = [t for t in self._tarefas.values() if (t['concluida_em'] or time.time()) < limite]
+            for tarefa in expiradas:
+                self._tarefas.pop(tarefa['id'], None)
+        for tarefa in expiradas:
+            try:
+                os.remove(tarefa['caminho'])
+            except OSError:
+                pass
+
+
+# Instância global
+tarefas_exportacao = TarefasExportacao()
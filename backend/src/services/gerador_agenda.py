@@ -0,0 +1,439 @@
+"""
+Gerador automático de cronograma semanal
+Distribui as tarefas de cada funcionário nos slots de 30 minutos da semana,
+respeitando horário de trabalho, ausências e compromissos fixos
+"""
+
+import datetime
+import math
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.services.horarios import (
+    HORARIO_PADRAO, SLOT_MINUTOS, horario_para_minutos, inicios_livres, mascara_expediente,
+    mascara_slots, menor_bit, minutos_para_horario, slots_da_duracao
+)
+
+# Peso de cada prioridade na função objetivo (slots não alocados custam isso cada)
+PESO_PRIORIDADE = {'alta': 100, 'media': 10, 'baixa': 1}
+
+# Frequências que geram uma ocorrência por dia; as demais geram uma por semana
+FREQUENCIAS_DIARIAS = {'diária', 'diaria', 'contínua', 'continua'}
+
+# Penalidade por ocorrência de tarefa diária fora do horário mais comum da semana
+PENALIDADE_DESALINHAMENTO = 2
+
+# Tarefas mantidas no mesmo horário do cronograma atual
+TAREFAS_FIXAS = {'reuniao_diaria', 'almoco', 'indisponivel', 'pausa'}
+
+# Limites da entrada de /api/agenda/gerar
+MAX_DIAS = 31
+MAX_MINUTOS = 24 * 60 * MAX_DIAS
+
+
+def _inteiro(valor, minimo: int, maximo: int) -> bool:
+    return type(valor) is int and minimo <= valor <= maximo
+
+
+def _data_valida(valor) -> bool:
+    try:
+        datetime.date.fromisoformat(valor)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def validar_entrada(atribuicoes, ausencias, fixos) -> Optional[str]:
+    """Mensagem de erro ou None se atribuições, ausências e fixos estiverem no formato esperado"""
+    for nome, lista in (('atribuicoes', atribuicoes), ('ausencias', ausencias), ('fixos', fixos)):
+        if not isinstance(lista, list) or not all(isinstance(item, dict) for item in lista):
+            return f'{nome} deve ser uma lista de objetos'
+    for a in atribuicoes:
+        if not isinstance(a.get('funcionario'), str) or not isinstance(a.get('tarefa'), str):
+            return 'Cada atribuição precisa de funcionario e tarefa'
+        if not _inteiro(a.get('minutos', 30), 1, MAX_MINUTOS):
+            return f'minutos deve ser um inteiro entre 1 e {MAX_MINUTOS}'
+    for ausencia in ausencias:
+        if not _data_valida(ausencia.get('dataInicio')):
+            return 'Cada ausência precisa de dataInicio (YYYY-MM-DD)'
+        if ausencia.get('dataFim') and not _data_valida(ausencia['dataFim']):
+            return 'dataFim inválida (use YYYY-MM-DD)'
+    for fixo in fixos:
+        if not all(isinstance(fixo.get(campo), str) for campo in ('funcionario', 'tarefa', 'horario')):
+            return 'Cada compromisso fixo precisa de funcionario, tarefa e horario'
+        if horario_para_minutos(fixo['horario']) is None:
+            return 'horario deve estar no formato HH:MM (00:00 a 23:59)'
+        if fixo.get('duracao') is not None and not _inteiro(fixo['duracao'], 1, 24 * 60):
+            return 'duracao deve ser um inteiro entre 1 e 1440'
+    return None
+
+
+@dataclass
+class Atribuicao:
+    """Tarefa que um funcionário deve cumprir e quanto tempo ela ocupa"""
+    funcionario: str
+    tarefa: str
+    minutos: int
+
+
+@dataclass
+class Bloco:
+    """Bloco de slots consecutivos a ser posicionado na grade"""
+    funcionario: int
+    tarefa: str
+    slots: int
+    peso: int
+    dias: Tuple[int, ...]          # dias permitidos (um só para tarefas diárias)
+    grupo: Tuple[int, str, int]    # (funcionário, tarefa, n-ésimo bloco) para alinhar horários
+    dia: Optional[int] = None
+    inicio: Optional[int] = None
+
+    @property
+    def alocado(self) -> bool:
+        return self.inicio is not None
+
+
+@dataclass
+class Proposta:
+    agenda: List[Dict] = field(default_factory=list)
+    nao_alocadas: List[Dict] = field(default_factory=list)
+    estatisticas: Dict = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        return {
+            'agenda': self.agenda,
+            'nao_alocadas': self.nao_alocadas,
+            'estatisticas': self.estatisticas
+        }
+
+
+class GeradorAgenda:
+    """
+    Heurística gulosa + busca local para montar a agenda da semana
+
+    A grade de cada funcionário em cada dia é um inteiro em que cada bit é um
+    slot de 30 minutos. Encontrar espaço para um bloco de k slots é um punhado
+    de operações AND/shift, o que mantém o gerador rápido mesmo com dezenas de
+    funcionários e tarefas.
+
+    Fases:
+    1. Compromissos fixos (ex.: reunião diária) e ausências bloqueiam a grade.
+    2. Guloso: blocos em ordem de prioridade, duração e frequência. Tarefas
+       diárias tentam o mesmo horário em todos os dias.
+    3. Busca local (opcional, limitada por tempo): encaixa blocos não alocados
+       desalojando blocos de prioridade menor e realinha tarefas diárias no
+       horário mais comum da semana.
+    """
+
+    def __init__(self, funcionarios: List[Dict], tarefas: List[Dict], frequencias: Dict[str, str],
+                 atribuicoes: Iterable[Atribuicao], dias: List[datetime.date],
+                 ausencias: Iterable[Dict] = (), fixos: Iterable[Dict] = (),
+                 horario_padrao: Tuple[str, str] = HORARIO_PADRAO):
+        self.funcionarios = [f['id'] for f in funcionarios]
+        self._indice = {func_id: i for i, func_id in enumerate(self.funcionarios)}
+        self.tarefas = {t['id']: t for t in tarefas}
+        self.frequencias = {k: (v or '').lower() for k, v in frequencias.items()}
+        self.dias = list(dias)
+
+        self.janela = [self._janela(f, horario_padrao) for f in funcionarios]
+        self.ocupado = [[0] * len(self.dias) for _ in self.funcionarios]
+        self.fixos: List[Dict] = []
+
+        self._aplicar_ausencias(ausencias)
+        self._aplicar_fixos(fixos)
+        self.blocos = self._criar_blocos(atribuicoes)
+
+    # Montagem do problema
+
+    @staticmethod
+    def _janela(funcionario: Dict, horario_padrao: Tuple[str, str]) -> int:
+        return mascara_expediente(funcionario.get('horarioInicio'), funcionario.get('horarioFim'), horario_padrao)
+
+    def _aplicar_ausencias(self, ausencias: Iterable[Dict]):
+        for ausencia in ausencias:
+            idx = self._indice.get(ausencia.get('funcionario'))
+            if idx is None or ausencia.get('tipo') == 'home_office':
+                continue
+            if ausencia.get('status') in ('rejeitada', 'recusada'):
+                continue
+            inicio = datetime.date.fromisoformat(ausencia['dataInicio'])
+            fim = datetime.date.fromisoformat(ausencia.get('dataFim') or ausencia['dataInicio'])
+            for d, dia in enumerate(self.dias):
+                if inicio <= dia <= fim:
+                    self.ocupado[idx][d] = self.janela[idx]
+
+    def _aplicar_fixos(self, fixos: Iterable[Dict]):
+        for fixo in fixos:
+            idx = self._indice.get(fixo['funcionario'])
+            inicio = horario_para_minutos(fixo['horario'])
+            if idx is None or inicio is None or not 0 <= inicio < 24 * 60:
+                continue
+            slots = slots_da_duracao(fixo.get('duracao'))
+            mascara = mascara_slots(inicio // SLOT_MINUTOS, slots)
+            for d in range(len(self.dias)):
+                # Fixos não se sobrepõem a ausências
+                if self.ocupado[idx][d] & mascara == 0:
+                    self.ocupado[idx][d] |= mascara
+                    self.fixos.append({**fixo, 'dia': d})
+
+    def _criar_blocos(self, atribuicoes: Iterable[Atribuicao]) -> List[Bloco]:
+        blocos = []
+        todos_os_dias = tuple(range(len(self.dias)))
+        for atribuicao in atribuicoes:
+            idx = self._indice.get(atribuicao.funcionario)
+            tarefa = self.tarefas.get(atribuicao.tarefa)
+            if idx is None or tarefa is None:
+                continue
+
+            slots = max(math.ceil((tarefa.get('tempoEstimado') or SLOT_MINUTOS) / SLOT_MINUTOS), 1)
+            quantidade = max(math.ceil(atribuicao.minutos / (slots * SLOT_MINUTOS)), 1)
+            peso = PESO_PRIORIDADE.get(tarefa.get('prioridade'), 1)
+            diaria = self.frequencias.get(atribuicao.tarefa, 'diária') in FREQUENCIAS_DIARIAS
+
+            for n in range(quantidade):
+                grupo = (idx, atribuicao.tarefa, n)
+                if diaria:
+                    blocos.extend(Bloco(idx, atribuicao.tarefa, slots, peso, (d,), grupo) for d in todos_os_dias)
+                else:
+                    blocos.append(Bloco(idx, atribuicao.tarefa, slots, peso, todos_os_dias, grupo))
+        return blocos
+
+    # Operações na grade
+
+    def _livre(self, funcionario: int, dia: int) -> int:
+        return self.janela[funcionario] & ~self.ocupado[funcionario][dia]
+
+    def _colocar(self, bloco: Bloco, dia: int, inicio: int):
+        self.ocupado[bloco.funcionario][dia] |= mascara_slots(inicio, bloco.slots)
+        bloco.dia, bloco.inicio = dia, inicio
+
+    def _retirar(self, bloco: Bloco):
+        self.ocupado[bloco.funcionario][bloco.dia] &= ~mascara_slots(bloco.inicio, bloco.slots)
+        bloco.dia, bloco.inicio = None, None
+
+    def _tentar_colocar(self, bloco: Bloco, preferido: Optional[int] = None) -> bool:
+        """Coloca o bloco no horário preferido ou no primeiro espaço livre dos dias permitidos"""
+        # Tarefas semanais vão para o dia com mais espaço livre
+        dias = sorted(bloco.dias, key=lambda d: -bin(self._livre(bloco.funcionario, d)).count('1'))
+        for dia in dias:
+            inicios = inicios_livres(self._livre(bloco.funcionario, dia), bloco.slots)
+            if not inicios:
+                continue
+            if preferido is not None and inicios >> preferido & 1:
+                self._colocar(bloco, dia, preferido)
+            else:
+                self._colocar(bloco, dia, menor_bit(inicios))
+            return True
+        return False
+
+    # Fases
+
+    def _guloso(self):
+        # Prioridade maior primeiro; entre iguais, blocos maiores (mais difíceis de encaixar)
+        grupos: Dict[Tuple, List[Bloco]] = defaultdict(list)
+        for bloco in self.blocos:
+            grupos[bloco.grupo].append(bloco)
+        ordem = sorted(grupos.values(), key=lambda g: (-g[0].peso, -g[0].slots, len(g[0].dias) > 1))
+
+        for grupo in ordem:
+            if len(grupo) > 1:
+                # Tarefa diária: procura um horário livre em todos os dias ao mesmo tempo
+                comum = -1
+                for bloco in grupo:
+                    comum &= inicios_livres(self._livre(bloco.funcionario, bloco.dias[0]), bloco.slots)
+                if comum:
+                    inicio = menor_bit(comum)
+                    for bloco in grupo:
+                        self._colocar(bloco, bloco.dias[0], inicio)
+                    continue
+
+            preferido = None
+            for bloco in grupo:
+                if self._tentar_colocar(bloco, preferido) and preferido is None:
+                    preferido = bloco.inicio
+
+    def _penalidade(self) -> int:
+        nao_alocados = sum(b.peso * b.slots for b in self.blocos if not b.alocado)
+
+        inicios = defaultdict(list)
+        for bloco in self.blocos:
+            if bloco.alocado and len(bloco.dias) == 1:
+                inicios[bloco.grupo].append(bloco.inicio)
+        desalinhados = 0
+        for valores in inicios.values():
+            desalinhados += len(valores) - Counter(valores).most_common(1)[0][1]
+
+        return nao_alocados + PENALIDADE_DESALINHAMENTO * desalinhados
+
+    def _busca_local(self, prazo: float) -> Dict[str, int]:
+        estatisticas = {'desalojamentos': 0, 'realinhamentos': 0, 'iteracoes': 0}
+        melhorou = True
+
+        while melhorou and time.perf_counter() < prazo:
+            melhorou = False
+            estatisticas['iteracoes'] += 1
+
+            # 1) Encaixa blocos não alocados tirando um bloco de prioridade menor do caminho
+            por_funcionario_dia = defaultdict(list)
+            for bloco in self.blocos:
+                if bloco.alocado:
+                    por_funcionario_dia[(bloco.funcionario, bloco.dia)].append(bloco)
+
+            pendentes = sorted((b for b in self.blocos if not b.alocado), key=lambda b: -b.peso * b.slots)
+            for pendente in pendentes:
+                if time.perf_counter() >= prazo:
+                    break
+                for dia in pendente.dias:
+                    candidatos = [b for b in por_funcionario_dia[(pendente.funcionario, dia)]
+                                  if b.peso * b.slots < pendente.peso * pendente.slots]
+                    if self._desalojar(pendente, dia, candidatos, por_funcionario_dia):
+                        estatisticas['desalojamentos'] += 1
+                        melhorou = True
+                        break
+
+            # 2) Move tarefas diárias para o horário mais comum da semana
+            grupos = defaultdict(list)
+            for bloco in self.blocos:
+                if bloco.alocado and len(bloco.dias) == 1:
+                    grupos[bloco.grupo].append(bloco)
+            for blocos in grupos.values():
+                if time.perf_counter() >= prazo:
+                    break
+                alvo = Counter(b.inicio for b in blocos).most_common(1)[0][0]
+                for bloco in blocos:
+                    if bloco.inicio == alvo:
+                        continue
+                    dia, inicio = bloco.dia, bloco.inicio
+                    self._retirar(bloco)
+                    if inicios_livres(self._livre(bloco.funcionario, dia), bloco.slots) >> alvo & 1:
+                        self._colocar(bloco, dia, alvo)
+                        estatisticas['realinhamentos'] += 1
+                        melhorou = True
+                    else:
+                        self._colocar(bloco, dia, inicio)
+
+        return estatisticas
+
+    def _desalojar(self, pendente: Bloco, dia: int, candidatos: List[Bloco],
+                   por_funcionario_dia: Dict) -> bool:
+        """
+        Tenta colocar `pendente` retirando um dos candidatos
+
+        Os candidatos valem menos (peso x slots) que o pendente, então a troca
+        sempre reduz a penalidade, mesmo que o candidato não caiba em outro lugar.
+        """
+        for candidato in sorted(candidatos, key=lambda b: b.peso * b.slots):
+            posicao = (candidato.dia, candidato.inicio)
+            self._retirar(candidato)
+            inicios = inicios_livres(self._livre(pendente.funcionario, dia), pendente.slots)
+            if not inicios:
+                self._colocar(candidato, *posicao)
+                continue
+
+            self._colocar(pendente, dia, menor_bit(inicios))
+            self._tentar_colocar(candidato)
+
+            por_funcionario_dia[(candidato.funcionario, posicao[0])].remove(candidato)
+            por_funcionario_dia[(pendente.funcionario, dia)].append(pendente)
+            if candidato.alocado:
+                por_funcionario_dia[(candidato.funcionario, candidato.dia)].append(candidato)
+            return True
+        return False
+
+    def gerar(self, tempo_limite: float = 1.0, melhorar: bool = True) -> Proposta:
+        """
+        Gera a proposta de agenda
+
+        Args:
+            tempo_limite: Tempo máximo (segundos) para a fase de busca local
+            melhorar: Se False, retorna só o resultado guloso
+        """
+        inicio = time.perf_counter()
+        self._guloso()
+        penalidade_gulosa = self._penalidade()
+        fim_guloso = time.perf_counter()
+
+        busca = {}
+        if melhorar:
+            busca = self._busca_local(fim_guloso + tempo_limite)
+
+        proposta = Proposta()
+        for fixo in self.fixos:
+            proposta.agenda.append({
+                'horario': fixo['horario'],
+                'funcionario': fixo['funcionario'],
+                'tarefa': fixo['tarefa'],
+                'data': self.dias[fixo['dia']].isoformat(),
+                'duracao': fixo.get('duracao') or SLOT_MINUTOS,
+                'fixo': True
+            })
+        for bloco in self.blocos:
+            item = {'funcionario': self.funcionarios[bloco.funcionario], 'tarefa': bloco.tarefa,
+                    'duracao': bloco.slots * SLOT_MINUTOS}
+            if bloco.alocado:
+                proposta.agenda.append({
+                    'horario': minutos_para_horario(bloco.inicio * SLOT_MINUTOS),
+                    **item,
+                    'data': self.dias[bloco.dia].isoformat()
+                })
+            else:
+                proposta.nao_alocadas.append({
+                    **item,
+                    'dias': [self.dias[d].isoformat() for d in bloco.dias]
+                })
+        proposta.agenda.sort(key=lambda a: (a['data'], a['horario'], a['funcionario']))
+
+        alocados = sum(1 for b in self.blocos if b.alocado)
+        proposta.estatisticas = {
+            'blocos': len(self.blocos),
+            'alocados': alocados,
+            'nao_alocados': len(self.blocos) - alocados,
+            'penalidade_gulosa': penalidade_gulosa,
+            'penalidade_final': self._penalidade(),
+            'tempo_guloso_ms': round((fim_guloso - inicio) * 1000, 1),
+            'tempo_total_ms': round((time.perf_counter() - inicio) * 1000, 1),
+            **busca
+        }
+        return proposta
+
+
+def atribuicoes_do_cronograma(agenda: Iterable[Dict], tarefas: Dict[str, Dict]) -> List[Atribuicao]:
+    """
+    Deduz quem faz o quê a partir do cronograma padrão (agendamentos sem data)
+
+    O tempo diário de cada par funcionário/tarefa é o tempo ocupado por ele
+    no cronograma, nunca menos que o tempo estimado da tarefa.
+    """
+    minutos = Counter()
+    for item in agenda:
+        if item.get('data') or item['tarefa'] in TAREFAS_FIXAS:
+            continue
+        minutos[(item['funcionario'], item['tarefa'])] += item.get('duracao') or SLOT_MINUTOS
+
+    return [
+        Atribuicao(funcionario, tarefa, max(total, (tarefas.get(tarefa) or {}).get('tempoEstimado') or 0))
+        for (funcionario, tarefa), total in minutos.items()
+    ]
+
+
+def fixos_do_cronograma(agenda: Iterable[Dict]) -> List[Dict]:
+    """Compromissos fixos (reunião diária, almoço...) do cronograma padrão"""
+    return [
+        {'funcionario': item['funcionario'], 'tarefa': item['tarefa'], 'horario': item['horario'],
+         'duracao': item.get('duracao') or SLOT_MINUTOS}
+        for item in agenda
+        if not item.get('data') and item['tarefa'] in TAREFAS_FIXAS
+    ]
+
+
+def dias_uteis(inicio: datetime.date, quantidade: int = 5) -> List[datetime.date]:
+    """Próximos `quantidade` dias úteis a partir de `inicio` (inclusive)"""
+    dias = []
+    dia = inicio
+    while len(dias) < quantidade:
+        if dia.weekday() < 5:
+            dias.append(dia)
+        dia += datetime.timedelta(days=1)
+    return dias
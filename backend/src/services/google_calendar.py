@@ -4,20 +4,82 @@ Implementa sincronização bidirecional entre Workspace Visual e Google Calendar
 """
 
 import os
+import re
 import json
+import time
+import hashlib
 import datetime
-from typing import Dict, List, Optional, Any
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple
 from googleapiclient.errors import HttpError
 import logging
 
+from src.services.metricas import medir_arquivo_json, metricas
+from src.services.perfilamento import perfilador
+
+# As bibliotecas de autenticação e o cliente da API custam ~200ms de import;
+# só são carregadas quando um usuário de fato conecta ou usa o calendário
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import Flow
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pasta com as credenciais e mapeamentos de cada usuário conectado
+ACCOUNTS_DIR = os.getenv('GOOGLE_CALENDAR_ACCOUNTS_DIR', 'calendar_accounts')
+OAUTH_REDIRECT_URI = os.getenv('GOOGLE_OAUTH_REDIRECT_URI', 'http://localhost:5000/api/calendar/oauth/callback')
+
+
+class OAuthStateStore:
+    """
+    Guarda em memória os fluxos OAuth pendentes, com validade
+    
+    Cada estado só pode ser usado uma vez; estados expirados são descartados
+    a cada escrita, então fluxos abandonados não se acumulam.
+    """
+    
+    def __init__(self, ttl_seconds: int = 600):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._states: Dict[str, Tuple[float, Optional[str], 'Flow']] = {}
+    
+    def put(self, state: str, user_id: Optional[str], flow: 'Flow'):
+        """Registra um fluxo pendente para o usuário"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (expires_at, _, _) in self._states.items() if expires_at <= now]
+            for key in expired:
+                del self._states[key]
+            self._states[state] = (now + self.ttl_seconds, user_id, flow)
+    
+    def owner(self, state: str) -> Optional[str]:
+        """user_id dono de um estado pendente (sem consumir o estado)"""
+        with self._lock:
+            entry = self._states.get(state)
+        if not entry or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+    
+    def pop(self, state: str) -> Optional[Tuple[Optional[str], 'Flow']]:
+        """Remove e retorna (user_id, flow) do estado, ou None se inválido/expirado"""
+        with self._lock:
+            entry = self._states.pop(state, None)
+        if not entry or entry[0] <= time.monotonic():
+            return None
+        return entry[1], entry[2]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._states)
+
+
+# Fluxos OAuth pendentes, compartilhados por todas as contas do processo
+oauth_state_store = OAuthStateStore()
+
+
 class GoogleCalendarService:
     """Serviço para integração com Google Calendar API"""
     
@@ -27,10 +89,41 @@ class GoogleCalendarService:
         'https://www.googleapis.com/auth/calendar.events'
     ]
     
-    def __init__(self):
+    # Campos do evento convertido que são comparados na sincronização
+    SYNC_FIELDS = ('title', 'description', 'start', 'end', 'location')
+    
+    # Tempo (s) até verificar de novo se um usuário sem token já conectou
+    MISSING_CREDENTIALS_RECHECK = 30
+    
+    def __init__(self, user_id: Optional[str] = None, state_store: Optional[OAuthStateStore] = None):
+        """
+        Args:
+            user_id: Conta do usuário no Workspace. Sem user_id, usa os arquivos
+                token.json e event_mappings.json do diretório atual (conta única).
+            state_store: Onde guardar fluxos OAuth pendentes
+        """
+        self.user_id = user_id
+        self.state_store = state_store or oauth_state_store
         self.credentials_file = 'credentials.json'
-        self.token_file = 'token.json'
+        
+        if user_id is None:
+            self.token_file = 'token.json'
+            self.mapping_file = 'event_mappings.json'
+        else:
+            account_dir = os.path.join(ACCOUNTS_DIR, self._safe_user_dir(user_id))
+            self.token_file = os.path.join(account_dir, 'token.json')
+            self.mapping_file = os.path.join(account_dir, 'event_mappings.json')
+        
         self.service = None
+        self._event_mappings = None
+        self._credentials_missing_until = 0.0
+    
+    @staticmethod
+    def _safe_user_dir(user_id: str) -> str:
+        """Nome de pasta seguro para o usuário (IDs com caracteres especiais viram hash)"""
+        if re.fullmatch(r'[A-Za-z0-9_.-]{1,64}', user_id) and user_id not in ('.', '..'):
+            return user_id
+        return hashlib.sha256(user_id.encode('utf-8')).hexdigest()[:32]
         
     def setup_oauth_flow(self, client_config: Dict[str, Any]) -> str:
         """
@@ -42,12 +135,14 @@ class GoogleCalendarService:
         Returns:
             URL de autorização para redirecionamento do usuário
         """
+        from google_auth_oauthlib.flow import Flow
+
         try:
             # Cria o fluxo OAuth
             flow = Flow.from_client_config(
                 client_config,
                 scopes=self.SCOPES,
-                redirect_uri='http://localhost:5000/oauth/callback'
+                redirect_uri=OAUTH_REDIRECT_URI
             )
             
             # Gera a URL de autorização
@@ -57,8 +152,8 @@ class GoogleCalendarService:
                 prompt='consent'
             )
             
-            # Salva o estado para validação posterior
-            self._save_oauth_state(state, flow)
+            # Guarda o fluxo (em memória) para validação no callback
+            self.state_store.put(state, self.user_id, flow)
             
             return authorization_url
             
@@ -78,10 +173,11 @@ class GoogleCalendarService:
             True se a autenticação foi bem-sucedida
         """
         try:
-            # Recupera o fluxo OAuth salvo
-            flow = self._load_oauth_state(state)
-            if not flow:
+            # Recupera o fluxo OAuth pendente
+            pending = self.state_store.pop(state)
+            if not pending or pending[0] != self.user_id:
                 raise ValueError("Estado OAuth inválido")
+            flow = pending[1]
             
             # Troca o código de autorização por credenciais
             flow.fetch_token(code=authorization_code)
@@ -99,62 +195,41 @@ class GoogleCalendarService:
             logger.error(f"Erro no callback OAuth: {e}")
             return False
     
-    def _save_oauth_state(self, state: str, flow: Flow):
-        """Salva o estado OAuth temporariamente"""
-        # Em produção, isso deveria ser salvo em um cache/database
-        # Por simplicidade, salvamos em arquivo temporário
-        with open(f'oauth_state_{state}.json', 'w') as f:
-            json.dump({
-                'client_config': flow.client_config,
-                'redirect_uri': flow.redirect_uri,
-                'scopes': flow.scopes
-            }, f)
-    
-    def _load_oauth_state(self, state: str) -> Optional[Flow]:
-        """Carrega o estado OAuth salvo"""
-        try:
-            with open(f'oauth_state_{state}.json', 'r') as f:
-                data = json.load(f)
-            
-            flow = Flow.from_client_config(
-                data['client_config'],
-                scopes=data['scopes'],
-                redirect_uri=data['redirect_uri']
-            )
-            
-            # Remove o arquivo temporário
-            os.remove(f'oauth_state_{state}.json')
-            
-            return flow
-            
-        except FileNotFoundError:
-            return None
-    
-    def _save_credentials(self, credentials: Credentials):
+    def _save_credentials(self, credentials: 'Credentials'):
         """Salva as credenciais OAuth"""
+        os.makedirs(os.path.dirname(self.token_file) or '.', exist_ok=True)
         with open(self.token_file, 'w') as token:
             token.write(credentials.to_json())
     
-    def _load_credentials(self) -> Optional[Credentials]:
+    def _load_credentials(self) -> Optional['Credentials']:
         """Carrega as credenciais salvas"""
         if os.path.exists(self.token_file):
+            from google.oauth2.credentials import Credentials
+
             return Credentials.from_authorized_user_file(self.token_file, self.SCOPES)
         return None
     
     def _initialize_service(self) -> bool:
         """Inicializa o serviço Google Calendar API"""
         try:
+            # Usuário sem token: evita consultar o disco a cada requisição
+            if time.monotonic() < self._credentials_missing_until:
+                return False
+            
             credentials = self._load_credentials()
             
             if not credentials:
+                self._credentials_missing_until = time.monotonic() + self.MISSING_CREDENTIALS_RECHECK
                 return False
             
             # Atualiza as credenciais se necessário
             if credentials.expired and credentials.refresh_token:
+                from google.auth.transport.requests import Request
                 credentials.refresh(Request())
                 self._save_credentials(credentials)
             
             # Constrói o serviço
+            from googleapiclient.discovery import build
             self.service = build('calendar', 'v3', credentials=credentials)
             return True
             
@@ -167,7 +242,26 @@ class GoogleCalendarService:
         if self.service:
             return True
         return self._initialize_service()
-    
+
+    def _execute(self, request):
+        """Executa uma chamada à API registrando contagem, status e duração por método"""
+        method = getattr(request, 'methodId', None) or 'desconhecido'
+        status = 'ok'
+        inicio = time.perf_counter()
+        try:
+            return request.execute()
+        except HttpError as e:
+            status = str(e.resp.status)
+            raise
+        except Exception:
+            status = 'erro'
+            raise
+        finally:
+            duracao = time.perf_counter() - inicio
+            metricas.contar('workspace_google_calendar_chamadas_total', (method, status))
+            metricas.observar('workspace_google_calendar_duracao_segundos', (method,), duracao)
+            perfilador.etapa('google_calendar', duracao)
+
     def get_calendars(self) -> List[Dict[str, Any]]:
         """
         Obtém lista de calendários do usuário
@@ -179,7 +273,7 @@ class GoogleCalendarService:
             return []
         
         try:
-            calendar_list = self.service.calendarList().list().execute()
+            calendar_list = self._execute(self.service.calendarList().list())
             calendars = []
             
             for calendar_item in calendar_list.get('items', []):
@@ -227,40 +321,132 @@ class GoogleCalendarService:
             time_max_str = time_max.isoformat()
             
             # Busca eventos
-            events_result = self.service.events().list(
+            events_result = self._execute(self.service.events().list(
                 calendarId=calendar_id,
                 timeMin=time_min_str,
                 timeMax=time_max_str,
                 maxResults=max_results,
                 singleEvents=True,
                 orderBy='startTime'
-            ).execute()
-            
-            events = []
-            for event in events_result.get('items', []):
-                # Processa informações do evento
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                events.append({
-                    'id': event['id'],
-                    'title': event.get('summary', 'Sem título'),
-                    'description': event.get('description', ''),
-                    'start': start,
-                    'end': end,
-                    'location': event.get('location', ''),
-                    'attendees': event.get('attendees', []),
-                    'created': event.get('created'),
-                    'updated': event.get('updated'),
-                    'calendar_id': calendar_id
-                })
+            ))
             
-            return events
+            return [
+                self._simplify_event(event, calendar_id)
+                for event in events_result.get('items', [])
+            ]
             
         except HttpError as e:
             logger.error(f"Erro ao obter eventos: {e}")
             return []
     
+    def list_event_changes(self, calendar_id: str = 'primary',
+                           sync_token: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Lista eventos alterados desde a última sincronização (sincronização incremental)
+        
+        Sem sync_token faz a listagem completa a partir de agora; com sync_token
+        retorna apenas o que mudou, incluindo eventos removidos (status 'cancelled').
+        Se o Google invalidar o token (HTTP 410), refaz a listagem completa.
+        
+        Args:
+            calendar_id: ID do calendário
+            sync_token: Token retornado pela chamada anterior
+            
+        Returns:
+            Tupla (eventos alterados no formato de get_events, próximo sync_token)
+        """
+        if not self.is_authenticated():
+            return [], sync_token
+        
+        params = {'calendarId': calendar_id, 'singleEvents': True, 'maxResults': 2500}
+        if sync_token:
+            params['syncToken'] = sync_token
+        else:
+            params['timeMin'] = datetime.datetime.now(tz=datetime.timezone.utc).isoformat()
+        
+        changes = []
+        try:
+            while True:
+                result = self._execute(self.service.events().list(**params))
+                for event in result.get('items', []):
+                    if event.get('status') == 'cancelled':
+                        changes.append({'id': event['id'], 'status': 'cancelled', 'calendar_id': calendar_id})
+                    else:
+                        changes.append(self._simplify_event(event, calendar_id))
+                
+                if not result.get('nextPageToken'):
+                    return changes, result.get('nextSyncToken')
+                params['pageToken'] = result['nextPageToken']
+                
+        except HttpError as e:
+            if e.resp.status == 410 and sync_token:
+                logger.info(f"Sync token expirado para {calendar_id}, refazendo sincronização completa")
+                return self.list_event_changes(calendar_id)
+            logger.error(f"Erro ao listar alterações: {e}")
+            return [], sync_token
+    
+    def watch_events(self, calendar_id: str, channel_id: str, address: str,
+                     token: Optional[str] = None, ttl_seconds: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Registra um canal de notificações (push) para mudanças nos eventos
+        
+        Args:
+            calendar_id: ID do calendário
+            channel_id: ID único do canal
+            address: URL HTTPS que recebe as notificações
+            token: Valor devolvido no cabeçalho X-Goog-Channel-Token
+            ttl_seconds: Validade solicitada para o canal
+            
+        Returns:
+            Dados do canal criado (id, resourceId, expiration) ou None se falhou
+        """
+        if not self.is_authenticated():
+            return None
+        
+        body = {'id': channel_id, 'type': 'web_hook', 'address': address}
+        if token:
+            body['token'] = token
+        if ttl_seconds:
+            body['params'] = {'ttl': str(ttl_seconds)}
+        
+        try:
+            return self._execute(self.service.events().watch(calendarId=calendar_id, body=body))
+        except HttpError as e:
+            logger.error(f"Erro ao registrar canal de notificações: {e}")
+            return None
+    
+    def stop_channel(self, channel_id: str, resource_id: str) -> bool:
+        """Encerra um canal de notificações"""
+        if not self.is_authenticated():
+            return False
+        
+        try:
+            self._execute(self.service.channels().stop(body={'id': channel_id, 'resourceId': resource_id}))
+            return True
+        except HttpError as e:
+            logger.error(f"Erro ao encerrar canal de notificações: {e}")
+            return False
+    
+    def _simplify_event(self, event: Dict[str, Any], calendar_id: str) -> Dict[str, Any]:
+        """Extrai os campos usados pelo Workspace de um evento da API"""
+        # Processa informações do evento
+        start = event['start'].get('dateTime', event['start'].get('date'))
+        end = event['end'].get('dateTime', event['end'].get('date'))
+        
+        return {
+            'id': event['id'],
+            'title': event.get('summary', 'Sem título'),
+            'description': event.get('description', ''),
+            'start': start,
+            'end': end,
+            'location': event.get('location', ''),
+            'attendees': event.get('attendees', []),
+            'created': event.get('created'),
+            'updated': event.get('updated'),
+            'calendar_id': calendar_id
+        }
+    
+    
     def create_event(self, calendar_id: str, event_data: Dict[str, Any]) -> Optional[str]:
         """
         Cria um novo evento no Google Calendar
@@ -302,10 +488,10 @@ class GoogleCalendarService:
                 ]
             
             # Cria o evento
-            created_event = self.service.events().insert(
+            created_event = self._execute(self.service.events().insert(
                 calendarId=calendar_id,
                 body=event
-            ).execute()
+            ))
             
             logger.info(f"Evento criado: {created_event['id']}")
             return created_event['id']
@@ -332,35 +518,20 @@ class GoogleCalendarService:
         
         try:
             # Obtém o evento atual
-            event = self.service.events().get(
+            event = self._execute(self.service.events().get(
                 calendarId=calendar_id,
                 eventId=event_id
-            ).execute()
+            ))
             
             # Atualiza os campos
-            if 'title' in event_data:
-                event['summary'] = event_data['title']
-            if 'description' in event_data:
-                event['description'] = event_data['description']
-            if 'start' in event_data:
-                event['start'] = {
-                    'dateTime': event_data['start'],
-                    'timeZone': 'America/Sao_Paulo',
-                }
-            if 'end' in event_data:
-                event['end'] = {
-                    'dateTime': event_data['end'],
-                    'timeZone': 'America/Sao_Paulo',
-                }
-            if 'location' in event_data:
-                event['location'] = event_data['location']
+            event.update(self._build_google_fields(event_data))
             
             # Salva as alterações
-            updated_event = self.service.events().update(
+            updated_event = self._execute(self.service.events().update(
                 calendarId=calendar_id,
                 eventId=event_id,
                 body=event
-            ).execute()
+            ))
             
             logger.info(f"Evento atualizado: {updated_event['id']}")
             return True
@@ -369,6 +540,43 @@ class GoogleCalendarService:
             logger.error(f"Erro ao atualizar evento: {e}")
             return False
     
+    def patch_event(self, calendar_id: str, event_id: str,
+                    event_data: Dict[str, Any]) -> Optional[bool]:
+        """
+        Atualiza parcialmente um evento, enviando apenas os campos informados
+        
+        Diferente de update_event, não busca o evento antes e usa events().patch,
+        então custa uma única chamada à API.
+        
+        Args:
+            calendar_id: ID do calendário
+            event_id: ID do evento
+            event_data: Campos alterados (mesmo formato de update_event)
+            
+        Returns:
+            True se atualizado com sucesso, False em caso de erro ou None se o
+            evento não existe mais no Google (404/410: removido por lá)
+        """
+        if not self.is_authenticated():
+            return False
+        
+        try:
+            patched_event = self._execute(self.service.events().patch(
+                calendarId=calendar_id,
+                eventId=event_id,
+                body=self._build_google_fields(event_data)
+            ))
+            
+            logger.info(f"Evento atualizado (patch): {patched_event['id']}")
+            return True
+            
+        except HttpError as e:
+            if e.resp.status in (404, 410):
+                logger.warning(f"Evento {event_id} não existe mais no Google Calendar")
+                return None
+            logger.error(f"Erro ao atualizar evento: {e}")
+            return False
+    
     def delete_event(self, calendar_id: str, event_id: str) -> bool:
         """
         Remove um evento do Google Calendar
@@ -384,10 +592,10 @@ class GoogleCalendarService:
             return False
         
         try:
-            self.service.events().delete(
+            self._execute(self.service.events().delete(
                 calendarId=calendar_id,
                 eventId=event_id
-            ).execute()
+            ))
             
             logger.info(f"Evento removido: {event_id}")
             return True
@@ -396,6 +604,7 @@ class GoogleCalendarService:
             logger.error(f"Erro ao remover evento: {e}")
             return False
     
+    @perfilador.tarefa('google_calendar.sync_workspace_to_google')
     def sync_workspace_to_google(self, workspace_events: List[Dict[str, Any]], 
                                 calendar_id: str = 'primary') -> Dict[str, Any]:
         """
@@ -414,46 +623,83 @@ class GoogleCalendarService:
         sync_report = {
             'created': 0,
             'updated': 0,
+            'skipped': 0,
             'errors': 0,
             'details': []
         }
         
+        mappings = self._load_event_mappings()
+        mappings_changed = False
+        
         for ws_event in workspace_events:
             try:
+                workspace_id = ws_event.get('workspace_id')
+                
                 # Converte evento do Workspace Visual para formato Google Calendar
                 event_data = self._convert_workspace_to_google_event(ws_event)
+                field_hashes = self._hash_event_fields(event_data)
+                event_hash = self._hash_payload(field_hashes)
                 
-                # Verifica se o evento já existe (baseado em ID personalizado)
-                existing_event_id = self._find_existing_event(
-                    calendar_id, ws_event.get('workspace_id')
-                )
+                # Verifica se o evento já existe (mapeamento salvo em sincronizações anteriores)
+                mapping = mappings.get(workspace_id) if workspace_id else None
                 
-                if existing_event_id:
-                    # Atualiza evento existente
-                    if self.update_event(calendar_id, existing_event_id, event_data):
+                if mapping and mapping.get('hash') == event_hash:
+                    # Nada mudou desde a última sincronização: nenhuma chamada à API
+                    sync_report['skipped'] += 1
+                    sync_report['details'].append(f"Sem alterações: {ws_event.get('title')}")
+                    continue
+
+                recriar = False
+                if mapping:
+                    # Envia apenas os campos que mudaram
+                    old_fields = mapping.get('fields', {})
+                    changed = {
+                        field: event_data[field] for field in self.SYNC_FIELDS
+                        if field_hashes[field] != old_fields.get(field)
+                    }
+                    patched = self.patch_event(calendar_id, mapping['google_event_id'], changed)
+                    if patched:
                         sync_report['updated'] += 1
                         sync_report['details'].append(f"Atualizado: {ws_event.get('title')}")
-                    else:
+                        mapping.update({'hash': event_hash, 'fields': field_hashes})
+                        mappings_changed = True
+                        continue
+                    if patched is False:
                         sync_report['errors'] += 1
                         sync_report['details'].append(f"Erro ao atualizar: {ws_event.get('title')}")
+                        continue
+                    # Removido no Google: o mapeamento não vale mais, o evento é criado de novo
+                    del mappings[workspace_id]
+                    mappings_changed = True
+                    recriar = True
+
+                # Cria novo evento
+                event_id = self.create_event(calendar_id, event_data)
+                if event_id:
+                    sync_report['created'] += 1
+                    sync_report['details'].append(f"{'Recriado' if recriar else 'Criado'}: {ws_event.get('title')}")
+                    # Salva mapeamento para futuras sincronizações
+                    if workspace_id:
+                        mappings[workspace_id] = {
+                            'google_event_id': event_id,
+                            'hash': event_hash,
+                            'fields': field_hashes
+                        }
+                        mappings_changed = True
                 else:
-                    # Cria novo evento
-                    event_id = self.create_event(calendar_id, event_data)
-                    if event_id:
-                        sync_report['created'] += 1
-                        sync_report['details'].append(f"Criado: {ws_event.get('title')}")
-                        # Salva mapeamento para futuras sincronizações
-                        self._save_event_mapping(ws_event.get('workspace_id'), event_id)
-                    else:
-                        sync_report['errors'] += 1
-                        sync_report['details'].append(f"Erro ao criar: {ws_event.get('title')}")
-                        
+                    sync_report['errors'] += 1
+                    sync_report['details'].append(f"Erro ao criar: {ws_event.get('title')}")
+
             except Exception as e:
                 sync_report['errors'] += 1
                 sync_report['details'].append(f"Erro: {str(e)}")
         
+        if mappings_changed:
+            self._save_event_mappings()
+        
         return sync_report
     
+    @perfilador.tarefa('google_calendar.sync_google_to_workspace')
     def sync_google_to_workspace(self, calendar_id: str = 'primary') -> List[Dict[str, Any]]:
         """
         Sincroniza eventos do Google Calendar para o Workspace Visual
@@ -520,33 +766,64 @@ class GoogleCalendarService:
             logger.error(f"Erro ao converter evento Google: {e}")
             return None
     
-    def _find_existing_event(self, calendar_id: str, workspace_id: str) -> Optional[str]:
-        """Encontra evento existente baseado no ID do Workspace"""
-        # Em produção, isso seria feito através de um banco de dados
-        # Por simplicidade, usamos busca por texto na descrição
-        try:
-            events = self.get_events(calendar_id)
-            for event in events:
-                if f"workspace_id:{workspace_id}" in event.get('description', ''):
-                    return event['id']
-            return None
-        except:
-            return None
+    def _build_google_fields(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Converte os campos presentes em event_data para o formato da API do Google"""
+        fields = {}
+        if 'title' in event_data:
+            fields['summary'] = event_data['title']
+        if 'description' in event_data:
+            fields['description'] = event_data['description']
+        if 'start' in event_data:
+            fields['start'] = {
+                'dateTime': event_data['start'],
+                'timeZone': 'America/Sao_Paulo',
+            }
+        if 'end' in event_data:
+            fields['end'] = {
+                'dateTime': event_data['end'],
+                'timeZone': 'America/Sao_Paulo',
+            }
+        if 'location' in event_data:
+            fields['location'] = event_data['location']
+        return fields
     
-    def _save_event_mapping(self, workspace_id: str, google_event_id: str):
-        """Salva mapeamento entre IDs do Workspace e Google Calendar"""
-        # Em produção, isso seria salvo em banco de dados
-        mapping_file = 'event_mappings.json'
-        mappings = {}
-        
-        if os.path.exists(mapping_file):
-            with open(mapping_file, 'r') as f:
-                mappings = json.load(f)
-        
-        mappings[workspace_id] = google_event_id
+    @staticmethod
+    def _hash_payload(payload: Any) -> str:
+        """Gera um hash estável de um payload JSON (chaves ordenadas, sem espaços)"""
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def _hash_event_fields(self, event_data: Dict[str, Any]) -> Dict[str, str]:
+        """Gera o hash de cada campo sincronizado de um evento convertido"""
+        return {field: self._hash_payload(event_data.get(field)) for field in self.SYNC_FIELDS}
+    
+    def _load_event_mappings(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Carrega os mapeamentos Workspace -> Google (uma vez por instância)
         
-        with open(mapping_file, 'w') as f:
-            json.dump(mappings, f)
+        Cada mapeamento guarda o ID do evento no Google e os hashes do payload
+        enviado na última sincronização. Mapeamentos no formato antigo
+        (workspace_id -> google_event_id) são convertidos sem hash, o que força
+        um patch completo na próxima sincronização.
+        """
+        if self._event_mappings is None:
+            mappings = {}
+            if os.path.exists(self.mapping_file):
+                with medir_arquivo_json(self.mapping_file, 'carregar'), open(self.mapping_file, 'r') as f:
+                    mappings = json.load(f)
+            
+            self._event_mappings = {
+                workspace_id: (value if isinstance(value, dict) else {'google_event_id': value})
+                for workspace_id, value in mappings.items()
+            }
+        return self._event_mappings
+    
+    def _save_event_mappings(self):
+        """Salva os mapeamentos entre IDs do Workspace e Google Calendar"""
+        # Em produção, isso seria salvo em banco de dados
+        os.makedirs(os.path.dirname(self.mapping_file) or '.', exist_ok=True)
+        with medir_arquivo_json(self.mapping_file, 'salvar'), open(self.mapping_file, 'w') as f:
+            json.dump(self._load_event_mappings(), f)
     
     def disconnect(self) -> bool:
         """Desconecta da conta Google e remove credenciais"""
@@ -556,11 +833,13 @@ class GoogleCalendarService:
                 os.remove(self.token_file)
             
             # Remove mapeamentos
-            if os.path.exists('event_mappings.json'):
-                os.remove('event_mappings.json')
+            if os.path.exists(self.mapping_file):
+                os.remove(self.mapping_file)
             
             # Limpa serviço
             self.service = None
+            self._event_mappings = None
+            self._credentials_missing_until = 0.0
             
             return True
             
@@ -568,6 +847,80 @@ class GoogleCalendarService:
             logger.error(f"Erro ao desconectar: {e}")
             return False
 
-# Instância global do serviço
+class CalendarServicePool:
+    """
+    Pool LRU de serviços do Google Calendar, um por usuário
+    
+    Cada usuário tem seu próprio token e mapeamento de eventos. O cliente da API
+    é criado uma vez e reaproveitado enquanto estiver em uso; clientes parados
+    há mais de idle_seconds, ou além de max_size, são descartados.
+    """
+    
+    def __init__(self, max_size: int = 500, idle_seconds: int = 1800,
+                 state_store: Optional[OAuthStateStore] = None):
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self.state_store = state_store or oauth_state_store
+        self._lock = threading.Lock()
+        self._services: "OrderedDict[str, Tuple[float, GoogleCalendarService]]" = OrderedDict()
+    
+    def get(self, user_id: str) -> GoogleCalendarService:
+        """Retorna o serviço do usuário, criando se necessário"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._services.pop(user_id, None)
+            service = entry[1] if entry else GoogleCalendarService(user_id, self.state_store)
+            self._services[user_id] = (now, service)
+            self._evict(now)
+        return service
+    
+    def _evict(self, now: float):
+        # Os mais antigos ficam no início do OrderedDict
+        while self._services:
+            user_id, (last_used, _) = next(iter(self._services.items()))
+            if len(self._services) <= self.max_size and now - last_used < self.idle_seconds:
+                break
+            del self._services[user_id]
+    
+    def evict_idle(self) -> int:
+        """Descarta os serviços ociosos; retorna quantos foram removidos"""
+        with self._lock:
+            before = len(self._services)
+            self._evict(time.monotonic())
+            return before - len(self._services)
+    
+    def handle_oauth_callback(self, authorization_code: str, state: str) -> Optional[str]:
+        """
+        Conclui o OAuth do usuário dono do estado
+        
+        Returns:
+            user_id autenticado, ou None se o estado for inválido ou a troca falhar
+        """
+        user_id = self.state_store.owner(state)
+        if user_id is None:
+            return None
+        
+        service = self.get(user_id)
+        return user_id if service.handle_oauth_callback(authorization_code, state) else None
+    
+    def disconnect(self, user_id: str) -> bool:
+        """Remove as credenciais do usuário e o tira do pool"""
+        service = self.get(user_id)
+        with self._lock:
+            self._services.pop(user_id, None)
+        return service.disconnect()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._services)
+
+
+# Instância global do serviço (conta única, arquivos no diretório atual)
 google_calendar_service = GoogleCalendarService()
 
+# Serviços por usuário
+calendar_service_pool = CalendarServicePool(
+    max_size=int(os.getenv('GOOGLE_CALENDAR_POOL_SIZE', '500')),
+    idle_seconds=int(os.getenv('GOOGLE_CALENDAR_POOL_IDLE', '1800'))
+)
+
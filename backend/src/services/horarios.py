@@ -0,0 +1,137 @@
+"""
+Funções de apoio para horários da agenda
+O cronograma usa slots de 30 minutos e horários no formato "HH:MM"
+"""
+
+import datetime
+import math
+from typing import List, Optional, Tuple
+
+# Duração de um slot do cronograma (minutos)
+SLOT_MINUTOS = 30
+
+# Duração padrão de um agendamento sem `duracao` (igual ao padrão do Supabase)
+DURACAO_PADRAO = 30
+
+# Slots em um dia
+SLOTS_POR_DIA = 24 * 60 // SLOT_MINUTOS
+
+# Horário de trabalho de quem não tem horarioInicio/horarioFim
+HORARIO_PADRAO = ('09:00', '17:30')
+
+
+def horario_para_minutos(horario: Optional[str]) -> Optional[int]:
+    """
+    Converte "HH:MM" em minutos desde 00:00
+
+    None se vazio, inválido (ex.: "flexible") ou fora do dia (ex.: "99:99",
+    "-5:00"): as grades em bits não aceitam deslocamentos fora de 0..1439.
+    """
+    try:
+        horas, minutos = horario.split(':')
+        horas, minutos = int(horas), int(minutos)
+    except (AttributeError, ValueError):
+        return None
+    if not (0 <= horas < 24 and 0 <= minutos < 60):
+        return None
+    return horas * 60 + minutos
+
+
+def minutos_para_horario(minutos: int) -> str:
+    """Converte minutos desde 00:00 em "HH:MM\""""
+    return f'{minutos // 60:02d}:{minutos % 60:02d}'
+
+
+def horarios_ocupados(horario: str, duracao: Optional[int] = None) -> List[str]:
+    """Slots de 30 minutos ocupados por um agendamento (como a coluna horarios_ocupados)"""
+    inicio = horario_para_minutos(horario)
+    if inicio is None:
+        return []
+    duracao = duracao or DURACAO_PADRAO
+    return [minutos_para_horario(m) for m in range(inicio, inicio + duracao, SLOT_MINUTOS)]
+
+
+def parse_data(valor) -> Optional[datetime.date]:
+    """Aceita date, "YYYY-MM-DD" ou None"""
+    if valor is None or isinstance(valor, datetime.date):
+        return valor
+    try:
+        return datetime.date.fromisoformat(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def data_do_parametro(valor, nome: str) -> Optional[datetime.date]:
+    """
+    Data de um parâmetro opcional (query string ou corpo)
+
+    Returns:
+        None se o parâmetro não veio (ou veio vazio)
+
+    Raises:
+        ValueError: parâmetro fora do formato YYYY-MM-DD
+    """
+    if valor in (None, ''):
+        return None
+    data = parse_data(valor)
+    if data is None:
+        raise ValueError(f'{nome} inválido (use YYYY-MM-DD)')
+    return data
+
+
+# Grades em bits: cada bit de um inteiro é um slot de 30 minutos (bit 0 = 00:00)
+
+def mascara_slots(inicio: int, slots: int) -> int:
+    """Máscara com `slots` bits ligados a partir do slot `inicio`"""
+    return ((1 << slots) - 1) << inicio
+
+
+def slots_da_duracao(duracao: Optional[int]) -> int:
+    """Quantidade de slots ocupados por uma duração em minutos (mínimo 1)"""
+    return max(math.ceil((duracao or DURACAO_PADRAO) / SLOT_MINUTOS), 1)
+
+
+def mascara_agendamento(horario: Optional[str], duracao: Optional[int] = None) -> int:
+    """Slots ocupados por um agendamento (0 se o horário for inválido)"""
+    inicio = horario_para_minutos(horario)
+    if inicio is None:
+        return 0
+    primeiro = inicio // SLOT_MINUTOS
+    return mascara_slots(primeiro, min(slots_da_duracao(duracao), SLOTS_POR_DIA - primeiro))
+
+
+def mascara_expediente(horario_inicio: Optional[str], horario_fim: Optional[str],
+                       padrao: Tuple[str, str] = HORARIO_PADRAO) -> int:
+    """
+    Slots de trabalho de um funcionário
+
+    O horário de fim é o início do último slot (ex.: "17:30" trabalha até 18:00),
+    como no cronograma.
+    """
+    inicio = horario_para_minutos(horario_inicio)
+    fim = horario_para_minutos(horario_fim)
+    if inicio is None:
+        inicio = horario_para_minutos(padrao[0])
+    if fim is None:
+        fim = horario_para_minutos(padrao[1])
+    primeiro, ultimo = inicio // SLOT_MINUTOS, min(fim // SLOT_MINUTOS, SLOTS_POR_DIA - 1)
+    return mascara_slots(primeiro, max(ultimo - primeiro + 1, 0))
+
+
+def inicios_livres(livre: int, slots: int) -> int:
+    """
+    Bits onde começa uma sequência de `slots` bits livres consecutivos
+
+    Usa deslocamentos dobrando o alcance a cada passo (log2(slots) operações).
+    """
+    inicios, cobertos = livre, 1
+    while cobertos < slots:
+        passo = min(cobertos, slots - cobertos)
+        inicios &= inicios >> passo
+        cobertos += passo
+    return inicios
+
+
+def menor_bit(mascara: int) -> int:
+    """Índice do bit ligado mais baixo"""
+    return (mascara & -mascara).bit_length() - 1
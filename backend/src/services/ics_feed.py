@@ -0,0 +1,212 @@
+"""
+Feeds ICS (iCalendar) somente leitura da agenda
+Cada agendamento vira um VEVENT; agendamentos sem data são o cronograma
+padrão e viram eventos recorrentes (RRULE da coluna recorrencia). As exceções
+de um agendamento recorrente (AgendaExcecao) saem no mesmo bloco: EXDATE para
+ocorrências canceladas e um VEVENT com RECURRENCE-ID para as alteradas
+"""
+
+import datetime
+import hashlib
+import threading
+from email.utils import format_datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.services.horarios import DURACAO_PADRAO, horario_para_minutos
+from src.services.recorrencia import INICIO_RECORRENCIA, parse_regra
+
+TIMEZONE = 'America/Sao_Paulo'
+
+VTIMEZONE = (
+    'BEGIN:VTIMEZONE\r\n'
+    f'TZID:{TIMEZONE}\r\n'
+    'BEGIN:STANDARD\r\n'
+    'DTSTART:19700101T000000\r\n'
+    'TZOFFSETFROM:-0300\r\n'
+    'TZOFFSETTO:-0300\r\n'
+    'TZNAME:-03\r\n'
+    'END:STANDARD\r\n'
+    'END:VTIMEZONE\r\n'
+)
+
+
+def _escape(texto: Optional[str]) -> str:
+    """Escapa texto conforme RFC 5545"""
+    return (texto or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def _fold(linha: str) -> str:
+    """Quebra linhas com mais de 75 octetos (RFC 5545, seção 3.1)"""
+    dados = linha.encode('utf-8')
+    if len(dados) <= 75:
+        return linha + '\r\n'
+
+    partes, atual, tamanho = [], '', 0
+    for char in linha:
+        char_len = len(char.encode('utf-8'))
+        if tamanho + char_len > (75 if not partes else 74):
+            partes.append(atual)
+            atual, tamanho = '', 0
+        atual += char
+        tamanho += char_len
+    partes.append(atual)
+    return '\r\n '.join(partes) + '\r\n'
+
+
+def _format_local(momento: datetime.datetime) -> str:
+    return momento.strftime('%Y%m%dT%H%M%S')
+
+
+class IcsFeedRenderer:
+    """
+    Gera feeds ICS reaproveitando os VEVENTs já renderizados
+
+    Cada agendamento é identificado por uma "impressão digital" com todos os
+    campos que aparecem no VEVENT, inclusive as exceções (último campo da linha). Só agendamentos cuja impressão mudou são
+    renderizados de novo; o ETag do feed é derivado das impressões, então um
+    feed sem mudanças pode responder 304 sem renderizar nada.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blocks: Dict[int, Tuple[tuple, str]] = {}
+        self._last_modified: Dict[str, Tuple[str, datetime.datetime]] = {}
+
+    @staticmethod
+    def fingerprint(row) -> tuple:
+        """Campos que determinam o VEVENT de um agendamento (linha da consulta do feed)"""
+        return tuple(row)
+
+    def feed_etag(self, feed_key: str, rows: Iterable[tuple]) -> Tuple[str, datetime.datetime]:
+        """
+        ETag e Last-Modified do feed
+
+        Last-Modified é o momento em que o ETag do feed mudou pela última vez
+        neste processo.
+        """
+        digest = hashlib.sha256(feed_key.encode('utf-8'))
+        for row in rows:
+            digest.update(repr(self.fingerprint(row)).encode('utf-8'))
+        etag = f'"{digest.hexdigest()[:32]}"'
+
+        with self._lock:
+            anterior = self._last_modified.get(feed_key)
+            if anterior and anterior[0] == etag:
+                return etag, anterior[1]
+            agora = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+            self._last_modified[feed_key] = (etag, agora)
+            return etag, agora
+
+    def render(self, nome_calendario: str, rows: List[tuple]) -> str:
+        """Monta o VCALENDAR com um VEVENT por linha"""
+        blocos = [self._vevent(row) for row in rows]
+        return (
+            'BEGIN:VCALENDAR\r\n'
+            'VERSION:2.0\r\n'
+            'PRODID:-//Workspace Visual//Agenda//PT-BR\r\n'
+            'CALSCALE:GREGORIAN\r\n'
+            'METHOD:PUBLISH\r\n'
+            + _fold(f'X-WR-CALNAME:{_escape(nome_calendario)}')
+            + f'X-WR-TIMEZONE:{TIMEZONE}\r\n'
+            + VTIMEZONE
+            + ''.join(blocos)
+            + 'END:VCALENDAR\r\n'
+        )
+
+    def prune(self, ids_existentes: Iterable[int]):
+        """Descarta do cache os agendamentos removidos"""
+        existentes = set(ids_existentes)
+        with self._lock:
+            for agenda_id in [key for key in self._blocks if key not in existentes]:
+                del self._blocks[agenda_id]
+
+    def _vevent(self, row: tuple) -> str:
+        impressao = self.fingerprint(row)
+        agenda_id = row[0]
+
+        with self._lock:
+            cached = self._blocks.get(agenda_id)
+        if cached and cached[0] == impressao:
+            return cached[1]
+
+        bloco = self._render_vevent(row)
+        with self._lock:
+            self._blocks[agenda_id] = (impressao, bloco)
+        return bloco
+
+    @staticmethod
+    def _render_vevent(row: tuple) -> str:
+        """
+        VEVENT do agendamento e, se recorrente, das ocorrências alteradas
+
+        A linha termina com as exceções: tuplas (data, cancelado, horario,
+        duracao, tarefa_id, tarefa_nome, categoria, descricao), em que None
+        mantém o valor do agendamento (como em recorrencia.expandir).
+        """
+        (agenda_id, horario, data, duracao, recorrencia, funcionario_id, funcionario_nome,
+         tarefa_id, tarefa_nome, categoria, descricao, excecoes) = row
+
+        minutos = horario_para_minutos(horario) or 0
+        agora = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        uid = f'UID:agenda-{agenda_id}@workspace-visual'
+        funcionario = f'X-WORKSPACE-FUNCIONARIO:{_escape(funcionario_nome or funcionario_id)}'
+
+        def inicio_em(dia: datetime.date, minutos_dia: int) -> datetime.datetime:
+            return datetime.datetime.combine(dia, datetime.time()) + datetime.timedelta(minutes=minutos_dia)
+
+        def evento(inicio, minutos_duracao, titulo, texto, categoria_evento, extras) -> List[str]:
+            fim = inicio + datetime.timedelta(minutes=minutos_duracao or DURACAO_PADRAO)
+            return [
+                'BEGIN:VEVENT',
+                uid,
+                f'DTSTAMP:{agora}',
+                f'DTSTART;TZID={TIMEZONE}:{_format_local(inicio)}',
+                f'DTEND;TZID={TIMEZONE}:{_format_local(fim)}',
+                *extras,
+                f'SUMMARY:{_escape(titulo)}',
+                f'DESCRIPTION:{_escape(texto)}',
+                f'CATEGORIES:{_escape(categoria_evento)}',
+                funcionario,
+                'TRANSP:OPAQUE',
+                'END:VEVENT',
+            ]
+
+        if data is not None:
+            linhas = evento(inicio_em(data, minutos), duracao, tarefa_nome or tarefa_id, descricao, categoria, [])
+            return ''.join(_fold(linha) for linha in linhas)
+
+        regra = parse_regra(recorrencia)
+        extras = [f'RRULE:{regra.to_rrule()}']
+        alteradas = []
+        for (dia, cancelado, ex_horario, ex_duracao, ex_tarefa_id, ex_tarefa_nome,
+             ex_categoria, ex_descricao) in excecoes:
+            original = _format_local(inicio_em(dia, minutos))
+            if cancelado:
+                if regra.ocorre_em(dia):
+                    extras.append(f'EXDATE;TZID={TIMEZONE}:{original}')
+                continue
+            if not regra.ocorre_em(dia):
+                # Exceção numa data fora da regra acrescenta uma ocorrência (como em expandir)
+                extras.append(f'RDATE;TZID={TIMEZONE}:{original}')
+            novo_horario = horario_para_minutos(ex_horario) if ex_horario else None
+            alteradas += evento(
+                inicio_em(dia, minutos if novo_horario is None else novo_horario),
+                ex_duracao or duracao,
+                (ex_tarefa_nome or ex_tarefa_id) if ex_tarefa_id else (tarefa_nome or tarefa_id),
+                ex_descricao if ex_tarefa_id else descricao,
+                ex_categoria if ex_tarefa_id else categoria,
+                [f'RECURRENCE-ID;TZID={TIMEZONE}:{original}']
+            )
+
+        linhas = evento(inicio_em(INICIO_RECORRENCIA, minutos), duracao, tarefa_nome or tarefa_id, descricao,
+                        categoria, extras)
+        return ''.join(_fold(linha) for linha in linhas + alteradas)
+
+
+def http_date(momento: datetime.datetime) -> str:
+    """Formata datetime para cabeçalhos HTTP (Last-Modified)"""
+    return format_datetime(momento, usegmt=True)
+
+
+# Instância global usada pelas rotas
+ics_feed_renderer = IcsFeedRenderer()
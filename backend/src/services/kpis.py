@@ -0,0 +1,421 @@
+"""
+Indicadores do cronograma (KPIs)
+A agenda é carregada em colunas NumPy (funcionário, tarefa, início, duração,
+dia e se computa horas) e os indicadores são calculados sobre as colunas
+inteiras, sem laços por agendamento; os resultados ficam em cache pela versão
+dos dados
+"""
+
+import datetime
+import threading
+from typing import Callable, Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.services.horarios import (
+    DURACAO_PADRAO, SLOT_MINUTOS, SLOTS_POR_DIA, horario_para_minutos, mascara_expediente, minutos_para_horario
+)
+from src.services.recorrencia import INICIO_RECORRENCIA, CacheJanelas, parse_regra
+
+MINUTOS_DIA = 24 * 60
+
+# Maior intervalo aceito em uma consulta (dias, ~10 anos)
+MAX_DIAS_KPI = 3660
+
+# Carga diária acima de `capacidade * LIMITE_SOBRECARGA` conta como sobrecarga
+LIMITE_SOBRECARGA = 1.0
+
+# Menor lacuna de ociosidade listada (minutos) e quantas são devolvidas
+LACUNA_MINIMA = 60
+MAX_LACUNAS = 50
+MAX_SOBRECARGAS = 200
+
+# Dias da semana em bits (bit 0 = segunda); regra sem BYDAY vale para todos
+TODOS_OS_DIAS = 0b1111111
+
+# Fim sem UNTIL
+SEM_FIM = np.iinfo(np.int32).max
+
+
+def _inteiros(valores: Iterable, dtype=np.int32) -> np.ndarray:
+    return np.fromiter(valores, dtype=dtype)
+
+
+class TabelaAgenda:
+    """
+    Agenda em colunas
+
+    - datados: agendamentos de um dia específico, ordenados por dia (ordinal)
+    - modelos: agendamentos sem data, com a regra de recorrência em colunas
+      (dias da semana em bits, intervalo, semanal/diária, UNTIL)
+    - exceções: ocorrências de modelos canceladas ou alteradas
+
+    Agendamentos com horário inválido (ex.: "flexible") ficam de fora.
+    """
+
+    def __init__(self, funcionarios: Sequence[Tuple], tarefas: Sequence[Tuple],
+                 agenda: Sequence[Tuple], excecoes: Sequence[Tuple]):
+        """
+        Args:
+            funcionarios: (id, nome, horario_inicio, horario_fim)
+            tarefas: (id, nome, categoria, computar_horas)
+            agenda: (id, funcionario_id, tarefa_id, horario, duracao, data, recorrencia)
+            excecoes: (agenda_id, data, cancelado, horario, tarefa_id, duracao)
+        """
+        self.funcionarios = [f[0] for f in funcionarios]
+        self.nomes = [f[1] for f in funcionarios]
+        indice_func = {fid: i for i, fid in enumerate(self.funcionarios)}
+        expedientes = [mascara_expediente(f[2], f[3]) for f in funcionarios]
+        slots = np.arange(SLOTS_POR_DIA, dtype=np.int64)
+        # (F, SLOTS_POR_DIA): slots de trabalho de cada funcionário em dia útil
+        self.expediente = ((np.array(expedientes, dtype=np.int64).reshape(-1, 1) >> slots) & 1).astype(bool)
+
+        self.tarefas = [t[0] for t in tarefas]
+        self.nomes_tarefas = [t[1] for t in tarefas]
+        indice_tarefa = {tid: i for i, tid in enumerate(self.tarefas)}
+        self.categorias = sorted({t[2] for t in tarefas})
+        indice_categoria = {c: i for i, c in enumerate(self.categorias)}
+        self.categoria_da_tarefa = _inteiros((indice_categoria[t[2]] for t in tarefas))
+        self.computa_tarefa = np.fromiter((t[3] is not False for t in tarefas), dtype=bool, count=len(tarefas))
+
+        minutos = {}
+
+        def inicio_em_minutos(horario):
+            if horario not in minutos:
+                valor = horario_para_minutos(horario)
+                minutos[horario] = -1 if valor is None or not 0 <= valor < MINUTOS_DIA else valor
+            return minutos[horario]
+
+        validos = [
+            item for item in agenda
+            if item[1] in indice_func and item[2] in indice_tarefa and inicio_em_minutos(item[3]) >= 0
+        ]
+        datados = sorted((item for item in validos if item[5] is not None), key=lambda item: item[5])
+        modelos = [item for item in validos if item[5] is None]
+
+        self.d_func = _inteiros(indice_func[item[1]] for item in datados)
+        self.d_tarefa = _inteiros(indice_tarefa[item[2]] for item in datados)
+        self.d_inicio = _inteiros(minutos[item[3]] for item in datados)
+        self.d_duracao = _inteiros((item[4] or DURACAO_PADRAO) for item in datados)
+        self.d_dia = _inteiros(item[5].toordinal() for item in datados)
+
+        regras = []
+        for item in modelos:
+            try:
+                regras.append(parse_regra(item[6]))
+            except ValueError:
+                regras.append(None)
+        modelos = [item for item, regra in zip(modelos, regras) if regra is not None]
+        regras = [regra for regra in regras if regra is not None]
+
+        posicao_modelo = {item[0]: i for i, item in enumerate(modelos)}
+        self.m_func = _inteiros(indice_func[item[1]] for item in modelos)
+        self.m_tarefa = _inteiros(indice_tarefa[item[2]] for item in modelos)
+        self.m_inicio = _inteiros(minutos[item[3]] for item in modelos)
+        self.m_duracao = _inteiros((item[4] or DURACAO_PADRAO) for item in modelos)
+        self.m_dias_semana = _inteiros(
+            (sum(1 << d for d in regra.dias_semana) or TODOS_OS_DIAS) for regra in regras
+        )
+        self.m_intervalo = _inteiros(regra.intervalo for regra in regras)
+        self.m_passo = _inteiros((7 if regra.frequencia == 'WEEKLY' else 1) for regra in regras)
+        self.m_ate = _inteiros((regra.ate.toordinal() if regra.ate else SEM_FIM) for regra in regras)
+
+        excecoes = [e for e in excecoes if e[0] in posicao_modelo]
+        modelo_de = [modelos[posicao_modelo[e[0]]] for e in excecoes]
+        self.e_modelo = _inteiros(posicao_modelo[e[0]] for e in excecoes)
+        self.e_dia = _inteiros(e[1].toordinal() for e in excecoes)
+        self.e_cancelado = np.fromiter((bool(e[2]) for e in excecoes), dtype=bool, count=len(excecoes))
+        # Campos vazios da exceção herdam do modelo
+        self.e_inicio = _inteiros(inicio_em_minutos(e[3] or m[3]) for e, m in zip(excecoes, modelo_de))
+        self.e_tarefa = _inteiros(
+            indice_tarefa.get(e[4], indice_tarefa[m[2]]) for e, m in zip(excecoes, modelo_de)
+        )
+        self.e_duracao = _inteiros((e[5] or m[4] or DURACAO_PADRAO) for e, m in zip(excecoes, modelo_de))
+
+    def ocorrencias(self, inicio: datetime.date, fim: datetime.date) -> Dict[str, np.ndarray]:
+        """
+        Todas as ocorrências do intervalo em colunas (func, tarefa, inicio, duracao, dia)
+
+        `dia` é o deslocamento a partir de `inicio`. As ocorrências dos modelos
+        saem de uma matriz modelos x dias calculada de uma vez a partir das regras.
+        """
+        o_inicio, o_fim = inicio.toordinal(), fim.toordinal()
+        dias = np.arange(o_inicio, o_fim + 1, dtype=np.int32)
+
+        a, b = np.searchsorted(self.d_dia, [o_inicio, o_fim + 1])
+        partes = [(
+            self.d_func[a:b], self.d_tarefa[a:b], self.d_inicio[a:b], self.d_duracao[a:b], self.d_dia[a:b] - o_inicio
+        )]
+
+        if len(self.m_func):
+            dia_semana = (dias - 1) % 7  # ordinal 1 (01/01/0001) é uma segunda-feira
+            desde = dias - INICIO_RECORRENCIA.toordinal()
+            ocorre = ((self.m_dias_semana[:, None] >> dia_semana[None, :]) & 1).astype(bool)
+            ocorre &= (desde >= 0)[None, :]
+            ocorre &= dias[None, :] <= self.m_ate[:, None]
+            ocorre &= (np.maximum(desde, 0)[None, :] // self.m_passo[:, None]) % self.m_intervalo[:, None] == 0
+
+            no_intervalo = (self.e_dia >= o_inicio) & (self.e_dia <= o_fim)
+            e_modelo, e_dia = self.e_modelo[no_intervalo], self.e_dia[no_intervalo] - o_inicio
+            # A exceção substitui a ocorrência do dia (sempre, mesmo fora da regra)
+            ocorre[e_modelo, e_dia] = False
+
+            modelo, dia = np.nonzero(ocorre)
+            partes.append((self.m_func[modelo], self.m_tarefa[modelo], self.m_inicio[modelo],
+                           self.m_duracao[modelo], dia.astype(np.int32)))
+
+            alteradas = no_intervalo & ~self.e_cancelado
+            partes.append((self.m_func[self.e_modelo[alteradas]], self.e_tarefa[alteradas], self.e_inicio[alteradas],
+                           self.e_duracao[alteradas], self.e_dia[alteradas] - o_inicio))
+
+        colunas = ('func', 'tarefa', 'inicio', 'duracao', 'dia')
+        ocorrencias = {nome: np.concatenate([parte[i] for parte in partes]) for i, nome in enumerate(colunas)}
+        validas = ocorrencias['inicio'] >= 0
+        return {nome: valores[validas] for nome, valores in ocorrencias.items()}
+
+
+def _horas(minutos) -> float:
+    return round(float(minutos) / 60, 2)
+
+
+def _razao(parte, todo) -> Optional[float]:
+    return round(float(parte) / float(todo), 4) if todo else None
+
+
+def calcular_kpis(tabela: TabelaAgenda, inicio: datetime.date, fim: datetime.date,
+                  funcionarios: Optional[Sequence[str]] = None,
+                  limite_sobrecarga: float = LIMITE_SOBRECARGA, lacuna_minima: int = LACUNA_MINIMA) -> Dict:
+    """
+    Indicadores do intervalo (inclusive)
+
+    - utilização por funcionário e por hora do dia: minutos de tarefas que
+      computam horas sobre os minutos de expediente em dias úteis
+    - mix de categorias (agendamentos e horas)
+    - equilíbrio da carga entre funcionários
+    - sobrecarga: dias em que a carga passa da capacidade (trabalho em dia
+      sem expediente também conta)
+    - cobertura: slots do expediente sem nenhum agendamento (lacunas de
+      ociosidade) e quantas pessoas estão disponíveis em cada horário; almoço,
+      pausas e indisponibilidade (tarefas que não computam horas) não contam
+      como ociosidade nem como cobertura
+    """
+    n_dias = (fim - inicio).days + 1
+    n_func = len(tabela.funcionarios)
+    selecionados = np.arange(n_func) if funcionarios is None else \
+        np.array([tabela.funcionarios.index(f) for f in funcionarios], dtype=np.int64)
+    fora = np.setdiff1d(np.arange(n_func), selecionados)
+
+    occ = tabela.ocorrencias(inicio, fim)
+    filtro = np.isin(occ['func'], selecionados)
+    func, tarefa, inicio_min, duracao, dia = (
+        occ['func'][filtro], occ['tarefa'][filtro], occ['inicio'][filtro], occ['duracao'][filtro], occ['dia'][filtro]
+    )
+    computa = tabela.computa_tarefa[tarefa]
+    fim_min = np.minimum(inicio_min + duracao, MINUTOS_DIA)
+    minutos = (fim_min - inicio_min).astype(np.int64)
+
+    dias_uteis = ((np.arange(inicio.toordinal(), fim.toordinal() + 1) - 1) % 7) < 5
+    n_uteis = int(dias_uteis.sum())
+
+    # Capacidade: slots de expediente em dias úteis
+    capacidade_dia = tabela.expediente.sum(axis=1) * SLOT_MINUTOS  # (F,)
+    capacidade = capacidade_dia * n_uteis
+
+    # Minutos ocupados por funcionário x minuto do dia, somados no intervalo
+    # (diferenças acumuladas: +1 no início, -1 no fim de cada agendamento)
+    largura = MINUTOS_DIA + 1
+    diferencas = np.bincount(func[computa] * largura + inicio_min[computa], minlength=n_func * largura) - \
+        np.bincount(func[computa] * largura + fim_min[computa], minlength=n_func * largura)
+    por_minuto = np.cumsum(diferencas.reshape(n_func, largura), axis=1)[:, :MINUTOS_DIA]
+    ocupado_hora = por_minuto.reshape(n_func, 24, 60).sum(axis=2)
+    expediente_minuto = np.repeat(tabela.expediente, SLOT_MINUTOS, axis=1)
+    capacidade_hora = expediente_minuto.reshape(n_func, 24, 60).sum(axis=2) * n_uteis
+
+    horas_func = np.bincount(func[computa], weights=minutos[computa], minlength=n_func)
+    horas_nao_computadas = np.bincount(func[~computa], weights=minutos[~computa], minlength=n_func)
+    agendamentos_func = np.bincount(func, minlength=n_func)
+
+    # Carga por funcionário x dia
+    carga_dia = np.bincount(func[computa] * n_dias + dia[computa], weights=minutos[computa],
+                            minlength=n_func * n_dias).reshape(n_func, n_dias)
+    capacidade_por_dia = capacidade_dia[:, None] * dias_uteis[None, :]
+    sobrecarga = (carga_dia > capacidade_por_dia * limite_sobrecarga) & (carga_dia > 0)
+
+    # Slots ocupados por funcionário x dia x slot (qualquer agendamento) e os
+    # bloqueados por tarefas que não computam horas
+    primeiro_slot = inicio_min // SLOT_MINUTOS
+    ultimo_slot = np.minimum(-(-fim_min // SLOT_MINUTOS), SLOTS_POR_DIA)
+    linha = (func * n_dias + dia) * (SLOTS_POR_DIA + 1)
+    tamanho = n_func * n_dias * (SLOTS_POR_DIA + 1)
+
+    def cobertos(mascara):
+        marcas = np.bincount(linha[mascara] + primeiro_slot[mascara], minlength=tamanho) - \
+            np.bincount(linha[mascara] + ultimo_slot[mascara], minlength=tamanho)
+        contagem = np.cumsum(marcas.reshape(n_func, n_dias, SLOTS_POR_DIA + 1), axis=2)
+        return contagem[:, :, :SLOTS_POR_DIA] > 0
+
+    ocupado = cobertos(np.ones(len(func), dtype=bool))
+    bloqueado = cobertos(~computa)
+    em_expediente = tabela.expediente[:, None, :] & dias_uteis[None, :, None]
+    em_expediente[fora] = False
+    ocioso = em_expediente & ~ocupado
+    presentes = (em_expediente & ~bloqueado).sum(axis=0)  # (dias, slots)
+
+    # Lacunas: sequências de slots ociosos; cada linha (funcionário, dia) é
+    # cercada de zeros para que as sequências não se emendem
+    bordas = np.zeros((n_func * n_dias, SLOTS_POR_DIA + 2), dtype=np.int8)
+    bordas[:, 1:-1] = ocioso.reshape(n_func * n_dias, SLOTS_POR_DIA)
+    passos = np.diff(bordas, axis=1)
+    linhas_ini, inicios = np.nonzero(passos == 1)
+    _, fins = np.nonzero(passos == -1)
+    tamanhos = fins - inicios
+    longas = tamanhos * SLOT_MINUTOS >= lacuna_minima
+    ordem = np.lexsort((inicios[longas], linhas_ini[longas] % n_dias, -tamanhos[longas]))[:MAX_LACUNAS]
+    lacunas = []
+    for linha_lacuna, slot, tamanho_lacuna in zip(linhas_ini[longas][ordem], inicios[longas][ordem],
+                                                  tamanhos[longas][ordem]):
+        f, d = divmod(int(linha_lacuna), n_dias)
+        lacunas.append({
+            'funcionario': tabela.funcionarios[f],
+            'data': (inicio + datetime.timedelta(days=d)).isoformat(),
+            'inicio': minutos_para_horario(int(slot) * SLOT_MINUTOS),
+            'fim': minutos_para_horario((int(slot) + int(tamanho_lacuna)) * SLOT_MINUTOS % MINUTOS_DIA),
+            'minutos': int(tamanho_lacuna) * SLOT_MINUTOS
+        })
+
+    sobrecargas = []
+    f_sobre, d_sobre = np.nonzero(sobrecarga)
+    for f, d in list(zip(f_sobre, d_sobre))[:MAX_SOBRECARGAS]:
+        sobrecargas.append({
+            'funcionario': tabela.funcionarios[f],
+            'data': (inicio + datetime.timedelta(days=int(d))).isoformat(),
+            'horas': _horas(carga_dia[f, d]),
+            'capacidade_horas': _horas(capacidade_por_dia[f, d])
+        })
+
+    ociosos_func = ocioso.sum(axis=(1, 2)) * SLOT_MINUTOS
+    dias_sobrecarga = sobrecarga.sum(axis=1)
+    por_funcionario = []
+    for f in selecionados:
+        por_funcionario.append({
+            'id': tabela.funcionarios[f],
+            'nome': tabela.nomes[f],
+            'agendamentos': int(agendamentos_func[f]),
+            'horas': _horas(horas_func[f]),
+            'horas_nao_computadas': _horas(horas_nao_computadas[f]),
+            'capacidade_horas': _horas(capacidade[f]),
+            'utilizacao': _razao(horas_func[f], capacidade[f]),
+            'utilizacao_por_hora': [_razao(ocupado_hora[f, h], capacidade_hora[f, h]) for h in range(24)],
+            'horas_ociosas': _horas(ociosos_func[f]),
+            'dias_sobrecarga': int(dias_sobrecarga[f])
+        })
+
+    categoria = tabela.categoria_da_tarefa[tarefa]
+    n_categorias = len(tabela.categorias)
+    agendamentos_cat = np.bincount(categoria, minlength=n_categorias)
+    minutos_cat = np.bincount(categoria, weights=minutos, minlength=n_categorias)
+    total_minutos = minutos_cat.sum()
+    categorias = sorted((
+        {
+            'categoria': tabela.categorias[c],
+            'agendamentos': int(agendamentos_cat[c]),
+            'horas': _horas(minutos_cat[c]),
+            'percentual': round(float(minutos_cat[c]) / total_minutos * 100, 1) if total_minutos else 0.0
+        }
+        for c in range(n_categorias) if agendamentos_cat[c]
+    ), key=lambda c: (-c['horas'], c['categoria']))
+
+    horas_sel = horas_func[selecionados] / 60
+    equilibrio = None
+    if len(selecionados):
+        media = float(horas_sel.mean())
+        desvio = float(horas_sel.std())
+        equilibrio = {
+            'media_horas': round(media, 2),
+            'desvio_padrao_horas': round(desvio, 2),
+            'coeficiente_variacao': round(desvio / media, 4) if media else None,
+            'mais_carregado': tabela.funcionarios[selecionados[int(horas_sel.argmax())]],
+            'menos_carregado': tabela.funcionarios[selecionados[int(horas_sel.argmin())]],
+            'diferenca_horas': round(float(horas_sel.max() - horas_sel.min()), 2)
+        }
+
+    # Cobertura por slot: média e mínimo de pessoas disponíveis nos dias úteis,
+    # só nos horários em que alguém tem expediente
+    cobertura = []
+    if n_uteis:
+        presentes_uteis = presentes[dias_uteis]
+        algum_expediente = tabela.expediente[selecionados].any(axis=0)
+        sem_ninguem = (presentes_uteis == 0).sum(axis=0)
+        media_slot = presentes_uteis.mean(axis=0)
+        minimo_slot = presentes_uteis.min(axis=0)
+        for s in np.nonzero(algum_expediente)[0]:
+            cobertura.append({
+                'horario': minutos_para_horario(int(s) * SLOT_MINUTOS),
+                'media': round(float(media_slot[s]), 2),
+                'minimo': int(minimo_slot[s]),
+                'dias_sem_cobertura': int(sem_ninguem[s])
+            })
+
+    total_horas = horas_func[selecionados].sum()
+    total_capacidade = capacidade[selecionados].sum()
+    return {
+        'periodo': {'inicio': inicio.isoformat(), 'fim': fim.isoformat(), 'dias': n_dias, 'dias_uteis': n_uteis},
+        'totais': {
+            'agendamentos': int(len(func)),
+            'horas': _horas(total_horas),
+            'horas_nao_computadas': _horas(horas_nao_computadas[selecionados].sum()),
+            'capacidade_horas': _horas(total_capacidade),
+            'utilizacao': _razao(total_horas, total_capacidade),
+            'horas_ociosas': _horas(ociosos_func[selecionados].sum()),
+            'dias_sobrecarga': int(dias_sobrecarga.sum())
+        },
+        'funcionarios': por_funcionario,
+        'categorias': categorias,
+        'equilibrio': equilibrio,
+        'sobrecargas': sobrecargas,
+        'lacunas': lacunas,
+        'cobertura': cobertura
+    }
+
+
+class MotorKPIs:
+    """
+    Tabela colunar e resultados em cache por versão dos dados
+
+    A tabela é remontada quando a versão muda (qualquer commit em funcionários,
+    tarefas, agenda ou exceções); cada consulta fica num LRU cuja chave inclui
+    a versão, então nunca se serve um resultado antigo.
+    """
+
+    def __init__(self, max_resultados: int = 64):
+        self._lock = threading.Lock()
+        self._tabela: Optional[TabelaAgenda] = None
+        self._versao: Optional[Hashable] = None
+        self.resultados = CacheJanelas(max_resultados)
+
+    def tabela(self, versao: Hashable, carregar: Callable[[], TabelaAgenda]) -> TabelaAgenda:
+        with self._lock:
+            if self._tabela is None or self._versao != versao:
+                self._tabela = carregar()
+                self._versao = versao
+            return self._tabela
+
+    def kpis(self, versao: Hashable, carregar: Callable[[], TabelaAgenda], inicio: datetime.date,
+             fim: datetime.date, funcionarios: Optional[Sequence[str]] = None, **opcoes) -> Dict:
+        chave = (versao, inicio, fim, tuple(funcionarios) if funcionarios is not None else None,
+                 tuple(sorted(opcoes.items())))
+        resultado = self.resultados.get(chave)
+        if resultado is None:
+            resultado = calcular_kpis(self.tabela(versao, carregar), inicio, fim, funcionarios, **opcoes)
+            self.resultados.put(chave, resultado)
+        return resultado
+
+    def limpar(self):
+        with self._lock:
+            self._tabela = None
+            self._versao = None
+        self.resultados.clear()
+
+
+# Instância global
+motor_kpis = MotorKPIs()
@@ -0,0 +1,188 @@
+"""
+Requisições em lote
+POST /api/batch recebe uma lista de GETs e devolve todas as respostas de uma
+vez, para a carga inicial do painel pagar um preflight de CORS, uma ida e
+volta e (na Vercel) um cold start, em vez de um por recurso.
+
+Cada item roda pelo app WSGI inteiro (controle de admissão, métricas,
+perfilamento), sem HTTP: o environ da requisição do lote é copiado com outro
+caminho e query. Os itens rodam em paralelo num pool de threads quando o
+armazenamento permite; as respostas JSON entram no corpo como vieram, sem
+decodificar e codificar de novo.
+
+Consistência: a versão dos dados (src/services/versoes.py) é lida antes e
+depois dos itens; se mudou no meio (uma escrita entrou), o lote roda de novo,
+até LOTE_TENTATIVAS vezes. A resposta leva a versão em que todos os itens
+foram lidos e `consistente: false` se nenhuma tentativa passou sem escrita no
+meio. Como as versões, isso vale dentro do processo: escritas feitas por
+outro processo não são vistas.
+
+Variáveis de ambiente:
+    LOTE_MAX_ITENS   itens por lote (padrão 32)
+    LOTE_THREADS     threads do pool que roda os itens (padrão 4)
+    LOTE_TENTATIVAS  execuções do lote até as versões baterem (padrão 3)
+"""
+
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from flask import Response, jsonify, request
+
+# Cabeçalhos da requisição do lote que não passam para os itens
+_SEM_REPASSE = ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'werkzeug.request')
+
+# Cabeçalhos dos itens devolvidos no lote
+_CABECALHOS_ITEM = ('ETag', 'Retry-After', 'X-Perfil-Captura')
+
+
+def _env_int(nome: str, padrao: int) -> int:
+    try:
+        return int(os.environ[nome])
+    except (KeyError, ValueError):
+        return padrao
+
+
+class ItemInvalido(ValueError):
+    pass
+
+
+def _normalizar(item, rota: str) -> Tuple[str, str]:
+    """Item da lista ('/api/x?y=1' ou {"caminho": ..., "parametros": {...}}) -> (caminho, query)"""
+    if isinstance(item, str):
+        partes = urlsplit(item)
+        caminho, query = partes.path, partes.query
+    elif isinstance(item, dict) and isinstance(item.get('caminho'), str):
+        partes = urlsplit(item['caminho'])
+        caminho, query = partes.path, partes.query
+        parametros = item.get('parametros') or {}
+        if not isinstance(parametros, dict):
+            raise ItemInvalido('parametros deve ser um objeto')
+        if parametros:
+            extra = urlencode(parametros, doseq=True)
+            query = f'{query}&{extra}' if query else extra
+    else:
+        raise ItemInvalido('cada item deve ser um caminho ou {"caminho": ..., "parametros": {...}}')
+    if not caminho.startswith('/api/'):
+        raise ItemInvalido(f'caminho fora da API: {caminho}')
+    if caminho.rstrip('/') == rota:
+        raise ItemInvalido('lotes não podem conter outro lote')
+    return caminho, query
+
+
+class ExecutorLote:
+    """Roda os itens de um lote contra o app WSGI"""
+
+    def __init__(self, app, versao: Optional[Callable[[], Hashable]] = None, paralelo: bool = True,
+                 threads: int = 4, tentativas: int = 3):
+        self.app = app
+        self.versao = versao or (lambda: 0)
+        self.paralelo = paralelo
+        self.threads = threads
+        self.tentativas = tentativas
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        # Um pool por processo (o mestre do gunicorn não leva o dele para os filhos)
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._pool = ThreadPoolExecutor(self.threads, thread_name_prefix='lote')
+                    self._pid = os.getpid()
+        return self._pool
+
+    def _item(self, base: Dict, caminho: str, query: str) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        environ = dict(base, REQUEST_METHOD='GET', PATH_INFO=caminho, QUERY_STRING=query)
+        environ['wsgi.input'] = io.BytesIO()
+        environ['workspace.lote'] = True
+        inicio: Dict = {}
+
+        def start_response(status, cabecalhos, exc_info=None):
+            inicio['status'], inicio['cabecalhos'] = status, cabecalhos
+
+        # Sempre numa thread do pool: métricas e perfilamento guardam estado por thread,
+        # e a thread da requisição do lote ainda está no meio da dela
+        resposta = self.app.wsgi_app(environ, start_response)
+        try:
+            corpo = b''.join(resposta)
+        finally:
+            if hasattr(resposta, 'close'):
+                resposta.close()
+        return int(inicio['status'].split(' ', 1)[0]), inicio['cabecalhos'], corpo
+
+    def executar(self, itens: List[Tuple[str, str]], environ: Dict) -> Tuple[Hashable, bool, List]:
+        """Roda os itens; devolve (versão, consistente, [(status, cabeçalhos, corpo)])"""
+        base = {chave: valor for chave, valor in environ.items() if chave not in _SEM_REPASSE}
+        executor = self._executor()
+        for _ in range(max(self.tentativas, 1)):
+            antes = self.versao()
+            if self.paralelo:
+                resultados = list(executor.map(lambda item: self._item(base, *item), itens))
+            else:
+                resultados = [executor.submit(self._item, base, *item).result() for item in itens]
+            if self.versao() == antes:
+                return antes, True, resultados
+        return antes, False, resultados
+
+
+def _corpo_item(status: int, cabecalhos: List[Tuple[str, str]], corpo: bytes, caminho: str, query: str) -> bytes:
+    tipo = ''
+    extras = {}
+    for nome, valor in cabecalhos:
+        if nome.lower() == 'content-type':
+            tipo = valor
+        elif nome in _CABECALHOS_ITEM:
+            extras[nome] = valor
+    cabeca = {'caminho': caminho + (f'?{query}' if query else ''), 'status': status}
+    if extras:
+        cabeca['cabecalhos'] = extras
+    if tipo.startswith('application/json') and corpo.strip():
+        # JSON do próprio app: entra como está
+        dados = corpo
+    else:
+        dados = json.dumps(corpo.decode('utf-8', 'replace'), ensure_ascii=False).encode('utf-8')
+    return json.dumps(cabeca, ensure_ascii=False)[:-1].encode('utf-8') + b',"corpo":' + dados + b'}'
+
+
+def registrar_lote(app, rota: str = '/api/batch', versao: Optional[Callable[[], Hashable]] = None,
+                   paralelo: bool = True):
+    """
+    Adiciona a rota de lote ao app
+
+    Corpo: {"requisicoes": ["/api/funcionarios", {"caminho": "/api/demandas", "parametros": {"status": "pendente"}}]}
+    Resposta: {"versao": ..., "consistente": true, "respostas": [{"caminho", "status", "corpo"}, ...]}, na ordem pedida
+
+    Args:
+        versao: versão atual dos dados lidos pelos itens (sem ela, o lote não confere consistência)
+        paralelo: False quando o armazenamento não aguenta leituras simultâneas (ex.: SQLite em memória)
+    """
+    lote = ExecutorLote(app, versao, paralelo, max(_env_int('LOTE_THREADS', 4), 1),
+                        _env_int('LOTE_TENTATIVAS', 3))
+    max_itens = _env_int('LOTE_MAX_ITENS', 32)
+
+    @app.route(rota, methods=['POST'], endpoint='lote')
+    def executar_lote():
+        dados = request.get_json(silent=True)
+        pedidos = dados.get('requisicoes') if isinstance(dados, dict) else dados
+        if not isinstance(pedidos, list) or not pedidos:
+            return jsonify({'error': 'Envie {"requisicoes": [...]} com pelo menos um item'}), 400
+        if len(pedidos) > max_itens:
+            return jsonify({'error': f'No máximo {max_itens} itens por lote'}), 400
+        try:
+            itens = [_normalizar(pedido, rota) for pedido in pedidos]
+        except ItemInvalido as erro:
+            return jsonify({'error': str(erro)}), 400
+
+        versao, consistente, resultados = lote.executar(itens, request.environ)
+        respostas = b','.join(_corpo_item(*resultado, *item) for resultado, item in zip(resultados, itens))
+        token = '-'.join(map(str, versao)) if isinstance(versao, tuple) else str(versao)
+        cabeca = json.dumps({'versao': token, 'consistente': consistente})[:-1].encode()
+        return Response(cabeca + b',"respostas":[' + respostas + b']}', mimetype='application/json')
+
+    return lote
@@ -0,0 +1,282 @@
+"""
+Métricas no formato de texto do Prometheus
+Latência, status e tamanhos por rota, consultas SQL por requisição, leitura e
+gravação de arquivos JSON, chamadas à Google Calendar API e caches, expostos
+em GET /metrics.
+
+Cada thread acumula nos próprios dicionários, sem trava no caminho da
+requisição; o scrape junta os dicionários de todas as threads. As métricas
+são por processo: com vários processos do gunicorn, cada scrape vê o
+processo que o atendeu (o rótulo `pid` de workspace_processo_info diz qual).
+
+As consultas SQL só são contadas depois de `ouvir_consultas` (chamado por
+src.database), para este módulo não exigir o SQLAlchemy.
+"""
+
+import bisect
+import contextlib
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from flask import Response, request
+
+# Limites dos histogramas
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_BYTES = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+BUCKETS_CONSULTAS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# nome -> (tipo, ajuda, rótulos, buckets)
+DEFINICOES: Dict[str, Tuple[str, str, Tuple[str, ...], Optional[Sequence[float]]]] = {
+    'workspace_http_requisicoes_total': (
+        'counter', 'Requisições HTTP atendidas', ('rota', 'metodo', 'status'), None),
+    'workspace_http_duracao_segundos': (
+        'histogram', 'Duração das requisições HTTP', ('rota', 'metodo'), BUCKETS_LATENCIA),
+    'workspace_http_requisicao_bytes': (
+        'histogram', 'Tamanho do corpo das requisições', ('rota', 'metodo'), BUCKETS_BYTES),
+    'workspace_http_resposta_bytes': (
+        'histogram', 'Tamanho do corpo das respostas (quando conhecido)', ('rota', 'metodo'), BUCKETS_BYTES),
+    'workspace_sql_consultas_por_requisicao': (
+        'histogram', 'Consultas SQL executadas por requisição', ('rota',), BUCKETS_CONSULTAS),
+    'workspace_sql_duracao_por_requisicao_segundos': (
+        'histogram', 'Tempo em consultas SQL por requisição', ('rota',), BUCKETS_LATENCIA),
+    'workspace_sql_consultas_total': (
+        'counter', 'Consultas SQL executadas (dentro e fora de requisições)', (), None),
+    'workspace_sql_duracao_segundos_total': (
+        'counter', 'Tempo total em consultas SQL', (), None),
+    'workspace_arquivo_json_duracao_segundos': (
+        'histogram', 'Leitura e gravação de arquivos JSON', ('arquivo', 'operacao'), BUCKETS_LATENCIA),
+    'workspace_google_calendar_chamadas_total': (
+        'counter', 'Chamadas à Google Calendar API', ('metodo', 'status'), None),
+    'workspace_google_calendar_duracao_segundos': (
+        'histogram', 'Duração das chamadas à Google Calendar API', ('metodo',), BUCKETS_LATENCIA),
+    'workspace_cache_consultas_total': (
+        'counter', 'Consultas a caches em memória', ('cache', 'resultado'), None),
+    'workspace_admissao_decisoes_total': (
+        'counter', 'Decisões do controle de admissão', ('classe', 'resultado'), None),
+    'workspace_admissao_em_andamento': (
+        'gauge', 'Requisições em andamento sob o controle de admissão', (), None),
+    'workspace_admissao_fila': (
+        'gauge', 'Requisições esperando vaga', (), None),
+    'workspace_admissao_clientes': (
+        'gauge', 'Baldes de fichas em memória (cliente x classe)', (), None),
+    'workspace_processo_info': (
+        'gauge', 'Processo que respondeu o scrape', ('pid',), None),
+}
+
+
+class Metricas:
+    """
+    Registro de métricas com um fragmento por thread
+
+    Incrementos mexem só no dicionário da thread atual (sem trava); a trava
+    só é usada quando uma thread nova aparece e no scrape.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._fragmentos: List[Dict] = []
+        self._coletores: List[Callable[[], Iterable[Tuple[str, Tuple[str, ...], float]]]] = []
+
+    def _fragmento(self) -> Dict:
+        fragmento = getattr(self._local, 'fragmento', None)
+        if fragmento is None:
+            fragmento = self._local.fragmento = {}
+            with self._lock:
+                self._fragmentos.append(fragmento)
+        return fragmento
+
+    def contar(self, nome: str, rotulos: Tuple[str, ...] = (), valor: float = 1):
+        fragmento = self._fragmento()
+        chave = (nome, rotulos)
+        fragmento[chave] = fragmento.get(chave, 0) + valor
+
+    def observar(self, nome: str, rotulos: Tuple[str, ...], valor: float):
+        fragmento = self._fragmento()
+        chave = (nome, rotulos)
+        buckets = DEFINICOES[nome][3]
+        histograma = fragmento.get(chave)
+        if histograma is None:
+            # [contagem por bucket..., +Inf, soma]
+            histograma = fragmento[chave] = [0] * (len(buckets) + 2)
+        histograma[bisect.bisect_left(buckets, valor)] += 1
+        histograma[-1] += valor
+
+    @contextlib.contextmanager
+    def medir(self, nome: str, rotulos: Tuple[str, ...]) -> Iterator[None]:
+        """Observa a duração do bloco no histograma `nome`"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(nome, rotulos, time.perf_counter() - inicio)
+
+    def registrar_coletor(self, coletor: Callable[[], Iterable[Tuple[str, Tuple[str, ...], float]]]):
+        """Função chamada no scrape que devolve (nome, rótulos, valor) de contadores mantidos em outro lugar"""
+        with self._lock:
+            self._coletores.append(coletor)
+
+    def registrar_cache(self, nome: str, cache):
+        """Expõe os atributos `acertos` e `faltas` de um cache como workspace_cache_consultas_total"""
+        self.registrar_coletor(lambda: [
+            ('workspace_cache_consultas_total', (nome, 'acerto'), cache.acertos),
+            ('workspace_cache_consultas_total', (nome, 'falta'), cache.faltas),
+        ])
+
+    def coletar(self) -> Dict[Tuple[str, Tuple[str, ...]], object]:
+        """Junta os fragmentos de todas as threads e os coletores"""
+        with self._lock:
+            fragmentos = list(self._fragmentos)
+            coletores = list(self._coletores)
+        total: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+        for fragmento in fragmentos:
+            for chave, valor in fragmento.copy().items():
+                if isinstance(valor, list):
+                    acumulado = total.get(chave)
+                    total[chave] = list(valor) if acumulado is None else [a + b for a, b in zip(acumulado, valor)]
+                else:
+                    total[chave] = total.get(chave, 0) + valor
+        for coletor in coletores:
+            for nome, rotulos, valor in coletor():
+                total[(nome, rotulos)] = total.get((nome, rotulos), 0) + valor
+        total[('workspace_processo_info', (str(os.getpid()),))] = 1
+        return total
+
+    def texto(self) -> str:
+        """Formato de texto do Prometheus (versão 0.0.4)"""
+        por_nome: Dict[str, List] = {}
+        for (nome, rotulos), valor in self.coletar().items():
+            por_nome.setdefault(nome, []).append((rotulos, valor))
+
+        linhas = []
+        for nome in sorted(por_nome):
+            tipo, ajuda, nomes_rotulos, buckets = DEFINICOES[nome]
+            linhas.append(f'# HELP {nome} {ajuda}')
+            linhas.append(f'# TYPE {nome} {tipo}')
+            for rotulos, valor in sorted(por_nome[nome], key=lambda item: item[0]):
+                pares = [f'{r}="{_escapar(v)}"' for r, v in zip(nomes_rotulos, rotulos)]
+                if tipo != 'histogram':
+                    linhas.append(f'{nome}{_rotulos(pares)} {_numero(valor)}')
+                    continue
+                acumulado = 0
+                for limite, contagem in zip([*buckets, '+Inf'], valor[:-1]):
+                    acumulado += contagem
+                    le = 'le="%s"' % limite
+                    linhas.append(f'{nome}_bucket{_rotulos(pares + [le])} {acumulado}')
+                linhas.append(f'{nome}_sum{_rotulos(pares)} {_numero(valor[-1])}')
+                linhas.append(f'{nome}_count{_rotulos(pares)} {acumulado}')
+        return '\n'.join(linhas) + '\n'
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _rotulos(pares: List[str]) -> str:
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+# Instância global (uma por processo)
+metricas = Metricas()
+
+
+# Consultas SQL: contadas por thread; dentro de uma requisição, também entram no resumo dela
+
+_requisicao_atual = threading.local()
+
+
+def _antes_consulta(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metricas_inicio', []).append(time.perf_counter())
+
+
+def _depois_consulta(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get('metricas_inicio')
+    if not inicios:
+        return
+    duracao = time.perf_counter() - inicios.pop()
+    metricas.contar('workspace_sql_consultas_total')
+    metricas.contar('workspace_sql_duracao_segundos_total', valor=duracao)
+    resumo = getattr(_requisicao_atual, 'sql', None)
+    if resumo is not None:
+        resumo[0] += 1
+        resumo[1] += duracao
+
+
+def ouvir_consultas():
+    """Conta as consultas de todos os engines do SQLAlchemy (idempotente)"""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    for nome, ouvinte in (('before_cursor_execute', _antes_consulta), ('after_cursor_execute', _depois_consulta)):
+        if not event.contains(Engine, nome, ouvinte):
+            event.listen(Engine, nome, ouvinte)
+
+
+def sql_da_requisicao() -> Optional[List[float]]:
+    """[consultas, segundos] da requisição em andamento nesta thread (None fora de requisições)"""
+    return getattr(_requisicao_atual, 'sql', None)
+
+
+@contextlib.contextmanager
+def medir_arquivo_json(caminho: str, operacao: str) -> Iterator[None]:
+    """Mede a leitura ('carregar') ou gravação ('salvar') de um arquivo JSON"""
+    with metricas.medir('workspace_arquivo_json_duracao_segundos', (os.path.basename(caminho), operacao)):
+        yield
+
+
+def _rota_atual() -> str:
+    # O modelo da rota (não a URL) mantém a cardinalidade baixa
+    regra = request.url_rule
+    return regra.rule if regra is not None else 'nao_encontrada'
+
+
+def _registrar_requisicao(status: int, tamanho: Optional[int]):
+    inicio, sql = _requisicao_atual.inicio, _requisicao_atual.sql
+    _requisicao_atual.inicio = _requisicao_atual.sql = None
+    rota_modelo, metodo = _rota_atual(), request.method
+    metricas.contar('workspace_http_requisicoes_total', (rota_modelo, metodo, str(status)))
+    metricas.observar('workspace_http_duracao_segundos', (rota_modelo, metodo), time.perf_counter() - inicio)
+    metricas.observar('workspace_http_requisicao_bytes', (rota_modelo, metodo), request.content_length or 0)
+    if tamanho is not None:
+        metricas.observar('workspace_http_resposta_bytes', (rota_modelo, metodo), tamanho)
+    metricas.observar('workspace_sql_consultas_por_requisicao', (rota_modelo,), sql[0])
+    metricas.observar('workspace_sql_duracao_por_requisicao_segundos', (rota_modelo,), sql[1])
+
+
+def instrumentar_app(app, rota: str = '/metrics'):
+    """
+    Mede as requisições do app Flask e adiciona a rota de métricas
+
+    Com a variável METRICS_TOKEN definida, a rota exige `Authorization: Bearer <token>`.
+    """
+
+    @app.before_request
+    def _inicio_requisicao():
+        _requisicao_atual.inicio = time.perf_counter()
+        _requisicao_atual.sql = [0, 0.0]
+
+    @app.after_request
+    def _fim_requisicao(resposta):
+        if getattr(_requisicao_atual, 'inicio', None) is not None:
+            _registrar_requisicao(resposta.status_code,
+                                  None if resposta.is_streamed else resposta.calculate_content_length())
+        return resposta
+
+    @app.teardown_request
+    def _requisicao_interrompida(erro):
+        # Só sobra algo aqui se a resposta não passou pelo after_request
+        if getattr(_requisicao_atual, 'inicio', None) is not None:
+            _registrar_requisicao(500, None)
+
+    @app.route(rota, endpoint='metricas')
+    def expor_metricas():
+        token = os.getenv('METRICS_TOKEN')
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return Response('não autorizado\n', status=401, mimetype='text/plain')
+        return Response(metricas.texto(), content_type='text/plain; version=0.0.4; charset=utf-8')
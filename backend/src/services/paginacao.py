@@ -0,0 +1,85 @@
+"""
+Paginação por chave (keyset)
+Em vez de OFFSET, cada página continua a partir dos valores de ordenação do
+último item da anterior, então o banco usa o índice e não relê as linhas puladas
+"""
+
+import base64
+import datetime
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+
+def codificar_cursor(valores: Sequence[Any]) -> str:
+    """Cursor opaco com os valores de ordenação do último item da página"""
+    itens = []
+    for valor in valores:
+        if isinstance(valor, datetime.datetime):
+            itens.append(['t', valor.isoformat()])
+        elif isinstance(valor, datetime.date):
+            itens.append(['d', valor.isoformat()])
+        else:
+            itens.append(['v', valor])
+    return base64.urlsafe_b64encode(json.dumps(itens, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor: str) -> List[Any]:
+    """
+    Raises:
+        ValueError: cursor malformado
+    """
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        itens = json.loads(bruto)
+        valores = []
+        for tipo, valor in itens:
+            if tipo == 't':
+                valores.append(datetime.datetime.fromisoformat(valor))
+            elif tipo == 'd':
+                valores.append(datetime.date.fromisoformat(valor))
+            else:
+                valores.append(valor)
+        return valores
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError('Cursor inválido') from e
+
+
+def paginar(query, chaves: Sequence[Tuple[Any, Any]], descendente: bool, limite: int,
+            cursor: Optional[str] = None):
+    """
+    Aplica ordenação, continuação a partir do cursor e limite
+
+    Args:
+        chaves: pares (expressão SQL, função que extrai o valor do objeto),
+                do mais significativo ao desempate (normalmente o id)
+
+    Returns:
+        (itens da página, cursor da próxima página ou None)
+
+    Raises:
+        ValueError: cursor malformado ou de outra ordenação
+    """
+    expressoes = [expressao for expressao, _ in chaves]
+
+    if cursor:
+        valores = decodificar_cursor(cursor)
+        if len(valores) != len(expressoes):
+            raise ValueError('Cursor inválido para esta ordenação')
+        # (a, b, c) > (x, y, z) expandido, para funcionar em qualquer banco
+        condicoes = []
+        for i, expressao in enumerate(expressoes):
+            iguais = [expressoes[j] == valores[j] for j in range(i)]
+            passo = expressao < valores[i] if descendente else expressao > valores[i]
+            condicoes.append(and_(*iguais, passo))
+        query = query.filter(or_(*condicoes))
+
+    query = query.order_by(*[e.desc() if descendente else e.asc() for e in expressoes])
+    itens = query.limit(limite + 1).all()
+
+    proximo = None
+    if len(itens) > limite:
+        itens = itens[:limite]
+        proximo = codificar_cursor([extrair(itens[-1]) for _, extrair in chaves])
+    return itens, proximo
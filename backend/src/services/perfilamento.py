@@ -0,0 +1,427 @@
+"""
+Perfilamento sob demanda e captura de requisições lentas
+
+Duas formas de capturar, ambas gravadas num anel de arquivos em disco
+(PROFILE_CAPTURES_DIR, no máximo PROFILE_CAPTURES_MAX capturas):
+
+- Sob demanda: com PROFILE_TOKEN definido, uma requisição com o cabeçalho
+  `X-Perfil: <token>` (ou `?perfil=<token>`) roda inteira sob o cProfile, ou sob
+  o amostrador com `X-Perfil-Modo: amostragem` (`?perfil_modo=amostragem`). O
+  ID da captura volta no cabeçalho `X-Perfil-Captura`; com
+  `?perfil_saida=resposta`, o próprio perfil substitui a resposta.
+- Requisições lentas: com SLOW_REQUEST_MS definido, toda requisição (ou tarefa
+  em segundo plano marcada com `perfilador.tarefa`) que passar do limite é
+  gravada com as pilhas amostradas a partir do momento em que ficou lenta, o
+  SQL executado e a divisão do tempo entre SQL, Google Calendar e o resto.
+
+Sem token nem limite configurados, nada disso roda: os ganchos voltam na
+primeira linha. Com o limite ligado, uma thread acorda a cada
+PROFILE_SAMPLE_INTERVAL_MS e só lê as pilhas se houver algo passando do limite.
+"""
+
+import contextlib
+import datetime
+import hmac
+import io
+import itertools
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+from urllib.parse import urlencode
+
+from flask import Response, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# cProfile e pstats (~25ms de import) só quando alguém pede um perfil
+if TYPE_CHECKING:
+    import cProfile
+
+logger = logging.getLogger(__name__)
+
+MODOS = ('cprofile', 'amostragem')
+
+# Limites do que entra em uma captura
+MAX_CONSULTAS_DISTINTAS = 200
+MAX_PILHAS = 200
+PROFUNDIDADE_PILHA = 80
+LINHAS_PERFIL = 60
+
+ID_CAPTURA = re.compile(r'^[0-9TZ]{16}-\d+-\d{4}-(lenta|cprofile|amostragem)$')
+
+
+class Execucao:
+    """Uma requisição ou tarefa em andamento que pode virar captura"""
+
+    __slots__ = ('nome', 'metodo', 'url', 'thread', 'inicio', 'inicio_utc', 'modo', 'saida',
+                 'perfil', 'amostrando_desde', 'amostras', 'sql', 'etapas')
+
+    def __init__(self, nome: str, metodo: str, url: str = '', modo: Optional[str] = None, saida: str = 'arquivo'):
+        self.nome = nome
+        self.metodo = metodo
+        self.url = url
+        self.thread = threading.get_ident()
+        self.inicio = time.perf_counter()
+        self.inicio_utc = datetime.datetime.now(datetime.timezone.utc)
+        self.modo = modo
+        self.saida = saida
+        self.perfil: Optional['cProfile.Profile'] = None
+        # Instante (perf_counter) da primeira amostra; None enquanto não amostrada
+        self.amostrando_desde: Optional[float] = None
+        self.amostras: Counter = Counter()
+        # consulta -> [vezes, segundos]
+        self.sql: Dict[str, List[float]] = {}
+        # nome -> [chamadas, segundos]
+        self.etapas: Dict[str, List[float]] = {}
+
+
+def _pilha(frame) -> str:
+    """Pilha no formato "collapsed" (raiz primeiro, separada por ';')"""
+    partes = []
+    while frame is not None and len(partes) < PROFUNDIDADE_PILHA:
+        codigo = frame.f_code
+        partes.append(f'{os.path.basename(codigo.co_filename)}:{codigo.co_name}:{frame.f_lineno}')
+        frame = frame.f_back
+    return ';'.join(reversed(partes))
+
+
+class Perfilador:
+    """
+    Capturas sob demanda e de execuções lentas, num anel de arquivos
+
+    Args:
+        pasta: onde ficam as capturas
+        max_capturas: tamanho do anel (as mais antigas são apagadas)
+        limite_lento_ms: duração a partir da qual a execução é capturada (0 desliga)
+        token: segredo das capturas sob demanda e das rotas de administração (vazio desliga o sob demanda)
+        intervalo_ms: intervalo entre amostras de pilha
+    """
+
+    def __init__(self, pasta: str = 'profile_captures', max_capturas: int = 50, limite_lento_ms: float = 0,
+                 token: str = '', intervalo_ms: float = 10):
+        self.pasta = pasta
+        self.max_capturas = max_capturas
+        self.limite_lento = limite_lento_ms / 1000
+        self.token = token
+        self.intervalo = intervalo_ms / 1000
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._em_andamento: Dict[int, Execucao] = {}
+        self._amostrador: Optional[threading.Thread] = None
+        self._amostrador_pid: Optional[int] = None
+        self._sql_ligado = False
+        self._sequencia = itertools.count(1)
+
+    @classmethod
+    def do_ambiente(cls) -> 'Perfilador':
+        return cls(
+            pasta=os.getenv('PROFILE_CAPTURES_DIR', 'profile_captures'),
+            max_capturas=int(os.getenv('PROFILE_CAPTURES_MAX', '50')),
+            limite_lento_ms=float(os.getenv('SLOW_REQUEST_MS', '0')),
+            token=os.getenv('PROFILE_TOKEN', ''),
+            intervalo_ms=float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', '10'))
+        )
+
+    @property
+    def ativo(self) -> bool:
+        return bool(self.limite_lento or self.token)
+
+    def token_confere(self, valor: Optional[str]) -> bool:
+        return bool(self.token and valor and hmac.compare_digest(valor.encode(), self.token.encode()))
+
+    # Execuções
+
+    def atual(self) -> Optional[Execucao]:
+        return getattr(self._local, 'execucao', None)
+
+    def iniciar(self, execucao: Execucao) -> Execucao:
+        """Acompanha a execução na thread atual (perfil completo se `modo` foi pedido)"""
+        self._ligar_sql()
+        self._local.execucao = execucao
+        if execucao.modo == 'cprofile':
+            import cProfile
+            execucao.perfil = cProfile.Profile()
+            execucao.perfil.enable()
+        if execucao.modo == 'amostragem' or self.limite_lento:
+            self._em_andamento[execucao.thread] = execucao
+            self._garantir_amostrador()
+        return execucao
+
+    def terminar(self, execucao: Execucao, status: Optional[int] = None) -> Optional[str]:
+        """Encerra a execução; grava a captura se foi pedida ou passou do limite e devolve o ID"""
+        duracao = time.perf_counter() - execucao.inicio
+        if execucao.perfil is not None:
+            execucao.perfil.disable()
+        self._em_andamento.pop(execucao.thread, None)
+        self._local.execucao = None
+        if execucao.modo:
+            tipo = execucao.modo
+        elif self.limite_lento and duracao >= self.limite_lento:
+            tipo = 'lenta'
+        else:
+            return None
+        try:
+            return self._gravar(execucao, tipo, duracao, status)
+        except OSError as e:
+            logger.error(f'Erro ao gravar captura de {execucao.nome}: {e}')
+            return None
+
+    @contextlib.contextmanager
+    def tarefa(self, nome: str) -> Iterator[Optional[Execucao]]:
+        """
+        Acompanha uma tarefa fora de requisição (ex.: sincronização do calendário)
+
+        Também funciona como decorador. Dentro de uma requisição já acompanhada, não faz nada.
+        """
+        if not self.limite_lento or self.atual() is not None:
+            yield None
+            return
+        execucao = self.iniciar(Execucao(nome, 'TAREFA'))
+        try:
+            yield execucao
+        finally:
+            self.terminar(execucao)
+
+    def etapa(self, nome: str, segundos: float):
+        """Soma o tempo de uma etapa (ex.: chamada à Google Calendar API) à execução atual"""
+        execucao = getattr(self._local, 'execucao', None)
+        if execucao is None:
+            return
+        etapa = execucao.etapas.get(nome)
+        if etapa is None:
+            etapa = execucao.etapas[nome] = [0, 0.0]
+        etapa[0] += 1
+        etapa[1] += segundos
+
+    # Amostragem
+
+    def _garantir_amostrador(self):
+        # A thread não sobrevive ao fork do gunicorn; cada processo inicia a sua
+        if self._amostrador_pid == os.getpid() and self._amostrador.is_alive():
+            return
+        with self._lock:
+            if self._amostrador_pid == os.getpid() and self._amostrador.is_alive():
+                return
+            self._amostrador = threading.Thread(target=self._amostrar, name='perfilamento-amostrador', daemon=True)
+            self._amostrador_pid = os.getpid()
+            self._amostrador.start()
+
+    def _amostrar(self):
+        while True:
+            time.sleep(self.intervalo)
+            agora = time.perf_counter()
+            alvos = [
+                execucao for execucao in self._em_andamento.copy().values()
+                if execucao.modo == 'amostragem' or (self.limite_lento and agora - execucao.inicio >= self.limite_lento)
+            ]
+            if not alvos:
+                continue
+            frames = sys._current_frames()
+            for execucao in alvos:
+                frame = frames.get(execucao.thread)
+                if frame is None:
+                    continue
+                if execucao.amostrando_desde is None:
+                    execucao.amostrando_desde = agora
+                execucao.amostras[_pilha(frame)] += 1
+            del frames
+
+    # SQL
+
+    def _ligar_sql(self):
+        if self._sql_ligado:
+            return
+        with self._lock:
+            if self._sql_ligado:
+                return
+            event.listen(Engine, 'before_cursor_execute', self._antes_consulta)
+            event.listen(Engine, 'after_cursor_execute', self._depois_consulta)
+            self._sql_ligado = True
+
+    def _antes_consulta(self, conn, cursor, statement, parameters, context, executemany):
+        if getattr(self._local, 'execucao', None) is not None:
+            conn.info.setdefault('perfilamento_inicio', []).append(time.perf_counter())
+
+    def _depois_consulta(self, conn, cursor, statement, parameters, context, executemany):
+        execucao = getattr(self._local, 'execucao', None)
+        inicios = conn.info.get('perfilamento_inicio')
+        if execucao is None or not inicios:
+            return
+        duracao = time.perf_counter() - inicios.pop()
+        consulta = execucao.sql.get(statement)
+        if consulta is None:
+            if len(execucao.sql) >= MAX_CONSULTAS_DISTINTAS:
+                statement = '(outras consultas)'
+                consulta = execucao.sql.setdefault(statement, [0, 0.0])
+            else:
+                consulta = execucao.sql[statement] = [0, 0.0]
+        consulta[0] += 1
+        consulta[1] += duracao
+
+    # Anel em disco
+
+    def _gravar(self, execucao: Execucao, tipo: str, duracao: float, status: Optional[int]) -> str:
+        captura_id = (f"{execucao.inicio_utc.strftime('%Y%m%dT%H%M%SZ')}-{os.getpid()}-"
+                      f"{next(self._sequencia) % 10000:04d}-{tipo}")
+        os.makedirs(self.pasta, exist_ok=True)
+
+        sql_segundos = sum(segundos for _, segundos in execucao.sql.values())
+        etapas_segundos = sum(segundos for _, segundos in execucao.etapas.values())
+        dados = {
+            'id': captura_id,
+            'tipo': tipo,
+            'nome': execucao.nome,
+            'metodo': execucao.metodo,
+            'url': execucao.url,
+            'status': status,
+            'inicio': execucao.inicio_utc.isoformat(),
+            'duracao_ms': round(duracao * 1000, 2),
+            'pid': os.getpid(),
+            'tempos': {
+                'sql_ms': round(sql_segundos * 1000, 2),
+                'sql_consultas': sum(vezes for vezes, _ in execucao.sql.values()),
+                'etapas': {nome: {'chamadas': chamadas, 'ms': round(segundos * 1000, 2)}
+                           for nome, (chamadas, segundos) in execucao.etapas.items()},
+                'outros_ms': round(max(duracao - sql_segundos - etapas_segundos, 0) * 1000, 2)
+            },
+            'sql': [
+                {'consulta': consulta, 'vezes': vezes, 'ms': round(segundos * 1000, 2)}
+                for consulta, (vezes, segundos) in sorted(execucao.sql.items(), key=lambda item: -item[1][1])
+            ],
+            'amostras': {
+                'intervalo_ms': self.intervalo * 1000,
+                'desde_ms': (round((execucao.amostrando_desde - execucao.inicio) * 1000, 1)
+                             if execucao.amostrando_desde is not None else None),
+                'total': sum(execucao.amostras.values()),
+                'pilhas': [{'pilha': pilha, 'amostras': n} for pilha, n in execucao.amostras.most_common(MAX_PILHAS)]
+            }
+        }
+        if execucao.perfil is not None:
+            import pstats
+            self._escrever(f'{captura_id}.prof', lambda caminho: execucao.perfil.dump_stats(caminho))
+            saida = io.StringIO()
+            pstats.Stats(execucao.perfil, stream=saida).sort_stats('cumulative').print_stats(LINHAS_PERFIL)
+            dados['perfil'] = saida.getvalue()
+
+        def escrever_json(caminho):
+            with open(caminho, 'w', encoding='utf-8') as arquivo:
+                json.dump(dados, arquivo, ensure_ascii=False)
+        self._escrever(f'{captura_id}.json', escrever_json)
+        self._girar()
+        logger.info(f'Captura {captura_id}: {execucao.metodo} {execucao.nome} em {dados["duracao_ms"]} ms')
+        return captura_id
+
+    def _escrever(self, nome: str, gravar):
+        # Grava num temporário e troca: quem lista nunca vê arquivo pela metade
+        caminho = os.path.join(self.pasta, nome)
+        temporario = f'{caminho}.{threading.get_ident()}.tmp'
+        gravar(temporario)
+        os.replace(temporario, caminho)
+
+    def _girar(self):
+        ids = self._ids()
+        for captura_id in ids[:max(len(ids) - self.max_capturas, 0)]:
+            for extensao in ('.json', '.prof'):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(self.pasta, captura_id + extensao))
+
+    def _ids(self) -> List[str]:
+        try:
+            nomes = os.listdir(self.pasta)
+        except FileNotFoundError:
+            return []
+        return sorted(nome[:-5] for nome in nomes if nome.endswith('.json') and ID_CAPTURA.match(nome[:-5]))
+
+    def listar(self) -> List[Dict]:
+        """Resumo das capturas, da mais recente para a mais antiga"""
+        resumos = []
+        for captura_id in reversed(self._ids()):
+            try:
+                with open(os.path.join(self.pasta, f'{captura_id}.json'), encoding='utf-8') as arquivo:
+                    dados = json.load(arquivo)
+            except (OSError, ValueError):
+                continue
+            resumos.append({
+                **{campo: dados.get(campo) for campo in ('id', 'tipo', 'nome', 'metodo', 'url', 'status', 'inicio',
+                                                         'duracao_ms', 'pid')},
+                'sql_ms': dados['tempos']['sql_ms'],
+                'sql_consultas': dados['tempos']['sql_consultas'],
+                'prof': os.path.exists(os.path.join(self.pasta, f'{captura_id}.prof'))
+            })
+        return resumos
+
+    def caminho(self, captura_id: str, formato: str = 'json') -> Optional[str]:
+        """Arquivo da captura ('json' ou 'prof'), ou None se não existir"""
+        if formato not in ('json', 'prof') or not ID_CAPTURA.match(captura_id):
+            return None
+        caminho = os.path.join(self.pasta, f'{captura_id}.{formato}')
+        return os.path.abspath(caminho) if os.path.exists(caminho) else None
+
+
+# Instância global configurada pelo ambiente
+perfilador = Perfilador.do_ambiente()
+
+
+def _pedido_sob_demanda():
+    """(modo, saída) se a requisição pediu perfil com o token certo; None se não pediu"""
+    valor = request.headers.get('X-Perfil') or request.args.get('perfil')
+    if valor is None:
+        return None
+    if not perfilador.token_confere(valor):
+        return False
+    modo = request.headers.get('X-Perfil-Modo') or request.args.get('perfil_modo') or 'cprofile'
+    return (modo if modo in MODOS else 'cprofile'), request.args.get('perfil_saida', 'arquivo')
+
+
+def _url_sem_token() -> str:
+    # O token não pode parar nos arquivos de captura
+    argumentos = [(chave, valor) for chave, valor in request.args.items(multi=True) if chave != 'perfil']
+    return request.path + (f'?{urlencode(argumentos)}' if argumentos else '')
+
+
+def perfilar_app(app):
+    """Liga as capturas nas requisições do app Flask (sem custo quando nada está configurado)"""
+
+    @app.before_request
+    def _inicio_perfil():
+        if not perfilador.ativo:
+            return None
+        pedido = _pedido_sob_demanda() if perfilador.token else None
+        if pedido is False:
+            return jsonify({'error': 'Token de perfilamento inválido'}), 403
+        if pedido is None and not perfilador.limite_lento:
+            return None
+        modo, saida = pedido or (None, 'arquivo')
+        regra = request.url_rule
+        perfilador.iniciar(Execucao(regra.rule if regra is not None else request.path, request.method,
+                                    _url_sem_token(), modo, saida))
+        return None
+
+    @app.after_request
+    def _fim_perfil(resposta):
+        execucao = perfilador.atual()
+        if execucao is None:
+            return resposta
+        captura_id = perfilador.terminar(execucao, resposta.status_code)
+        if captura_id is None:
+            return resposta
+        if execucao.modo and execucao.saida == 'resposta':
+            with open(perfilador.caminho(captura_id), encoding='utf-8') as arquivo:
+                dados = json.load(arquivo)
+            texto = dados.get('perfil') or '\n'.join(f"{p['amostras']} {p['pilha']}" for p in dados['amostras']['pilhas'])
+            resposta = Response(texto, mimetype='text/plain')
+        resposta.headers['X-Perfil-Captura'] = captura_id
+        return resposta
+
+    @app.teardown_request
+    def _perfil_interrompido(erro):
+        # Só sobra execução aqui se a resposta não passou pelo after_request
+        execucao = perfilador.atual()
+        if execucao is not None:
+            perfilador.terminar(execucao, 500)
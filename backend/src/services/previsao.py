@@ -0,0 +1,291 @@
+"""
+Previsão de carga de trabalho
+Ajusta, para cada funcionário e categoria, um modelo sazonal sobre o histórico
+diário: Holt-Winters aditivo (período de 7 dias) nos totais do dia e um perfil
+dia da semana x hora por suavização exponencial, que distribui o total do dia
+pelas horas. Todas as séries são ajustadas juntas em arrays NumPy e o ajuste
+avança dia a dia, então só os dias novos são processados quando o tempo passa
+"""
+
+import datetime
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.services.horarios import SLOT_MINUTOS, minutos_para_horario
+from src.services.kpis import MINUTOS_DIA, TabelaAgenda
+
+# Dias de histórico usados num ajuste completo
+HISTORICO_DIAS = 365
+
+# Suavização: nível, tendência e sazonalidade semanal dos totais diários,
+# e perfil horário de cada dia da semana
+ALFA = 0.3
+BETA = 0.02
+GAMA = 0.2
+ALFA_PERFIL = 0.2
+
+# Horizonte máximo de uma previsão (dias)
+MAX_DIAS_PREVISAO = 28
+
+# Hora prevista acima de `capacidade * limite` é sobrecarga, se tiver pelo menos
+# estes minutos (evita apontar resíduos do modelo fora do expediente)
+LIMITE_SOBRECARGA = 1.0
+MINUTOS_MINIMOS_SOBRECARGA = 15
+MAX_SOBRECARGAS = 200
+
+
+def _dia_semana(ordinal) -> np.ndarray:
+    return (np.asarray(ordinal) - 1) % 7
+
+
+def minutos_por_hora(serie: np.ndarray, dia: np.ndarray, inicio: np.ndarray, duracao: np.ndarray,
+                     n_series: int, n_dias: int) -> np.ndarray:
+    """
+    Minutos ocupados por série x dia x hora
+
+    Cada agendamento é partido nos pedaços de hora que ele cobre (um agendamento
+    das 9:45 às 11:15 vira 15 + 60 + 15 minutos) e os pedaços são somados com
+    bincount.
+    """
+    fim = np.minimum(inicio + duracao, MINUTOS_DIA)
+    primeira = inicio // 60
+    pedacos = np.maximum((fim - 1) // 60 - primeira + 1, 0)
+    origem = np.repeat(np.arange(len(inicio)), pedacos)
+    hora = primeira[origem] + (np.arange(len(origem)) - np.repeat(np.cumsum(pedacos) - pedacos, pedacos))
+    minutos = np.minimum(fim[origem], (hora + 1) * 60) - np.maximum(inicio[origem], hora * 60)
+    indice = (serie[origem].astype(np.int64) * n_dias + dia[origem]) * 24 + hora
+    return np.bincount(indice, weights=minutos, minlength=n_series * n_dias * 24).reshape(n_series, n_dias, 24)
+
+
+class ModeloSazonal:
+    """
+    Holt-Winters aditivo nos totais diários e perfil horário por dia da semana,
+    para várias séries de uma vez
+
+    Os primeiros 7 dias inicializam nível, sazonalidade e perfil; depois cada
+    dia novo é uma atualização vetorizada sobre todas as séries.
+    """
+
+    def __init__(self, n_series: int):
+        self.nivel = np.zeros(n_series)
+        self.tendencia = np.zeros(n_series)
+        self.sazonal = np.zeros((n_series, 7))
+        self.perfil = np.zeros((n_series, 7, 24))
+        self._inicio: List[Tuple[int, np.ndarray]] = []
+        self.dias = 0
+        self.ultimo: Optional[int] = None
+
+    def atualizar(self, valores: np.ndarray, primeiro: int):
+        """Incorpora os dias `primeiro`, `primeiro + 1`, ... (valores: séries x dias x 24)"""
+        for i in range(valores.shape[1]):
+            dia, hora_a_hora = primeiro + i, valores[:, i, :]
+            semana = int(_dia_semana(dia))
+            total = hora_a_hora.sum(axis=1)
+            if self.dias < 7:
+                self._inicio.append((semana, hora_a_hora))
+                if len(self._inicio) == 7:
+                    totais = np.stack([h.sum(axis=1) for _, h in self._inicio], axis=1)
+                    self.nivel = totais.mean(axis=1)
+                    for k, (s, h) in enumerate(self._inicio):
+                        self.sazonal[:, s] = totais[:, k] - self.nivel
+                        self.perfil[:, s, :] = h
+                    self._inicio = []
+            else:
+                nivel = ALFA * (total - self.sazonal[:, semana]) + (1 - ALFA) * (self.nivel + self.tendencia)
+                self.tendencia = BETA * (nivel - self.nivel) + (1 - BETA) * self.tendencia
+                self.sazonal[:, semana] = GAMA * (total - nivel) + (1 - GAMA) * self.sazonal[:, semana]
+                self.perfil[:, semana, :] = ALFA_PERFIL * hora_a_hora + (1 - ALFA_PERFIL) * self.perfil[:, semana, :]
+                self.nivel = nivel
+            self.dias += 1
+            self.ultimo = dia
+
+    def prever(self, dias: Sequence[int]) -> np.ndarray:
+        """Minutos previstos por série x dia x hora para os ordinais em `dias` (depois de `ultimo`)"""
+        dias = np.asarray(dias)
+        semana = _dia_semana(dias)
+        if self.dias < 7:
+            return np.zeros((len(self.nivel), len(dias), 24))
+        passos = (dias - self.ultimo)[None, :]
+        totais = np.maximum(self.nivel[:, None] + passos * self.tendencia[:, None] + self.sazonal[:, semana], 0)
+        perfil = self.perfil[:, semana, :]
+        soma = perfil.sum(axis=2, keepdims=True)
+        forma = np.divide(perfil, soma, out=np.zeros_like(perfil), where=soma > 0)
+        return totais[:, :, None] * forma
+
+
+class AjustePrevisao:
+    """Modelos ajustados (funcionários, categorias e entregas) até `ultimo` dia"""
+
+    def __init__(self, tabela: TabelaAgenda, entregas: Sequence[Tuple[str, datetime.datetime]]):
+        self.tabela = tabela
+        indice_func = {fid: i for i, fid in enumerate(tabela.funcionarios)}
+        entregas = sorted(
+            ((indice_func[f], momento) for f, momento in entregas if f in indice_func and momento),
+            key=lambda e: e[1]
+        )
+        self.e_func = np.fromiter((e[0] for e in entregas), dtype=np.int32, count=len(entregas))
+        self.e_dia = np.fromiter((e[1].toordinal() for e in entregas), dtype=np.int32, count=len(entregas))
+        self.e_hora = np.fromiter((e[1].hour for e in entregas), dtype=np.int32, count=len(entregas))
+
+        n_func, n_cat = len(tabela.funcionarios), len(tabela.categorias)
+        self.funcionarios = ModeloSazonal(n_func)
+        self.categorias = ModeloSazonal(n_cat)
+        self.entregas = ModeloSazonal(n_func)
+
+    @property
+    def ultimo(self) -> Optional[int]:
+        return self.funcionarios.ultimo
+
+    def avancar(self, ate: datetime.date, desde: datetime.date):
+        """Ajusta os dias depois do último já visto (ou a partir de `desde`) até `ate`"""
+        primeiro = datetime.date.fromordinal(self.ultimo + 1) if self.ultimo else desde
+        if primeiro > ate:
+            return 0
+        n_dias = (ate - primeiro).days + 1
+        tabela = self.tabela
+
+        occ = tabela.ocorrencias(primeiro, ate)
+        computa = tabela.computa_tarefa[occ['tarefa']]
+        args = [occ[c][computa] for c in ('dia', 'inicio', 'duracao')]
+        self.funcionarios.atualizar(
+            minutos_por_hora(occ['func'][computa], *args, len(tabela.funcionarios), n_dias), primeiro.toordinal()
+        )
+        self.categorias.atualizar(
+            minutos_por_hora(tabela.categoria_da_tarefa[occ['tarefa']][computa], *args, len(tabela.categorias),
+                             n_dias),
+            primeiro.toordinal()
+        )
+
+        a, b = np.searchsorted(self.e_dia, [primeiro.toordinal(), ate.toordinal() + 1])
+        contagem = np.bincount(
+            (self.e_func[a:b].astype(np.int64) * n_dias + (self.e_dia[a:b] - primeiro.toordinal())) * 24 +
+            self.e_hora[a:b],
+            minlength=len(tabela.funcionarios) * n_dias * 24
+        ).reshape(len(tabela.funcionarios), n_dias, 24)
+        self.entregas.atualizar(contagem.astype(float), primeiro.toordinal())
+        return n_dias
+
+
+def prever_semana(ajuste: AjustePrevisao, inicio: datetime.date, n_dias: int,
+                  funcionarios: Optional[Sequence[str]] = None, limite_sobrecarga: float = LIMITE_SOBRECARGA) -> Dict:
+    """
+    Projeção de horas por funcionário e categoria e horas com sobrecarga prevista
+
+    A capacidade de cada hora vem do expediente do funcionário em dias úteis;
+    as horas já planejadas no cronograma para o período vêm junto, para comparação.
+    """
+    tabela = ajuste.tabela
+    dias = np.arange(inicio.toordinal(), inicio.toordinal() + n_dias)
+    datas = [datetime.date.fromordinal(int(d)).isoformat() for d in dias]
+    selecionados = np.arange(len(tabela.funcionarios)) if funcionarios is None else \
+        np.array([tabela.funcionarios.index(f) for f in funcionarios], dtype=np.int64)
+
+    previsto = ajuste.funcionarios.prever(dias)[selecionados]  # (F, D, 24) minutos
+    por_categoria = ajuste.categorias.prever(dias)
+    entregas = ajuste.entregas.prever(dias)[selecionados].sum(axis=(1, 2))
+
+    capacidade_hora = np.repeat(tabela.expediente, SLOT_MINUTOS, axis=1).reshape(-1, 24, 60).sum(axis=2)
+    uteis = _dia_semana(dias) < 5
+    capacidade = capacidade_hora[selecionados][:, None, :] * uteis[None, :, None]  # (F, D, 24)
+
+    fim = datetime.date.fromordinal(int(dias[-1]))
+    occ = tabela.ocorrencias(inicio, fim)
+    computa = tabela.computa_tarefa[occ['tarefa']]
+    planejado = np.bincount(occ['func'][computa], weights=occ['duracao'][computa],
+                            minlength=len(tabela.funcionarios))
+
+    sobrecarga = (previsto > capacidade * limite_sobrecarga) & (previsto >= MINUTOS_MINIMOS_SOBRECARGA)
+    sobrecargas = []
+    for f, d, h in list(zip(*np.nonzero(sobrecarga)))[:MAX_SOBRECARGAS]:
+        sobrecargas.append({
+            'funcionario': tabela.funcionarios[selecionados[f]],
+            'data': datas[d],
+            'horario': minutos_para_horario(int(h) * 60),
+            'minutos_previstos': round(float(previsto[f, d, h]), 1),
+            'capacidade_minutos': int(capacidade[f, d, h])
+        })
+
+    def horas(minutos):
+        return round(float(minutos) / 60, 2)
+
+    resultado_funcionarios = []
+    for i, f in enumerate(selecionados):
+        total, cap = previsto[i].sum(), capacidade[i].sum()
+        resultado_funcionarios.append({
+            'id': tabela.funcionarios[f],
+            'nome': tabela.nomes[f],
+            'horas_previstas': horas(total),
+            'horas_planejadas': horas(planejado[f]),
+            'capacidade_horas': horas(cap),
+            'utilizacao_prevista': round(float(total / cap), 4) if cap else None,
+            'entregas_previstas': round(float(entregas[i]), 1),
+            'horas_sobrecarga': int(sobrecarga[i].sum()),
+            'por_dia': [
+                {'data': datas[d], 'horas': horas(previsto[i, d].sum()),
+                 'por_hora': [round(float(m), 1) for m in previsto[i, d]]}
+                for d in range(n_dias)
+            ]
+        })
+
+    resultado_categorias = sorted((
+        {
+            'categoria': categoria,
+            'horas_previstas': horas(por_categoria[c].sum()),
+            'por_dia': [{'data': datas[d], 'horas': horas(por_categoria[c, d].sum())} for d in range(n_dias)]
+        }
+        for c, categoria in enumerate(tabela.categorias)
+    ), key=lambda c: (-c['horas_previstas'], c['categoria']))
+
+    return {
+        'periodo': {'inicio': inicio.isoformat(), 'fim': fim.isoformat(), 'dias': n_dias},
+        'funcionarios': resultado_funcionarios,
+        'categorias': resultado_categorias,
+        'sobrecargas': sobrecargas
+    }
+
+
+class PrevisaoCarga:
+    """
+    Ajuste em cache
+
+    Enquanto a versão dos dados não muda, cada chamada só ajusta os dias que
+    passaram desde a anterior; qualquer commit nas tabelas de origem faz um
+    ajuste completo sobre os últimos HISTORICO_DIAS dias.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ajuste: Optional[AjustePrevisao] = None
+        self._versao: Optional[Hashable] = None
+
+    def ajuste(self, versao: Hashable, carregar_tabela: Callable[[], TabelaAgenda],
+               carregar_entregas: Callable[[], Sequence], hoje: datetime.date) -> Tuple[AjustePrevisao, Dict]:
+        """
+        Returns:
+            (ajuste até ontem, informações do ajuste: completo ou incremental, dias processados)
+        """
+        ontem = hoje - datetime.timedelta(days=1)
+        with self._lock:
+            completo = self._ajuste is None or self._versao != versao or \
+                (self._ajuste.ultimo is not None and self._ajuste.ultimo > ontem.toordinal())
+            if completo:
+                self._ajuste = AjustePrevisao(carregar_tabela(), carregar_entregas())
+                self._versao = versao
+            processados = self._ajuste.avancar(ontem, desde=hoje - datetime.timedelta(days=HISTORICO_DIAS))
+            return self._ajuste, {
+                'tipo': 'completo' if completo else 'incremental',
+                'dias_processados': processados,
+                'dias_historico': self._ajuste.funcionarios.dias,
+                'ate': ontem.isoformat()
+            }
+
+    def limpar(self):
+        with self._lock:
+            self._ajuste = None
+            self._versao = None
+
+
+# Instância global
+previsao_carga = PrevisaoCarga()
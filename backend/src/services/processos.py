@@ -0,0 +1,87 @@
+"""
+Edição de processos
+JSON Merge Patch (RFC 7386) para o processo inteiro e operações por passo
+(inserir, editar, remover, mover) que mexem só na lista de passos
+"""
+
+import copy
+from typing import Any, Dict, List, Optional
+
+# Campos de um processo no formato de processos.json
+CAMPOS_PROCESSO = ('titulo', 'descricao', 'tempoEstimado', 'frequencia', 'passos', 'observacoes')
+
+
+def merge_patch(alvo: Any, patch: Any) -> Any:
+    """Aplica um JSON Merge Patch (RFC 7386) e devolve o resultado, sem alterar o alvo"""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+
+    resultado = copy.deepcopy(alvo) if isinstance(alvo, dict) else {}
+    for chave, valor in patch.items():
+        if valor is None:
+            resultado.pop(chave, None)
+        else:
+            resultado[chave] = merge_patch(resultado.get(chave), valor)
+    return resultado
+
+
+def _indice(passos: List[Dict], numero: Any, permitir_fim: bool = False) -> int:
+    limite = len(passos) + (1 if permitir_fim else 0)
+    if not isinstance(numero, int) or not 1 <= numero <= limite:
+        raise ValueError(f'Passo {numero} não existe (1 a {limite})')
+    return numero - 1
+
+
+def aplicar_operacoes(passos: List[Dict], operacoes: List[Dict]) -> List[Dict]:
+    """
+    Aplica operações na lista de passos, em ordem, e renumera os passos
+
+    Operações (números de passo começam em 1, como o campo `numero`):
+        {"op": "inserir", "posicao": n, "passo": {...}}   posicao padrão: no fim
+        {"op": "editar", "numero": n, "passo": {...}}     merge patch no passo
+        {"op": "remover", "numero": n}
+        {"op": "mover", "numero": n, "para": m}
+
+    Raises:
+        ValueError: operação inválida (nada é aplicado)
+    """
+    passos = copy.deepcopy(passos)
+    for operacao in operacoes:
+        tipo = operacao.get('op') if isinstance(operacao, dict) else None
+        if tipo == 'inserir':
+            if not isinstance(operacao.get('passo'), dict):
+                raise ValueError('inserir exige o objeto passo')
+            posicao = _indice(passos, operacao.get('posicao', len(passos) + 1), permitir_fim=True)
+            passos.insert(posicao, copy.deepcopy(operacao['passo']))
+        elif tipo == 'editar':
+            if not isinstance(operacao.get('passo'), dict):
+                raise ValueError('editar exige o objeto passo')
+            i = _indice(passos, operacao.get('numero'))
+            passos[i] = merge_patch(passos[i], operacao['passo'])
+        elif tipo == 'remover':
+            passos.pop(_indice(passos, operacao.get('numero')))
+        elif tipo == 'mover':
+            passo = passos.pop(_indice(passos, operacao.get('numero')))
+            passos.insert(_indice(passos, operacao.get('para'), permitir_fim=True), passo)
+        else:
+            raise ValueError(f'Operação desconhecida: {tipo!r}')
+
+    for numero, passo in enumerate(passos, start=1):
+        passo['numero'] = numero
+    return passos
+
+
+def validar_processo(dados: Any) -> Optional[str]:
+    """Mensagem de erro ou None se o processo estiver no formato esperado"""
+    if not isinstance(dados, dict):
+        return 'O processo deve ser um objeto'
+    extras = set(dados) - set(CAMPOS_PROCESSO)
+    if extras:
+        return f"Campos desconhecidos: {', '.join(sorted(extras))}"
+    if not dados.get('titulo'):
+        return 'Campo obrigatório: titulo'
+    if not isinstance(dados.get('passos', []), list) or not all(isinstance(p, dict) for p in dados.get('passos', [])):
+        return 'passos deve ser uma lista de objetos'
+    if not isinstance(dados.get('observacoes', []), list):
+        return 'observacoes deve ser uma lista'
+    return None
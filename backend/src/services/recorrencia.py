@@ -0,0 +1,207 @@
+"""
+Recorrência dos agendamentos do cronograma
+Agendamentos sem data são modelos com uma regra no estilo RRULE (RFC 5545);
+as ocorrências de cada dia são geradas sob demanda, já com exceções aplicadas
+"""
+
+import datetime
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+# Regra dos agendamentos sem `recorrencia` (o cronograma se repete em dias úteis)
+REGRA_PADRAO = 'FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR'
+
+# Referência para INTERVAL e primeira ocorrência nos feeds (uma segunda-feira)
+INICIO_RECORRENCIA = datetime.date(2025, 1, 6)
+
+DIAS_SEMANA = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+
+# Atalhos aceitos no lugar de uma RRULE
+ATALHOS = {
+    'diaria': 'FREQ=DAILY',
+    'dias_uteis': REGRA_PADRAO,
+    'semanal': 'FREQ=WEEKLY',
+}
+
+
+@dataclass(frozen=True)
+class Regra:
+    """Subconjunto de RRULE: FREQ=DAILY|WEEKLY, BYDAY, INTERVAL e UNTIL"""
+    frequencia: str
+    dias_semana: FrozenSet[int]
+    intervalo: int = 1
+    ate: Optional[datetime.date] = None
+
+    def ocorre_em(self, dia: datetime.date) -> bool:
+        if dia < INICIO_RECORRENCIA or (self.ate and dia > self.ate):
+            return False
+        if self.dias_semana and dia.weekday() not in self.dias_semana:
+            return False
+        if self.intervalo == 1:
+            return True
+        if self.frequencia == 'DAILY':
+            return (dia - INICIO_RECORRENCIA).days % self.intervalo == 0
+        return ((dia - INICIO_RECORRENCIA).days // 7) % self.intervalo == 0
+
+    def datas(self, inicio: datetime.date, fim: datetime.date) -> Iterator[datetime.date]:
+        """Datas das ocorrências entre inicio e fim (inclusive), geradas uma a uma"""
+        dia = max(inicio, INICIO_RECORRENCIA)
+        if self.ate:
+            fim = min(fim, self.ate)
+        while dia <= fim:
+            if self.ocorre_em(dia):
+                yield dia
+            dia += datetime.timedelta(days=1)
+
+    def to_rrule(self) -> str:
+        partes = [f'FREQ={self.frequencia}']
+        if self.intervalo != 1:
+            partes.append(f'INTERVAL={self.intervalo}')
+        if self.dias_semana:
+            nomes = {v: k for k, v in DIAS_SEMANA.items()}
+            partes.append('BYDAY=' + ','.join(nomes[d] for d in sorted(self.dias_semana)))
+        if self.ate:
+            partes.append(f"UNTIL={self.ate.strftime('%Y%m%d')}")
+        return ';'.join(partes)
+
+
+@lru_cache(maxsize=256)
+def parse_regra(texto: Optional[str]) -> Regra:
+    """
+    Converte o texto da coluna `recorrencia` em Regra
+
+    Raises:
+        ValueError: regra fora do subconjunto suportado
+    """
+    texto = (texto or REGRA_PADRAO).strip()
+    texto = ATALHOS.get(texto.lower(), texto)
+    if texto.upper().startswith('RRULE:'):
+        texto = texto[6:]
+
+    campos = {}
+    for parte in texto.split(';'):
+        chave, sep, valor = parte.partition('=')
+        if not sep:
+            raise ValueError(f'Parte inválida na regra: {parte!r}')
+        campos[chave.strip().upper()] = valor.strip().upper()
+
+    frequencia = campos.pop('FREQ', None)
+    if frequencia not in ('DAILY', 'WEEKLY'):
+        raise ValueError('FREQ deve ser DAILY ou WEEKLY')
+
+    try:
+        dias = frozenset(DIAS_SEMANA[d.strip()] for d in campos.pop('BYDAY', '').split(',') if d.strip())
+    except KeyError as e:
+        raise ValueError(f'Dia da semana inválido: {e.args[0]}')
+
+    try:
+        intervalo = int(campos.pop('INTERVAL', 1))
+    except ValueError:
+        raise ValueError('INTERVAL deve ser um número inteiro')
+    if intervalo < 1:
+        raise ValueError('INTERVAL deve ser maior que zero')
+
+    ate = None
+    if 'UNTIL' in campos:
+        try:
+            ate = datetime.datetime.strptime(campos.pop('UNTIL')[:8], '%Y%m%d').date()
+        except ValueError:
+            raise ValueError('UNTIL deve estar no formato AAAAMMDD')
+
+    if campos:
+        raise ValueError(f"Campos não suportados: {', '.join(sorted(campos))}")
+
+    # Semanal sem BYDAY repete no dia da semana da referência
+    if frequencia == 'WEEKLY' and not dias:
+        dias = frozenset({INICIO_RECORRENCIA.weekday()})
+    return Regra(frequencia, dias, intervalo, ate)
+
+
+def expandir(modelos: Iterable[Dict], excecoes: Dict[Tuple[int, str], Dict], avulsos: Iterable[Dict],
+             inicio: datetime.date, fim: datetime.date) -> Iterator[Dict]:
+    """
+    Gera as ocorrências da agenda dia a dia, em ordem de data e horário
+
+    Args:
+        modelos: agendamentos sem data (formato Agenda.to_dict, com 'recorrencia')
+        excecoes: {(agenda_id, 'YYYY-MM-DD'): AgendaExcecao.to_dict()} do intervalo
+        avulsos: agendamentos com data dentro do intervalo, em ordem de data; são
+                 consumidos um dia de cada vez, então podem vir de um cursor do banco
+    """
+    modelos = sorted(modelos, key=lambda m: (m['horario'], m['funcionario'], m['id']))
+    regras = [(modelo, parse_regra(modelo.get('recorrencia'))) for modelo in modelos]
+
+    avulsos = iter(avulsos)
+    proximo = next(avulsos, None)
+
+    dia = inicio
+    while dia <= fim:
+        data = dia.isoformat()
+        do_dia = []
+        for modelo, regra in regras:
+            excecao = excecoes.get((modelo['id'], data))
+            if excecao is None:
+                if regra.ocorre_em(dia):
+                    do_dia.append({**modelo, 'data': data, 'modelo': modelo['id'], 'excecao': False})
+            elif not excecao['cancelado']:
+                do_dia.append({
+                    **modelo,
+                    'horario': excecao['horario'] or modelo['horario'],
+                    'tarefa': excecao['tarefa'] or modelo['tarefa'],
+                    'duracao': excecao['duracao'] or modelo['duracao'],
+                    'data': data,
+                    'modelo': modelo['id'],
+                    'excecao': True
+                })
+        while proximo is not None and proximo['data'] <= data:
+            if proximo['data'] == data:
+                do_dia.append({**proximo, 'modelo': None, 'excecao': False})
+            proximo = next(avulsos, None)
+
+        do_dia.sort(key=lambda o: (o['horario'], o['funcionario']))
+        yield from do_dia
+        dia += datetime.timedelta(days=1)
+
+
+class CacheJanelas:
+    """
+    LRU de janelas já expandidas
+
+    A chave inclui a versão dos dados, então qualquer escrita na agenda torna as
+    janelas antigas inalcançáveis; elas saem do cache pela ordem de uso.
+    """
+
+    def __init__(self, max_itens: int = 128):
+        self.max_itens = max_itens
+        self._lock = threading.Lock()
+        self._itens: 'OrderedDict[Hashable, List[Dict]]' = OrderedDict()
+        self.acertos = 0
+        self.faltas = 0
+
+    def get(self, chave: Hashable) -> Optional[List[Dict]]:
+        with self._lock:
+            valor = self._itens.get(chave)
+            if valor is None:
+                self.faltas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+    def put(self, chave: Hashable, valor: List[Dict]):
+        with self._lock:
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._itens.clear()
+
+
+# Instância global usada pelas rotas
+cache_janelas = CacheJanelas()
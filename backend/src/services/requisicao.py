@@ -0,0 +1,49 @@
+"""
+Leitura do corpo e dos parâmetros das requisições
+Os handlers fazem `dados.get(...)` no corpo: um JSON que não é objeto
+([1, 2], "texto", 3) precisa virar 400 antes disso, e não um 500. Parâmetros
+numéricos malformados também são recusados, em vez de virarem o padrão
+(como faz `request.args.get(..., type=int)`)
+"""
+
+import math
+from typing import Dict, Optional, Tuple, Union
+
+from flask import jsonify, request
+
+
+def corpo_objeto() -> Tuple[Optional[Dict], Optional[tuple]]:
+    """
+    Corpo da requisição como dicionário
+
+    Sem corpo vale {} (endpoints com todos os campos opcionais). JSON
+    malformado, outro Content-Type ou um JSON que não é objeto são recusados.
+
+    Returns:
+        (dados, None) ou (None, resposta 400)
+    """
+    if not request.get_data(cache=True):
+        return {}, None
+    dados = request.get_json(silent=True)
+    if not isinstance(dados, dict):
+        return None, (jsonify({'error': 'O corpo deve ser um objeto JSON'}), 400)
+    return dados, None
+
+
+def numero_do_parametro(nome: str, padrao: Union[int, float], tipo: type = float) -> Union[int, float]:
+    """
+    Parâmetro numérico da query string (padrão se ausente ou vazio)
+
+    Raises:
+        ValueError: valor que não é um número (inteiro, se tipo=int) finito
+    """
+    valor = request.args.get(nome)
+    if valor is None or valor.strip() == '':
+        return padrao
+    try:
+        numero = tipo(valor)
+    except ValueError:
+        numero = None
+    if numero is None or not math.isfinite(numero):
+        raise ValueError(f"{nome} deve ser um número{' inteiro' if tipo is int else ''}")
+    return numero
@@ -0,0 +1,88 @@
+"""
+Versão dos dados por tabela
+Cada commit do ORM que altera uma tabela incrementa o contador dela; caches
+usam essas versões na chave para nunca servir dados antigos
+
+Os ouvintes do ORM só são instalados por `ouvir_commits`, chamado por
+src.database: quem só usa os contadores (app_simple, a superfície ASGI) não
+depende do SQLAlchemy.
+"""
+
+import threading
+from typing import Callable, Dict, List, Tuple
+
+
+class VersoesDados:
+    """
+    Contadores de versão por tabela (neste processo)
+
+    Escritas feitas por outro processo ou fora do ORM (SQL direto,
+    query.update) não passam por aqui; chame `incrementar` nesses casos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versoes: Dict[str, int] = {}
+        self._ouvintes: List[Callable[[Tuple[str, ...]], None]] = []
+
+    def versao(self, *tabelas: str) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._versoes.get(tabela, 0) for tabela in tabelas)
+
+    def incrementar(self, *tabelas: str):
+        with self._lock:
+            for tabela in tabelas:
+                self._versoes[tabela] = self._versoes.get(tabela, 0) + 1
+            ouvintes = list(self._ouvintes)
+        for ouvinte in ouvintes:
+            ouvinte(tabelas)
+
+    def ouvir(self, ouvinte: Callable[[Tuple[str, ...]], None]):
+        """
+        Chama `ouvinte(tabelas)` depois de cada incremento, na thread que fez o commit
+
+        O ouvinte deve ser rápido e não pode gravar no banco (ex.: só acordar
+        quem espera numa fila ou num event loop).
+        """
+        with self._lock:
+            self._ouvintes.append(ouvinte)
+
+    def parar_de_ouvir(self, ouvinte: Callable[[Tuple[str, ...]], None]):
+        with self._lock:
+            if ouvinte in self._ouvintes:
+                self._ouvintes.remove(ouvinte)
+
+
+# Instância global
+versoes_dados = VersoesDados()
+
+_CHAVE_SESSAO = 'versoes_pendentes'
+
+
+def _registrar_tabelas(session, flush_context):
+    tabelas = session.info.setdefault(_CHAVE_SESSAO, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        tabela = getattr(obj, '__tablename__', None)
+        if tabela:
+            tabelas.add(tabela)
+
+
+def _incrementar_versoes(session):
+    tabelas = session.info.pop(_CHAVE_SESSAO, None)
+    if tabelas:
+        versoes_dados.incrementar(*tabelas)
+
+
+def _descartar_tabelas(session):
+    session.info.pop(_CHAVE_SESSAO, None)
+
+
+def ouvir_commits():
+    """Incrementa as versões a cada commit do ORM (idempotente)"""
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    for nome, ouvinte in (('after_flush', _registrar_tabelas), ('after_commit', _incrementar_versoes),
+                          ('after_rollback', _descartar_tabelas)):
+        if not event.contains(Session, nome, ouvinte):
+            event.listen(Session, nome, ouvinte)
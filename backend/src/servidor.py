@@ -0,0 +1,171 @@
+"""
+Servidor de produção
+Roda o app no gunicorn (pré-fork): um processo com várias threads por
+padrão, app carregado uma vez no processo mestre, reinício gracioso e
+timeout por requisição. O servidor de desenvolvimento do Flask só roda
+quando pedido explicitamente (--dev ou SERVIDOR=dev)
+
+Vários processos dimensionados pelas CPUs ficam para quando o estado abaixo
+estiver num lugar compartilhado (banco ou Redis); até lá o padrão é um
+processo só, porque parte do estado vive na memória do processo: versões
+dos dados (src/services/versoes.py), que invalidam os caches de indicadores,
+previsão, ocorrências, busca e disponibilidade; state do OAuth, canais de
+notificação do Google Calendar e exportações em segundo plano. Com mais de
+um processo (WEB_CONCURRENCY), uma escrita num processo não invalida os
+caches dos outros, e callbacks do OAuth, notificações e downloads que caem
+em outro processo falham. Pelo mesmo motivo o processo não é reciclado
+depois de N requisições (max_requests do gunicorn): cada reciclagem perderia
+states do OAuth pendentes, exportações e a renovação dos canais.
+
+Variáveis de ambiente:
+    PORT                     porta (padrão depende do ponto de entrada)
+    WEB_CONCURRENCY          processos (padrão 1; veja acima)
+    WEB_THREADS              threads por processo (padrão 8)
+    WEB_TIMEOUT              segundos até um processo travado ser reiniciado (padrão 30)
+    WEB_GRACEFUL_TIMEOUT     segundos para terminar as requisições em andamento ao reiniciar (padrão 30)
+    SERVIDOR                 'producao' (padrão) ou 'dev'
+
+Reinício gracioso: `kill -HUP <pid do mestre>` troca os processos sem
+derrubar conexões. Como o app é pré-carregado no mestre, código novo exige
+`kill -USR2` (sobe um novo mestre) seguido de `kill -QUIT` no antigo.
+"""
+
+import os
+import signal
+import sys
+import threading
+from typing import Callable, Dict, Optional
+
+from flask import jsonify
+
+
+def _env_int(nome: str, padrao: int) -> int:
+    try:
+        return int(os.environ[nome])
+    except (KeyError, ValueError):
+        return padrao
+
+
+def configuracao(porta: int) -> Dict:
+    """Configuração do gunicorn a partir do ambiente"""
+    return {
+        'bind': f"0.0.0.0:{_env_int('PORT', porta)}",
+        'workers': max(_env_int('WEB_CONCURRENCY', 1), 1),
+        'worker_class': 'gthread',
+        'threads': max(_env_int('WEB_THREADS', 8), 1),
+        'preload_app': True,
+        'timeout': _env_int('WEB_TIMEOUT', 30),
+        'graceful_timeout': _env_int('WEB_GRACEFUL_TIMEOUT', 30),
+        'keepalive': 5,
+        'accesslog': '-',
+        'errorlog': '-',
+    }
+
+
+class Prontidao:
+    """
+    Estado de prontidão do processo
+
+    Pronto quando todas as verificações registradas passam e o processo não
+    está encerrando; ao receber SIGTERM o processo deixa de estar pronto na
+    hora, para o balanceador parar de mandar tráfego enquanto as requisições
+    em andamento terminam.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._verificacoes: Dict[str, Callable[[], bool]] = {}
+        self.encerrando = False
+
+    def registrar(self, nome: str, verificacao: Callable[[], bool]):
+        with self._lock:
+            self._verificacoes[nome] = verificacao
+
+    def marcar_encerrando(self):
+        self.encerrando = True
+
+    def estado(self) -> Dict:
+        with self._lock:
+            verificacoes = dict(self._verificacoes)
+        resultados = {}
+        for nome, verificacao in verificacoes.items():
+            try:
+                resultados[nome] = bool(verificacao())
+            except Exception:
+                resultados[nome] = False
+        pronto = not self.encerrando and all(resultados.values())
+        return {
+            'status': 'ready' if pronto else 'not_ready',
+            'encerrando': self.encerrando,
+            'verificacoes': resultados,
+            'pid': os.getpid()
+        }
+
+
+# Instância global (uma por processo)
+prontidao = Prontidao()
+
+
+def registrar_prontidao(app, rota: str = '/api/ready'):
+    """Adiciona a rota de prontidão ao app: 200 quando pronto, 503 caso contrário"""
+
+    @app.route(rota, endpoint='prontidao')
+    def pronto():
+        estado = prontidao.estado()
+        return jsonify(estado), 200 if estado['status'] == 'ready' else 503
+
+
+def _post_worker_init(worker):
+    # O gunicorn instala seus sinais antes deste gancho; o SIGTERM passa a
+    # marcar o processo como encerrando antes de seguir o tratamento normal
+    original = signal.getsignal(signal.SIGTERM)
+
+    def ao_terminar(signum, frame):
+        prontidao.marcar_encerrando()
+        if callable(original):
+            original(signum, frame)
+
+    signal.signal(signal.SIGTERM, ao_terminar)
+
+
+def executar(app, porta: int, ao_fork: Optional[Callable[[], None]] = None, argv=None):
+    """
+    Sobe o app no modo escolhido
+
+    Args:
+        ao_fork: chamado em cada processo logo depois do fork (ex.: descartar
+                 conexões de banco abertas pelo mestre)
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if '--dev' in argv or os.environ.get('SERVIDOR') == 'dev':
+        print('⚠️  Servidor de desenvolvimento do Flask (não use em produção)')
+        app.run(host='0.0.0.0', port=_env_int('PORT', porta), debug='--debug' in argv, threaded=True)
+        return
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        # gunicorn não roda no Windows; lá, use o modo de desenvolvimento explicitamente
+        sys.exit('gunicorn não está instalado (ou não há suporte neste sistema). '
+                 'Instale com `pip install gunicorn` ou rode com --dev / SERVIDOR=dev.')
+
+    opcoes = configuracao(porta)
+
+    def post_fork(servidor, worker):
+        if ao_fork:
+            ao_fork()
+
+    class Aplicacao(BaseApplication):
+        def load_config(self):
+            for chave, valor in opcoes.items():
+                self.cfg.set(chave, valor)
+            self.cfg.set('post_fork', post_fork)
+            self.cfg.set('post_worker_init', _post_worker_init)
+
+        def load(self):
+            return app
+
+    print(f"🚀 gunicorn em {opcoes['bind']}: {opcoes['workers']} processos x {opcoes['threads']} threads")
+    if opcoes['workers'] > 1:
+        print('⚠️  Com WEB_CONCURRENCY > 1, caches, OAuth, canais e exportações ficam por processo (veja src/servidor.py)')
+    Aplicacao().run()
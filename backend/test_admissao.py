@@ -0,0 +1,116 @@
+"""
+Controle de admissão: classes de rota, baldes de fichas, identidade do
+cliente atrás de proxies e o middleware (429, 503 e vagas devolvidas)
+"""
+
+import pytest
+from werkzeug.test import Client
+
+from src.services.admissao import ControleAdmissao, MiddlewareAdmissao, classificar
+
+
+def _app_wsgi(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'ok']
+
+
+def _cliente(controle):
+    return Client(MiddlewareAdmissao(_app_wsgi, controle))
+
+
+@pytest.mark.parametrize('metodo,caminho,classe', [
+    ('GET', '/api/agenda', 'leitura'),
+    ('HEAD', '/api/export', 'sync'),
+    ('GET', '/api/export/', 'sync'),
+    ('GET', '/api/export/tarefas/abc', 'leitura'),
+    ('POST', '/api/batch', 'leitura'),
+    ('POST', '/api/admin/funcionarios', 'escrita'),
+    ('DELETE', '/api/calendar/canais/c1', 'sync'),
+    ('GET', '/api/health', None),
+    ('GET', '/api/mudancas/stream', None),
+    ('OPTIONS', '/api/agenda', None),
+])
+def test_classificar(metodo, caminho, classe):
+    assert classificar(metodo, caminho) == classe
+
+
+def test_balde_de_fichas():
+    controle = ControleAdmissao(limites={'escrita': (1.0, 2.0)})
+    assert controle.limitar('escrita', 'a', agora=0) is None
+    assert controle.limitar('escrita', 'a', agora=0) is None
+    assert controle.limitar('escrita', 'a', agora=0) == 1.0
+    assert controle.limitar('escrita', 'b', agora=0) is None
+    assert controle.limitar('escrita', 'a', agora=1) is None
+
+
+def test_limites_do_ambiente(monkeypatch):
+    monkeypatch.setenv('ADMISSAO_LEITURA', '3')
+    monkeypatch.setenv('ADMISSAO_ESCRITA', '2/7')
+    monkeypatch.setenv('ADMISSAO_SYNC', 'lixo')
+    controle = ControleAdmissao.do_ambiente()
+    assert controle.limites == {'leitura': (3.0, 6.0), 'escrita': (2.0, 7.0), 'sync': (0.2, 3.0)}
+
+
+@pytest.mark.parametrize('proxies,encaminhado,esperado', [
+    (0, '6.6.6.6, 1.2.3.4', '10.0.0.1'),
+    (1, '6.6.6.6, 1.2.3.4', '1.2.3.4'),
+    (2, '6.6.6.6, 1.2.3.4', '6.6.6.6'),
+    (3, '1.2.3.4', '1.2.3.4'),
+    (1, None, '10.0.0.1'),
+])
+def test_cliente_atras_de_proxies(proxies, encaminhado, esperado):
+    controle = ControleAdmissao(proxies=proxies)
+    assert controle.cliente('10.0.0.1', {'X-Forwarded-For': encaminhado}.get) == esperado
+
+
+def test_cliente_pelo_cabecalho_de_usuario():
+    controle = ControleAdmissao(cabecalho_cliente='X-User-Id')
+    assert controle.cliente('10.0.0.1', {'X-User-Id': 'ana'}.get) == 'usuario:ana'
+    assert controle.cliente('10.0.0.1', {}.get) == '10.0.0.1'
+
+
+def test_middleware_responde_429_com_retry_after():
+    cliente = _cliente(ControleAdmissao(limites={'leitura': (0.5, 1.0)}))
+    assert cliente.get('/api/agenda').status_code == 200
+
+    resposta = cliente.get('/api/agenda')
+
+    assert resposta.status_code == 429
+    assert resposta.headers['Retry-After'] == '2'
+    assert resposta.json['retry_after'] == 2
+    assert cliente.get('/api/health').status_code == 200
+
+
+def test_middleware_cheio_responde_503_sem_gastar_ficha():
+    controle = ControleAdmissao(limites={'sync': (0.001, 1.0)}, max_sync=1, fila=0)
+    app = MiddlewareAdmissao(_app_wsgi, controle)
+    ambiente = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/api/export', 'REMOTE_ADDR': '1.1.1.1'}
+    status = []
+
+    em_andamento = app(dict(ambiente), lambda linha, cabecalhos: status.append(linha))
+    app(dict(ambiente, REMOTE_ADDR='2.2.2.2'), lambda linha, cabecalhos: status.append(linha))
+    em_andamento.close()
+    app(dict(ambiente, REMOTE_ADDR='2.2.2.2'), lambda linha, cabecalhos: status.append(linha)).close()
+
+    assert [linha[:3] for linha in status] == ['200', '503', '200']
+    assert controle.em_andamento == 0
+    assert controle.decisoes[('sync', 'sobrecarga')] == 1
+
+
+def test_item_de_lote_nao_ocupa_vaga():
+    controle = ControleAdmissao(max_simultaneas=1, fila=0)
+    controle.entrar('leitura')
+    resposta = _cliente(controle).get('/api/agenda', environ_overrides={'workspace.lote': True})
+    assert resposta.status_code == 200
+    assert controle.em_andamento == 1
+
+
+def test_vaga_devolvida_quando_o_app_falha():
+    def quebra(environ, start_response):
+        raise RuntimeError('falhou')
+
+    controle = ControleAdmissao()
+    with pytest.raises(RuntimeError):
+        MiddlewareAdmissao(quebra, controle)({'REQUEST_METHOD': 'POST', 'PATH_INFO': '/api/demandas'},
+                                             lambda *_: None)
+    assert controle.em_andamento == 0
@@ -0,0 +1,78 @@
+"""
+Agenda compacta: mesmo conteúdo da lista de dicionários (linhas, JSON da
+agenda inteira e por funcionário, consultas por dia), inclusive para
+agendamentos fora do formato das colunas
+"""
+
+import datetime
+import json
+import os
+
+import pytest
+
+from src.services.agenda_compacta import AgendaCompacta
+
+DADOS = os.path.join(os.path.dirname(__file__), 'src', 'data', 'agenda.json')
+
+FUNCIONARIOS = [{'id': 'ana'}, {'id': 'bia'}, {'id': 'caio'}]
+TAREFAS = [{'id': 't1'}, {'id': 't2'}]
+AGENDA = [
+    {'horario': '08:00', 'funcionario': 'ana', 'tarefa': 't1'},
+    {'horario': '09:30', 'funcionario': 'bia', 'tarefa': 't2', 'duracao': 45, 'data': '2026-03-02'},
+    {'horario': '10:00', 'funcionario': 'ana', 'tarefa': 't2', 'data': '2026-03-02'},
+    {'horario': '11:00', 'funcionario': 'ana', 'tarefa': 't1', 'data': '2026-03-03'},
+    # Fora do formato das colunas: guardados como vieram
+    {'horario': '09:00', 'funcionario': 'bia', 'tarefa': 't1', 'recorrencia': 'FREQ=WEEKLY;BYDAY=MO'},
+    {'horario': '9:00', 'funcionario': 'ana', 'tarefa': 't1'},
+    {'horario': '12:00', 'funcionario': 'ana', 'tarefa': 't1', 'duracao': True},
+    {'horario': '12:00', 'funcionario': 'ana', 'tarefa': 't1', 'duracao': '30'},
+    {'horario': '12:00', 'funcionario': 7, 'tarefa': 't1'},
+    {'horario': '12:00', 'funcionario': 'ana', 'tarefa': 't1', 'data': '2026-3-2'},
+    # Funcionário e tarefa fora das listas entram na tabela de ids
+    {'horario': '13:00', 'funcionario': 'novo', 'tarefa': 'nova', 'data': '2026-03-02'},
+]
+
+
+@pytest.fixture
+def compacta():
+    return AgendaCompacta(AGENDA, FUNCIONARIOS, TAREFAS)
+
+
+def test_linhas_iguais_a_lista(compacta):
+    assert len(compacta) == len(AGENDA)
+    assert list(compacta) == AGENDA
+    assert set(compacta.extras) == {4, 5, 6, 7, 8, 9}
+
+
+def test_json_da_agenda(compacta):
+    assert json.loads(compacta.json_agenda) == AGENDA
+
+
+@pytest.mark.parametrize('funcionario', ['ana', 'bia', 'caio', 'novo'])
+def test_por_funcionario(compacta, funcionario):
+    esperado = [item for item in AGENDA if item['funcionario'] == funcionario]
+    assert compacta.do_funcionario(funcionario) == esperado
+    assert json.loads(compacta.json_do_funcionario(funcionario)) == esperado
+
+
+def test_funcionario_desconhecido(compacta):
+    assert compacta.do_funcionario('ninguem') == []
+    assert compacta.json_do_funcionario('ninguem') == b'[]'
+
+
+@pytest.mark.parametrize('dia', ['2026-03-02', '2026-03-03', '2026-03-04'])
+def test_por_dia(compacta, dia):
+    esperado = [item for item in AGENDA if item.get('data') == dia]
+    assert compacta.do_dia(datetime.date.fromisoformat(dia)) == esperado
+
+
+def test_agenda_do_repositorio():
+    with open(DADOS, encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    compacta = AgendaCompacta(dados['agenda'], dados['funcionarios'], dados['tarefas'])
+
+    assert list(compacta) == dados['agenda']
+    assert json.loads(compacta.json_agenda) == dados['agenda']
+    for funcionario in dados['funcionarios']:
+        esperado = [item for item in dados['agenda'] if item['funcionario'] == funcionario['id']]
+        assert json.loads(compacta.json_do_funcionario(funcionario['id'])) == esperado
@@ -0,0 +1,52 @@
+"""
+POST /api/agenda/gerar: proposta de agenda e validação do corpo
+"""
+
+import pytest
+
+
+def _gerar(cliente, **corpo):
+    return cliente.post('/api/agenda/gerar', json={'inicio': '2026-03-02', 'dias': 1, 'melhorar': False, **corpo})
+
+
+def test_gera_as_atribuicoes_informadas(cliente, funcionario, tarefa):
+    resposta = _gerar(cliente, atribuicoes=[{'funcionario': funcionario, 'tarefa': tarefa, 'minutos': 60}],
+                      fixos=[])
+
+    assert resposta.status_code == 200
+    proposta = resposta.get_json()
+    meus = [item for item in proposta['agenda'] if item['funcionario'] == funcionario]
+    assert {item['tarefa'] for item in meus} == {tarefa}
+    assert all(item['data'] == '2026-03-02' for item in meus)
+    assert not [item for item in proposta['nao_alocadas'] if item.get('funcionario') == funcionario]
+
+
+def test_nao_salva_nada(cliente, funcionario, tarefa):
+    _gerar(cliente, atribuicoes=[{'funcionario': funcionario, 'tarefa': tarefa}], fixos=[])
+    agenda = cliente.get(f'/api/agenda/funcionario/{funcionario}').get_json()
+    assert agenda == []
+
+
+@pytest.mark.parametrize('corpo', [[1, 2], 'texto', 3])
+def test_corpo_que_nao_e_objeto(cliente, corpo):
+    resposta = cliente.post('/api/agenda/gerar', json=corpo)
+    assert resposta.status_code == 400
+    assert resposta.get_json()['error'] == 'O corpo deve ser um objeto JSON'
+
+
+@pytest.mark.parametrize('corpo,erro', [
+    ({'inicio': '02/03/2026'}, 'Parâmetros inválidos'),
+    ({'dias': 'cinco'}, 'Parâmetros inválidos'),
+    ({'dias': 0}, 'dias deve estar entre'),
+    ({'melhorar': 'false'}, 'melhorar deve ser true ou false'),
+    ({'fixos': [{'funcionario': 'x', 'horario': '09:00'}]}, 'Cada compromisso fixo precisa'),
+    ({'fixos': [{'funcionario': 'x', 'tarefa': 'y', 'horario': '25:00'}]}, 'horario deve estar no formato'),
+    ({'fixos': {'funcionario': 'x'}}, 'fixos deve ser uma lista de objetos'),
+    ({'atribuicoes': [{'funcionario': 'x'}]}, 'Cada atribuição precisa'),
+    ({'atribuicoes': [{'funcionario': 'x', 'tarefa': 'y', 'minutos': 0}]}, 'minutos deve ser um inteiro'),
+    ({'ausencias': [{'dataFim': '2026-03-03'}]}, 'Cada ausência precisa de dataInicio'),
+])
+def test_corpo_invalido(cliente, corpo, erro):
+    resposta = cliente.post('/api/agenda/gerar', json=corpo)
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()['error']
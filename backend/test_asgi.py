@@ -0,0 +1,124 @@
+"""
+Superfície ASGI de leitura: listagens versionadas, agenda por funcionário,
+long-poll e encaminhamento ao app WSGI
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.asgi import AppLeitura, FonteBanco, FonteEstatica, FonteLeitura
+from src.services.versoes import versoes_dados
+
+DADOS = {
+    'funcionarios': [{'id': 'ana', 'nome': 'Ana'}],
+    'tarefas': [{'id': 't1', 'nome': 'Tarefa'}],
+    'agenda': [{'id': 1, 'funcionario': 'ana', 'tarefa': 't1'}, {'id': 2, 'funcionario': 'bia', 'tarefa': 't1'}],
+}
+
+
+async def _chamar(app, caminho, metodo='GET', query=b'', cabecalhos=()):
+    """Uma requisição ASGI; devolve (status, cabeçalhos, corpo)"""
+    recebidos = []
+    corpo = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    async def receive():
+        if corpo:
+            return corpo.pop()
+        await asyncio.sleep(3600)
+
+    async def send(mensagem):
+        recebidos.append(mensagem)
+
+    await app({
+        'type': 'http', 'http_version': '1.1', 'scheme': 'http', 'method': metodo, 'path': caminho,
+        'root_path': '', 'query_string': query, 'server': ('testserver', 80),
+        'headers': [(nome.encode(), valor.encode()) for nome, valor in cabecalhos], 'client': ('127.0.0.1', 1234)
+    }, receive, send)
+    inicio = recebidos[0]
+    return (inicio['status'], {n.decode(): v.decode() for n, v in inicio['headers']},
+            b''.join(m.get('body', b'') for m in recebidos[1:]))
+
+
+def _requisitar(app, caminho, **opcoes):
+    return asyncio.run(_chamar(app, caminho, **opcoes))
+
+
+@pytest.fixture
+def leitura():
+    return AppLeitura(FonteEstatica(DADOS))
+
+
+def test_fonte_sem_os_metodos_de_leitura_nao_instancia():
+    class Incompleta(FonteLeitura):
+        def funcionarios(self):
+            return []
+
+    with pytest.raises(TypeError):
+        Incompleta()
+
+
+def test_listagem_com_etag(leitura):
+    status, cabecalhos, corpo = _requisitar(leitura, '/api/funcionarios')
+    assert status == 200
+    assert json.loads(corpo) == DADOS['funcionarios']
+
+    status, _, corpo = _requisitar(leitura, '/api/funcionarios', cabecalhos=[('if-none-match', cabecalhos['etag'])])
+    assert (status, corpo) == (304, b'')
+
+
+def test_head_sem_corpo(leitura):
+    status, _, corpo = _requisitar(leitura, '/api/tarefas', metodo='HEAD')
+    assert (status, corpo) == (200, b'')
+
+
+def test_agenda_por_funcionario(leitura):
+    assert json.loads(_requisitar(leitura, '/api/agenda/funcionario/ana')[2]) == DADOS['agenda'][:1]
+    assert json.loads(_requisitar(leitura, '/api/agenda/funcionario/ninguem')[2]) == []
+
+
+def test_rotas_fora_da_superficie_sem_app_wsgi(leitura):
+    assert _requisitar(leitura, '/api/agenda', query=b'data=2026-03-02')[0] == 404
+    assert _requisitar(leitura, '/api/agenda/funcionario/ana.ics')[0] == 404
+    assert _requisitar(leitura, '/api/funcionarios', metodo='POST')[0] == 404
+
+
+@pytest.mark.parametrize('query', [b'timeout=abc', b'timeout=-1', b'timeout=61'])
+def test_long_poll_com_timeout_invalido(leitura, query):
+    assert _requisitar(leitura, '/api/mudancas', query=query)[0] == 400
+
+
+def test_long_poll(leitura):
+    resposta = json.loads(_requisitar(leitura, '/api/mudancas', query=b'desde=antiga&timeout=0')[2])
+    assert resposta['mudou'] is True
+
+    desde = resposta['versao'].encode()
+    resposta = json.loads(_requisitar(leitura, '/api/mudancas', query=b'desde=' + desde + b'&timeout=0')[2])
+    assert resposta['mudou'] is False
+
+
+def test_fonte_banco_acompanha_escritas(app, cliente, funcionario):
+    leitura = AppLeitura(FonteBanco(app), wsgi=app)
+
+    async def cenario():
+        _, cabecalhos, corpo = await _chamar(leitura, '/api/funcionarios')
+        assert funcionario in [f['id'] for f in json.loads(corpo)]
+        desde = json.loads((await _chamar(leitura, '/api/mudancas', query=b'timeout=0'))[2])['versao']
+
+        espera = asyncio.ensure_future(_chamar(leitura, '/api/mudancas', query=f'desde={desde}&timeout=5'.encode()))
+        await asyncio.sleep(0.05)
+        await asyncio.to_thread(cliente.put, f'/api/admin/funcionarios/{funcionario}', json={'nome': 'Renomeado'})
+        assert json.loads((await espera)[2])['mudou'] is True
+
+        _, novos, corpo = await _chamar(leitura, '/api/funcionarios')
+        assert novos['etag'] != cabecalhos['etag']
+        assert {f['id']: f['nome'] for f in json.loads(corpo)}[funcionario] == 'Renomeado'
+
+        # Com query string, a listagem vai para o Flask
+        assert (await _chamar(leitura, '/api/funcionarios', query=b'x=1'))[0] == 200
+
+    try:
+        asyncio.run(cenario())
+    finally:
+        versoes_dados.parar_de_ouvir(leitura._ouvinte)
@@ -0,0 +1,54 @@
+"""
+GET /api/search: acentos, prefixos, erros de digitação, filtro por tipo e
+atualização do índice pelas rotas de escrita
+"""
+
+import pytest
+
+
+@pytest.fixture
+def tarefa_buscavel(cliente, novo_id):
+    tarefa_id = novo_id('tarefa')
+    resposta = cliente.post('/api/admin/tarefas', json={
+        'id': tarefa_id, 'nome': 'Conciliação Quinzenal Xylofônica', 'categoria': 'financeiro',
+        'tempoEstimado': 30, 'descricao': 'Conferir extratos bancários', 'prioridade': 'alta'
+    })
+    assert resposta.status_code == 201
+    return tarefa_id
+
+
+def _ids(cliente, **parametros):
+    resposta = cliente.get('/api/search', query_string=parametros)
+    assert resposta.status_code == 200
+    return [(r['tipo'], r['id']) for r in resposta.get_json()['resultados']]
+
+
+@pytest.mark.parametrize('consulta', ['xylofonica', 'XYLOFÔNICA', 'xylof', 'xilofonica', 'conciliacao xylofonica'])
+def test_encontra_a_tarefa(cliente, tarefa_buscavel, consulta):
+    assert ('tarefa', tarefa_buscavel) in _ids(cliente, q=consulta)
+
+
+def test_filtro_por_tipo(cliente, tarefa_buscavel):
+    assert _ids(cliente, q='xylofonica', tipos='funcionario') == []
+    assert ('tarefa', tarefa_buscavel) in _ids(cliente, q='xylofonica', tipos='funcionario,tarefa')
+
+
+def test_indice_acompanha_edicao_e_remocao(cliente, tarefa_buscavel):
+    assert cliente.put(f'/api/admin/tarefas/{tarefa_buscavel}', json={'nome': 'Fechamento Trimestral Wumpus'}).status_code == 200
+    assert ('tarefa', tarefa_buscavel) not in _ids(cliente, q='xylofonica conciliacao')
+    assert ('tarefa', tarefa_buscavel) in _ids(cliente, q='wumpus')
+
+    assert cliente.delete(f'/api/admin/tarefas/{tarefa_buscavel}').status_code == 200
+    assert ('tarefa', tarefa_buscavel) not in _ids(cliente, q='wumpus')
+
+
+def test_limite(cliente, tarefa_buscavel):
+    resposta = cliente.get('/api/search', query_string={'q': 'a', 'limite': 1})
+    assert resposta.get_json()['total'] <= 1
+
+
+@pytest.mark.parametrize('consulta', ['', '   '])
+def test_consulta_vazia(cliente, consulta):
+    resposta = cliente.get('/api/search', query_string={'q': consulta})
+    assert resposta.status_code == 400
+    assert resposta.get_json()['error'] == 'Parâmetro q é obrigatório'
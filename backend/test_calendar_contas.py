@@ -0,0 +1,107 @@
+"""
+Rotas de conta do Google por usuário: token do próprio usuário ou do admin
+(CALENDAR_AUTH_SECRET) e erros do OAuth
+"""
+
+import pytest
+
+from src.routes.calendar import token_do_usuario
+from src.services.google_calendar import CalendarServicePool, GoogleCalendarService, OAuthStateStore
+
+SEGREDO = 'segredo-de-teste'
+
+
+@pytest.fixture
+def segredo(monkeypatch):
+    monkeypatch.setenv('CALENDAR_AUTH_SECRET', SEGREDO)
+
+
+def _bearer(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_sem_segredo_as_rotas_ficam_fechadas(cliente, monkeypatch):
+    monkeypatch.delenv('CALENDAR_AUTH_SECRET', raising=False)
+    assert cliente.get('/api/calendar/contas/ana').status_code == 503
+
+
+def test_sem_token(cliente, segredo):
+    assert cliente.get('/api/calendar/contas/ana').status_code == 401
+
+
+@pytest.mark.parametrize('metodo,caminho', [
+    ('get', '/api/calendar/contas/bia'),
+    ('post', '/api/calendar/contas/bia/conectar'),
+    ('get', '/api/calendar/contas/bia/calendarios'),
+    ('delete', '/api/calendar/contas/bia'),
+    ('get', '/api/calendar/eventos/primary?usuario=bia'),
+])
+def test_usuario_nao_acessa_conta_de_outro(cliente, segredo, metodo, caminho):
+    resposta = getattr(cliente, metodo)(caminho, headers=_bearer(token_do_usuario('ana')))
+    assert resposta.status_code == 403
+
+
+def test_usuario_acessa_a_propria_conta(cliente, segredo):
+    resposta = cliente.get('/api/calendar/contas/ana', headers=_bearer(token_do_usuario('ana')))
+    assert resposta.status_code == 200
+    assert resposta.get_json() == {'usuario': 'ana', 'conectado': False}
+
+
+def test_admin_acessa_qualquer_conta(cliente, segredo):
+    assert cliente.get('/api/calendar/contas/bia', headers=_bearer(SEGREDO)).status_code == 200
+
+
+def test_calendarios_de_conta_nao_conectada(cliente, segredo):
+    resposta = cliente.get('/api/calendar/contas/ana/calendarios', headers=_bearer(token_do_usuario('ana')))
+    assert resposta.status_code == 409
+
+
+def test_token_do_usuario_so_para_o_admin(cliente, segredo):
+    assert cliente.get('/api/calendar/contas/ana/token',
+                       headers=_bearer(token_do_usuario('ana'))).status_code == 403
+    resposta = cliente.get('/api/calendar/contas/ana/token', headers=_bearer(SEGREDO))
+    assert resposta.get_json()['token'] == token_do_usuario('ana')
+
+
+def test_callback_sem_parametros(cliente):
+    assert cliente.get('/api/calendar/oauth/callback').status_code == 400
+
+
+def test_callback_com_estado_desconhecido(cliente):
+    resposta = cliente.get('/api/calendar/oauth/callback?code=abc&state=desconhecido')
+    assert resposta.status_code == 400
+    assert resposta.get_json()['error'] == 'Autorização inválida ou expirada'
+
+
+def test_estado_oauth_vale_uma_vez():
+    store = OAuthStateStore()
+    store.put('estado', 'ana', object())
+
+    assert store.owner('estado') == 'ana'
+    assert store.pop('estado')[0] == 'ana'
+    assert store.pop('estado') is None
+
+
+def test_estado_oauth_expirado():
+    store = OAuthStateStore(ttl_seconds=0)
+    store.put('estado', 'ana', object())
+
+    assert store.owner('estado') is None
+    assert store.pop('estado') is None
+
+
+def test_pool_descarta_o_menos_usado():
+    pool = CalendarServicePool(max_size=2)
+    ana = pool.get('ana')
+    pool.get('bia')
+    pool.get('ana')
+    pool.get('caio')
+
+    assert len(pool) == 2
+    assert pool.get('ana') is ana
+
+
+def test_pasta_do_usuario_nao_escapa_do_diretorio_de_contas():
+    assert GoogleCalendarService._safe_user_dir('ana.silva') == 'ana.silva'
+    assert '/' not in GoogleCalendarService._safe_user_dir('../../etc')
+    assert GoogleCalendarService._safe_user_dir('..') != '..'
@@ -0,0 +1,78 @@
+"""
+Notificações push do Google Calendar: validação das rotas de canais,
+agrupamento de rajadas e renovação com espera crescente
+"""
+
+import threading
+
+import pytest
+
+from benchmarks.fake_google_calendar import FakeCalendarServer
+from src.services.calendar_push import ChannelRegistry, NotificationDebouncer
+from src.services.google_calendar import GoogleCalendarService
+
+
+@pytest.fixture
+def registro(tmp_path):
+    with FakeCalendarServer() as server:
+        service = GoogleCalendarService()
+        service.mapping_file = str(tmp_path / 'event_mappings.json')
+        service.service = server.build_service()
+        registry = ChannelRegistry(service, str(tmp_path / 'canais' / 'watch_channels.json'),
+                                   retry_base=60, retry_max=150)
+        yield registry
+        registry.shutdown()
+
+
+def test_notificacao_de_canal_desconhecido(cliente):
+    resposta = cliente.post('/api/calendar/notificacoes', headers={
+        'X-Goog-Channel-ID': 'nao-existe', 'X-Goog-Channel-Token': 'x', 'X-Goog-Resource-State': 'exists'
+    })
+    assert resposta.status_code == 404
+
+
+def test_canal_sem_endereco(cliente, monkeypatch):
+    monkeypatch.setattr('src.routes.calendar.WEBHOOK_URL', '')
+    resposta = cliente.post('/api/calendar/canais', json={'calendar_id': 'primary'})
+    assert resposta.status_code == 400
+    assert 'address' in resposta.get_json()['error']
+
+
+def test_encerrar_canal_desconhecido(cliente):
+    assert cliente.delete('/api/calendar/canais/nao-existe').status_code == 404
+
+
+def test_rajada_vira_uma_execucao():
+    chamadas = []
+    terminou = threading.Event()
+
+    def buscar(chave):
+        chamadas.append(chave)
+        terminou.set()
+
+    debouncer = NotificationDebouncer(buscar, delay=0.05)
+    for _ in range(10):
+        debouncer.notify('primary')
+
+    assert terminou.wait(2)
+    assert chamadas == ['primary']
+
+
+def test_canal_salvo_no_arquivo_configurado(registro, tmp_path):
+    canal = registro.watch('primary', 'https://exemplo.com/api/calendar/notificacoes')
+
+    recarregado = ChannelRegistry(registro.service, str(tmp_path / 'canais' / 'watch_channels.json'))
+    assert recarregado.get(canal['id'])['token'] == canal['token']
+
+
+def test_renovacao_que_falha_tenta_de_novo_com_espera_crescente(registro):
+    canal = registro.watch('primary', 'https://exemplo.com/api/calendar/notificacoes')
+    registro.service.service = None  # o Google deixa de aceitar o watch
+
+    esperas = []
+    for _ in range(4):
+        assert registro.renew(canal['id']) is None
+        esperas.append(registro._timers[canal['id']].interval)
+
+    assert esperas == [60, 120, 150, 150]
+    assert registro.get(canal['id']) is not None
@@ -0,0 +1,22 @@
+"""
+Orçamento de cold start como teste: roda benchmarks/bench_cold_start.py e
+falha se ele sair com código diferente de zero
+
+Em máquinas lentas, COLD_START_ESCALA multiplica os orçamentos de tempo
+(ex.: COLD_START_ESCALA=2 python -m pytest test_cold_start.py).
+"""
+
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_cold_start_dentro_do_orcamento():
+    processo = subprocess.run(
+        [sys.executable, os.path.join(BACKEND, 'benchmarks', 'bench_cold_start.py'),
+         '--escala', os.getenv('COLD_START_ESCALA', '1')],
+        cwd=BACKEND, capture_output=True, text=True
+    )
+    assert processo.returncode == 0, processo.stdout + processo.stderr
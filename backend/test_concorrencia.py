@@ -0,0 +1,78 @@
+"""
+Controle de concorrência otimista nas rotas de admin: ETag, If-Match,
+If-None-Match e conflitos na remoção em cascata
+"""
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from src.database import db
+
+
+def _etag(cliente, caminho):
+    resposta = cliente.get(caminho)
+    assert resposta.status_code == 200
+    return resposta.headers['ETag']
+
+
+def test_if_match_atual_grava(cliente, funcionario):
+    etag = _etag(cliente, f'/api/admin/funcionarios/{funcionario}')
+    resposta = cliente.put(f'/api/admin/funcionarios/{funcionario}', json={'nome': 'Novo'}, headers={'If-Match': etag})
+    assert resposta.status_code == 200
+    assert resposta.headers['ETag'] != etag
+
+
+def test_if_match_antigo_responde_412_com_a_versao_atual(cliente, tarefa):
+    etag = _etag(cliente, f'/api/admin/tarefas/{tarefa}')
+    cliente.put(f'/api/admin/tarefas/{tarefa}', json={'nome': 'Primeira edição'})
+
+    resposta = cliente.put(f'/api/admin/tarefas/{tarefa}', json={'nome': 'Segunda'}, headers={'If-Match': etag})
+
+    assert resposta.status_code == 412
+    assert resposta.get_json()['atual']['nome'] == 'Primeira edição'
+    assert resposta.headers['ETag'] == _etag(cliente, f'/api/admin/tarefas/{tarefa}')
+
+
+def test_remocao_com_if_match_antigo(cliente, funcionario):
+    etag = _etag(cliente, f'/api/admin/funcionarios/{funcionario}')
+    cliente.put(f'/api/admin/funcionarios/{funcionario}', json={'cor': '#000000'})
+    assert cliente.delete(f'/api/admin/funcionarios/{funcionario}', headers={'If-Match': etag}).status_code == 412
+
+
+def test_criacao_condicional_de_processo(cliente, tarefa):
+    caminho = f'/api/admin/processos/{tarefa}'
+    assert cliente.put(caminho, json={'titulo': 'x'}, headers={'If-Match': '"1"'}).status_code == 412
+    assert cliente.put(caminho, json={'titulo': 'x'}, headers={'If-None-Match': '*'}).status_code == 200
+    assert cliente.put(caminho, json={'titulo': 'y'}, headers={'If-None-Match': '*'}).status_code == 412
+
+
+@pytest.fixture
+def edicao_concorrente_da_agenda(app):
+    """Antes do próximo flush, outra conexão altera a agenda do funcionário informado"""
+    alvo = {}
+
+    def alterar(session, contexto, instancias):
+        funcionario_id = alvo.pop('funcionario', None)
+        if funcionario_id:
+            with db.engine.begin() as conexao:
+                conexao.execute(text('UPDATE agenda SET versao = versao + 1 WHERE funcionario_id = :f'),
+                                {'f': funcionario_id})
+
+    event.listen(Session, 'before_flush', alterar)
+    yield alvo
+    event.remove(Session, 'before_flush', alterar)
+
+
+def test_conflito_num_agendamento_da_cascata(cliente, funcionario, agendamento, edicao_concorrente_da_agenda):
+    agenda_id = agendamento()
+    etag = _etag(cliente, f'/api/admin/funcionarios/{funcionario}')
+    edicao_concorrente_da_agenda['funcionario'] = funcionario
+
+    resposta = cliente.delete(f'/api/admin/funcionarios/{funcionario}', headers={'If-Match': etag})
+
+    # O funcionário não mudou: o conflito é do agendamento, e o mesmo If-Match continua valendo
+    assert resposta.status_code == 409
+    assert resposta.get_json()['conflito']['id'] == agenda_id
+    assert 'ETag' not in resposta.headers
+    assert cliente.delete(f'/api/admin/funcionarios/{funcionario}', headers={'If-Match': etag}).status_code == 200
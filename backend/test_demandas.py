@@ -0,0 +1,154 @@
+"""
+Demandas e tarefas a fazer: filtros, paginação por cursor, contagens,
+atualizações em lote e validação dos corpos
+"""
+
+import pytest
+
+
+@pytest.fixture
+def demandas(cliente, funcionario):
+    """Quatro demandas do funcionário, com prazos e importâncias diferentes; retorna os ids"""
+    ids = []
+    for dia, importancia, status in (('01', 'baixa', 'pendente'), ('02', 'alta', 'pendente'),
+                                     ('03', 'media', 'em_andamento'), ('04', 'alta', 'concluida')):
+        resposta = cliente.post('/api/demandas', json={
+            'titulo': f'Demanda {dia}', 'descricao': 'Teste', 'funcionario_id': funcionario,
+            'prazo': f'2026-03-{dia}', 'importancia': importancia, 'status': status
+        })
+        assert resposta.status_code == 201, resposta.get_json()
+        ids.append(resposta.get_json()['id'])
+    return ids
+
+
+def _listar(cliente, caminho, **parametros):
+    resposta = cliente.get(caminho, query_string=parametros)
+    assert resposta.status_code == 200
+    return resposta.get_json()
+
+
+def test_paginacao_por_cursor(cliente, funcionario, demandas):
+    primeira = _listar(cliente, '/api/demandas', funcionario=funcionario, limite=3)
+    segunda = _listar(cliente, '/api/demandas', funcionario=funcionario, limite=3, cursor=primeira['proximo_cursor'])
+
+    assert [d['id'] for d in primeira['itens'] + segunda['itens']] == demandas
+    assert segunda['proximo_cursor'] is None
+
+
+def test_ordem_por_importancia(cliente, funcionario, demandas):
+    itens = _listar(cliente, '/api/demandas', funcionario=funcionario, ordem='importancia')['itens']
+    assert [d['importancia'] for d in itens] == ['alta', 'alta', 'media', 'baixa']
+
+
+def test_filtros(cliente, funcionario, demandas):
+    assert len(_listar(cliente, '/api/demandas', funcionario=funcionario, status='pendente,concluida')['itens']) == 3
+    assert len(_listar(cliente, '/api/demandas', funcionario=funcionario, prazo_de='2026-03-02',
+                       prazo_ate='2026-03-03')['itens']) == 2
+
+
+def test_contagens(cliente, funcionario, demandas):
+    contagens = _listar(cliente, '/api/demandas/contagens', funcionario=funcionario, agrupar='importancia')
+    assert contagens['total'] == 4
+    assert contagens['atrasadas'] == 3
+    assert sorted((g['importancia'], g['total']) for g in contagens['grupos']) == [('alta', 2), ('baixa', 1), ('media', 1)]
+
+
+def test_status_em_lote(cliente, funcionario, demandas):
+    resposta = cliente.post('/api/demandas/status', json={'ids': demandas[:2], 'status': 'concluida'})
+    assert resposta.get_json() == {'atualizadas': 2}
+    assert _listar(cliente, '/api/demandas/contagens', funcionario=funcionario)['atrasadas'] == 1
+
+
+def test_editar_e_remover_demanda(cliente, demandas):
+    resposta = cliente.patch(f'/api/demandas/{demandas[0]}', json={'importancia': 'alta'})
+    assert resposta.status_code == 200
+    assert resposta.get_json()['importancia'] == 'alta'
+
+    assert cliente.delete(f'/api/demandas/{demandas[0]}').status_code == 200
+    assert cliente.get(f'/api/demandas/{demandas[0]}').status_code == 404
+
+
+@pytest.mark.parametrize('corpo,erro', [
+    ({'descricao': 'x', 'prazo': '2026-03-01'}, 'Campo obrigatório: titulo'),
+    ({'titulo': 'x', 'descricao': 'x', 'prazo': '01/03/2026'}, 'prazo deve estar no formato'),
+    ({'titulo': 'x', 'descricao': 'x', 'prazo': '2026-03-01', 'importancia': 'urgente'}, 'importancia deve ser'),
+    ({'titulo': 'x', 'descricao': 'x', 'prazo': '2026-03-01', 'status': 'parada'}, 'status deve ser'),
+    ({'titulo': 'x', 'descricao': 'x', 'prazo': '2026-03-01', 'tarefa_id': 'nao-existe'}, 'Tarefa não encontrada'),
+    ({'titulo': ['x'], 'descricao': 'x', 'prazo': '2026-03-01'}, 'titulo não pode ser objeto nem lista'),
+])
+def test_demanda_invalida(cliente, funcionario, corpo, erro):
+    resposta = cliente.post('/api/demandas', json={'funcionario_id': funcionario, **corpo})
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()['error']
+
+
+def test_demanda_de_funcionario_inexistente(cliente):
+    resposta = cliente.post('/api/demandas', json={
+        'titulo': 'x', 'descricao': 'x', 'prazo': '2026-03-01', 'funcionario_id': 'nao-existe'
+    })
+    assert resposta.get_json()['error'] == 'Funcionário não encontrado'
+
+
+@pytest.mark.parametrize('corpo', [{'ids': [], 'status': 'concluida'}, {'ids': ['1'], 'status': 'concluida'},
+                                   {'ids': [1], 'status': 'parada'}])
+def test_status_em_lote_invalido(cliente, corpo):
+    assert cliente.post('/api/demandas/status', json=corpo).status_code == 400
+
+
+@pytest.mark.parametrize('caminho', ['/api/demandas', '/api/demandas/status', '/api/tarefas-a-fazer',
+                                     '/api/tarefas-a-fazer/concluir'])
+def test_corpo_que_nao_e_objeto(cliente, caminho):
+    resposta = cliente.post(caminho, json=[1])
+    assert resposta.status_code == 400
+    assert resposta.get_json()['error'] == 'O corpo deve ser um objeto JSON'
+
+
+@pytest.mark.parametrize('parametros,erro', [
+    ({'ordem': 'titulo'}, 'ordem deve ser'),
+    ({'cursor': 'lixo'}, ''),
+])
+def test_listagem_invalida(cliente, parametros, erro):
+    resposta = cliente.get('/api/demandas', query_string=parametros)
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()['error']
+
+
+def test_contagens_com_agrupamento_invalido(cliente):
+    assert cliente.get('/api/demandas/contagens?agrupar=titulo').status_code == 400
+    assert cliente.get('/api/tarefas-a-fazer/contagens?agrupar=status').status_code == 400
+
+
+def test_tarefas_a_fazer(cliente, funcionario):
+    ids = []
+    for dia in ('01', '02'):
+        resposta = cliente.post('/api/tarefas-a-fazer', json={
+            'titulo': f'Ligar {dia}', 'descricao': 'Teste', 'funcionario_responsavel_id': funcionario,
+            'prazo': f'2026-03-{dia}'
+        })
+        assert resposta.status_code == 201
+        ids.append(resposta.get_json()['id'])
+
+    assert cliente.post('/api/tarefas-a-fazer/concluir', json={'ids': ids[:1]}).get_json() == {'atualizadas': 1}
+    pendentes = _listar(cliente, '/api/tarefas-a-fazer', funcionario=funcionario, concluida='false')['itens']
+    assert [t['id'] for t in pendentes] == ids[1:]
+
+    resposta = cliente.patch(f'/api/tarefas-a-fazer/{ids[1]}', json={'concluida': True})
+    assert resposta.get_json()['concluida'] is True
+    assert _listar(cliente, '/api/tarefas-a-fazer/contagens', funcionario=funcionario)['atrasadas'] == 0
+
+
+@pytest.mark.parametrize('corpo,erro', [
+    ({'concluida': 'sim'}, 'concluida deve ser true ou false'),
+    ({'funcionario_responsavel_id': {}}, 'funcionario_responsavel_id não pode ser objeto nem lista'),
+])
+def test_tarefa_a_fazer_invalida(cliente, funcionario, corpo, erro):
+    resposta = cliente.post('/api/tarefas-a-fazer', json={
+        'titulo': 'x', 'descricao': 'x', 'funcionario_responsavel_id': funcionario, 'prazo': '2026-03-01', **corpo
+    })
+    assert resposta.status_code == 400
+    assert resposta.get_json()['error'] == erro
+
+
+def test_concluir_em_lote_invalido(cliente):
+    assert cliente.post('/api/tarefas-a-fazer/concluir', json={'ids': [1], 'concluida': 'sim'}).status_code == 400
+    assert cliente.post('/api/tarefas-a-fazer/concluir', json={'ids': 1}).status_code == 400
@@ -0,0 +1,70 @@
+"""
+GET /api/disponibilidade: janelas livres, quem está livre num horário e
+validação dos parâmetros
+"""
+
+import pytest
+
+SEGUNDA = '2026-03-02'
+
+
+def _consultar(cliente, **parametros):
+    return cliente.get('/api/disponibilidade', query_string={'inicio': SEGUNDA, 'fim': SEGUNDA, **parametros})
+
+
+def test_janelas_em_volta_de_um_agendamento(cliente, funcionario, agendamento):
+    agendamento(horario='10:00', data=SEGUNDA, duracao=60)
+
+    resposta = _consultar(cliente, funcionarios=funcionario, duracao=60)
+
+    # O horário de fim é o início do último slot: expediente até 17:30
+    assert resposta.status_code == 200
+    janelas = [(j['inicio'], j['fim']) for j in resposta.get_json()['janelas']]
+    assert janelas == [('08:00', '10:00'), ('11:00', '17:30')]
+
+
+def test_de_e_ate_limitam_o_trecho_do_dia(cliente, funcionario):
+    resposta = _consultar(cliente, funcionarios=funcionario, de='13:00', ate='15:00')
+    assert [(j['inicio'], j['fim']) for j in resposta.get_json()['janelas']] == [('13:00', '15:00')]
+
+
+def test_quem_esta_livre_no_horario(cliente, funcionario, agendamento):
+    agendamento(horario='10:00', data=SEGUNDA, duracao=60)
+
+    ocupado = _consultar(cliente, funcionarios=funcionario, horario='10:30').get_json()
+    livre = _consultar(cliente, funcionarios=funcionario, horario='11:00').get_json()
+
+    assert ocupado['livres'] == {SEGUNDA: []}
+    assert livre['livres'] == {SEGUNDA: [funcionario]}
+
+
+def test_fim_de_semana_nao_tem_janelas(cliente, funcionario):
+    resposta = cliente.get('/api/disponibilidade', query_string={
+        'funcionarios': funcionario, 'inicio': '2026-03-07', 'fim': '2026-03-08'
+    })
+    assert resposta.get_json()['janelas'] == []
+
+
+def test_funcionario_desconhecido(cliente):
+    resposta = _consultar(cliente, funcionarios='nao-existe')
+    assert resposta.status_code == 404
+
+
+@pytest.mark.parametrize('parametros,erro', [
+    ({'inicio': '2026-13-01'}, 'inicio'),
+    ({'fim': '2026-03-01'}, 'Intervalo de datas inválido'),
+    ({'fim': '2027-04-01'}, 'Intervalo de datas inválido'),
+    ({'duracao': 'abc'}, 'duracao deve ser'),
+    ({'duracao': '0'}, 'duracao deve ser'),
+    ({'duracao': '1441'}, 'duracao deve ser'),
+    ({'modo': 'algum'}, 'modo deve ser'),
+    ({'horario': '-5:00'}, 'horario deve estar no formato'),
+    ({'horario': '99:99'}, 'horario deve estar no formato'),
+    ({'de': '25:00'}, 'de deve estar no formato'),
+    ({'ate': '10:75'}, 'ate deve estar no formato'),
+    ({'de': '15:00', 'ate': '14:00'}, 'ate deve ser depois de de'),
+])
+def test_parametros_invalidos(cliente, parametros, erro):
+    resposta = _consultar(cliente, **parametros)
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()['error']
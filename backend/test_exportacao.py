@@ -0,0 +1,128 @@
+"""
+Exportação do cronograma: CSV e relatório JSON, exportações em segundo
+plano (status, download, expiração) e validação dos parâmetros
+"""
+
+import os
+import time
+
+import pytest
+
+from src.services.exportacao import TarefasExportacao
+
+SEGUNDA = '2026-03-02'
+
+
+@pytest.fixture
+def agenda_exportavel(funcionario, agendamento):
+    agendamento(data=SEGUNDA, duracao=120)
+    return funcionario
+
+
+def _aguardar(cliente, status_url):
+    for _ in range(200):
+        tarefa = cliente.get(status_url).get_json()
+        if tarefa['status'] in ('concluida', 'erro'):
+            return tarefa
+        time.sleep(0.01)
+    raise AssertionError(f'Exportação não terminou: {tarefa}')
+
+
+def test_csv(cliente, agenda_exportavel):
+    resposta = cliente.get('/api/export', query_string={'inicio': SEGUNDA, 'fim': SEGUNDA,
+                                                       'funcionarios': agenda_exportavel})
+
+    assert resposta.status_code == 200
+    assert resposta.headers['Content-Type'] == 'text/csv; charset=utf-8'
+    assert 'cronograma_2026-03-02_2026-03-02.csv' in resposta.headers['Content-Disposition']
+    cabecalho, linha = resposta.get_data(as_text=True).lstrip('﻿').splitlines()
+    assert cabecalho.startswith('Data,Início,Fim,Duração (min)')
+    assert linha.startswith(f'2026-03-02,09:00,11:00,120,{agenda_exportavel},')
+
+
+def test_relatorio_json(cliente, agenda_exportavel):
+    relatorio = cliente.get('/api/export', query_string={
+        'formato': 'json', 'inicio': SEGUNDA, 'fim': SEGUNDA, 'funcionarios': agenda_exportavel
+    }).get_json()
+
+    assert relatorio['totais'] == {'agendamentos': 1, 'horas': 2.0, 'horas_computadas': 2.0}
+    assert relatorio['por_dia_semana'][0] == {'agendamentos': 1, 'dia': 'segunda', 'horas': 2.0}
+
+
+def test_filtro_por_categoria(cliente, agenda_exportavel):
+    relatorio = cliente.get('/api/export', query_string={
+        'formato': 'json', 'inicio': SEGUNDA, 'fim': SEGUNDA, 'funcionarios': agenda_exportavel,
+        'categorias': 'outra'
+    }).get_json()
+    assert relatorio['totais']['agendamentos'] == 0
+
+
+def test_xlsx_longo_vai_para_segundo_plano(cliente):
+    resposta = cliente.get('/api/export', query_string={'formato': 'xlsx', 'inicio': '2026-01-01', 'fim': '2026-06-30'})
+    assert resposta.status_code == 413
+    assert resposta.get_json()['tarefas'] == '/api/export/tarefas'
+
+
+def test_exportacao_em_segundo_plano(cliente, agenda_exportavel):
+    resposta = cliente.post('/api/export/tarefas', json={
+        'formato': 'json', 'inicio': SEGUNDA, 'fim': SEGUNDA, 'funcionarios': [agenda_exportavel]
+    })
+
+    assert resposta.status_code == 202
+    status_url = resposta.get_json()['status_url']
+    assert resposta.headers['Location'] == status_url
+    tarefa = _aguardar(cliente, status_url)
+    assert (tarefa['status'], tarefa['linhas']) == ('concluida', 1)
+    assert 'caminho' not in tarefa
+
+    arquivo = cliente.get(tarefa['download'])
+    assert arquivo.status_code == 200
+    assert arquivo.get_json()['totais']['agendamentos'] == 1
+
+
+@pytest.mark.parametrize('parametros,erro', [
+    ({'formato': 'pdf'}, 'formato deve ser um de: csv, xlsx, json'),
+    ({'inicio': '02/03/2026'}, 'inicio'),
+    ({'inicio': '2026-03-05', 'fim': SEGUNDA}, 'fim não pode ser antes de inicio'),
+    ({'inicio': '2000-01-01', 'fim': SEGUNDA}, 'Intervalo de datas longo demais'),
+])
+def test_parametros_invalidos(cliente, parametros, erro):
+    resposta = cliente.get('/api/export', query_string=parametros)
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()['error']
+
+
+@pytest.mark.parametrize('corpo,erro', [
+    ([1], 'O corpo deve ser um objeto JSON'),
+    ({'funcionarios': [1]}, 'funcionarios e categorias devem ser textos separados por vírgula'),
+    ({'categorias': {'a': 1}}, 'funcionarios e categorias devem ser textos separados por vírgula'),
+    ({'formato': ['csv']}, 'formato deve ser um de'),
+])
+def test_tarefa_com_corpo_invalido(cliente, corpo, erro):
+    resposta = cliente.post('/api/export/tarefas', json=corpo)
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()['error']
+
+
+def test_tarefa_inexistente(cliente):
+    assert cliente.get('/api/export/tarefas/nao-existe').status_code == 404
+    assert cliente.get('/api/export/tarefas/nao-existe/arquivo').status_code == 404
+
+
+def test_arquivo_expira(tmp_path):
+    tarefas = TarefasExportacao(pasta=str(tmp_path), validade=0)
+
+    def executar(destino):
+        with open(destino, 'w') as arquivo:
+            arquivo.write('{}')
+        return 0
+
+    tarefa_id = tarefas.criar('json', executar, 'relatorio.json')['id']
+    for _ in range(200):
+        if tarefas._tarefas.get(tarefa_id, {}).get('concluida_em'):
+            break
+        time.sleep(0.01)
+    time.sleep(0.01)
+
+    assert tarefas.obter(tarefa_id) is None
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,80 @@
+"""
+sync_workspace_to_google contra o servidor falso (benchmarks/fake_google_calendar.py):
+só chama a API quando o conteúdo muda e recria eventos apagados no Google
+"""
+
+import datetime
+import json
+
+import pytest
+
+from benchmarks.bench_calendar_sync import generate_workspace_events
+from benchmarks.fake_google_calendar import FakeCalendarServer
+from src.services.google_calendar import GoogleCalendarService
+
+
+@pytest.fixture
+def servidor():
+    with FakeCalendarServer() as server:
+        yield server
+
+
+@pytest.fixture
+def calendario(servidor, tmp_path):
+    service = GoogleCalendarService()
+    service.mapping_file = str(tmp_path / 'event_mappings.json')
+    service.service = servidor.build_service()
+    return service
+
+
+@pytest.fixture
+def eventos():
+    inicio = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0) + datetime.timedelta(hours=1)
+    return generate_workspace_events(3, inicio)
+
+
+def _contagem(relatorio):
+    return {chave: relatorio[chave] for chave in ('created', 'updated', 'skipped', 'errors')}
+
+
+def _google_id(calendario, workspace_id):
+    with open(calendario.mapping_file) as arquivo:
+        return json.load(arquivo)[workspace_id]['google_event_id']
+
+
+def test_sem_mudancas_nao_chama_a_api(calendario, servidor, eventos):
+    assert _contagem(calendario.sync_workspace_to_google(eventos, 'primary')) == \
+        {'created': 3, 'updated': 0, 'skipped': 0, 'errors': 0}
+    servidor.reset_stats()
+
+    relatorio = calendario.sync_workspace_to_google(eventos, 'primary')
+
+    assert _contagem(relatorio) == {'created': 0, 'updated': 0, 'skipped': 3, 'errors': 0}
+    assert sum(servidor.stats().values()) == 0
+
+
+def test_mudanca_envia_so_o_evento_alterado(calendario, eventos):
+    calendario.sync_workspace_to_google(eventos, 'primary')
+    eventos[1]['categoria'] = 'outra'
+
+    relatorio = calendario.sync_workspace_to_google(eventos, 'primary')
+
+    assert _contagem(relatorio) == {'created': 0, 'updated': 1, 'skipped': 2, 'errors': 0}
+
+
+def test_evento_apagado_no_google_e_recriado(calendario, servidor, eventos):
+    calendario.sync_workspace_to_google(eventos, 'primary')
+    antigo = _google_id(calendario, 'bench-0')
+    servidor.store.delete('primary', antigo)
+    eventos[0]['categoria'] = 'outra'
+
+    relatorio = calendario.sync_workspace_to_google(eventos, 'primary')
+
+    assert _contagem(relatorio) == {'created': 1, 'updated': 0, 'skipped': 2, 'errors': 0}
+    assert 'Recriado: Agendamento 0' in relatorio['details']
+    assert _google_id(calendario, 'bench-0') != antigo
+
+    # O mapeamento novo vale: a próxima mudança é um patch, sem erro
+    eventos[0]['categoria'] = 'mais uma'
+    assert _contagem(calendario.sync_workspace_to_google(eventos, 'primary')) == \
+        {'created': 0, 'updated': 1, 'skipped': 2, 'errors': 0}
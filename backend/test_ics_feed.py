@@ -0,0 +1,68 @@
+"""
+Feeds ICS da agenda: conteúdo, 404 de funcionário inexistente e validação
+condicional (ETag / Last-Modified)
+"""
+
+
+def _feed(cliente, funcionario, **headers):
+    return cliente.get(f'/api/agenda/funcionario/{funcionario}.ics', headers=headers)
+
+
+def test_feed_de_funcionario_inexistente(cliente):
+    assert cliente.get('/api/agenda/funcionario/nao-existe.ics').status_code == 404
+
+
+def test_feed_do_funcionario(cliente, funcionario, tarefa, agendamento):
+    agendamento(horario='09:00', recorrencia='FREQ=WEEKLY;BYDAY=MO,WE')
+    agendamento(horario='14:30', data='2026-03-10', duracao=60)
+
+    resposta = _feed(cliente, funcionario)
+
+    assert resposta.status_code == 200
+    assert resposta.mimetype == 'text/calendar'
+    texto = resposta.get_data(as_text=True)
+    assert texto.startswith('BEGIN:VCALENDAR')
+    assert texto.count('BEGIN:VEVENT') == 2
+    assert 'RRULE:FREQ=WEEKLY;BYDAY=MO,WE' in texto
+    assert 'T143000' in texto and 'T153000' in texto
+    assert f'Tarefa {tarefa}' in texto
+
+
+def test_if_none_match_responde_304(cliente, funcionario, agendamento):
+    agendamento()
+    etag = _feed(cliente, funcionario).headers['ETag']
+
+    resposta = _feed(cliente, funcionario, **{'If-None-Match': etag})
+
+    assert resposta.status_code == 304
+    assert resposta.get_data() == b''
+
+
+def test_edicao_muda_o_etag(cliente, funcionario, agendamento):
+    agenda_id = agendamento()
+    etag = _feed(cliente, funcionario).headers['ETag']
+
+    assert cliente.put(f'/api/admin/agenda/{agenda_id}', json={'horario': '10:00'}).status_code == 200
+
+    resposta = _feed(cliente, funcionario, **{'If-None-Match': etag})
+    assert resposta.status_code == 200
+    assert resposta.headers['ETag'] != etag
+
+
+def test_remocao_muda_o_etag(cliente, funcionario, agendamento):
+    agendamento()
+    agenda_id = agendamento(horario='11:00')
+    etag = _feed(cliente, funcionario).headers['ETag']
+
+    assert cliente.delete(f'/api/admin/agenda/{agenda_id}').status_code == 200
+
+    resposta = _feed(cliente, funcionario, **{'If-None-Match': etag})
+    assert resposta.status_code == 200
+    assert resposta.get_data(as_text=True).count('BEGIN:VEVENT') == 1
+
+
+def test_feed_da_equipe(cliente, funcionario, agendamento):
+    agendamento()
+    resposta = cliente.get('/api/agenda.ics')
+    assert resposta.status_code == 200
+    assert f'X-WORKSPACE-FUNCIONARIO:Funcionário {funcionario}' in resposta.get_data(as_text=True)
@@ -0,0 +1,69 @@
+"""
+GET /api/kpis: indicadores de um funcionário, parâmetros de sobrecarga e
+lacunas, e validação da query string
+"""
+
+import pytest
+
+SEGUNDA, SEXTA = '2026-03-02', '2026-03-06'
+
+
+@pytest.fixture
+def agenda_de_duas_horas(funcionario, agendamento):
+    agendamento(data=SEGUNDA, duracao=120)
+    return funcionario
+
+
+def _kpis(cliente, funcionario, **parametros):
+    resposta = cliente.get('/api/kpis', query_string={
+        'inicio': SEGUNDA, 'fim': SEXTA, 'funcionarios': funcionario, **parametros
+    })
+    assert resposta.status_code == 200
+    return resposta.get_json()
+
+
+def test_indicadores_do_funcionario(cliente, agenda_de_duas_horas):
+    kpis = _kpis(cliente, agenda_de_duas_horas)
+
+    [indicadores] = kpis['funcionarios']
+    assert indicadores['id'] == agenda_de_duas_horas
+    assert (indicadores['agendamentos'], indicadores['horas']) == (1, 2.0)
+    assert indicadores['dias_sobrecarga'] == 0
+    assert kpis['categorias'] == [{'agendamentos': 1, 'categoria': 'teste', 'horas': 2.0, 'percentual': 100.0}]
+
+
+def test_limite_de_sobrecarga(cliente, agenda_de_duas_horas):
+    [indicadores] = _kpis(cliente, agenda_de_duas_horas, limite_sobrecarga=0.1)['funcionarios']
+    assert indicadores['dias_sobrecarga'] == 1
+
+
+def test_lacuna_minima(cliente, agenda_de_duas_horas):
+    lacunas = _kpis(cliente, agenda_de_duas_horas)['lacunas']
+    assert {'data': SEGUNDA, 'funcionario': agenda_de_duas_horas, 'inicio': '08:00', 'fim': '09:00',
+            'minutos': 60} in lacunas
+
+    lacunas = _kpis(cliente, agenda_de_duas_horas, lacuna_minima=120)['lacunas']
+    assert all(l['minutos'] >= 120 for l in lacunas)
+    assert _kpis(cliente, agenda_de_duas_horas, lacuna_minima=600)['lacunas'] == []
+
+
+@pytest.mark.parametrize('parametros,erro', [
+    ({'inicio': '2026-02-30'}, 'inicio'),
+    ({'inicio': SEXTA, 'fim': SEGUNDA}, 'fim não pode ser antes de inicio'),
+    ({'inicio': '2000-01-01', 'fim': SEXTA}, 'Intervalo de datas longo demais'),
+    ({'limite_sobrecarga': 0}, 'limite_sobrecarga deve ser um número positivo'),
+    ({'limite_sobrecarga': 'abc'}, 'limite_sobrecarga deve ser um número'),
+    ({'limite_sobrecarga': 'nan'}, 'limite_sobrecarga deve ser um número'),
+    ({'lacuna_minima': -5}, 'lacuna_minima deve ser um número positivo de minutos'),
+    ({'lacuna_minima': '1.5'}, 'lacuna_minima deve ser um número inteiro'),
+])
+def test_parametros_invalidos(cliente, parametros, erro):
+    resposta = cliente.get('/api/kpis', query_string=parametros)
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()['error']
+
+
+def test_funcionario_desconhecido(cliente, funcionario):
+    resposta = cliente.get('/api/kpis', query_string={'funcionarios': f'{funcionario},nao-existe'})
+    assert resposta.status_code == 404
+    assert resposta.get_json()['error'] == 'Funcionários não encontrados: nao-existe'
@@ -0,0 +1,83 @@
+"""
+POST /api/batch: respostas na ordem pedida, corpos JSON e de texto,
+validação dos itens e conferência de consistência pela versão dos dados
+"""
+
+import itertools
+
+import pytest
+from flask import Flask, jsonify
+
+from src.services.lote import registrar_lote
+
+
+def _lote(cliente, requisicoes):
+    resposta = cliente.post('/api/batch', json={'requisicoes': requisicoes})
+    assert resposta.status_code == 200
+    return resposta.get_json()
+
+
+def test_respostas_na_ordem(cliente, funcionario):
+    lote = _lote(cliente, [
+        f'/api/admin/funcionarios/{funcionario}',
+        {'caminho': '/api/demandas', 'parametros': {'funcionario': funcionario, 'limite': 1}},
+        '/api/admin/funcionarios/nao-existe',
+    ])
+
+    assert lote['consistente'] is True
+    individual = cliente.get(f'/api/admin/funcionarios/{funcionario}')
+    primeira, segunda, terceira = lote['respostas']
+    assert (primeira['status'], primeira['corpo']) == (200, individual.get_json())
+    assert primeira['cabecalhos']['ETag'] == individual.headers['ETag']
+    assert segunda['caminho'] == f'/api/demandas?funcionario={funcionario}&limite=1'
+    assert segunda['corpo']['itens'] == []
+    assert terceira['status'] == 404
+
+
+def test_corpo_que_nao_e_json(cliente, funcionario):
+    [resposta] = _lote(cliente, [f'/api/agenda/funcionario/{funcionario}.ics'])['respostas']
+    assert resposta['corpo'].startswith('BEGIN:VCALENDAR')
+
+
+def test_lista_no_corpo(cliente):
+    resposta = cliente.post('/api/batch', json=['/api/tarefas'])
+    assert resposta.status_code == 200
+    assert resposta.get_json()['respostas'][0]['status'] == 200
+
+
+@pytest.mark.parametrize('corpo,erro', [
+    ({'requisicoes': []}, 'pelo menos um item'),
+    ({'requisicoes': '/api/tarefas'}, 'pelo menos um item'),
+    ({'requisicoes': ['/api/tarefas'] * 33}, 'No máximo 32 itens por lote'),
+    ({'requisicoes': ['/metrics']}, 'caminho fora da API: /metrics'),
+    ({'requisicoes': ['/api/batch']}, 'lotes não podem conter outro lote'),
+    ({'requisicoes': [{'caminho': '/api/tarefas', 'parametros': [1]}]}, 'parametros deve ser um objeto'),
+    ({'requisicoes': [3]}, 'cada item deve ser um caminho'),
+])
+def test_lote_invalido(cliente, corpo, erro):
+    resposta = cliente.post('/api/batch', json=corpo)
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()['error']
+
+
+def _app_com_versoes(versoes):
+    app = Flask(__name__)
+
+    @app.route('/api/x')
+    def x():
+        return jsonify(ok=True)
+
+    registrar_lote(app, versao=lambda: next(versoes), paralelo=False)
+    return app.test_client()
+
+
+def test_refaz_o_lote_quando_a_versao_muda():
+    # Primeira tentativa vê 1 -> 2; a segunda, 2 -> 2
+    lote = _lote(_app_com_versoes(iter([1, 2, 2, 2])), ['/api/x'])
+    assert (lote['versao'], lote['consistente']) == ('2', True)
+
+
+def test_inconsistente_depois_das_tentativas():
+    lote = _lote(_app_com_versoes(itertools.count()), ['/api/x'])
+    assert lote['consistente'] is False
+    assert lote['respostas'][0]['corpo'] == {'ok': True}
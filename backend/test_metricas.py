@@ -0,0 +1,85 @@
+"""
+GET /metrics: contadores por rota, consultas SQL por requisição, formato dos
+histogramas, fragmentos por thread e token de acesso
+"""
+
+import re
+import threading
+
+from src.services.metricas import Metricas
+
+
+def _valor(texto, linha):
+    """Valor da série `linha` (nome com rótulos) no texto do scrape; 0 se ausente"""
+    encontrado = re.search(rf'^{re.escape(linha)} (\S+)$', texto, re.MULTILINE)
+    return float(encontrado.group(1)) if encontrado else 0
+
+
+def _scrape(cliente):
+    resposta = cliente.get('/metrics')
+    assert resposta.status_code == 200
+    assert resposta.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+    return resposta.get_data(as_text=True)
+
+
+def test_conta_requisicoes_pelo_modelo_da_rota(cliente, funcionario):
+    serie = 'workspace_http_requisicoes_total{rota="/api/admin/funcionarios/<funcionario_id>",metodo="GET",status="200"}'
+    antes = _valor(_scrape(cliente), serie)
+
+    cliente.get(f'/api/admin/funcionarios/{funcionario}')
+    cliente.get('/api/admin/funcionarios/outro-id')
+
+    texto = _scrape(cliente)
+    assert _valor(texto, serie) == antes + 1
+    assert _valor(texto, serie.replace('status="200"', 'status="404"')) >= 1
+
+
+def test_requisicao_sem_rota(cliente):
+    assert cliente.delete('/metrics').status_code == 405
+    assert _valor(_scrape(cliente), 'workspace_http_requisicoes_total{rota="nao_encontrada",metodo="DELETE",status="405"}') >= 1
+
+
+def test_consultas_sql_por_requisicao(cliente):
+    serie = 'workspace_sql_consultas_por_requisicao_sum{rota="/api/demandas"}'
+    antes = _valor(_scrape(cliente), serie)
+    cliente.get('/api/demandas')
+    assert _valor(_scrape(cliente), serie) > antes
+
+
+def test_histograma_acumulado():
+    registro = Metricas()
+    for valor in (0.003, 0.02, 7):
+        registro.observar('workspace_http_duracao_segundos', ('/x', 'GET'), valor)
+
+    texto = registro.texto()
+    prefixo = 'workspace_http_duracao_segundos'
+    assert _valor(texto, f'{prefixo}_bucket{{rota="/x",metodo="GET",le="0.005"}}') == 1
+    assert _valor(texto, f'{prefixo}_bucket{{rota="/x",metodo="GET",le="0.025"}}') == 2
+    assert _valor(texto, f'{prefixo}_bucket{{rota="/x",metodo="GET",le="+Inf"}}') == 3
+    assert _valor(texto, f'{prefixo}_count{{rota="/x",metodo="GET"}}') == 3
+    assert _valor(texto, f'{prefixo}_sum{{rota="/x",metodo="GET"}}') == 7.023
+
+
+def test_fragmentos_de_outras_threads():
+    registro = Metricas()
+    threads = [threading.Thread(target=registro.contar, args=('workspace_sql_consultas_total',)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    registro.contar('workspace_sql_consultas_total')
+
+    assert _valor(registro.texto(), 'workspace_sql_consultas_total') == 5
+
+
+def test_rotulos_escapados():
+    registro = Metricas()
+    registro.contar('workspace_cache_consultas_total', ('a"b\\c', 'acerto'))
+    assert 'cache="a\\"b\\\\c"' in registro.texto()
+
+
+def test_token(cliente, monkeypatch):
+    monkeypatch.setenv('METRICS_TOKEN', 'segredo')
+    assert cliente.get('/metrics').status_code == 401
+    assert cliente.get('/metrics', headers={'Authorization': 'Bearer outro'}).status_code == 401
+    assert cliente.get('/metrics', headers={'Authorization': 'Bearer segredo'}).status_code == 200
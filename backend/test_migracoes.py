@@ -0,0 +1,87 @@
+"""
+Migrações: banco antigo sem colunas e índices novos, checagem de
+inicialização sem DDL e impressão do schema
+"""
+
+import sqlite3
+
+import pytest
+from flask import Flask
+from sqlalchemy import inspect
+
+from src.database import db
+from src.database import migracoes
+from src.database.migracoes import BancoDesatualizado, impressao_schema, migrar, preparar_banco
+
+# Tabelas como estavam em produção antes das colunas e índices adicionados
+SCHEMA_ANTIGO = '''
+CREATE TABLE tarefas (id VARCHAR(50) PRIMARY KEY, nome VARCHAR(200) NOT NULL, categoria VARCHAR(50) NOT NULL,
+    tempo_estimado INTEGER NOT NULL, descricao TEXT, prioridade VARCHAR(20) NOT NULL, created_at DATETIME,
+    updated_at DATETIME);
+CREATE TABLE demandas (id INTEGER PRIMARY KEY, titulo VARCHAR(200) NOT NULL, descricao TEXT NOT NULL,
+    funcionario_id VARCHAR(50) NOT NULL, tarefa_id VARCHAR(50), importancia VARCHAR(10) NOT NULL,
+    status VARCHAR(20) NOT NULL, prazo DATE NOT NULL, data_criacao DATETIME, observacoes TEXT,
+    created_at DATETIME, updated_at DATETIME);
+INSERT INTO tarefas VALUES ('antiga', 'Tarefa antiga', 'gestao', 30, '', 'alta', NULL, NULL);
+'''
+
+
+@pytest.fixture
+def banco_antigo(tmp_path):
+    """App Flask ligado a um SQLite com o schema antigo; roda dentro do contexto do app"""
+    caminho = tmp_path / 'antigo.db'
+    conexao = sqlite3.connect(caminho)
+    conexao.executescript(SCHEMA_ANTIGO)
+    conexao.close()
+
+    antigo = Flask(__name__)
+    antigo.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{caminho}'
+    db.init_app(antigo)
+    with antigo.app_context():
+        yield caminho
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_migra_banco_antigo(banco_antigo):
+    resumo = migrar()
+
+    assert resumo['pendentes'] == ['schema', 'dados_iniciais']
+    assert 'tarefas.computar_horas' in resumo['colunas_adicionadas']
+    assert 'idx_demandas_funcionario_status_prazo' in resumo['indices_criados']
+    indices = {i['name'] for i in inspect(db.engine).get_indexes('demandas')}
+    assert {nome for nome, tabela, _ in migracoes.INDICES_ADICIONADOS if tabela == 'demandas'} <= indices
+
+    conexao = sqlite3.connect(banco_antigo)
+    assert conexao.execute("SELECT computar_horas, versao FROM tarefas WHERE id = 'antiga'").fetchone() == (1, 1)
+    conexao.close()
+
+
+def test_banco_em_dia_nao_migra(banco_antigo):
+    migrar()
+    assert preparar_banco() == {'pendentes': []}
+    assert migrar(forcar=True)['indices_criados'] == []
+
+
+def test_sem_migracao_automatica(banco_antigo):
+    with pytest.raises(BancoDesatualizado, match='schema, dados_iniciais'):
+        preparar_banco(migrar_se_preciso=False)
+
+
+def test_impressao_muda_com_o_schema(monkeypatch):
+    atual = impressao_schema()
+    monkeypatch.setattr(migracoes, 'INDICES_ADICIONADOS',
+                        [*migracoes.INDICES_ADICIONADOS, ('idx_novo', 'demandas', 'titulo')])
+    impressao_schema.cache_clear()
+    try:
+        assert impressao_schema() != atual
+    finally:
+        monkeypatch.undo()
+        impressao_schema.cache_clear()
+    assert impressao_schema() == atual
+
+
+def test_comando_status(app):
+    resultado = app.test_cli_runner().invoke(args=['banco', 'status'])
+    assert resultado.exit_code == 0
+    assert 'Pendentes: nenhuma' in resultado.output
@@ -0,0 +1,99 @@
+"""
+Perfilamento: capturas sob demanda, requisições lentas, anel em disco e
+rotas de administração das capturas
+"""
+
+import time
+
+import pytest
+
+from src.services.perfilamento import Perfilador, perfilador
+
+TOKEN = 'segredo-de-teste'
+AUTORIZADO = {'Authorization': f'Bearer {TOKEN}'}
+
+
+@pytest.fixture
+def com_token(monkeypatch, tmp_path):
+    monkeypatch.setattr(perfilador, 'token', TOKEN)
+    monkeypatch.setattr(perfilador, 'pasta', str(tmp_path))
+    return tmp_path
+
+
+def _capturas(cliente):
+    resposta = cliente.get('/api/admin/capturas', headers=AUTORIZADO)
+    assert resposta.status_code == 200
+    return resposta.get_json()
+
+
+def test_captura_sob_demanda(cliente, com_token):
+    resposta = cliente.get('/api/demandas?perfil=' + TOKEN + '&limite=5')
+
+    assert resposta.status_code == 200
+    captura_id = resposta.headers['X-Perfil-Captura']
+    [resumo] = _capturas(cliente)
+    assert (resumo['id'], resumo['tipo'], resumo['prof']) == (captura_id, 'cprofile', True)
+    assert resumo['url'] == '/api/demandas?limite=5'
+    assert resumo['sql_consultas'] >= 1
+
+    captura = cliente.get(f'/api/admin/capturas/{captura_id}', headers=AUTORIZADO).get_json()
+    assert 'cumulative' in captura['perfil']
+    assert captura['sql']
+    prof = cliente.get(f'/api/admin/capturas/{captura_id}?formato=prof', headers=AUTORIZADO)
+    assert prof.status_code == 200
+    assert prof.mimetype == 'application/octet-stream'
+
+
+def test_perfil_na_resposta(cliente, com_token):
+    resposta = cliente.get('/api/tarefas', headers={'X-Perfil': TOKEN}, query_string={'perfil_saida': 'resposta'})
+    assert resposta.mimetype == 'text/plain'
+    assert 'function calls' in resposta.get_data(as_text=True)
+
+
+def test_amostragem(cliente, com_token):
+    resposta = cliente.get('/api/tarefas', headers={'X-Perfil': TOKEN, 'X-Perfil-Modo': 'amostragem'})
+    assert resposta.headers['X-Perfil-Captura'].endswith('-amostragem')
+    assert _capturas(cliente)[0]['prof'] is False
+
+
+def test_token_errado(cliente, com_token):
+    assert cliente.get('/api/tarefas', headers={'X-Perfil': 'outro'}).status_code == 403
+    assert cliente.get('/api/admin/capturas').status_code == 403
+    assert cliente.get('/api/admin/capturas', headers={'Authorization': 'Bearer outro'}).status_code == 403
+    assert cliente.get('/api/admin/capturas/x', headers={'Authorization': TOKEN}).status_code == 403
+
+
+def test_sem_pedido_nao_captura(cliente, com_token):
+    resposta = cliente.get('/api/tarefas')
+    assert 'X-Perfil-Captura' not in resposta.headers
+    assert _capturas(cliente) == []
+
+
+@pytest.mark.parametrize('caminho', [
+    '/api/admin/capturas/20260101T000000Z-1-0001-cprofile',
+    '/api/admin/capturas/..app',
+    '/api/admin/capturas/20260101T000000Z-1-0001-cprofile?formato=txt',
+])
+def test_captura_inexistente(cliente, com_token, caminho):
+    assert cliente.get(caminho, headers=AUTORIZADO).status_code == 404
+
+
+def test_anel_apaga_as_mais_antigas(cliente, com_token, monkeypatch):
+    monkeypatch.setattr(perfilador, 'max_capturas', 2)
+    ids = [cliente.get('/api/tarefas', headers={'X-Perfil': TOKEN}).headers['X-Perfil-Captura'] for _ in range(3)]
+
+    assert [c['id'] for c in _capturas(cliente)] == ids[:0:-1]
+    assert sorted(p.name for p in com_token.iterdir()) == sorted(f'{i}.{e}' for i in ids[1:] for e in ('json', 'prof'))
+
+
+def test_tarefa_lenta(tmp_path):
+    lento = Perfilador(pasta=str(tmp_path), limite_lento_ms=5, intervalo_ms=1)
+    with lento.tarefa('rapida'):
+        pass
+    with lento.tarefa('sincronizacao') as execucao:
+        lento.etapa('google_calendar', 0.002)
+        time.sleep(0.05)
+
+    [resumo] = lento.listar()
+    assert (resumo['tipo'], resumo['nome'], resumo['metodo']) == ('lenta', 'sincronizacao', 'TAREFA')
+    assert execucao.amostras
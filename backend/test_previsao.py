@@ -0,0 +1,54 @@
+"""
+GET /api/previsao: previsão de carga para um funcionário novo e validação
+da query string
+"""
+
+import datetime
+
+import pytest
+
+AMANHA = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+ONTEM = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
+
+
+def test_previsao_do_funcionario(cliente, funcionario):
+    resposta = cliente.get('/api/previsao', query_string={'inicio': AMANHA, 'dias': 2, 'funcionarios': funcionario})
+
+    assert resposta.status_code == 200
+    previsao = resposta.get_json()
+    [linha] = previsao['funcionarios']
+    assert linha['id'] == funcionario
+    assert linha['capacidade_horas'] == 19.0
+    assert linha['por_dia'][0]['data'] == AMANHA
+    assert len(linha['por_dia']) == 2
+    assert all(len(c['por_dia']) == 2 for c in previsao['categorias'])
+
+
+def test_ajuste_reaproveitado_sem_mudancas(cliente, funcionario):
+    cliente.get('/api/previsao')
+    ajuste = cliente.get('/api/previsao').get_json()['ajuste']
+    assert (ajuste['tipo'], ajuste['dias_processados']) == ('incremental', 0)
+
+    cliente.put(f'/api/admin/funcionarios/{funcionario}', json={'horarioFim': '18:00'})
+    assert cliente.get('/api/previsao').get_json()['ajuste']['tipo'] == 'completo'
+
+
+@pytest.mark.parametrize('parametros,erro', [
+    ({'inicio': 'amanha'}, 'inicio'),
+    ({'inicio': ONTEM}, 'inicio não pode ser antes de hoje'),
+    ({'dias': 0}, 'dias deve estar entre 1 e 28'),
+    ({'dias': 29}, 'dias deve estar entre 1 e 28'),
+    ({'dias': 'abc'}, 'dias deve ser um número inteiro'),
+    ({'limite_sobrecarga': -1}, 'limite_sobrecarga deve ser um número positivo'),
+    ({'limite_sobrecarga': 'inf'}, 'limite_sobrecarga deve ser um número'),
+])
+def test_parametros_invalidos(cliente, parametros, erro):
+    resposta = cliente.get('/api/previsao', query_string=parametros)
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()['error']
+
+
+def test_funcionario_desconhecido(cliente):
+    resposta = cliente.get('/api/previsao', query_string={'funcionarios': 'nao-existe'})
+    assert resposta.status_code == 404
+    assert resposta.get_json()['error'] == 'Funcionários não encontrados: nao-existe'
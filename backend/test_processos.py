@@ -0,0 +1,107 @@
+"""
+Processos: um registro por tarefa, resumo sem passos, JSON Merge Patch e
+operações sobre os passos
+"""
+
+import json
+
+import pytest
+
+MERGE_PATCH = 'application/merge-patch+json'
+
+
+@pytest.fixture
+def processo(cliente, tarefa):
+    resposta = cliente.put(f'/api/admin/processos/{tarefa}', json={
+        'titulo': 'Processo de teste', 'descricao': 'Descrição', 'tempoEstimado': '30 min',
+        'frequencia': 'diaria', 'observacoes': ['obs'],
+        'passos': [{'numero': 1, 'titulo': 'Abrir'}, {'numero': 2, 'titulo': 'Conferir'},
+                   {'numero': 3, 'titulo': 'Fechar'}]
+    })
+    assert resposta.status_code == 200
+    return tarefa
+
+
+def _patch(cliente, tarefa_id, corpo, tipo=MERGE_PATCH):
+    return cliente.patch(f'/api/processos/{tarefa_id}', data=json.dumps(corpo), content_type=tipo)
+
+
+def _titulos(resposta):
+    return [(p['numero'], p['titulo']) for p in resposta.get_json()['passos']]
+
+
+def test_resumo_sem_passos(cliente, processo):
+    resumo = {p['id']: p for p in cliente.get('/api/processos').get_json()}[processo]
+    assert resumo['titulo'] == 'Processo de teste'
+    assert 'passos' not in resumo
+
+
+def test_merge_patch(cliente, processo):
+    resposta = _patch(cliente, processo, {'titulo': 'Novo título', 'descricao': None})
+
+    assert resposta.status_code == 200
+    atual = cliente.get(f'/api/processos/{processo}').get_json()
+    assert atual['titulo'] == 'Novo título'
+    assert not atual.get('descricao')
+    assert len(atual['passos']) == 3
+
+
+def test_operacoes_nos_passos(cliente, processo):
+    resposta = _patch(cliente, processo, {'operacoes': [
+        {'op': 'inserir', 'posicao': 1, 'passo': {'titulo': 'Preparar'}},
+        {'op': 'remover', 'numero': 3},
+        {'op': 'mover', 'numero': 3, 'para': 1},
+        {'op': 'editar', 'numero': 2, 'passo': {'titulo': 'Preparar tudo'}},
+    ]}, 'application/json')
+
+    assert resposta.status_code == 200
+    assert _titulos(resposta) == [(1, 'Fechar'), (2, 'Preparar tudo'), (3, 'Abrir')]
+
+
+@pytest.mark.parametrize('operacoes,erro', [
+    ([{'op': 'remover', 'numero': 9}], 'Passo 9 não existe'),
+    ([{'op': 'inserir'}], 'inserir exige o objeto passo'),
+    ([{'op': 'trocar'}], 'Operação desconhecida'),
+])
+def test_operacao_invalida_nao_aplica_nada(cliente, processo, operacoes, erro):
+    resposta = _patch(cliente, processo, {'operacoes': [{'op': 'remover', 'numero': 1}, *operacoes]},
+                      'application/json')
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()['error']
+    assert len(cliente.get(f'/api/processos/{processo}').get_json()['passos']) == 3
+
+
+@pytest.mark.parametrize('corpo,erro', [
+    ({'titulo': None}, 'Campo obrigatório: titulo'),
+    ({'extra': 1}, 'Campos desconhecidos: extra'),
+    ({'passos': 'um'}, 'passos deve ser uma lista de objetos'),
+    ([1, 2], 'O processo deve ser um objeto'),
+])
+def test_merge_patch_invalido(cliente, processo, corpo, erro):
+    resposta = _patch(cliente, processo, corpo)
+    assert resposta.status_code == 400
+    assert resposta.get_json()['error'] == erro
+
+
+def test_corpo_que_nao_e_json(cliente, processo):
+    resposta = cliente.patch(f'/api/processos/{processo}', data='{', content_type=MERGE_PATCH)
+    assert resposta.status_code == 400
+
+
+def test_formato_nao_suportado(cliente, processo):
+    assert _patch(cliente, processo, {'titulo': 'x'}, 'application/json').status_code == 415
+
+
+def test_processo_inexistente(cliente):
+    assert cliente.get('/api/processos/nao-existe').status_code == 404
+    assert _patch(cliente, 'nao-existe', {'titulo': 'x'}).status_code == 404
+
+
+def test_criar_processo_de_tarefa_inexistente(cliente):
+    resposta = cliente.put('/api/admin/processos/nao-existe', json={'titulo': 'x'})
+    assert resposta.status_code == 404
+
+
+def test_remover_processo(cliente, processo):
+    assert cliente.delete(f'/api/admin/processos/{processo}').status_code == 200
+    assert cliente.delete(f'/api/admin/processos/{processo}').status_code == 404
@@ -0,0 +1,119 @@
+"""
+Agenda recorrente: expansão em /api/agenda/ocorrencias, regra de
+recorrência, exceções (inclusive nos feeds ICS) e validação
+"""
+
+import pytest
+
+SEGUNDA, TERCA, QUARTA = '2026-03-02', '2026-03-03', '2026-03-04'
+
+
+def _ocorrencias(cliente, funcionario, inicio=SEGUNDA, fim=QUARTA):
+    resposta = cliente.get('/api/agenda/ocorrencias',
+                           query_string={'funcionario': funcionario, 'inicio': inicio, 'fim': fim})
+    assert resposta.status_code == 200
+    return [(o['data'], o['horario']) for o in resposta.get_json()]
+
+
+def test_expande_a_regra(cliente, funcionario, agendamento):
+    agendamento(recorrencia='FREQ=WEEKLY;BYDAY=MO,WE')
+    assert _ocorrencias(cliente, funcionario) == [(SEGUNDA, '09:00'), (QUARTA, '09:00')]
+
+
+def test_excecoes_alteram_e_cancelam_ocorrencias(cliente, funcionario, agendamento):
+    agenda_id = agendamento()
+    assert cliente.post(f'/api/agenda/{agenda_id}/excecoes', json={'data': SEGUNDA, 'cancelado': True}).status_code == 201
+    assert cliente.post(f'/api/agenda/{agenda_id}/excecoes', json={'data': TERCA, 'horario': '15:00'}).status_code == 201
+
+    assert _ocorrencias(cliente, funcionario) == [(TERCA, '15:00'), (QUARTA, '09:00')]
+
+    assert cliente.delete(f'/api/agenda/{agenda_id}/excecoes/{SEGUNDA}').status_code == 200
+    assert _ocorrencias(cliente, funcionario) == [(SEGUNDA, '09:00'), (TERCA, '15:00'), (QUARTA, '09:00')]
+
+
+def test_trocar_a_regra(cliente, funcionario, agendamento):
+    agenda_id = agendamento()
+    resposta = cliente.put(f'/api/agenda/{agenda_id}/recorrencia', json={'recorrencia': 'FREQ=WEEKLY;BYDAY=TU'})
+    assert resposta.status_code == 200
+    assert _ocorrencias(cliente, funcionario) == [(TERCA, '09:00')]
+
+
+def test_excecoes_no_feed_ics(cliente, funcionario, agendamento):
+    agenda_id = agendamento()
+    etag = cliente.get(f'/api/agenda/funcionario/{funcionario}.ics').headers['ETag']
+    cliente.post(f'/api/agenda/{agenda_id}/excecoes', json={'data': SEGUNDA, 'cancelado': True})
+    cliente.post(f'/api/agenda/{agenda_id}/excecoes', json={'data': TERCA, 'horario': '15:00'})
+
+    resposta = cliente.get(f'/api/agenda/funcionario/{funcionario}.ics', headers={'If-None-Match': etag})
+
+    assert resposta.status_code == 200
+    texto = resposta.get_data(as_text=True)
+    assert 'EXDATE;TZID=America/Sao_Paulo:20260302T090000' in texto
+    assert 'RECURRENCE-ID;TZID=America/Sao_Paulo:20260303T090000' in texto
+    assert 'DTSTART;TZID=America/Sao_Paulo:20260303T150000' in texto
+
+
+def test_limite_de_ocorrencias(cliente, funcionario, agendamento):
+    agendamento()
+    resposta = cliente.get('/api/agenda/ocorrencias', query_string={
+        'funcionario': funcionario, 'inicio': SEGUNDA, 'fim': QUARTA, 'limite': 2
+    })
+    assert len(resposta.get_json()) == 2
+
+
+@pytest.mark.parametrize('parametros,erro', [
+    ({'inicio': '2026-02-30'}, 'inicio'),
+    ({'inicio': QUARTA, 'fim': SEGUNDA}, 'Intervalo de datas inválido'),
+    ({'inicio': SEGUNDA, 'fim': '2027-06-01'}, 'Intervalo de datas inválido'),
+    ({'limite': 0}, 'limite deve ser positivo'),
+])
+def test_ocorrencias_com_parametros_invalidos(cliente, parametros, erro):
+    resposta = cliente.get('/api/agenda/ocorrencias', query_string=parametros)
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()['error']
+
+
+def test_recorrencia_de_agendamento_inexistente_ou_datado(cliente, agendamento):
+    datado = agendamento(data=SEGUNDA)
+    assert cliente.put('/api/agenda/999999/recorrencia', json={'recorrencia': None}).status_code == 404
+    assert cliente.put(f'/api/agenda/{datado}/recorrencia', json={'recorrencia': None}).status_code == 404
+    assert cliente.post(f'/api/agenda/{datado}/excecoes', json={'data': SEGUNDA}).status_code == 404
+
+
+@pytest.mark.parametrize('corpo', [{'recorrencia': 5}, {'recorrencia': 'FREQ=HOURLY'}, [1]])
+def test_recorrencia_invalida(cliente, agendamento, corpo):
+    agenda_id = agendamento()
+    assert cliente.put(f'/api/agenda/{agenda_id}/recorrencia', json=corpo).status_code == 400
+
+
+@pytest.mark.parametrize('corpo,erro', [
+    ({}, 'data é obrigatória'),
+    ({'data': '03/02/2026'}, 'data é obrigatória'),
+    ({'data': SEGUNDA, 'horario': '99:99'}, 'horario deve estar no formato'),
+    ({'data': SEGUNDA, 'duracao': 0}, 'duracao deve ser'),
+    ({'data': SEGUNDA, 'duracao': '30'}, 'duracao deve ser'),
+    ({'data': SEGUNDA, 'tarefa': 'nao-existe'}, 'Tarefa não encontrada'),
+    ({'data': SEGUNDA, 'tarefa': {}}, 'Tarefa não encontrada'),
+    ({'data': SEGUNDA, 'cancelado': 'sim'}, 'cancelado deve ser true ou false'),
+])
+def test_excecao_invalida(cliente, agendamento, corpo, erro):
+    agenda_id = agendamento()
+    resposta = cliente.post(f'/api/agenda/{agenda_id}/excecoes', json=corpo)
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()['error']
+
+
+def test_excecao_com_corpo_que_nao_e_objeto(cliente, agendamento):
+    agenda_id = agendamento()
+    resposta = cliente.post(f'/api/agenda/{agenda_id}/excecoes', json=[SEGUNDA])
+    assert resposta.status_code == 400
+
+
+def test_remover_excecao_inexistente(cliente, agendamento):
+    agenda_id = agendamento()
+    assert cliente.delete(f'/api/agenda/{agenda_id}/excecoes/{SEGUNDA}').status_code == 404
+
+
+def test_agendamento_com_horario_invalido_e_recusado(cliente, funcionario, tarefa):
+    resposta = cliente.post('/api/admin/agenda', json={'horario': '99:99', 'funcionario': funcionario, 'tarefa': tarefa})
+    assert resposta.status_code == 400
@@ -0,0 +1,54 @@
+"""
+Servidor de produção: configuração do gunicorn pelo ambiente e rota de
+prontidão
+"""
+
+import pytest
+
+from src.servidor import Prontidao, configuracao, prontidao
+
+
+def test_configuracao_padrao(monkeypatch):
+    for nome in ('PORT', 'WEB_CONCURRENCY', 'WEB_THREADS', 'WEB_TIMEOUT'):
+        monkeypatch.delenv(nome, raising=False)
+
+    config = configuracao(5000)
+
+    assert config['bind'] == '0.0.0.0:5000'
+    assert (config['workers'], config['threads'], config['timeout']) == (1, 8, 30)
+    assert config['preload_app'] is True
+    assert 'max_requests' not in config
+
+
+def test_configuracao_pelo_ambiente(monkeypatch):
+    monkeypatch.setenv('PORT', '8080')
+    monkeypatch.setenv('WEB_THREADS', '0')
+    monkeypatch.setenv('WEB_TIMEOUT', 'abc')
+
+    config = configuracao(5000)
+
+    assert config['bind'] == '0.0.0.0:8080'
+    assert config['threads'] == 1
+    assert config['timeout'] == 30
+
+
+def test_pronto(cliente):
+    resposta = cliente.get('/api/ready')
+    assert resposta.status_code == 200
+    assert resposta.get_json()['verificacoes'] == {'banco': True}
+
+
+def test_encerrando_responde_503(cliente, monkeypatch):
+    monkeypatch.setattr(prontidao, 'encerrando', True)
+    resposta = cliente.get('/api/ready')
+    assert resposta.status_code == 503
+    assert resposta.get_json()['status'] == 'not_ready'
+
+
+@pytest.mark.parametrize('verificacao', [lambda: False, lambda: 1 / 0])
+def test_verificacao_que_falha(verificacao):
+    estado = Prontidao()
+    estado.registrar('ok', lambda: True)
+    estado.registrar('falha', verificacao)
+    assert estado.estado()['status'] == 'not_ready'
+    assert estado.estado()['verificacoes'] == {'ok': True, 'falha': False}
@@ -22,9 +22,13 @@ try:
     print("✅ Modelos importados")
     
     # Testa importação do app
-    from src.main import app
+    from src.main import app, garantir_banco
     print("✅ App importado")
     
+    # O import não toca no banco; a checagem (e migração, se preciso) roda antes de servir
+    garantir_banco()
+    print("✅ Banco conferido")
+    
     # Testa se o app consegue inicializar
     with app.app_context():
         print("✅ App context funcionando")
@@ -45,7 +49,7 @@ try:
                 print(f"  - {func.nome} ({func.id})")
     
     print("\n🎉 Backend está funcionando corretamente!")
-    print("🚀 Execute: py src/main.py")
+    print("🚀 Execute: py src/main.py --dev")
     
 except Exception as e:
     print(f"❌ Erro: {e}")
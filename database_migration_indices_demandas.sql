@@ -0,0 +1,10 @@
+-- Migração: índices compostos para as listagens paginadas de demandas e tarefas a fazer
+-- Execute este SQL no Supabase Dashboard > SQL Editor
+-- As rotas /api/demandas e /api/tarefas-a-fazer ordenam por (prazo, id) e paginam por cursor;
+-- estes índices cobrem os filtros mais usados (responsável + status, importância)
+
+CREATE INDEX IF NOT EXISTS idx_demandas_funcionario_status_prazo ON demandas(funcionario_id, status, prazo, id);
+CREATE INDEX IF NOT EXISTS idx_demandas_importancia_prazo ON demandas(importancia, prazo, id);
+
+CREATE INDEX IF NOT EXISTS idx_tarefas_responsavel_concluida_prazo ON tarefas_a_fazer(funcionario_responsavel_id, concluida, prazo, id);
+CREATE INDEX IF NOT EXISTS idx_tarefas_concluida_prazo ON tarefas_a_fazer(concluida, prazo, id);
@@ -0,0 +1,36 @@
+-- Migração: coluna versao para controle de concorrência otimista
+-- Execute este SQL no Supabase Dashboard > SQL Editor
+-- As rotas de escrita só gravam se a versao ainda for a lida (If-Match) e a incrementam;
+-- o trigger incrementa também quando um cliente atualiza a linha sem mexer na versao,
+-- para que essas escritas invalidem as cópias antigas dos outros
+
+ALTER TABLE funcionarios ADD COLUMN IF NOT EXISTS versao INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE tarefas ADD COLUMN IF NOT EXISTS versao INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE agenda ADD COLUMN IF NOT EXISTS versao INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE processos ADD COLUMN IF NOT EXISTS versao INTEGER NOT NULL DEFAULT 1;
+
+CREATE OR REPLACE FUNCTION incrementar_versao()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.versao = OLD.versao THEN
+        NEW.versao = OLD.versao + 1;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS funcionarios_versao ON funcionarios;
+CREATE TRIGGER funcionarios_versao BEFORE UPDATE ON funcionarios
+    FOR EACH ROW EXECUTE FUNCTION incrementar_versao();
+
+DROP TRIGGER IF EXISTS tarefas_versao ON tarefas;
+CREATE TRIGGER tarefas_versao BEFORE UPDATE ON tarefas
+    FOR EACH ROW EXECUTE FUNCTION incrementar_versao();
+
+DROP TRIGGER IF EXISTS agenda_versao ON agenda;
+CREATE TRIGGER agenda_versao BEFORE UPDATE ON agenda
+    FOR EACH ROW EXECUTE FUNCTION incrementar_versao();
+
+DROP TRIGGER IF EXISTS processos_versao ON processos;
+CREATE TRIGGER processos_versao BEFORE UPDATE ON processos
+    FOR EACH ROW EXECUTE FUNCTION incrementar_versao();
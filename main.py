@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
 # Importa o app do backend
 from app_simple import app
+from src.servidor import executar
 
 if __name__ == '__main__':
     # Render usa PORT do ambiente (padrão 10000)
@@ -17,4 +18,5 @@ if __name__ == '__main__':
     print(f"🚀 Iniciando API na porta {port}")
     print("📡 Render Backend - API funcionando")
     print("🔗 Endpoints: /api/funcionarios, /api/tarefas, /api/agenda")
-    app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
\ No newline at end of file
+    # gunicorn (um processo com threads); --dev ou SERVIDOR=dev usa o servidor do Flask
+    executar(app, 10000)
\ No newline at end of file